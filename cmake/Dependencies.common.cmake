@@ -78,6 +78,16 @@ if (BUILD_LIBTIFF)
   list(APPEND DALI_LIBS ${TIFF_LIBRARY})
 endif()
 
+##################################################################
+# libpng
+##################################################################
+if (BUILD_LIBPNG)
+  find_package(PNG REQUIRED)
+  include_directories(${PNG_INCLUDE_DIRS})
+  message("Using libpng at ${PNG_LIBRARIES}")
+  list(APPEND DALI_LIBS ${PNG_LIBRARIES})
+endif()
+
 ##################################################################
 # PyBind
 ##################################################################
@@ -69,6 +69,7 @@ cmake -DCUDA_TOOLKIT_ROOT_DIR=/usr/local/cuda \
       -DBUILD_NVJPEG=${BUILD_NVJPEG:-ON}                  \
       -DBUILD_NVJPEG2K=${BUILD_NVJPEG2K}                  \
       -DBUILD_LIBTIFF=${BUILD_LIBTIFF:-ON}                \
+      -DBUILD_LIBPNG=${BUILD_LIBPNG:-ON}                  \
       -DBUILD_LIBSND=${BUILD_LIBSND:-ON}                  \
       -DBUILD_FFTS=${BUILD_FFTS:-ON}                      \
       -DBUILD_NVOF=${BUILD_NVOF:-ON}                      \
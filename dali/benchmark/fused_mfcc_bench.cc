@@ -0,0 +1,171 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <benchmark/benchmark.h>
+#include <random>
+#include <vector>
+#include "dali/benchmark/dali_bench.h"
+#include "dali/kernels/audio/mel_scale/mel_filter_bank_cpu.h"
+#include "dali/kernels/audio/mfcc/fused_mfcc_cpu.h"
+#include "dali/kernels/scratch.h"
+#include "dali/kernels/signal/dct/dct_cpu.h"
+#include "dali/kernels/signal/decibel/to_decibels_cpu.h"
+#include "dali/kernels/signal/fft/fft_cpu.h"
+#include "dali/kernels/signal/window/extract_windows_cpu.h"
+#include "dali/kernels/signal/window/window_functions.h"
+
+namespace dali {
+
+using kernels::audio::FusedMfccArgs;
+
+namespace {
+
+template <int ndim>
+kernels::OutTensorCPU<float, ndim> OutView(std::vector<float> &data, const TensorShape<> &shape) {
+  return kernels::OutTensorCPU<float, DynamicDimensions>(data.data(), shape).to_static<ndim>();
+}
+
+template <>
+kernels::OutTensorCPU<float, DynamicDimensions> OutView<DynamicDimensions>(
+    std::vector<float> &data, const TensorShape<> &shape) {
+  return {data.data(), shape};
+}
+
+}  // namespace
+
+/**
+ * @brief Compares the fused MFCC kernel with the chain of kernels used by
+ *        Spectrogram -> MelFilterBank -> ToDecibels -> MFCC
+ *
+ * Arguments: signal length, window length, window step, nfft
+ */
+class MfccBenchCPU : public DALIBenchmark {
+ public:
+  void Prepare(benchmark::State &st) {
+    int64_t length = st.range(0);
+    signal_.resize(length);
+    std::mt19937 rng(1234);
+    std::uniform_real_distribution<float> dist(-1, 1);
+    for (auto &x : signal_)
+      x = dist(rng);
+
+    args_.window.window_length = st.range(1);
+    args_.window.window_step = st.range(2);
+    args_.window.window_center = args_.window.window_length / 2;
+    args_.window.padding = kernels::signal::Padding::Reflect;
+    args_.window.axis = 0;
+    args_.nfft = st.range(3);
+    args_.mel.nfilter = 64;
+    args_.mel.sample_rate = 16000;
+    args_.mel.freq_high = 8000;
+    args_.mel.axis = 0;
+    args_.db.ref_max = true;
+    args_.dct.ndct = 20;
+
+    window_fn_.resize(args_.window.window_length);
+    kernels::signal::HannWindow(make_span(window_fn_));
+  }
+
+  void RunChained(benchmark::State &st) {
+    Prepare(st);
+    auto in = make_tensor_cpu<1>(signal_.data(), {static_cast<int64_t>(signal_.size())});
+    auto window_fn = make_tensor_cpu<1>(window_fn_.data(), {args_.window.window_length});
+
+    kernels::signal::ExtractWindowsCpu<float, float, 1> window_kernel;
+    kernels::signal::fft::Fft1DCpu<float, float, 2> fft_kernel;
+    kernels::audio::MelFilterBankCpu<float, 2> mel_kernel;
+    kernels::signal::ToDecibelsCpu<float> db_kernel;
+    kernels::signal::dct::Dct1DCpu<float, float, 2> dct_kernel;
+    kernels::signal::fft::FftArgs fft_args;
+    fft_args.nfft = args_.nfft;
+    fft_args.spectrum_type = args_.spectrum_type;
+    fft_args.transform_axis = 0;
+
+    std::vector<float> windows, spectrogram, mel, db, mfcc;
+    TensorShape<> shape;
+    for (auto _ : st) {
+      RunKernel<2>(window_kernel, windows, shape, in, window_fn, args_.window);
+      auto windows_view = make_tensor_cpu<2>(windows.data(), shape.to_static<2>());
+      RunKernel<2>(fft_kernel, spectrogram, shape, windows_view, fft_args);
+      auto spectrogram_view = make_tensor_cpu<2>(spectrogram.data(), shape.to_static<2>());
+      RunKernel<2>(mel_kernel, mel, shape, spectrogram_view, args_.mel);
+      auto mel_view = make_tensor_cpu(mel.data(), shape);
+      RunKernel<DynamicDimensions>(db_kernel, db, shape, mel_view, args_.db);
+      auto db_view = make_tensor_cpu<2>(db.data(), shape.to_static<2>());
+      RunKernel<2>(dct_kernel, mfcc, shape, db_view, args_.dct, 0);
+      benchmark::DoNotOptimize(mfcc.data());
+    }
+    st.counters["FPS"] = benchmark::Counter(st.iterations(), benchmark::Counter::kIsRate);
+  }
+
+  void RunFused(benchmark::State &st) {
+    Prepare(st);
+    auto in = make_tensor_cpu<1>(signal_.data(), {static_cast<int64_t>(signal_.size())});
+    auto window_fn = make_tensor_cpu<1>(window_fn_.data(), {args_.window.window_length});
+
+    kernels::audio::FusedMfccCpu kernel;
+    std::vector<float> mfcc;
+    TensorShape<> shape;
+    for (auto _ : st) {
+      RunKernel<2>(kernel, mfcc, shape, in, window_fn, args_);
+      benchmark::DoNotOptimize(mfcc.data());
+    }
+    st.counters["FPS"] = benchmark::Counter(st.iterations(), benchmark::Counter::kIsRate);
+  }
+
+ private:
+  template <int ndim, typename Kernel, typename... Args>
+  void RunKernel(Kernel &kernel, std::vector<float> &out, TensorShape<> &shape,
+                 const Args &...args) {
+    kernels::KernelContext ctx;
+    auto req = kernel.Setup(ctx, args...);
+    shape = req.output_shapes[0][0];
+    out.resize(volume(shape));
+    scratch_alloc_.Reserve(req.scratch_sizes);
+    auto scratchpad = scratch_alloc_.GetScratchpad();
+    ctx.scratchpad = &scratchpad;
+    kernel.Run(ctx, OutView<ndim>(out, shape), args...);
+  }
+
+  std::vector<float> signal_, window_fn_;
+  FusedMfccArgs args_;
+  kernels::ScratchpadAllocator scratch_alloc_;
+};
+
+static void MfccArgs(benchmark::internal::Benchmark *b) {
+  // 16 kHz audio, 25 ms windows with 10 ms step (typical ASR front-end)
+  for (int64_t length : {16000, 160000})
+    b->Args({length, 400, 160, 512});
+  b->Args({160000, 512, 256, 512});
+}
+
+BENCHMARK_DEFINE_F(MfccBenchCPU, MfccChained_CPU)(benchmark::State& st) {
+  this->RunChained(st);
+}
+
+BENCHMARK_REGISTER_F(MfccBenchCPU, MfccChained_CPU)->Iterations(100)
+->Unit(benchmark::kMicrosecond)
+->UseRealTime()
+->Apply(MfccArgs);
+
+BENCHMARK_DEFINE_F(MfccBenchCPU, MfccFused_CPU)(benchmark::State& st) {
+  this->RunFused(st);
+}
+
+BENCHMARK_REGISTER_F(MfccBenchCPU, MfccFused_CPU)->Iterations(100)
+->Unit(benchmark::kMicrosecond)
+->UseRealTime()
+->Apply(MfccArgs);
+
+}  // namespace dali
@@ -170,6 +170,12 @@ void daliPrefetchUniform(daliPipelineHandle *pipe_handle, int queue_depth) {
 }
 
 
+void daliSetThreadLimit(daliPipelineHandle *pipe_handle, int num_threads) {
+  dali::Pipeline *pipeline = reinterpret_cast<dali::Pipeline *>(pipe_handle->pipe);
+  pipeline->SetThreadLimit(num_threads);
+}
+
+
 void daliPrefetchSeparate(daliPipelineHandle *pipe_handle,
                           int cpu_queue_depth, int gpu_queue_depth) {
   dali::Pipeline *pipeline = reinterpret_cast<dali::Pipeline *>(pipe_handle->pipe);
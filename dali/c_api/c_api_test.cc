@@ -181,6 +181,36 @@ TYPED_TEST(CApiTest, FileReaderPipe) {
   ComparePipelinesOutputs<TypeParam>(handle, *pipe_ptr);
 }
 
+TYPED_TEST(CApiTest, ThreadLimit) {
+  auto pipe_ptr = GetTestPipeline<TypeParam>(true, this->output_device_);
+  auto serialized = pipe_ptr->SerializeToProtobuf();
+
+  pipe_ptr->Build();
+  for (int i = 0; i < prefetch_queue_depth; i++) {
+    pipe_ptr->RunCPU();
+    pipe_ptr->RunGPU();
+  }
+
+  daliPipelineHandle handle;
+  daliCreatePipeline(&handle, serialized.c_str(), serialized.size(), batch_size, num_thread,
+                     device_id, false, prefetch_queue_depth, prefetch_queue_depth,
+                     prefetch_queue_depth, false);
+  daliSetThreadLimit(&handle, 1);
+  daliPrefetchUniform(&handle, prefetch_queue_depth);
+
+  // The results don't depend on the number of threads used
+  for (int i = 0; i < prefetch_queue_depth; i++) {
+    ComparePipelinesOutputs<TypeParam>(handle, *pipe_ptr);
+  }
+
+  daliSetThreadLimit(&handle, num_thread);
+  daliRun(&handle);
+  pipe_ptr->RunCPU();
+  pipe_ptr->RunGPU();
+
+  ComparePipelinesOutputs<TypeParam>(handle, *pipe_ptr);
+}
+
 TYPED_TEST(CApiTest, FileReaderDefaultPipe) {
   auto pipe_ptr = GetTestPipeline<TypeParam>(true, this->output_device_);
   auto serialized = pipe_ptr->SerializeToProtobuf();
@@ -0,0 +1,198 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <algorithm>
+#include <random>
+#include <vector>
+#include "dali/core/mm/mm_test_utils.h"
+#include "dali/core/mm/size_class_resource.h"
+
+namespace dali {
+namespace mm {
+namespace test {
+
+TEST(MMSizeClassResource, ClassSize) {
+  test_host_resource upstream;
+  size_class_options opt;
+  opt.min_class_size = 256;
+  opt.max_class_size = 1 << 20;
+  opt.size_class_bits = 2;
+  size_class_resource<detail::dummy_lock> pool(&upstream, opt);
+  EXPECT_EQ(pool.class_size(1), 256u);
+  EXPECT_EQ(pool.class_size(256), 256u);
+  EXPECT_EQ(pool.class_size(257), 320u);
+  EXPECT_EQ(pool.class_size(320), 320u);
+  EXPECT_EQ(pool.class_size(321), 384u);
+  EXPECT_EQ(pool.class_size(512), 512u);
+  EXPECT_EQ(pool.class_size(513), 640u);
+  EXPECT_EQ(pool.class_size((1 << 20) + 1), (1u << 20) + 1);
+  for (size_t size = 1; size < (1 << 20); size = size * 3 / 2 + 1) {
+    EXPECT_GE(pool.class_size(size), size);
+    EXPECT_LE(pool.class_size(size), std::max<size_t>(256, size + size / 4));
+  }
+}
+
+TEST(MMSizeClassResource, Reuse) {
+  test_host_resource upstream;
+  size_class_resource<detail::dummy_lock> pool(&upstream);
+  void *p1 = pool.allocate(1000);
+  pool.deallocate(p1, 1000);
+  void *p2 = pool.allocate(1001);  // same size class
+  EXPECT_EQ(p1, p2);
+  auto stats = pool.get_stats();
+  EXPECT_EQ(stats.hits, 1u);
+  EXPECT_EQ(stats.misses, 1u);
+  EXPECT_EQ(stats.cached_bytes, 0u);
+  EXPECT_EQ(stats.upstream_bytes, pool.class_size(1000));
+
+  void *p3 = pool.allocate(5000);  // different size class
+  EXPECT_NE(p2, p3);
+  pool.deallocate(p2, 1001);
+  pool.deallocate(p3, 5000);
+  stats = pool.get_stats();
+  EXPECT_EQ(stats.misses, 2u);
+  EXPECT_EQ(stats.cached_bytes, pool.class_size(1000) + pool.class_size(5000));
+
+  pool.release_cached();
+  stats = pool.get_stats();
+  EXPECT_EQ(stats.cached_bytes, 0u);
+  EXPECT_EQ(stats.upstream_bytes, 0u);
+  upstream.check_leaks();
+}
+
+TEST(MMSizeClassResource, MaxCachedBytes) {
+  test_host_resource upstream;
+  size_class_options opt;
+  opt.max_cached_bytes = 4096;
+  size_class_resource<detail::dummy_lock> pool(&upstream, opt);
+  void *p1 = pool.allocate(4096);
+  void *p2 = pool.allocate(4096);
+  pool.deallocate(p1, 4096);
+  pool.deallocate(p2, 4096);  // over the limit - freed
+  auto stats = pool.get_stats();
+  EXPECT_EQ(stats.cached_bytes, 4096u);
+  EXPECT_EQ(stats.upstream_bytes, 4096u);
+
+  pool.set_max_cached_bytes(0);
+  EXPECT_EQ(pool.get_stats().cached_bytes, 0u);
+  upstream.check_leaks();
+}
+
+struct sync_counting_resource : size_class_resource<detail::dummy_lock> {
+  using size_class_resource<detail::dummy_lock>::size_class_resource;
+  void synchronize() override { num_syncs++; }
+  int num_syncs = 0;
+};
+
+TEST(MMSizeClassResource, DeferredReuse) {
+  test_host_resource upstream;
+  size_class_options opt;
+  opt.deferred_reuse = true;
+  sync_counting_resource pool(&upstream, opt);
+  void *p1 = pool.allocate(1000);
+  void *p2 = pool.allocate(1000);
+  pool.deallocate(p1, 1000);
+  pool.deallocate(p2, 1000);
+  EXPECT_EQ(pool.num_syncs, 0);
+  void *p3 = pool.allocate(1000);
+  EXPECT_EQ(pool.num_syncs, 1);
+  void *p4 = pool.allocate(1000);
+  EXPECT_EQ(pool.num_syncs, 1);  // the second block was already synchronized
+  EXPECT_TRUE((p3 == p1 && p4 == p2) || (p3 == p2 && p4 == p1));
+  pool.deallocate(p3, 1000);
+  pool.deallocate(p4, 1000);
+}
+
+struct background_reclaim_resource : sync_counting_resource {
+  using sync_counting_resource::sync_counting_resource;
+  void on_deferred() override { num_deferred++; }
+  int num_deferred = 0;
+};
+
+TEST(MMSizeClassResource, DeferredReuseNoReclaimOnAllocate) {
+  test_host_resource upstream;
+  size_class_options opt;
+  opt.deferred_reuse = true;
+  opt.reclaim_on_allocate = false;
+  background_reclaim_resource pool(&upstream, opt);
+  void *p1 = pool.allocate(1000);
+  pool.deallocate(p1, 1000);
+  EXPECT_EQ(pool.num_deferred, 1);
+  void *p2 = pool.allocate(1000);  // the freed block is not available yet
+  EXPECT_NE(p1, p2);
+  EXPECT_EQ(pool.num_syncs, 0);
+  pool.reclaim_deferred();
+  EXPECT_EQ(pool.num_syncs, 1);
+  void *p3 = pool.allocate(1000);
+  EXPECT_EQ(p1, p3);
+  EXPECT_EQ(pool.num_syncs, 1);
+  pool.deallocate(p2, 1000);
+  pool.deallocate(p3, 1000);
+  pool.release_cached();
+  EXPECT_EQ(pool.get_stats().cached_bytes, 0u);
+  upstream.check_leaks();
+}
+
+TEST(MMSizeClassResource, RandomAllocations) {
+  test_host_resource upstream;
+  size_class_options opt;
+  opt.max_class_size = 1 << 16;
+  opt.max_cached_bytes = 1 << 20;
+  size_class_resource<detail::dummy_lock> pool(&upstream, opt);
+  std::mt19937_64 rng(12345);
+  std::bernoulli_distribution is_free(0.4);
+  std::uniform_int_distribution<int> align_dist(0, 8);  // alignment anywhere from 1B to 256B
+  std::uniform_int_distribution<int> size_dist(1, 1 << 17);
+  struct allocation {
+    void *ptr;
+    size_t size, alignment;
+    size_t fill;
+  };
+  std::vector<allocation> allocs;
+
+  for (int i = 0; i < 10000; i++) {
+    if (is_free(rng) && !allocs.empty()) {
+      auto idx = rng() % allocs.size();
+      allocation a = allocs[idx];
+      CheckFill(a.ptr, a.size, a.fill);
+      pool.deallocate(a.ptr, a.size, a.alignment);
+      std::swap(allocs[idx], allocs.back());
+      allocs.pop_back();
+    } else {
+      allocation a;
+      a.size = size_dist(rng);
+      a.alignment = 1 << align_dist(rng);
+      a.fill = rng();
+      a.ptr = pool.allocate(a.size, a.alignment);
+      ASSERT_TRUE(detail::is_aligned(a.ptr, a.alignment));
+      Fill(a.ptr, a.size, a.fill);
+      allocs.push_back(a);
+    }
+    ASSERT_LE(pool.get_stats().cached_bytes, opt.max_cached_bytes);
+  }
+
+  for (auto &a : allocs) {
+    CheckFill(a.ptr, a.size, a.fill);
+    pool.deallocate(a.ptr, a.size, a.alignment);
+  }
+  allocs.clear();
+  EXPECT_GT(pool.get_stats().hits, 0u);
+  pool.release_cached();
+  upstream.check_leaks();
+}
+
+}  // namespace test
+}  // namespace mm
+}  // namespace dali
@@ -48,7 +48,8 @@ class DomainTimeRangeImpl : RangeBase {
   nvtxDomainHandle_t dali_domain_;
 };
 
-DLL_PUBLIC DomainTimeRange::DomainTimeRange(const char *name, const uint32_t rgb) {
+DLL_PUBLIC DomainTimeRange::DomainTimeRange(const char *name, const uint32_t rgb)
+    : trace_(name) {
   DomainTimeRangeImpl::GetInstance().Start(name, rgb);
 }
 
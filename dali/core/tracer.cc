@@ -0,0 +1,221 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <unistd.h>
+#include <algorithm>
+#include <chrono>
+#include <cstdio>
+#include <map>
+#include <sstream>
+#include <utility>
+#include "dali/core/tracer.h"
+
+namespace dali {
+
+namespace {
+
+thread_local TraceScope *tl_current_scope = nullptr;
+
+std::mutex &ThreadNamesMutex() {
+  static std::mutex m;
+  return m;
+}
+
+std::map<int, std::string> &ThreadNames() {
+  static std::map<int, std::string> names;
+  return names;
+}
+
+void WriteJsonString(std::ostream &os, const std::string &s) {
+  os << '"';
+  for (char c : s) {
+    switch (c) {
+      case '"':  os << "\\\""; break;
+      case '\\': os << "\\\\"; break;
+      case '\n': os << "\\n"; break;
+      case '\t': os << "\\t"; break;
+      default:
+        if (static_cast<unsigned char>(c) < 0x20) {
+          char buf[8];
+          snprintf(buf, sizeof(buf), "\\u%04x", c);
+          os << buf;
+        } else {
+          os << c;
+        }
+    }
+  }
+  os << '"';
+}
+
+// Chrome trace uses microseconds
+void WriteMicroseconds(std::ostream &os, int64_t ns) {
+  char buf[32];
+  snprintf(buf, sizeof(buf), "%.3f", ns * 1e-3);
+  os << buf;
+}
+
+}  // namespace
+
+Tracer &Tracer::Get() {
+  static Tracer tracer;
+  return tracer;
+}
+
+void Tracer::Enable(size_t capacity) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  if (clients_ == 0) {
+    // a new tracing session - the events of the previous one are discarded
+    events_.clear();
+    capacity_ = 0;
+    head_ = 0;
+    count_ = 0;
+  }
+  if (capacity > capacity_) {
+    // keep the events recorded so far, the oldest first
+    std::vector<TraceEvent> events;
+    events.reserve(capacity);
+    for (size_t i = 0; i < count_; i++)
+      events.push_back(std::move(events_[(head_ + i) % capacity_]));
+    events.resize(capacity);
+    events_ = std::move(events);
+    capacity_ = capacity;
+    head_ = 0;
+  }
+  clients_++;
+  enabled_ = capacity_ > 0;
+}
+
+void Tracer::Disable() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  if (clients_ > 0 && --clients_ == 0)
+    enabled_ = false;
+}
+
+void Tracer::Record(TraceEvent event) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  if (!enabled_)
+    return;
+  if (count_ < capacity_) {
+    events_[(head_ + count_) % capacity_] = std::move(event);
+    count_++;
+  } else {
+    events_[head_] = std::move(event);
+    head_ = (head_ + 1) % capacity_;
+  }
+}
+
+std::vector<TraceEvent> Tracer::Events() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  std::vector<TraceEvent> events;
+  events.reserve(count_);
+  for (size_t i = 0; i < count_; i++)
+    events.push_back(events_[(head_ + i) % capacity_]);
+  return events;
+}
+
+void Tracer::Clear() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  head_ = 0;
+  count_ = 0;
+}
+
+std::string Tracer::ExportChromeTrace() const {
+  auto events = Events();
+  std::map<int, std::string> thread_names;
+  {
+    std::lock_guard<std::mutex> lock(ThreadNamesMutex());
+    thread_names = ThreadNames();
+  }
+  int pid = getpid();
+  std::stringstream ss;
+  ss << "{\"displayTimeUnit\": \"ms\", \"traceEvents\": [";
+  bool first = true;
+  auto separator = [&]() {
+    if (!first)
+      ss << ",";
+    ss << "\n";
+    first = false;
+  };
+  for (auto &tn : thread_names) {
+    separator();
+    ss << "{\"name\": \"thread_name\", \"ph\": \"M\", \"pid\": " << pid
+       << ", \"tid\": " << tn.first << ", \"args\": {\"name\": ";
+    WriteJsonString(ss, tn.second);
+    ss << "}}";
+  }
+  for (auto &e : events) {
+    separator();
+    ss << "{\"name\": ";
+    WriteJsonString(ss, e.name);
+    ss << ", \"cat\": \"dali\", \"ph\": \"X\", \"ts\": ";
+    WriteMicroseconds(ss, e.start);
+    ss << ", \"dur\": ";
+    WriteMicroseconds(ss, std::max<int64_t>(e.end - e.start, 0));
+    ss << ", \"pid\": " << pid << ", \"tid\": " << e.thread_id;
+    if (e.sample_begin >= 0) {
+      ss << ", \"args\": {\"sample_begin\": " << e.sample_begin
+         << ", \"sample_end\": " << e.sample_end << "}";
+    }
+    ss << "}";
+  }
+  ss << "\n]}\n";
+  return ss.str();
+}
+
+int64_t Tracer::Now() {
+  static const auto origin = std::chrono::steady_clock::now();
+  return std::chrono::duration_cast<std::chrono::nanoseconds>(
+      std::chrono::steady_clock::now() - origin).count();
+}
+
+int Tracer::ThreadId() {
+  static std::atomic<int> next_id{0};
+  thread_local int id = next_id++;
+  return id;
+}
+
+void Tracer::SetThreadName(const std::string &name) {
+  int tid = ThreadId();
+  std::lock_guard<std::mutex> lock(ThreadNamesMutex());
+  ThreadNames()[tid] = name;
+}
+
+void TraceScope::Start(const char *name) {
+  event_.name = name;
+  event_.thread_id = Tracer::ThreadId();
+  parent_ = tl_current_scope;
+  tl_current_scope = this;
+  active_ = true;
+  event_.start = Tracer::Now();
+}
+
+void TraceScope::Stop() {
+  event_.end = Tracer::Now();
+  tl_current_scope = parent_;
+  active_ = false;
+  Tracer::Get().Record(std::move(event_));
+}
+
+void TraceScope::SetSampleRange(int begin, int end) {
+  if (tl_current_scope) {
+    tl_current_scope->event_.sample_begin = begin;
+    tl_current_scope->event_.sample_end = end;
+  }
+}
+
+const char *TraceScope::CurrentName() {
+  return tl_current_scope ? tl_current_scope->event_.name.c_str() : nullptr;
+}
+
+}  // namespace dali
@@ -0,0 +1,119 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <string>
+#include <thread>
+#include "dali/core/nvtx.h"
+#include "dali/core/tracer.h"
+
+namespace dali {
+
+namespace {
+
+class TracerTest : public ::testing::Test {
+ protected:
+  void SetUp() override {
+    Tracer::Get().Clear();
+  }
+
+  void TearDown() override {
+    Tracer::Get().Clear();
+  }
+};
+
+}  // namespace
+
+TEST_F(TracerTest, DisabledByDefault) {
+  EXPECT_FALSE(Tracer::Get().enabled());
+  {
+    TraceScope scope("not recorded");
+    EXPECT_EQ(TraceScope::CurrentName(), nullptr);
+  }
+  EXPECT_TRUE(Tracer::Get().Events().empty());
+}
+
+TEST_F(TracerTest, NestedScopes) {
+  Tracer::Get().Enable();
+  {
+    TraceScope outer("outer");
+    EXPECT_STREQ(TraceScope::CurrentName(), "outer");
+    {
+      DomainTimeRange inner("inner");
+      EXPECT_STREQ(TraceScope::CurrentName(), "inner");
+      TraceScope::SetSampleRange(3, 5);
+    }
+    EXPECT_STREQ(TraceScope::CurrentName(), "outer");
+  }
+  EXPECT_EQ(TraceScope::CurrentName(), nullptr);
+  Tracer::Get().Disable();
+  EXPECT_FALSE(Tracer::Get().enabled());
+
+  auto events = Tracer::Get().Events();
+  ASSERT_EQ(events.size(), 2u);
+  EXPECT_EQ(events[0].name, "inner");
+  EXPECT_EQ(events[0].sample_begin, 3);
+  EXPECT_EQ(events[0].sample_end, 5);
+  EXPECT_EQ(events[1].name, "outer");
+  EXPECT_EQ(events[1].sample_begin, -1);
+  EXPECT_LE(events[1].start, events[0].start);
+  EXPECT_GE(events[1].end, events[0].end);
+  EXPECT_EQ(events[0].thread_id, events[1].thread_id);
+}
+
+TEST_F(TracerTest, RingBufferKeepsNewest) {
+  Tracer::Get().Enable(4);
+  for (int i = 0; i < 10; i++) {
+    TraceScope scope(std::to_string(i));
+  }
+  Tracer::Get().Disable();
+  auto events = Tracer::Get().Events();
+  ASSERT_EQ(events.size(), 4u);
+  for (int i = 0; i < 4; i++)
+    EXPECT_EQ(events[i].name, std::to_string(i + 6));
+}
+
+TEST_F(TracerTest, RefCounted) {
+  Tracer::Get().Enable();
+  Tracer::Get().Enable();
+  Tracer::Get().Disable();
+  EXPECT_TRUE(Tracer::Get().enabled());
+  Tracer::Get().Disable();
+  EXPECT_FALSE(Tracer::Get().enabled());
+}
+
+TEST_F(TracerTest, ChromeTrace) {
+  Tracer::Get().Enable();
+  int main_tid = Tracer::ThreadId();
+  int worker_tid = -1;
+  std::thread worker([&]() {
+    Tracer::SetThreadName("test \"worker\"");
+    worker_tid = Tracer::ThreadId();
+    TraceScope scope("work");
+    TraceScope::SetSampleRange(0, 1);
+  });
+  worker.join();
+  Tracer::Get().Disable();
+  EXPECT_NE(main_tid, worker_tid);
+
+  std::string json = Tracer::Get().ExportChromeTrace();
+  EXPECT_NE(json.find("\"traceEvents\""), std::string::npos);
+  EXPECT_NE(json.find("\"name\": \"work\", \"cat\": \"dali\", \"ph\": \"X\""), std::string::npos);
+  EXPECT_NE(json.find("\"tid\": " + std::to_string(worker_tid)), std::string::npos);
+  EXPECT_NE(json.find("\"args\": {\"sample_begin\": 0, \"sample_end\": 1}"), std::string::npos);
+  EXPECT_NE(json.find("\"ph\": \"M\""), std::string::npos);
+  EXPECT_NE(json.find("test \\\"worker\\\""), std::string::npos);
+}
+
+}  // namespace dali
@@ -76,8 +76,9 @@ int number_of_channels(int bpp, int compression_type,
 BmpImage::BmpImage(const uint8_t *encoded_buffer, size_t length, DALIImageType image_type)
   : GenericImage(encoded_buffer, length, image_type) {}
 
-Image::Shape BmpImage::PeekShapeImpl(const uint8_t *bmp, size_t length) const {
+Image::Shape PeekBmpShape(const uint8_t *bmp, size_t length) {
   DALI_ENFORCE(bmp != nullptr);
+  DALI_ENFORCE(length >= 18, "Truncated BMP header");
   auto ptr = bmp + 14;
   uint32_t header_size = ConsumeValue<uint32_t>(ptr);
   int64_t h = 0, w = 0, c = 0;
@@ -85,7 +86,7 @@ Image::Shape BmpImage::PeekShapeImpl(const uint8_t *bmp, size_t length) const {
   const uint8_t* palette_start = nullptr;
   size_t ncolors = 0;
   size_t palette_entry_size = 0;
-  if (length >= 22 && header_size == 12) {
+  if (length >= 26 && header_size == 12) {
     // BITMAPCOREHEADER:
     // | 32u header | 16u width | 16u height | 16u number of color planes | 16u bits per pixel
     w = ConsumeValue<uint16_t>(ptr);
@@ -97,7 +98,7 @@ Image::Shape BmpImage::PeekShapeImpl(const uint8_t *bmp, size_t length) const {
       palette_entry_size = 3;
       ncolors = (1 << bpp);
     }
-  } else if (length >= 26 && header_size >= 40) {
+  } else if (length >= 50 && header_size >= 40) {
     // BITMAPINFOHEADER and later:
     // | 32u header | 32s width | 32s height | 16u number of color planes | 16u bits per pixel
     // | 32u compression type
@@ -114,15 +115,20 @@ Image::Shape BmpImage::PeekShapeImpl(const uint8_t *bmp, size_t length) const {
       palette_entry_size = 4;
       ncolors = ncolors == 0 ? (1 << bpp) : ncolors;
     }
-    // sanity check
-    if (palette_start != nullptr) {
-      assert(palette_start + (ncolors * palette_entry_size) <= bmp + length);
-    }
-
-    c = number_of_channels(bpp, compression_type, palette_start, ncolors, palette_entry_size);
+  } else {
+    DALI_FAIL(make_string("Unsupported or truncated BMP header of size ", header_size));
   }
+  // sanity check
+  if (palette_start != nullptr) {
+    DALI_ENFORCE(palette_start + (ncolors * palette_entry_size) <= bmp + length,
+                 "Truncated BMP color palette");
+  }
+  c = number_of_channels(bpp, compression_type, palette_start, ncolors, palette_entry_size);
   return {h, w, c};
 }
 
+Image::Shape BmpImage::PeekShapeImpl(const uint8_t *encoded_buffer, size_t length) const {
+  return PeekBmpShape(encoded_buffer, length);
+}
 
 }  // namespace dali
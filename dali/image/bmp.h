@@ -19,6 +19,12 @@
 
 namespace dali {
 
+/**
+ * @brief Reads the shape of a BMP image from its DIB header (and color palette, if any)
+ * @return [height, width, channels]
+ */
+DLL_PUBLIC Image::Shape PeekBmpShape(const uint8_t *bmp, size_t length);
+
 /**
  * BMP image decoding is performed using OpenCV, thus it's the same as Generic decoding
  */
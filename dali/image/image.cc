@@ -12,8 +12,12 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
+#include <cstring>
 #include <iostream>
+#include <type_traits>
 #include "dali/image/image.h"
+#include "dali/core/convert.h"
+#include "dali/core/static_switch.h"
 
 namespace dali {
 
@@ -32,6 +36,37 @@ void Image::Decode() {
 }
 
 
+void Image::Decode(DALIDataType dtype, const OutputAllocator &allocate) {
+  DALI_ENFORCE(!decoded_, "Called decode for already decoded image");
+  DALI_ENFORCE(dtype == DALI_UINT8 || dtype == DALI_UINT16 || dtype == DALI_FLOAT,
+               make_string("Unsupported output type for the decoded image: ", dtype));
+  shape_ = DecodeToImpl(image_type_, encoded_image_, length_, dtype, allocate);
+  decoded_ = true;
+}
+
+Image::Shape Image::DecodeToImpl(DALIImageType image_type, const uint8_t *encoded_buffer,
+                                 size_t length, DALIDataType dtype,
+                                 const OutputAllocator &allocate) const {
+  return ConvertDecoded(DecodeImpl(image_type, encoded_buffer, length), dtype, allocate);
+}
+
+Image::Shape Image::ConvertDecoded(const std::pair<std::shared_ptr<uint8_t>, Shape> &decoded,
+                                   DALIDataType dtype, const OutputAllocator &allocate) {
+  const uint8_t *in = decoded.first.get();
+  int64_t n = volume(decoded.second);
+  void *out = allocate(decoded.second);
+  TYPE_SWITCH(dtype, type2id, Out, (uint8_t, uint16_t, float), (
+    if (std::is_same<Out, uint8_t>::value) {
+      std::memcpy(out, in, n);
+    } else {
+      auto *out_typed = static_cast<Out *>(out);
+      for (int64_t i = 0; i < n; i++)
+        out_typed[i] = ConvertSatNorm<Out>(in[i]);
+    }
+  ), DALI_FAIL(make_string("Unsupported output type for the decoded image: ", dtype)));  // NOLINT
+  return decoded.second;
+}
+
 std::shared_ptr<uint8_t> Image::GetImage() const {
   DALI_ENFORCE(decoded_, "Image not decoded. Run Decode()");
   return decoded_image_;
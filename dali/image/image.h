@@ -27,6 +27,7 @@
 #include "dali/core/error_handling.h"
 #include "dali/util/crop_window.h"
 #include "dali/core/tensor_shape.h"
+#include "dali/pipeline/data/types.h"
 
 namespace dali {
 
@@ -34,12 +35,29 @@ class Image {
  public:
   using Shape = TensorShape<3>;
 
+  /**
+   * Returns a buffer for the decoded image of given shape ([height, width, channels]).
+   * The buffer must be large enough to hold `volume(shape)` elements of the requested type.
+   */
+  using OutputAllocator = std::function<void *(const Shape &)>;
+
   /**
    * Perform image decoding. Actual implementation is defined
    * by DecodeImpl template method
    */
   DLL_PUBLIC void Decode();
 
+  /**
+   * Decodes the image into a buffer provided by the caller, converting it to `dtype`
+   * (DALI_UINT8, DALI_UINT16 or DALI_FLOAT, normalized to [0, 1]).
+   *
+   * The decoders which support it write the pixels directly to the output buffer;
+   * the other ones decode to a temporary buffer, which is then converted.
+   * After the call, GetShape() returns the shape of the decoded image, but GetImage() can't be
+   * used.
+   */
+  DLL_PUBLIC void Decode(DALIDataType dtype, const OutputAllocator &allocate);
+
   /**
    * Returns pointer to decoded image. Decode(...) has to be called
    * prior to calling this function
@@ -119,6 +137,23 @@ class Image {
   virtual std::pair<std::shared_ptr<uint8_t>, Shape>
   DecodeImpl(DALIImageType image_type, const uint8_t *encoded_buffer, size_t length) const = 0;
 
+  /**
+   * Template method, that decodes the image into a buffer obtained from `allocate`.
+   * The default implementation converts the result of DecodeImpl.
+   * @return shape of the decoded image
+   */
+  virtual Shape DecodeToImpl(DALIImageType image_type, const uint8_t *encoded_buffer,
+                             size_t length, DALIDataType dtype,
+                             const OutputAllocator &allocate) const;
+
+  /**
+   * Copies an image decoded with DecodeImpl to a buffer obtained from `allocate`,
+   * converting it to `dtype`.
+   * @return shape of the decoded image
+   */
+  static Shape ConvertDecoded(const std::pair<std::shared_ptr<uint8_t>, Shape> &decoded,
+                              DALIDataType dtype, const OutputAllocator &allocate);
+
   /**
    * Template method. Reads image dimensions, without decoding the image
    * @param encoded_buffer encoded image data
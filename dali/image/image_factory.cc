@@ -15,14 +15,16 @@
 #include "dali/image/image_factory.h"
 #include "dali/image/generic_image.h"
 #include "dali/image/png.h"
+#if LIBPNG_ENABLED
+#include "dali/image/png_libpng.h"
+#endif
 #include "dali/image/bmp.h"
 #include "dali/image/jpeg.h"
 #include "dali/image/jpeg2k.h"
 #if LIBTIFF_ENABLED
 #include "dali/image/tiff_libtiff.h"
-#else
-#include "dali/image/tiff.h"
 #endif
+#include "dali/image/tiff.h"
 #include "dali/image/pnm.h"
 
 namespace dali {
@@ -88,7 +90,11 @@ ImageFactory::CreateImage(const uint8_t *encoded_image, size_t length, DALIImage
                CheckIsJPEG2k(encoded_image, length) == 1,
                "Encoded image has ambiguous format");
   if (CheckIsPNG(encoded_image, length)) {
+#if LIBPNG_ENABLED
+    return std::make_unique<PngImage_Libpng>(encoded_image, length, image_type);
+#else
     return std::make_unique<PngImage>(encoded_image, length, image_type);
+#endif
   } else if (CheckIsJPEG2k(encoded_image, length)) {
     return std::make_unique<Jpeg2kImage>(encoded_image, length, image_type);
   } else if (CheckIsJPEG(encoded_image, length)) {
@@ -109,4 +115,34 @@ ImageFactory::CreateImage(const uint8_t *encoded_image, size_t length, DALIImage
   return std::make_unique<GenericImage>(encoded_image, length, image_type);
 }
 
+Image::Shape ImageFactory::PeekShape(const uint8_t *encoded_image, size_t length) {
+  DALI_ENFORCE(encoded_image != nullptr && length >= 4, "Encoded image is empty or truncated");
+  if (CheckIsPNG(encoded_image, length)) {
+    return PeekPngShape(encoded_image, length);
+  } else if (CheckIsJPEG2k(encoded_image, length)) {
+    return PeekJpeg2kShape(encoded_image, length);
+  } else if (CheckIsJPEG(encoded_image, length)) {
+    return PeekJpegShape(encoded_image, length);
+  } else if (CheckIsBMP(encoded_image, length)) {
+    return PeekBmpShape(encoded_image, length);
+  } else if (CheckIsPNM(encoded_image, length)) {
+    return PeekPnmShape(encoded_image, length);
+  } else if (CheckIsGIF(encoded_image, length)) {
+    DALI_FAIL("GIF format is not supported");
+  } else if (CheckIsTiff(encoded_image, length)) {
+#if LIBTIFF_ENABLED
+    // The header is parsed directly; the files which the parser can't handle
+    // (e.g. with defaulted or multi-valued fields) are opened with libtiff
+    try {
+      return PeekTiffShape(encoded_image, length);
+    } catch (const std::exception &) {
+      return TiffImage_Libtiff(encoded_image, length, DALI_RGB).PeekShape();
+    }
+#else
+    return PeekTiffShape(encoded_image, length);
+#endif
+  }
+  DALI_FAIL("Cannot peek dims for an image of unknown format");
+}
+
 }  // namespace dali
@@ -24,6 +24,15 @@ class ImageFactory {
  public:
   DLL_PUBLIC static std::unique_ptr<Image>
   CreateImage(const uint8_t *encoded_image, size_t length, DALIImageType image_type);
+
+  /**
+   * Reads the image dimensions from the header of the encoded image, without creating
+   * an Image object and without decoding any pixel data.
+   * Supports JPEG, PNG, BMP, PNM, TIFF and JPEG 2000.
+   * @return [height, width, channels]
+   */
+  DLL_PUBLIC static Image::Shape
+  PeekShape(const uint8_t *encoded_image, size_t length);
 };
 
 }  // namespace dali
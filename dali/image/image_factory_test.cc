@@ -0,0 +1,135 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <string>
+#include <vector>
+#include "dali/image/image_factory.h"
+#include "dali/image/tiff.h"
+#include "dali/test/dali_test_config.h"
+#include "dali/util/image.h"
+#include "dali/util/ocv.h"
+
+namespace dali {
+
+namespace {
+
+void CheckPeekShapeVsDecoded(const std::string &subdir, const std::vector<std::string> &exts) {
+  auto names = ImageList(testing::dali_extra_path() + "/db/single/" + subdir, exts);
+  ASSERT_FALSE(names.empty());
+  ImgSetDescr imgs;
+  LoadImages(names, &imgs);
+  for (size_t i = 0; i < imgs.nImages(); i++) {
+    auto shape = ImageFactory::PeekShape(imgs.data_[i], imgs.sizes_[i]);
+    cv::Mat decoded = cv::imdecode(cv::Mat(1, imgs.sizes_[i], CV_8UC1, imgs.data_[i]),
+                                   cv::IMREAD_UNCHANGED);
+    ASSERT_FALSE(decoded.empty()) << imgs.filenames_[i];
+    EXPECT_EQ(shape[0], decoded.rows) << imgs.filenames_[i];
+    EXPECT_EQ(shape[1], decoded.cols) << imgs.filenames_[i];
+    EXPECT_GT(shape[2], 0) << imgs.filenames_[i];
+
+    // Same result through the Image object
+    auto img = ImageFactory::CreateImage(imgs.data_[i], imgs.sizes_[i], DALI_RGB);
+    auto img_shape = img->PeekShape();
+    EXPECT_EQ(shape[0], img_shape[0]) << imgs.filenames_[i];
+    EXPECT_EQ(shape[1], img_shape[1]) << imgs.filenames_[i];
+  }
+}
+
+}  // namespace
+
+TEST(ImageFactoryPeekShape, Jpeg) {
+  CheckPeekShapeVsDecoded("jpeg", {".jpg"});
+}
+
+TEST(ImageFactoryPeekShape, Png) {
+  CheckPeekShapeVsDecoded("png", {".png"});
+}
+
+TEST(ImageFactoryPeekShape, Bmp) {
+  CheckPeekShapeVsDecoded("bmp", {".bmp"});
+}
+
+TEST(ImageFactoryPeekShape, Pnm) {
+  CheckPeekShapeVsDecoded("pnm", {".pnm", ".ppm", ".pgm", ".pbm"});
+}
+
+TEST(ImageFactoryPeekShape, Tiff) {
+  CheckPeekShapeVsDecoded("tiff", {".tif", ".tiff"});
+}
+
+TEST(ImageFactoryPeekShape, Jpeg2k) {
+  CheckPeekShapeVsDecoded("jpeg2k", {".jp2"});
+}
+
+TEST(ImageFactoryPeekShape, JpegHeaderOnly) {
+  // SOI | APP0 (16 bytes) | SOF0 (17 bytes) - no scan data at all
+  std::vector<uint8_t> jpeg = {
+    0xFF, 0xD8,
+    0xFF, 0xE0, 0x00, 0x10, 'J', 'F', 'I', 'F', 0, 1, 1, 0, 0, 1, 0, 1, 0, 0,
+    0xFF, 0xC2, 0x00, 0x11, 0x08, 0x01, 0xE0, 0x02, 0x80, 0x03,
+    1, 0x22, 0, 2, 0x11, 1, 3, 0x11, 1
+  };
+  auto shape = ImageFactory::PeekShape(jpeg.data(), jpeg.size());
+  EXPECT_EQ(shape, Image::Shape(480, 640, 3));
+
+  // Truncated before the frame header
+  EXPECT_THROW(ImageFactory::PeekShape(jpeg.data(), 24), std::runtime_error);
+}
+
+TEST(ImageFactoryPeekShape, TiffHeaderOnly) {
+  // Little endian, first IFD right after the header, with 3 entries and no image data
+  std::vector<uint8_t> tiff = {
+    'I', 'I', 42, 0, 8, 0, 0, 0,
+    3, 0,
+    0x00, 0x01, 3, 0, 1, 0, 0, 0, 0x80, 0x02, 0, 0,  // ImageWidth: SHORT 640
+    0x01, 0x01, 4, 0, 1, 0, 0, 0, 0xE0, 0x01, 0, 0,  // ImageLength: LONG 480
+    0x15, 0x01, 3, 0, 1, 0, 0, 0, 4, 0, 0, 0,        // SamplesPerPixel: 4
+    0, 0, 0, 0
+  };
+  auto shape = ImageFactory::PeekShape(tiff.data(), tiff.size());
+  EXPECT_EQ(shape, Image::Shape(480, 640, 4));
+
+  // The IFD doesn't fit in the buffer
+  EXPECT_THROW(ImageFactory::PeekShape(tiff.data(), 20), std::runtime_error);
+}
+
+TEST(ImageFactoryPeekShape, TiffNoSamplesPerPixel) {
+  // Little endian, 2x2 grayscale image without the SamplesPerPixel tag (1 by default)
+  std::vector<uint8_t> tiff = {
+    'I', 'I', 42, 0, 8, 0, 0, 0,
+    7, 0,
+    0x00, 0x01, 3, 0, 1, 0, 0, 0, 2, 0, 0, 0,   // ImageWidth: 2
+    0x01, 0x01, 3, 0, 1, 0, 0, 0, 2, 0, 0, 0,   // ImageLength: 2
+    0x02, 0x01, 3, 0, 1, 0, 0, 0, 8, 0, 0, 0,   // BitsPerSample: 8
+    0x03, 0x01, 3, 0, 1, 0, 0, 0, 1, 0, 0, 0,   // Compression: none
+    0x06, 0x01, 3, 0, 1, 0, 0, 0, 1, 0, 0, 0,   // PhotometricInterpretation: BlackIsZero
+    0x11, 0x01, 4, 0, 1, 0, 0, 0, 98, 0, 0, 0,  // StripOffsets: 98
+    0x17, 0x01, 4, 0, 1, 0, 0, 0, 4, 0, 0, 0,   // StripByteCounts: 4
+    0, 0, 0, 0,
+    10, 20, 30, 40
+  };
+  ASSERT_EQ(tiff.size(), 102u);
+  // The header parser requires the tag...
+  EXPECT_THROW(PeekTiffShape(tiff.data(), tiff.size()), std::runtime_error);
+#if LIBTIFF_ENABLED
+  // ...and the image is handled by libtiff instead
+  auto shape = ImageFactory::PeekShape(tiff.data(), tiff.size());
+  EXPECT_EQ(shape, Image::Shape(2, 2, 1));
+#else
+  EXPECT_THROW(ImageFactory::PeekShape(tiff.data(), tiff.size()), std::runtime_error);
+#endif
+}
+
+}  // namespace dali
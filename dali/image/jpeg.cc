@@ -14,6 +14,7 @@
 
 #include "dali/image/jpeg.h"
 #include <cmath>
+#include <functional>
 #include <memory>
 #include "dali/image/jpeg_mem.h"
 #include "dali/util/ocv.h"
@@ -27,39 +28,55 @@ JpegImage::JpegImage(const uint8_t *encoded_buffer,
   : GenericImage(encoded_buffer, length, image_type) {
 }
 
-#ifndef DALI_USE_JPEG_TURBO
-bool get_jpeg_size(const uint8 *data, size_t data_size, int *height, int *width, int *nchannels) {
-  unsigned int i = 0;
-  if (!(data[i] == 0xFF && data[i + 1] == 0xD8))
-    return false;  // Not a valid SOI header
-
-  i += 4;
-  // Retrieve the block length of the first block since
-  // the first block will not contain the size of file
-  uint16_t block_length = ReadValueBE<uint16_t>(data + i);
-  while (i < data_size) {
-    i += block_length;  // Increase the file index to get to the next block
-    if (i >= data_size) return false;  // Check to protect against segmentation faults
-    if (data[i] != 0xFF) return false;  // Check that we are truly at the start of another block
-    if (data[i + 1] >= 0xC0 && data[i + 1] <= 0xC3) {
-      // 0xFFC0 is the "Start of frame" marker which contains the file size
-      // The structure of the 0xFFC0 block is quite simple
-      // [0xFFC0][ushort length][uchar precision][ushort x][ushort y][uchar number_of_components]
-      *height = ReadValueBE<uint16_t>(data + i + 5);
-      *width  = ReadValueBE<uint16_t>(data + i + 7);
-      *nchannels = ReadValueBE<uint8_t>(data + i + 9);
-      return true;
-    } else {
-      i += 2;  // Skip the block marker
-      block_length = ReadValueBE<uint16_t>(data + i);  // Go to the next block
+namespace {
+
+bool IsSofMarker(uint8_t marker) {
+  // SOF0-SOF15, except DHT (0xC4), JPG (0xC8) and DAC (0xCC)
+  return marker >= 0xC0 && marker <= 0xCF && marker != 0xC4 && marker != 0xC8 && marker != 0xCC;
+}
+
+bool IsStandaloneMarker(uint8_t marker) {
+  // TEM, RST0-RST7, SOI, EOI - markers without a length field
+  return marker == 0x01 || (marker >= 0xD0 && marker <= 0xD9);
+}
+
+}  // namespace
+
+Image::Shape PeekJpegShape(const uint8_t *jpeg, size_t length) {
+  DALI_ENFORCE(jpeg != nullptr);
+  DALI_ENFORCE(length >= 4 && jpeg[0] == 0xFF && jpeg[1] == 0xD8, "Not a valid JPEG (no SOI)");
+  // Walk the marker segments until the frame header is found. The entropy-coded data
+  // follows the SOS segment, so the scan stops there at the latest.
+  size_t i = 2;
+  while (i + 4 <= length) {
+    DALI_ENFORCE(jpeg[i] == 0xFF, "Invalid JPEG marker");
+    uint8_t marker = jpeg[i + 1];
+    if (marker == 0xFF) {  // fill byte
+      i++;
+      continue;
+    }
+    i += 2;
+    if (IsStandaloneMarker(marker))
+      continue;
+    DALI_ENFORCE(marker != 0xDA, "JPEG frame header (SOF) not found before the scan data");
+    auto segment_length = ReadValueBE<uint16_t>(jpeg + i);
+    if (IsSofMarker(marker)) {
+      // | 16u length | 8u precision | 16u height | 16u width | 8u number of components
+      DALI_ENFORCE(segment_length >= 8 && i + 8 <= length, "Truncated JPEG frame header");
+      int64_t height = ReadValueBE<uint16_t>(jpeg + i + 3);
+      int64_t width = ReadValueBE<uint16_t>(jpeg + i + 5);
+      int64_t channels = jpeg[i + 7];
+      return {height, width, channels};
     }
+    i += segment_length;
   }
-  return false;  // If this point is reached then no size was found
+  DALI_FAIL("JPEG frame header (SOF) not found");
 }
-#endif
 
-std::pair<std::shared_ptr<uint8_t>, Image::Shape>
-JpegImage::DecodeImpl(DALIImageType type, const uint8 *jpeg, size_t length) const {
+
+#ifdef DALI_USE_JPEG_TURBO
+uint8_t *JpegImage::DecodeTurbo(DALIImageType type, const uint8 *jpeg, size_t length,
+                                const std::function<uint8_t *(const Shape &)> &allocate) const {
   const int c = IsColor(type) ? 3 : 1;
   const auto shape = PeekShapeImpl(jpeg, length);
   const auto h = shape[0];
@@ -70,18 +87,15 @@ JpegImage::DecodeImpl(DALIImageType type, const uint8 *jpeg, size_t length) cons
   DALI_ENFORCE(h > 0);
   DALI_ENFORCE(w > 0);
 
-#ifdef DALI_USE_JPEG_TURBO
-  // not supported by libjpeg-turbo
-  if (type == DALI_YCbCr) {
-    return GenericImage::DecodeImpl(type, jpeg, length);
-  }
-
   jpeg::UncompressFlags flags;
   if (UseFastIdct()) {
     flags.dct_method = JDCT_FASTEST;
   }
   flags.components = c;
 
+  // With a crop window, only the columns of the MCUs covering the window are decoded
+  // (jpeg_crop_scanline), the rows above it are skipped without the IDCT
+  // (jpeg_skip_scanlines) and the decompression stops after its last row.
   flags.crop = false;
   auto crop_window_generator = GetCropWindowGenerator();
   if (crop_window_generator) {
@@ -99,17 +113,30 @@ JpegImage::DecodeImpl(DALIImageType type, const uint8 *jpeg, size_t length) cons
                "Color space not supported by libjpeg-turbo");
   flags.color_space = type;
 
-  std::shared_ptr<uint8_t> decoded_image;
-  int cropped_h = 0;
-  int cropped_w = 0;
-  uint8_t* result = jpeg::Uncompress(
+  return jpeg::Uncompress(
     jpeg, length, flags, nullptr /* nwarn */,
-    [&decoded_image, &cropped_h, &cropped_w](int width, int height, int channels) -> uint8* {
+    [&allocate](int width, int height, int channels) -> uint8* {
+      return allocate({height, width, channels});
+    });
+}
+#endif  // DALI_USE_JPEG_TURBO
+
+std::pair<std::shared_ptr<uint8_t>, Image::Shape>
+JpegImage::DecodeImpl(DALIImageType type, const uint8 *jpeg, size_t length) const {
+#ifdef DALI_USE_JPEG_TURBO
+  // not supported by libjpeg-turbo
+  if (type == DALI_YCbCr) {
+    return GenericImage::DecodeImpl(type, jpeg, length);
+  }
+
+  std::shared_ptr<uint8_t> decoded_image;
+  Shape decoded_shape;
+  uint8_t *result = DecodeTurbo(type, jpeg, length,
+    [&decoded_image, &decoded_shape](const Shape &shape) {
       decoded_image.reset(
-        new uint8_t[height * width * channels],
+        new uint8_t[volume(shape)],
         [](uint8_t* data){ delete [] data; } );
-      cropped_h = height;
-      cropped_w = width;
+      decoded_shape = shape;
       return decoded_image.get();
     });
 
@@ -118,22 +145,36 @@ JpegImage::DecodeImpl(DALIImageType type, const uint8 *jpeg, size_t length) cons
     return GenericImage::DecodeImpl(type, jpeg, length);
   }
 
-  return {decoded_image, {cropped_h, cropped_w, c}};
+  return {decoded_image, decoded_shape};
 #else  // DALI_USE_JPEG_TURBO
   return GenericImage::DecodeImpl(type, jpeg, length);
 #endif  // DALI_USE_JPEG_TURBO
 }
 
+Image::Shape JpegImage::DecodeToImpl(DALIImageType type, const uint8_t *jpeg, size_t length,
+                                     DALIDataType dtype, const OutputAllocator &allocate) const {
+#ifdef DALI_USE_JPEG_TURBO
+  // The 8-bit output is decoded directly to the output buffer; in case of a crop window,
+  // the buffer has the size of the window only
+  if (type != DALI_YCbCr && dtype == DALI_UINT8) {
+    Shape decoded_shape;
+    uint8_t *result = DecodeTurbo(type, jpeg, length,
+      [&allocate, &decoded_shape](const Shape &shape) {
+        decoded_shape = shape;
+        return static_cast<uint8_t *>(allocate(shape));
+      });
+    if (result != nullptr)
+      return decoded_shape;
+    // Failed to decode, fallback
+    return ConvertDecoded(GenericImage::DecodeImpl(type, jpeg, length), dtype, allocate);
+  }
+#endif  // DALI_USE_JPEG_TURBO
+  return GenericImage::DecodeToImpl(type, jpeg, length, dtype, allocate);
+}
+
 Image::Shape JpegImage::PeekShapeImpl(const uint8_t *encoded_buffer,
                                       size_t length) const {
-  int height = 0, width = 0, components = 0;
-#ifdef DALI_USE_JPEG_TURBO
-  DALI_ENFORCE(
-    jpeg::GetImageInfo(encoded_buffer, length, &width, &height, &components) == true);
-#else
-  DALI_ENFORCE(get_jpeg_size(encoded_buffer, length, &height, &width, &components));
-#endif
-  return {height, width, components};
+  return PeekJpegShape(encoded_buffer, length);
 }
 
 }  // namespace dali
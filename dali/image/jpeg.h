@@ -15,6 +15,7 @@
 #ifndef DALI_IMAGE_JPEG_H_
 #define DALI_IMAGE_JPEG_H_
 
+#include <functional>
 #include <utility>
 #include <memory>
 
@@ -23,6 +24,13 @@
 
 namespace dali {
 
+/**
+ * @brief Reads the shape of a JPEG image by scanning the marker segments up to the frame
+ *        header (SOF). The entropy-coded data is never read.
+ * @return [height, width, channels]
+ */
+DLL_PUBLIC Image::Shape PeekJpegShape(const uint8_t *jpeg, size_t length);
+
 class JpegImage final : public GenericImage {
  public:
   JpegImage(const uint8_t *encoded_buffer,
@@ -35,7 +43,21 @@ class JpegImage final : public GenericImage {
   std::pair<std::shared_ptr<uint8_t>, Shape>
   DecodeImpl(DALIImageType image_type, const uint8_t *encoded_buffer, size_t length) const override;
 
+  Shape DecodeToImpl(DALIImageType image_type, const uint8_t *encoded_buffer, size_t length,
+                     DALIDataType dtype, const OutputAllocator &allocate) const override;
+
   Shape PeekShapeImpl(const uint8_t *encoded_buffer, size_t length) const override;
+
+ private:
+#ifdef DALI_USE_JPEG_TURBO
+  /**
+   * Decodes the image (or its crop window) with libjpeg-turbo, into a buffer obtained
+   * from `allocate`.
+   * @return the decoded image or nullptr, if the decoding failed
+   */
+  uint8_t *DecodeTurbo(DALIImageType type, const uint8_t *jpeg, size_t length,
+                       const std::function<uint8_t *(const Shape &)> &allocate) const;
+#endif  // DALI_USE_JPEG_TURBO
 };
 
 }  // namespace dali
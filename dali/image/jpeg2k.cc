@@ -59,7 +59,7 @@ bool CheckIsJPEG2k(const uint8_t *jpeg2k, int size) {
   return validate_block_type(jpeg2k, jp2_sig_type);
 }
 
-Image::Shape Jpeg2kImage::PeekShapeImpl(const uint8_t *encoded_buffer, size_t length) const {
+Image::Shape PeekJpeg2kShape(const uint8_t *encoded_buffer, size_t length) {
   assert(encoded_buffer);
   auto data = span<const uint8_t>(encoded_buffer, length);
   uint32_t index = 0;
@@ -79,4 +79,8 @@ Image::Shape Jpeg2kImage::PeekShapeImpl(const uint8_t *encoded_buffer, size_t le
   return {height, width, channels};
 }
 
+Image::Shape Jpeg2kImage::PeekShapeImpl(const uint8_t *encoded_buffer, size_t length) const {
+  return PeekJpeg2kShape(encoded_buffer, length);
+}
+
 }  // namespace dali
@@ -25,6 +25,12 @@ namespace dali {
 
 bool CheckIsJPEG2k(const uint8_t *jpeg2k, int size);
 
+/**
+ * @brief Reads the shape of a JPEG 2000 (JP2) image from its image header box
+ * @return [height, width, channels]
+ */
+DLL_PUBLIC Image::Shape PeekJpeg2kShape(const uint8_t *jpeg2k, size_t length);
+
 class Jpeg2kImage : public GenericImage {
  public:
   Jpeg2kImage(const uint8_t *encoded_buffer, size_t length, DALIImageType image_type)
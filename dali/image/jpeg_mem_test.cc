@@ -0,0 +1,126 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <cmath>
+#include <memory>
+#include <string>
+#include <vector>
+#include "dali/image/jpeg_mem.h"
+
+namespace dali {
+namespace jpeg {
+
+namespace {
+
+constexpr int kWidth = 203;
+constexpr int kHeight = 157;
+
+std::string EncodeTestImage(bool progressive) {
+  std::vector<uint8_t> rgb(kWidth * kHeight * 3);
+  for (int y = 0; y < kHeight; y++) {
+    for (int x = 0; x < kWidth; x++) {
+      uint8_t *px = &rgb[(y * kWidth + x) * 3];
+      px[0] = x * 255 / kWidth;
+      px[1] = y * 255 / kHeight;
+      px[2] = static_cast<uint8_t>(128 + 100 * std::sin(0.3 * x) * std::cos(0.2 * y));
+    }
+  }
+  CompressFlags flags;
+  flags.format = FORMAT_RGB;
+  flags.quality = 90;
+  flags.progressive = progressive;
+  flags.chroma_downsampling = true;
+  return Compress(rgb.data(), kWidth, kHeight, flags);
+}
+
+std::vector<uint8_t> Decode(const std::string &jpeg, UncompressFlags flags,
+                            int *width, int *height) {
+  int components = 0;
+  std::unique_ptr<uint8_t[]> data(Uncompress(jpeg.data(), jpeg.size(), flags, width, height,
+                                             &components, nullptr));
+  EXPECT_NE(data, nullptr);
+  if (!data)
+    return {};
+  EXPECT_EQ(components, flags.components);
+  return {data.get(), data.get() + *width * *height * components};
+}
+
+void TestCroppedDecode(bool progressive) {
+  auto jpeg = EncodeTestImage(progressive);
+  ASSERT_FALSE(jpeg.empty());
+  for (int components : {1, 3}) {
+    UncompressFlags flags;
+    flags.components = components;
+    flags.color_space = components == 1 ? DALI_GRAY : DALI_RGB;
+    int W = 0, H = 0;
+    auto full = Decode(jpeg, flags, &W, &H);
+    ASSERT_EQ(W, kWidth);
+    ASSERT_EQ(H, kHeight);
+
+    struct { int x, y, w, h; } windows[] = {
+      {0, 0, kWidth, kHeight},   // the whole image
+      {0, 0, 17, 9},             // top-left corner, the rest of the image is not decoded
+      {37, 51, 64, 33},          // in the middle, not aligned to MCUs
+      {kWidth - 29, kHeight - 13, 29, 13},  // bottom-right corner
+      {5, kHeight - 1, kWidth - 10, 1},     // the last row only
+    };
+    for (auto &wnd : windows) {
+      flags.crop = true;
+      flags.crop_x = wnd.x;
+      flags.crop_y = wnd.y;
+      flags.crop_width = wnd.w;
+      flags.crop_height = wnd.h;
+      int w = 0, h = 0;
+      auto cropped = Decode(jpeg, flags, &w, &h);
+      ASSERT_EQ(w, wnd.w);
+      ASSERT_EQ(h, wnd.h);
+      for (int y = 0; y < h; y++) {
+        for (int x = 0; x < w * components; x++) {
+          int expected = full[((y + wnd.y) * W + wnd.x) * components + x];
+          int actual = cropped[y * w * components + x];
+          ASSERT_NEAR(actual, expected, 1)
+            << "crop window " << wnd.x << ", " << wnd.y << ", " << wnd.w << "x" << wnd.h
+            << " at " << x << ", " << y << " components: " << components;
+        }
+      }
+    }
+  }
+}
+
+}  // namespace
+
+TEST(JpegUncompressTest, CroppedDecodeBaseline) {
+  TestCroppedDecode(false);
+}
+
+TEST(JpegUncompressTest, CroppedDecodeProgressive) {
+  TestCroppedDecode(true);
+}
+
+TEST(JpegUncompressTest, InvalidCropWindow) {
+  auto jpeg = EncodeTestImage(false);
+  UncompressFlags flags;
+  flags.components = 3;
+  flags.crop = true;
+  flags.crop_x = kWidth / 2;
+  flags.crop_y = kHeight / 2;
+  flags.crop_width = kWidth;
+  flags.crop_height = kHeight;
+  int w = 0, h = 0, c = 0;
+  EXPECT_EQ(Uncompress(jpeg.data(), jpeg.size(), flags, &w, &h, &c, nullptr), nullptr);
+}
+
+}  // namespace jpeg
+}  // namespace dali
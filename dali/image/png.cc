@@ -86,7 +86,7 @@ PngImage::PngImage(const uint8_t *encoded_buffer, size_t length, DALIImageType i
 }
 
 
-Image::Shape PngImage::PeekShapeImpl(const uint8_t *encoded_buffer, size_t length) const {
+Image::Shape PeekPngShape(const uint8_t *encoded_buffer, size_t length) {
   DALI_ENFORCE(encoded_buffer);
   DALI_ENFORCE(length >= 16);
 
@@ -106,5 +106,8 @@ Image::Shape PngImage::PeekShapeImpl(const uint8_t *encoded_buffer, size_t lengt
   return {H, W, C};
 }
 
+Image::Shape PngImage::PeekShapeImpl(const uint8_t *encoded_buffer, size_t length) const {
+  return PeekPngShape(encoded_buffer, length);
+}
 
 }  // namespace dali
@@ -20,7 +20,14 @@
 namespace dali {
 
 /**
- * PNG image decoding is performed using OpenCV, thus it's the same as Generic decoding
+ * @brief Reads the shape of a PNG image from its IHDR chunk
+ * @return [height, width, channels]
+ */
+DLL_PUBLIC Image::Shape PeekPngShape(const uint8_t *png, size_t length);
+
+/**
+ * PNG image decoding is performed using OpenCV, thus it's the same as Generic decoding.
+ * When DALI is built with libpng, PngImage_Libpng is used instead.
  */
 class PngImage final : public GenericImage {
  public:
@@ -0,0 +1,254 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include "dali/image/png_libpng.h"
+#include <png.h>
+#include <csetjmp>
+#include <cstring>
+#include <string>
+#include <type_traits>
+#include <vector>
+#include "dali/core/convert.h"
+#include "dali/core/static_switch.h"
+#include "dali/image/png.h"
+
+namespace dali {
+
+namespace detail {
+
+/**
+ * @brief Owns the libpng read structures and feeds libpng from a memory buffer
+ *
+ * libpng reports errors with longjmp. The calls which can fail are wrapped in `Call`,
+ * which turns the error into a `false` result, keeping the error message in `error()`.
+ * The functions passed to `Call` must not create objects with non-trivial destructors.
+ */
+class PngReader {
+ public:
+  PngReader(const uint8_t *data, size_t length) : data_(data), length_(length) {
+    png_ = png_create_read_struct(PNG_LIBPNG_VER_STRING, this, &OnError, &OnWarning);
+    DALI_ENFORCE(png_ != nullptr, "Could not create the PNG read structure");
+    info_ = png_create_info_struct(png_);
+    if (!info_) {
+      png_destroy_read_struct(&png_, nullptr, nullptr);
+      DALI_FAIL("Could not create the PNG info structure");
+    }
+    png_set_read_fn(png_, this, &Read);
+  }
+
+  ~PngReader() {
+    png_destroy_read_struct(&png_, &info_, nullptr);
+  }
+
+  DISABLE_COPY_MOVE_ASSIGN(PngReader);
+
+  template <typename Function>
+  bool Call(Function &&f) {
+    if (setjmp(png_jmpbuf(png_)))
+      return false;
+    f();
+    return true;
+  }
+
+  png_structp png() const { return png_; }
+  png_infop info() const { return info_; }
+  const char *error() const { return error_; }
+
+ private:
+  static void Read(png_structp png, png_bytep out, png_size_t n) {
+    auto *reader = static_cast<PngReader *>(png_get_io_ptr(png));
+    if (n > reader->length_ - reader->pos_)
+      png_error(png, "Unexpected end of the PNG data");
+    std::memcpy(out, reader->data_ + reader->pos_, n);
+    reader->pos_ += n;
+  }
+
+  static void OnError(png_structp png, png_const_charp msg) {
+    auto *reader = static_cast<PngReader *>(png_get_error_ptr(png));
+    std::strncpy(reader->error_, msg, sizeof(reader->error_) - 1);
+    png_longjmp(png, 1);
+  }
+
+  static void OnWarning(png_structp, png_const_charp) {}
+
+  png_structp png_ = nullptr;
+  png_infop info_ = nullptr;
+  const uint8_t *data_;
+  size_t length_;
+  size_t pos_ = 0;
+  char error_[256] = {};
+};
+
+template <typename Out, typename In>
+void ConvertRow(Out *out, const In *in, int64_t n) {
+  for (int64_t i = 0; i < n; i++)
+    out[i] = ConvertSatNorm<Out>(in[i]);
+}
+
+}  // namespace detail
+
+PngImage_Libpng::PngImage_Libpng(const uint8_t *encoded_buffer, size_t length,
+                                 DALIImageType image_type)
+    : GenericImage(encoded_buffer, length, image_type) {
+  // signature (8 bytes) | IHDR length and type (8 bytes) | width, height (8 bytes) |
+  // bit depth, color type, compression, filter, interlace method (1 byte each)
+  constexpr size_t kInterlaceOffset = 28;
+  interlaced_ = length > kInterlaceOffset && encoded_buffer[kInterlaceOffset] != 0;
+}
+
+Image::Shape PngImage_Libpng::PeekShapeImpl(const uint8_t *encoded_buffer, size_t length) const {
+  return PeekPngShape(encoded_buffer, length);
+}
+
+bool PngImage_Libpng::CanDecode(DALIImageType image_type) const {
+  return !interlaced_ && (image_type == DALI_RGB || image_type == DALI_BGR ||
+                          image_type == DALI_GRAY || image_type == DALI_ANY_DATA);
+}
+
+std::pair<std::shared_ptr<uint8_t>, Image::Shape>
+PngImage_Libpng::DecodeImpl(DALIImageType image_type, const uint8_t *encoded_buffer,
+                            size_t length) const {
+  if (!CanDecode(image_type))
+    return GenericImage::DecodeImpl(image_type, encoded_buffer, length);
+  std::shared_ptr<uint8_t> decoded;
+  auto shape = DecodeToImpl(image_type, encoded_buffer, length, DALI_UINT8,
+    [&](const Shape &shape) {
+      decoded.reset(new uint8_t[volume(shape)], [](uint8_t *ptr) { delete[] ptr; });
+      return decoded.get();
+    });
+  return {decoded, shape};
+}
+
+Image::Shape PngImage_Libpng::DecodeToImpl(DALIImageType image_type,
+                                           const uint8_t *encoded_buffer, size_t length,
+                                           DALIDataType dtype,
+                                           const OutputAllocator &allocate) const {
+  if (!CanDecode(image_type))
+    return GenericImage::DecodeToImpl(image_type, encoded_buffer, length, dtype, allocate);
+
+  detail::PngReader reader(encoded_buffer, length);
+  png_structp png = reader.png();
+  png_infop info = reader.info();
+  DALI_ENFORCE(reader.Call([&]() { png_read_info(png, info); }),
+               make_string("Failed to read the PNG header: ", reader.error()));
+
+  const int64_t H = png_get_image_height(png, info);
+  const int64_t W = png_get_image_width(png, info);
+  const int bit_depth = png_get_bit_depth(png, info);
+  const int color_type = png_get_color_type(png, info);
+  const bool has_color = color_type & PNG_COLOR_MASK_COLOR;
+  // the transparency of palette images is expanded to alpha together with the palette
+  const bool has_alpha = (color_type & PNG_COLOR_MASK_ALPHA) ||
+                         png_get_valid(png, info, PNG_INFO_tRNS);
+  // 16-bit images are decoded with full precision, unless the output is 8-bit anyway
+  const bool decode_16bit = bit_depth == 16 && dtype != DALI_UINT8;
+
+  if (color_type == PNG_COLOR_TYPE_PALETTE)
+    png_set_palette_to_rgb(png);
+  if (color_type == PNG_COLOR_TYPE_GRAY && bit_depth < 8)
+    png_set_expand_gray_1_2_4_to_8(png);
+  if (bit_depth == 16) {
+    if (decode_16bit) {
+#if __BYTE_ORDER__ == __ORDER_LITTLE_ENDIAN__
+      png_set_swap(png);  // PNG stores the samples as big endian
+#endif
+    } else {
+#ifdef PNG_READ_SCALE_16_TO_8_SUPPORTED
+      png_set_scale_16(png);
+#else
+      png_set_strip_16(png);
+#endif
+    }
+  }
+
+  switch (image_type) {
+    case DALI_GRAY:
+      if (has_alpha)
+        png_set_strip_alpha(png);
+      if (has_color)  // the same weights as in OpenCV and the other DALI decoders
+        png_set_rgb_to_gray_fixed(png, 1, 29900, 58700);
+      break;
+    case DALI_RGB:
+    case DALI_BGR:
+      if (has_alpha)
+        png_set_strip_alpha(png);
+      if (!has_color)
+        png_set_gray_to_rgb(png);
+      if (image_type == DALI_BGR)
+        png_set_bgr(png);
+      break;
+    default:  // DALI_ANY_DATA - keep all the channels, including the transparency
+      if (png_get_valid(png, info, PNG_INFO_tRNS))
+        png_set_tRNS_to_alpha(png);
+      break;
+  }
+  DALI_ENFORCE(reader.Call([&]() { png_read_update_info(png, info); }),
+               make_string("Failed to decode the PNG image: ", reader.error()));
+  const int64_t C = png_get_channels(png, info);
+
+  int64_t roi_x = 0, roi_y = 0;
+  int64_t roi_h = H, roi_w = W;
+  if (auto roi_generator = GetCropWindowGenerator()) {
+    auto roi = roi_generator({H, W}, "HW");
+    roi_y = roi.anchor[0];
+    roi_x = roi.anchor[1];
+    roi_h = roi.shape[0];
+    roi_w = roi.shape[1];
+    DALI_ENFORCE(roi_x >= 0 && roi_w > 0 && roi_x + roi_w <= W,
+                 make_string("Cropping window [", roi_x, ", ", roi_x + roi_w,
+                             ") is out of the image width ", W));
+    DALI_ENFORCE(roi_y >= 0 && roi_h > 0 && roi_y + roi_h <= H,
+                 make_string("Cropping window [", roi_y, ", ", roi_y + roi_h,
+                             ") is out of the image height ", H));
+  }
+
+  Shape out_shape = {roi_h, roi_w, C};
+  void *out = allocate(out_shape);
+  const int64_t out_row_len = roi_w * C;
+
+  // The rows are written straight to the output, if no conversion or horizontal crop is needed
+  const bool direct = roi_w == W &&
+                      ((dtype == DALI_UINT8 && !decode_16bit) ||
+                       (dtype == DALI_UINT16 && decode_16bit));
+  std::vector<uint8_t> row;
+  if (!direct)
+    row.resize(png_get_rowbytes(png, info));
+
+  bool ok = true;
+  TYPE_SWITCH(dtype, type2id, Out, (uint8_t, uint16_t, float), (
+    ok = reader.Call([&]() {
+      // Rows above the crop window still need to be decoded, but they are not stored
+      for (int64_t y = 0; y < roi_y; y++)
+        png_read_row(png, nullptr, nullptr);
+      for (int64_t y = 0; y < roi_h; y++) {
+        Out *out_row = static_cast<Out *>(out) + y * out_row_len;
+        if (direct) {
+          png_read_row(png, reinterpret_cast<png_bytep>(out_row), nullptr);
+        } else if (decode_16bit) {
+          png_read_row(png, row.data(), nullptr);
+          auto *in = reinterpret_cast<const uint16_t *>(row.data()) + roi_x * C;
+          detail::ConvertRow(out_row, in, out_row_len);
+        } else {
+          png_read_row(png, row.data(), nullptr);
+          detail::ConvertRow(out_row, row.data() + roi_x * C, out_row_len);
+        }
+      }
+    });
+  ), DALI_FAIL(make_string("Unsupported output type for the decoded image: ", dtype)));  // NOLINT
+  // The rest of the image (below the crop window) is not decoded at all
+  DALI_ENFORCE(ok, make_string("Failed to decode the PNG image: ", reader.error()));
+  return out_shape;
+}
+
+}  // namespace dali
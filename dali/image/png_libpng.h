@@ -0,0 +1,53 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_IMAGE_PNG_LIBPNG_H_
+#define DALI_IMAGE_PNG_LIBPNG_H_
+
+#include <memory>
+#include <utility>
+#include "dali/image/generic_image.h"
+
+namespace dali {
+
+/**
+ * PNG decoder based on libpng.
+ *
+ * The image is decoded row by row, directly into the output buffer, in the requested
+ * color space and data type (8 or 16 bits per channel, or float), so no intermediate image
+ * is allocated. Only the rows up to the end of the crop window are decoded.
+ * Interlaced images and the YCbCr output go to the OpenCV based decoder.
+ */
+class PngImage_Libpng : public GenericImage {
+ public:
+  PngImage_Libpng(const uint8_t *encoded_buffer, size_t length, DALIImageType image_type);
+  bool CanDecode(DALIImageType image_type) const;
+
+ protected:
+  std::pair<std::shared_ptr<uint8_t>, Image::Shape>
+  DecodeImpl(DALIImageType image_type, const uint8_t *encoded_buffer, size_t length) const override;
+
+  Image::Shape DecodeToImpl(DALIImageType image_type, const uint8_t *encoded_buffer,
+                            size_t length, DALIDataType dtype,
+                            const OutputAllocator &allocate) const override;
+
+  Image::Shape PeekShapeImpl(const uint8_t *encoded_buffer, size_t length) const override;
+
+ private:
+  bool interlaced_ = false;
+};
+
+}  // namespace dali
+
+#endif  // DALI_IMAGE_PNG_LIBPNG_H_
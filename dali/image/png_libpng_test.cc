@@ -0,0 +1,132 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <string>
+#include <vector>
+#include "dali/image/png_libpng.h"
+#include "dali/test/dali_test_config.h"
+#include "dali/util/image.h"
+#include "dali/util/ocv.h"
+
+namespace dali {
+
+namespace {
+
+template <typename T>
+std::vector<T> DecodeTo(const uint8_t *data, size_t size, DALIImageType image_type,
+                        DALIDataType dtype, Image::Shape *shape, CropWindow crop = {}) {
+  PngImage_Libpng img(data, size, image_type);
+  img.SetCropWindow(crop);
+  std::vector<T> out;
+  img.Decode(dtype, [&out](const Image::Shape &shape) {
+    out.resize(volume(shape));
+    return out.data();
+  });
+  *shape = img.GetShape();
+  return out;
+}
+
+class PngLibpngTest : public ::testing::Test {
+ protected:
+  void SetUp() override {
+    auto names = ImageList(testing::dali_extra_path() + "/db/single/png", {".png"});
+    ASSERT_FALSE(names.empty());
+    LoadImages(names, &imgs_);
+  }
+
+  ImgSetDescr imgs_;
+};
+
+}  // namespace
+
+TEST_F(PngLibpngTest, SameAsOpenCV) {
+  for (size_t i = 0; i < imgs_.nImages(); i++) {
+    PngImage_Libpng img(imgs_.data_[i], imgs_.sizes_[i], DALI_RGB);
+    if (!img.CanDecode(DALI_RGB))
+      continue;  // interlaced - decoded with OpenCV anyway
+    Image::Shape shape;
+    auto decoded = DecodeTo<uint8_t>(imgs_.data_[i], imgs_.sizes_[i], DALI_BGR, DALI_UINT8,
+                                     &shape);
+    cv::Mat ref = cv::imdecode(cv::Mat(1, imgs_.sizes_[i], CV_8UC1, imgs_.data_[i]),
+                               cv::IMREAD_COLOR);
+    ASSERT_EQ(shape, Image::Shape(ref.rows, ref.cols, 3)) << imgs_.filenames_[i];
+    ASSERT_TRUE(ref.isContinuous());
+    for (size_t j = 0; j < decoded.size(); j++)
+      ASSERT_EQ(decoded[j], ref.data[j]) << imgs_.filenames_[i] << " at " << j;
+  }
+}
+
+TEST_F(PngLibpngTest, DataTypesAndCrop) {
+  for (size_t i = 0; i < imgs_.nImages(); i++) {
+    PngImage_Libpng img(imgs_.data_[i], imgs_.sizes_[i], DALI_GRAY);
+    if (!img.CanDecode(DALI_GRAY))
+      continue;
+    Image::Shape shape, shape16, shape_f;
+    auto u8 = DecodeTo<uint8_t>(imgs_.data_[i], imgs_.sizes_[i], DALI_GRAY, DALI_UINT8, &shape);
+    ASSERT_EQ(shape[2], 1);
+    int64_t H = shape[0], W = shape[1];
+    CropWindow crop;
+    crop.anchor = {H / 4, W / 4};
+    crop.shape = {H / 2 + 1, W / 2 + 1};
+    auto u16 = DecodeTo<uint16_t>(imgs_.data_[i], imgs_.sizes_[i], DALI_GRAY, DALI_UINT16,
+                                  &shape16, crop);
+    auto f = DecodeTo<float>(imgs_.data_[i], imgs_.sizes_[i], DALI_GRAY, DALI_FLOAT,
+                             &shape_f, crop);
+    ASSERT_EQ(shape16, Image::Shape(crop.shape[0], crop.shape[1], 1));
+    ASSERT_EQ(shape_f, shape16);
+    for (int64_t y = 0; y < crop.shape[0]; y++) {
+      for (int64_t x = 0; x < crop.shape[1]; x++) {
+        int64_t out_idx = y * crop.shape[1] + x;
+        int in = u8[(y + crop.anchor[0]) * W + x + crop.anchor[1]];
+        // 8-bit images are scaled to the full range; 16-bit ones are decoded with more precision
+        ASSERT_NEAR(u16[out_idx] / 257.0, in, 1.0) << imgs_.filenames_[i];
+        ASSERT_NEAR(f[out_idx], u16[out_idx] / 65535.0, 1e-6) << imgs_.filenames_[i];
+      }
+    }
+  }
+}
+
+TEST_F(PngLibpngTest, CropOutOfBounds) {
+  for (size_t i = 0; i < imgs_.nImages(); i++) {
+    PngImage_Libpng img(imgs_.data_[i], imgs_.sizes_[i], DALI_RGB);
+    if (!img.CanDecode(DALI_RGB))
+      continue;
+    auto full_shape = img.PeekShape();
+    int64_t H = full_shape[0], W = full_shape[1];
+    Image::Shape shape;
+    CropWindow crop;
+    // the window fits in the image, but not at this position
+    crop.anchor = {0, W / 2};
+    crop.shape = {H, W / 2 + 1};
+    EXPECT_THROW(DecodeTo<uint8_t>(imgs_.data_[i], imgs_.sizes_[i], DALI_RGB, DALI_UINT8,
+                                   &shape, crop),
+                 std::runtime_error) << imgs_.filenames_[i];
+    crop.anchor = {H / 2, 0};
+    crop.shape = {H / 2 + 1, W};
+    EXPECT_THROW(DecodeTo<uint8_t>(imgs_.data_[i], imgs_.sizes_[i], DALI_RGB, DALI_UINT8,
+                                   &shape, crop),
+                 std::runtime_error) << imgs_.filenames_[i];
+  }
+}
+
+TEST_F(PngLibpngTest, Truncated) {
+  std::vector<uint8_t> truncated(imgs_.data_[0], imgs_.data_[0] + imgs_.sizes_[0] / 2);
+  Image::Shape shape;
+  EXPECT_THROW(DecodeTo<uint8_t>(truncated.data(), truncated.size(), DALI_RGB, DALI_UINT8,
+                                 &shape),
+               std::runtime_error);
+}
+
+}  // namespace dali
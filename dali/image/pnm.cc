@@ -21,7 +21,7 @@ PnmImage::PnmImage(const uint8_t *encoded_buffer, size_t length, DALIImageType i
         GenericImage(encoded_buffer, length, image_type) {
 }
 
-Image::Shape PnmImage::PeekShapeImpl(const uint8_t *pnm, size_t length) const {
+Image::Shape PeekPnmShape(const uint8_t *pnm, size_t length) {
   DALI_ENFORCE(pnm);
 
   // http://netpbm.sourceforge.net/doc/ppm.html
@@ -68,5 +68,8 @@ Image::Shape PnmImage::PeekShapeImpl(const uint8_t *pnm, size_t length) const {
   return {h, w, channels};
 }
 
+Image::Shape PnmImage::PeekShapeImpl(const uint8_t *encoded_buffer, size_t length) const {
+  return PeekPnmShape(encoded_buffer, length);
+}
 
 }  // namespace dali
@@ -19,6 +19,12 @@
 
 namespace dali {
 
+/**
+ * @brief Reads the shape of a PNM image from its text header
+ * @return [height, width, channels]
+ */
+DLL_PUBLIC Image::Shape PeekPnmShape(const uint8_t *pnm, size_t length);
+
 /**
  * PNM image decoding is performed using OpenCV, thus it's the same as Generic decoding
  */
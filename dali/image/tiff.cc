@@ -13,6 +13,7 @@
 // limitations under the License.
 
 #include "dali/image/tiff.h"
+#include "dali/core/byte_io.h"
 
 namespace dali {
 
@@ -26,12 +27,12 @@ constexpr int SAMPLESPERPIXEL_TAG = 277;
 constexpr int TYPE_WORD = 3;
 constexpr int TYPE_DWORD = 4;
 
-constexpr std::array<int, 4> le_header = {77, 77, 0, 42};
+constexpr std::array<int, 4> big_endian_header = {77, 77, 0, 42};  // "MM"
 
-bool is_little_endian(const unsigned char *tiff) {
+bool is_big_endian(const unsigned char *tiff) {
   DALI_ENFORCE(tiff);
-  for (unsigned int i = 0; i < le_header.size(); i++) {
-    if (tiff[i] != le_header[i]) {
+  for (unsigned int i = 0; i < big_endian_header.size(); i++) {
+    if (tiff[i] != big_endian_header[i]) {
       return false;
     }
   }
@@ -43,33 +44,40 @@ bool is_little_endian(const unsigned char *tiff) {
 TiffImage::TiffImage(const uint8_t *encoded_buffer, size_t length, dali::DALIImageType image_type)
     : GenericImage(encoded_buffer, length, image_type) {}
 
-Image::Shape TiffImage::PeekShapeImpl(const uint8_t *encoded_buffer, size_t length) const {
-  DALI_ENFORCE(encoded_buffer != nullptr);
-  TiffBuffer buffer(
-    std::string(reinterpret_cast<const char *>(encoded_buffer),
-    static_cast<size_t>(length)),
-    is_little_endian(encoded_buffer));
-
-  const auto ifd_offset = buffer.Read<uint32_t>(4);
-  const auto entry_count = buffer.Read<uint16_t>(ifd_offset);
+Image::Shape PeekTiffShape(const uint8_t *tiff, size_t length) {
+  DALI_ENFORCE(tiff != nullptr);
+  DALI_ENFORCE(length >= 8, "Truncated TIFF header");
+  // "MM" - big endian (Motorola), "II" - little endian (Intel)
+  const bool big_endian = is_big_endian(tiff);
+  auto read_u16 = [&](size_t offset) -> uint16_t {
+    return big_endian ? ReadValueBE<uint16_t>(tiff + offset) : ReadValueLE<uint16_t>(tiff + offset);
+  };
+  auto read_u32 = [&](size_t offset) -> uint32_t {
+    return big_endian ? ReadValueBE<uint32_t>(tiff + offset) : ReadValueLE<uint32_t>(tiff + offset);
+  };
+
+  // Only the first IFD is parsed; the values of interest fit in the entries
+  const size_t ifd_offset = read_u32(4);
+  DALI_ENFORCE(ifd_offset + COUNT_SIZE <= length, "TIFF IFD is out of bounds");
+  const auto entry_count = read_u16(ifd_offset);
+  DALI_ENFORCE(ifd_offset + COUNT_SIZE + entry_count * ENTRY_SIZE <= length,
+               "TIFF IFD is out of bounds");
   bool width_read = false, height_read = false, nchannels_read = false;
   int64_t width = 0, height = 0, nchannels = 0;
 
-  for (int entry_idx = 0;
-       entry_idx < entry_count && !(width_read && height_read && nchannels_read);
-       entry_idx++) {
+  for (int entry_idx = 0; entry_idx < entry_count; entry_idx++) {
     const auto entry_offset = ifd_offset + COUNT_SIZE + entry_idx * ENTRY_SIZE;
-    const auto tag_id = buffer.Read<uint16_t>(entry_offset);
+    const auto tag_id = read_u16(entry_offset);
     if (tag_id == WIDTH_TAG || tag_id == HEIGHT_TAG || tag_id == SAMPLESPERPIXEL_TAG) {
-      const auto value_type = buffer.Read<uint16_t>(entry_offset + 2);
-      const auto value_count = buffer.Read<uint32_t>(entry_offset + 4);
+      const auto value_type = read_u16(entry_offset + 2);
+      const auto value_count = read_u32(entry_offset + 4);
       DALI_ENFORCE(value_count == 1);
 
       int64_t value;
       if (value_type == TYPE_WORD) {
-        value = buffer.Read<uint16_t>(entry_offset + 8);
+        value = read_u16(entry_offset + 8);
       } else if (value_type == TYPE_DWORD) {
-        value = buffer.Read<uint32_t>(entry_offset + 8);
+        value = read_u32(entry_offset + 8);
       } else {
         DALI_FAIL("Couldn't read TIFF image dims.");
       }
@@ -80,17 +88,22 @@ Image::Shape TiffImage::PeekShapeImpl(const uint8_t *encoded_buffer, size_t leng
       } else if (tag_id == HEIGHT_TAG) {
         height = value;
         height_read = true;
-      } else if (tag_id == SAMPLESPERPIXEL_TAG) {
+      } else {
         nchannels = value;
         nchannels_read = true;
       }
     }
   }
 
-  DALI_ENFORCE(width_read && height_read && nchannels_read,
-    "TIFF image dims haven't been peeked properly");
-
+  DALI_ENFORCE(width_read && height_read, "TIFF image dims haven't been peeked properly");
+  // The tag is optional (1 by default), but the files without it are rare enough
+  // to be left to libtiff, which also handles the other defaulted fields.
+  DALI_ENFORCE(nchannels_read, "TIFF image doesn't specify the number of samples per pixel");
   return {height, width, nchannels};
 }
 
+Image::Shape TiffImage::PeekShapeImpl(const uint8_t *encoded_buffer, size_t length) const {
+  return PeekTiffShape(encoded_buffer, length);
+}
+
 }  // namespace dali
@@ -23,6 +23,16 @@
 
 namespace dali {
 
+/**
+ * @brief Reads the shape of a TIFF image from its first image file directory (IFD)
+ *
+ * The width, height and the number of samples per pixel must be specified explicitly,
+ * as single SHORT or LONG values - otherwise, an error is raised.
+ *
+ * @return [height, width, channels]
+ */
+DLL_PUBLIC Image::Shape PeekTiffShape(const uint8_t *tiff, size_t length);
+
 /**
  * Class, that handles byte buffer for tiff image
  */
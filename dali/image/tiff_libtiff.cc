@@ -68,6 +68,7 @@
 #include "dali/util/color_space_conversion_utils.h"
 #include "dali/core/convert.h"
 #include "dali/core/span.h"
+#include "dali/core/static_switch.h"
 
 #define LIBTIFF_CALL_SUCCESS 1
 #define LIBTIFF_CALL(call)                                \
@@ -273,12 +274,30 @@ std::pair<std::shared_ptr<uint8_t>, Image::Shape>
 TiffImage_Libtiff::DecodeImpl(DALIImageType image_type,
                               const uint8 *encoded_buffer,
                               size_t length) const {
-  // This decoder only handles bitdepth=8, non-tiled and top-left orientation
+  // This decoder only handles bitdepth=8 or 16, non-tiled and top-left orientation
   // Other cases go to OpenCV's based decoder
   if (!CanDecode(image_type)) {
     return GenericImage::DecodeImpl(image_type, encoded_buffer, length);
   }
 
+  std::shared_ptr<uint8_t> decoded_img_ptr;
+  auto decoded_shape = DecodeToImpl(image_type, encoded_buffer, length, DALI_UINT8,
+    [&](const Shape &shape) {
+      decoded_img_ptr.reset(new uint8_t[volume(shape)], [](uint8_t* ptr){ delete [] ptr; });
+      return decoded_img_ptr.get();
+    });
+  return {decoded_img_ptr, decoded_shape};
+}
+
+Image::Shape TiffImage_Libtiff::DecodeToImpl(DALIImageType image_type,
+                                             const uint8_t *encoded_buffer,
+                                             size_t length,
+                                             DALIDataType dtype,
+                                             const OutputAllocator &allocate) const {
+  if (!CanDecode(image_type)) {
+    return GenericImage::DecodeToImpl(image_type, encoded_buffer, length, dtype, allocate);
+  }
+
   const int64_t H = shape_[0], W = shape_[1], C = shape_[2];
 
   auto roi_generator = GetCropWindowGenerator();
@@ -311,29 +330,19 @@ TiffImage_Libtiff::DecodeImpl(DALIImageType image_type,
   }
 
   TensorShape<3> decoded_shape = {roi_h, roi_w, out_C};
-  const size_t decoded_size = volume(decoded_shape);
-  std::shared_ptr<uint8_t> decoded_img_ptr{
-    new uint8_t[decoded_size],
-    [](uint8_t* ptr){ delete [] ptr; }
-  };
-
-  // TODO(janton): support different types in ImageDecoder
-  using InType = uint8_t;
-  using OutType = uint8_t;
+  // The rows are converted straight into the output buffer
+  void *img_out = allocate(decoded_shape);
 
   // allocate memory for reading tif image
   auto row_nbytes = TIFFScanlineSize(tif_.get());
   DALI_ENFORCE(row_nbytes > 0);
 
-  std::unique_ptr<InType, void(*)(void*)> row_buf{
-    static_cast<InType *>(_TIFFmalloc(row_nbytes)), _TIFFfree};
+  std::unique_ptr<uint8_t, void(*)(void*)> row_buf{
+    static_cast<uint8_t *>(_TIFFmalloc(row_nbytes)), _TIFFfree};
   DALI_ENFORCE(row_buf.get() != nullptr, "Could not allocate memory");
   memset(row_buf.get(), 0, row_nbytes);
 
-
   const int64_t out_row_stride = roi_w * out_C;
-  InType * const row_in  = row_buf.get();
-  OutType * const img_out = decoded_img_ptr.get();
 
   // Need to read sequentially since not all the images support random access
 
@@ -351,23 +360,33 @@ TiffImage_Libtiff::DecodeImpl(DALIImageType image_type,
   if (!allow_random_row_access) {
     for (int64_t y = 0; y < roi_y; y++) {
       LIBTIFF_CALL(
-        TIFFReadScanline(tif_.get(), row_in, y, 0));
+        TIFFReadScanline(tif_.get(), row_buf.get(), y, 0));
     }
   }
 
-  for (int64_t y = 0; y < roi_h; y++) {
-    LIBTIFF_CALL(
-      TIFFReadScanline(tif_.get(), row_in, roi_y + y, 0));
-    OutType * const row_out = img_out + (y * out_row_stride);
-    detail::ConvertLine(row_out, out_C, row_in, C, roi_x, roi_w, image_type);
-  }
-
-  return {decoded_img_ptr, decoded_shape};
+  TYPE_SWITCH(dtype, type2id, OutType, (uint8_t, uint16_t, float), (
+    auto decode_rows = [&](auto *row_in) {
+      for (int64_t y = 0; y < roi_h; y++) {
+        LIBTIFF_CALL(
+          TIFFReadScanline(tif_.get(), row_buf.get(), roi_y + y, 0));
+        OutType * const row_out = static_cast<OutType *>(img_out) + (y * out_row_stride);
+        detail::ConvertLine(row_out, out_C, row_in, C, roi_x, roi_w, image_type);
+      }
+    };
+    // libtiff returns the samples in the native byte order
+    if (bit_depth_ == 16)
+      decode_rows(reinterpret_cast<const uint16_t *>(row_buf.get()));
+    else
+      decode_rows(row_buf.get());
+  ), DALI_FAIL(make_string("Unsupported output type for the decoded image: ", dtype)));  // NOLINT
+
+  return decoded_shape;
 }
 
 bool TiffImage_Libtiff::CanDecode(DALIImageType image_type) const {
+  // the YCbCr conversion is implemented for 8-bit samples only
   return !is_tiled_
-      && bit_depth_ == 8
+      && (bit_depth_ == 8 || (bit_depth_ == 16 && image_type != DALI_YCbCr))
       && orientation_ == ORIENTATION_TOPLEFT;
 }
 
@@ -33,6 +33,10 @@ class TiffImage_Libtiff : public GenericImage {
   std::pair<std::shared_ptr<uint8_t>, Image::Shape>
   DecodeImpl(DALIImageType image_type, const uint8_t *encoded_buffer, size_t length) const override;
 
+  Image::Shape DecodeToImpl(DALIImageType image_type, const uint8_t *encoded_buffer,
+                            size_t length, DALIDataType dtype,
+                            const OutputAllocator &allocate) const override;
+
   Image::Shape PeekShapeImpl(const uint8_t *encoded_buffer, size_t length) const override;
 
  private:
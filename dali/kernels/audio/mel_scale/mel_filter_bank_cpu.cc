@@ -13,9 +13,8 @@
 // limitations under the License.
 
 #include "dali/kernels/audio/mel_scale/mel_filter_bank_cpu.h"
-#include <cmath>
-#include <complex>
 #include <algorithm>
+#include <memory>
 #include <vector>
 #include "dali/core/common.h"
 #include "dali/core/error_handling.h"
@@ -23,44 +22,30 @@
 #include "dali/kernels/kernel.h"
 #include "dali/kernels/common/for_axis.h"
 #include "dali/kernels/common/utils.h"
-#include "dali/kernels/audio/mel_scale/mel_scale.h"
+#include "dali/kernels/audio/mel_scale/mel_filter_weights.h"
 
 namespace dali {
 namespace kernels {
 namespace audio {
 
-// In the outer loop we travel at a linearly spaced frequency grid in the mel scale
-// Each triangular filter is defined by three points in this grid (left, center, right)
-// For each iteration we process a range between two mel frequencies in the grid, calculating
-// the contribution of each FFT bin to 2 triangular filters (one is in the negative slope region
-// and the other in the positive slope region), except for the first and last iteration.
-// In total, we do a single pass on every FFT bin column
+// The filter bank is represented as a set of bands: each triangular filter only covers a
+// contiguous range of FFT bins, so for every filter we keep the first bin and the weights of the
+// bins in the band (see MelFilterWeights). The weights are shared by all the kernel instances
+// with the same filter bank parameters.
 //
-// For every FFT bin we compute the weight for each filter and travel through the row, computing
-// the contributions on every window of the spectrogram (horizontal axis)
+// Each output row (filter) is the weighted sum of the input rows (FFT bins) in its band.
+// The rows are accumulated a few at a time, with the loop over the windows (horizontal axis)
+// vectorized. Since the bands of adjacent filters overlap by about half, every FFT bin row is
+// read roughly twice.
 //
 template <typename T, int Dims>
-class MelFilterBankCpu<T, Dims>::Impl: public MelFilterImplBase<T, Dims> {
+class MelFilterBankCpu<T, Dims>::Impl {
  public:
-  template <typename MelScale>
-  Impl(MelScale mel_scale, const MelFilterBankArgs &args)
-  : MelFilterImplBase<T, Dims>(mel_scale, args) {
-    intervals_.resize(fftbin_size_, -1);
-    double mel = mel_low_ + mel_delta_;
-
-    int64_t fftbin = fftbin_start_;
-    double f = fftbin * hz_step_;
-
-    int last_interval = args_.nfilter;
-    for (int64_t interval = 0; interval <= last_interval; interval++, mel += mel_delta_) {
-      if (interval == last_interval) {
-        mel = mel_high_;
-      }
-      double freq = mel_scale.mel_to_hz(mel);
-      for (; fftbin <= fftbin_end_ && f < freq; fftbin++, f = fftbin * hz_step_) {
-        intervals_[fftbin] = interval;
-      }
-    }
+  explicit Impl(const MelFilterBankArgs &args)
+  : args_(args), weights_(GetMelFilterWeights<T>(args)) {}
+
+  const MelFilterBankArgs& Args() const {
+    return args_;
   }
 
   void Compute(T* out, const T* in, int64_t nwindows,
@@ -71,39 +56,16 @@ class MelFilterBankCpu<T, Dims>::Impl: public MelFilterImplBase<T, Dims> {
     if (in_stride <= 0)
       in_stride = nwindows;
 
-    int nfilter = args_.nfilter;
-
-    std::memset(out, 0, sizeof(T) * nfilter * nwindows);
-    for (int64_t fftbin = fftbin_start_; fftbin <= fftbin_end_; fftbin++) {
-      auto *in_row_start = in + fftbin * in_stride;
-      auto filter_up = intervals_[fftbin];
-      auto weight_up = T(1) - weights_down_[fftbin];
-      auto filter_down = filter_up - 1;
-      auto weight_down = weights_down_[fftbin];
-
-      if (filter_down >= 0) {
-        if (args_.normalize)
-          weight_down *= norm_factors_[filter_down];
-        auto *out_row_start = out + filter_down * out_stride;
-        for (int t = 0; t < nwindows; t++) {
-          out_row_start[t] += weight_down * in_row_start[t];
-        }
-      }
-
-      if (filter_up >= 0 && filter_up < nfilter) {
-        if (args_.normalize)
-          weight_up *= norm_factors_[filter_up];
-        auto *out_row_start = out + filter_up * out_stride;
-        for (int t = 0; t < nwindows; t++) {
-          out_row_start[t] += weight_up * in_row_start[t];
-        }
-      }
+    const auto &w = *weights_;
+    for (int filter = 0; filter < w.nfilter; filter++) {
+      WeightedRowSum(out + filter * out_stride, in + w.band_start[filter] * in_stride, in_stride,
+                     w.filter_weights(filter), w.band_length[filter], nwindows);
     }
   }
 
  private:
-  std::vector<int> intervals_;
-  USE_MEL_FILTER_IMPL_MEMBERS(T, Dims);
+  MelFilterBankArgs args_;
+  std::shared_ptr<const MelFilterWeights<T>> weights_;
 };
 
 template <typename T, int Dims>
@@ -131,18 +93,8 @@ KernelRequirements MelFilterBankCpu<T, Dims>::Setup(
 
   args.nfft = args.nfft > 0 ? args.nfft : 2 * (in.shape[args.axis] - 1);
   args.freq_high = args.freq_high > 0 ? args.freq_high : args.sample_rate / 2;
-  if (!impl_ || impl_->Args() != args) {
-    impl_.reset();
-    switch (args.mel_formula) {
-      case MelScaleFormula::HTK:
-        impl_ = std::make_unique<Impl>(HtkMelScale<T>(), args);
-        break;
-      case MelScaleFormula::Slaney:
-      default:
-        impl_ = std::make_unique<Impl>(SlaneyMelScale<T>(), args);
-        break;
-    }
-  }
+  if (!impl_ || impl_->Args() != args)
+    impl_ = std::make_unique<Impl>(args);
   return req;
 }
 
@@ -13,6 +13,8 @@
 // limitations under the License.
 
 #include <gtest/gtest.h>
+#include <algorithm>
+#include <random>
 #include <tuple>
 #include <vector>
 #include <complex>
@@ -21,6 +23,7 @@
 #include "dali/kernels/scratch.h"
 #include "dali/kernels/audio/mel_scale/mel_scale.h"
 #include "dali/kernels/audio/mel_scale/mel_filter_bank_cpu.h"
+#include "dali/kernels/audio/mel_scale/mel_filter_weights.h"
 #include "dali/kernels/common/utils.h"
 #include "dali/test/test_tensors.h"
 #include "dali/test/tensor_test_utils.h"
@@ -161,6 +164,57 @@ INSTANTIATE_TEST_SUITE_P(MelScaleCpuTest, MelScaleCpuTest, testing::Combine(
     testing::Values(0.0f, 1000.0f),  // fmin
     testing::Values(5000.0f, 8000.0f)));  // fmax
 
+// More filters than FFT bins - some of the filters are empty
+INSTANTIATE_TEST_SUITE_P(MelScaleCpuTestManyFilters, MelScaleCpuTest, testing::Combine(
+    testing::Values(std::array<int64_t, 2>{17, 1},
+                    std::array<int64_t, 2>{33, 13}),  // shape
+    testing::Values(64),  // nfilter
+    testing::Values(16000.0f),  // sample rate
+    testing::Values(0.0f, 1000.0f),  // fmin
+    testing::Values(8000.0f)));  // fmax
+
+TEST(MelFilterWeightsTest, SharedBetweenInstances) {
+  MelFilterBankArgs args;
+  args.nfft = 512;
+  args.nfilter = 40;
+  args.sample_rate = 16000;
+  args.freq_high = 8000;
+  auto w1 = GetMelFilterWeights<float>(args);
+  args.axis = 1;  // doesn't affect the filter bank
+  auto w2 = GetMelFilterWeights<float>(args);
+  EXPECT_EQ(w1.get(), w2.get());
+
+  args.nfilter = 41;
+  auto w3 = GetMelFilterWeights<float>(args);
+  EXPECT_NE(w1.get(), w3.get());
+  EXPECT_EQ(w3->nfilter, 41);
+  EXPECT_EQ(w3->nbins, 257);
+  EXPECT_EQ(w3->offset.back(), static_cast<int>(w3->weights.size()));
+}
+
+TEST(MelFilterWeightsTest, WeightedRowSum) {
+  std::mt19937 rng(123);
+  std::uniform_real_distribution<float> dist(-1, 1);
+  for (int nrows : {0, 1, 3, 4, 9}) {
+    for (int64_t length : {1, 4, 7, 33}) {
+      int64_t stride = length + 3;
+      std::vector<float> in(std::max(nrows, 1) * stride), weights(nrows);
+      for (auto &x : in)
+        x = dist(rng);
+      for (auto &x : weights)
+        x = dist(rng);
+      std::vector<float> out(length, 123.0f);
+      WeightedRowSum(out.data(), in.data(), stride, weights.data(), nrows, length);
+      for (int64_t t = 0; t < length; t++) {
+        float ref = 0;
+        for (int i = 0; i < nrows; i++)
+          ref += weights[i] * in[i * stride + t];
+        ASSERT_NEAR(ref, out[t], 1e-5) << "nrows=" << nrows << " length=" << length << " t=" << t;
+      }
+    }
+  }
+}
+
 }  // namespace test
 }  // namespace audio
 }  // namespace kernels
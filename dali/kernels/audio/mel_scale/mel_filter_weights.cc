@@ -0,0 +1,270 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include "dali/kernels/audio/mel_scale/mel_filter_weights.h"
+#include <cstring>
+#include <map>
+#include <mutex>
+#include <tuple>
+#include <utility>
+#include "dali/core/error_handling.h"
+#include "dali/kernels/audio/mel_scale/mel_scale.h"
+
+#ifdef __SSE__
+#include <xmmintrin.h>
+#endif
+
+namespace dali {
+namespace kernels {
+namespace audio {
+
+namespace {
+
+/**
+ * @brief Maximum number of distinct filter banks kept in the cache.
+ *
+ * When exceeded, the entries not referenced by any kernel are dropped.
+ */
+constexpr size_t kMaxCachedFilterBanks = 32;
+
+template <typename T>
+class MelFilterWeightsBuilder : public MelFilterImplBase<T, 2> {
+ public:
+  template <typename MelScale>
+  MelFilterWeightsBuilder(MelScale mel_scale, const MelFilterBankArgs &args)
+  : MelFilterImplBase<T, 2>(mel_scale, args) {
+    // Same traversal as in MelFilterBankCpu: for each FFT bin, find the interval of the mel grid
+    // it belongs to. Bins in interval `i` are in the rising slope of filter `i` and in the
+    // falling slope of filter `i - 1`.
+    intervals_.resize(fftbin_size_, -1);
+    double mel = mel_low_ + mel_delta_;
+    int64_t fftbin = fftbin_start_;
+    double f = fftbin * hz_step_;
+    int last_interval = args_.nfilter;
+    for (int64_t interval = 0; interval <= last_interval; interval++, mel += mel_delta_) {
+      if (interval == last_interval) {
+        mel = mel_high_;
+      }
+      double freq = mel_scale.mel_to_hz(mel);
+      for (; fftbin <= fftbin_end_ && f < freq; fftbin++, f = fftbin * hz_step_) {
+        intervals_[fftbin] = interval;
+      }
+    }
+  }
+
+  std::shared_ptr<MelFilterWeights<T>> Build() const {
+    auto ret = std::make_shared<MelFilterWeights<T>>();
+    int nfilter = args_.nfilter;
+    ret->nfilter = nfilter;
+    ret->nbins = fftbin_size_;
+    ret->band_start.resize(nfilter, 0);
+    ret->band_length.resize(nfilter, 0);
+    ret->offset.resize(nfilter + 1, 0);
+
+    for (int filter = 0; filter < nfilter; filter++) {
+      ret->offset[filter] = ret->weights.size();
+      bool started = false;
+      for (int64_t fftbin = fftbin_start_; fftbin <= fftbin_end_; fftbin++) {
+        int interval = intervals_[fftbin];
+        T weight;
+        if (interval == filter) {
+          weight = T(1) - weights_down_[fftbin];
+        } else if (interval == filter + 1) {
+          weight = weights_down_[fftbin];
+        } else if (interval > filter + 1) {
+          break;
+        } else {
+          continue;
+        }
+        if (args_.normalize)
+          weight *= norm_factors_[filter];
+        if (!started) {
+          ret->band_start[filter] = fftbin;
+          started = true;
+        }
+        ret->weights.push_back(weight);
+      }
+      ret->band_length[filter] = ret->weights.size() - ret->offset[filter];
+    }
+    ret->offset[nfilter] = ret->weights.size();
+    return ret;
+  }
+
+ private:
+  std::vector<int> intervals_;
+  USE_MEL_FILTER_IMPL_MEMBERS(T, 2);
+};
+
+template <typename T>
+std::shared_ptr<MelFilterWeights<T>> BuildMelFilterWeights(const MelFilterBankArgs &args) {
+  switch (args.mel_formula) {
+    case MelScaleFormula::HTK:
+      return MelFilterWeightsBuilder<T>(HtkMelScale<T>(), args).Build();
+    case MelScaleFormula::Slaney:
+    default:
+      return MelFilterWeightsBuilder<T>(SlaneyMelScale<T>(), args).Build();
+  }
+}
+
+using MelFilterWeightsKey = std::tuple<int, float, int, float, float, MelScaleFormula, bool>;
+
+template <typename T>
+class MelFilterWeightsCache {
+ public:
+  static MelFilterWeightsCache &instance() {
+    static MelFilterWeightsCache cache;
+    return cache;
+  }
+
+  std::shared_ptr<const MelFilterWeights<T>> Get(const MelFilterBankArgs &args) {
+    MelFilterWeightsKey key{args.nfft, args.sample_rate, args.nfilter, args.freq_low,
+                            args.freq_high, args.mel_formula, args.normalize};
+    std::lock_guard<std::mutex> guard(mtx_);
+    auto it = cache_.find(key);
+    if (it != cache_.end())
+      return it->second;
+
+    if (cache_.size() >= kMaxCachedFilterBanks) {
+      for (auto entry = cache_.begin(); entry != cache_.end(); ) {
+        if (entry->second.use_count() == 1)
+          entry = cache_.erase(entry);
+        else
+          ++entry;
+      }
+    }
+    std::shared_ptr<const MelFilterWeights<T>> weights = BuildMelFilterWeights<T>(args);
+    cache_.emplace(std::move(key), weights);
+    return weights;
+  }
+
+ private:
+  std::mutex mtx_;
+  std::map<MelFilterWeightsKey, std::shared_ptr<const MelFilterWeights<T>>> cache_;
+};
+
+template <typename T>
+void WeightedRowSumImpl(T *out, const T *in, int64_t in_stride,
+                        const T *weights, int nrows, int64_t length) {
+  if (nrows <= 0) {
+    std::memset(out, 0, length * sizeof(T));
+    return;
+  }
+  // The first group of rows initializes the output, the following ones accumulate
+  int row = 0;
+  for (; row + 4 <= nrows; row += 4) {
+    const T *in0 = in + row * in_stride;
+    const T *in1 = in0 + in_stride;
+    const T *in2 = in1 + in_stride;
+    const T *in3 = in2 + in_stride;
+    T w0 = weights[row], w1 = weights[row + 1], w2 = weights[row + 2], w3 = weights[row + 3];
+    if (row == 0) {
+      for (int64_t t = 0; t < length; t++)
+        out[t] = w0 * in0[t] + w1 * in1[t] + w2 * in2[t] + w3 * in3[t];
+    } else {
+      for (int64_t t = 0; t < length; t++)
+        out[t] += w0 * in0[t] + w1 * in1[t] + w2 * in2[t] + w3 * in3[t];
+    }
+  }
+  for (; row < nrows; row++) {
+    const T *in0 = in + row * in_stride;
+    T w0 = weights[row];
+    if (row == 0) {
+      for (int64_t t = 0; t < length; t++)
+        out[t] = w0 * in0[t];
+    } else {
+      for (int64_t t = 0; t < length; t++)
+        out[t] += w0 * in0[t];
+    }
+  }
+}
+
+#ifdef __SSE__
+template <>
+void WeightedRowSumImpl<float>(float *out, const float *in, int64_t in_stride,
+                               const float *weights, int nrows, int64_t length) {
+  if (nrows <= 0) {
+    std::memset(out, 0, length * sizeof(float));
+    return;
+  }
+  int64_t vec_length = length & ~int64_t(3);
+  int row = 0;
+  for (; row + 4 <= nrows; row += 4) {
+    const float *in0 = in + row * in_stride;
+    const float *in1 = in0 + in_stride;
+    const float *in2 = in1 + in_stride;
+    const float *in3 = in2 + in_stride;
+    float w0 = weights[row], w1 = weights[row + 1], w2 = weights[row + 2], w3 = weights[row + 3];
+    __m128 vw0 = _mm_set1_ps(w0), vw1 = _mm_set1_ps(w1);
+    __m128 vw2 = _mm_set1_ps(w2), vw3 = _mm_set1_ps(w3);
+    int64_t t = 0;
+    for (; t < vec_length; t += 4) {
+      __m128 acc = row == 0 ? _mm_setzero_ps() : _mm_loadu_ps(out + t);
+      acc = _mm_add_ps(acc, _mm_mul_ps(vw0, _mm_loadu_ps(in0 + t)));
+      acc = _mm_add_ps(acc, _mm_mul_ps(vw1, _mm_loadu_ps(in1 + t)));
+      acc = _mm_add_ps(acc, _mm_mul_ps(vw2, _mm_loadu_ps(in2 + t)));
+      acc = _mm_add_ps(acc, _mm_mul_ps(vw3, _mm_loadu_ps(in3 + t)));
+      _mm_storeu_ps(out + t, acc);
+    }
+    for (; t < length; t++) {
+      float acc = row == 0 ? 0.0f : out[t];
+      out[t] = acc + w0 * in0[t] + w1 * in1[t] + w2 * in2[t] + w3 * in3[t];
+    }
+  }
+  for (; row < nrows; row++) {
+    const float *in0 = in + row * in_stride;
+    float w0 = weights[row];
+    __m128 vw0 = _mm_set1_ps(w0);
+    int64_t t = 0;
+    for (; t < vec_length; t += 4) {
+      __m128 acc = row == 0 ? _mm_setzero_ps() : _mm_loadu_ps(out + t);
+      acc = _mm_add_ps(acc, _mm_mul_ps(vw0, _mm_loadu_ps(in0 + t)));
+      _mm_storeu_ps(out + t, acc);
+    }
+    for (; t < length; t++) {
+      float acc = row == 0 ? 0.0f : out[t];
+      out[t] = acc + w0 * in0[t];
+    }
+  }
+}
+#endif
+
+}  // namespace
+
+template <typename T>
+std::shared_ptr<const MelFilterWeights<T>> GetMelFilterWeights(const MelFilterBankArgs &args) {
+  DALI_ENFORCE(args.nfft > 0, "The FFT size must be resolved before building the filter bank");
+  DALI_ENFORCE(args.freq_high > 0,
+               "The maximum frequency must be resolved before building the filter bank");
+  return MelFilterWeightsCache<T>::instance().Get(args);
+}
+
+template <typename T>
+void WeightedRowSum(T *out, const T *in, int64_t in_stride,
+                    const T *weights, int nrows, int64_t length) {
+  WeightedRowSumImpl<T>(out, in, in_stride, weights, nrows, length);
+}
+
+template DLL_PUBLIC std::shared_ptr<const MelFilterWeights<float>>
+GetMelFilterWeights<float>(const MelFilterBankArgs &args);
+template DLL_PUBLIC std::shared_ptr<const MelFilterWeights<double>>
+GetMelFilterWeights<double>(const MelFilterBankArgs &args);
+
+template DLL_PUBLIC void WeightedRowSum<float>(float *, const float *, int64_t,
+                                               const float *, int, int64_t);
+template DLL_PUBLIC void WeightedRowSum<double>(double *, const double *, int64_t,
+                                                const double *, int, int64_t);
+
+}  // namespace audio
+}  // namespace kernels
+}  // namespace dali
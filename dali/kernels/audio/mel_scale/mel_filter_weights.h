@@ -0,0 +1,82 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_KERNELS_AUDIO_MEL_SCALE_MEL_FILTER_WEIGHTS_H_
+#define DALI_KERNELS_AUDIO_MEL_SCALE_MEL_FILTER_WEIGHTS_H_
+
+#include <cstdint>
+#include <memory>
+#include <vector>
+#include "dali/core/api_helper.h"
+#include "dali/kernels/audio/mel_scale/mel_filter_bank_args.h"
+
+namespace dali {
+namespace kernels {
+namespace audio {
+
+/**
+ * @brief Banded representation of a mel filter bank.
+ *
+ * Each triangular filter covers a contiguous range of FFT bins (its band). For every filter,
+ * only the first bin of the band and the weights of the bins within the band are stored,
+ * so applying the filter bank costs (roughly) two multiply-adds per FFT bin, regardless
+ * of the number of filters. The normalization factors (if any) are folded into the weights.
+ */
+template <typename T>
+struct MelFilterWeights {
+  int nfilter = 0;
+  /// Number of FFT bins (nfft / 2 + 1)
+  int nbins = 0;
+  /// First FFT bin of the band of each filter
+  std::vector<int> band_start;
+  /// Number of FFT bins in the band of each filter
+  std::vector<int> band_length;
+  /// Offset of the weights of each filter in `weights`; has nfilter + 1 elements
+  std::vector<int> offset;
+  std::vector<T> weights;
+
+  const T *filter_weights(int filter) const {
+    return weights.data() + offset[filter];
+  }
+};
+
+/**
+ * @brief Returns the banded filter weights for given arguments.
+ *
+ * The weights are cached per (nfft, sample_rate, nfilter, freq_low, freq_high, mel_formula,
+ * normalize) and shared by all the kernel instances in the process. The `axis` argument is
+ * ignored. `nfft` and `freq_high` must be already resolved (positive).
+ *
+ * The function is thread-safe.
+ */
+template <typename T>
+DLL_PUBLIC std::shared_ptr<const MelFilterWeights<T>>
+GetMelFilterWeights(const MelFilterBankArgs &args);
+
+/**
+ * @brief Calculates `out[t] = sum_i(weights[i] * in[i * in_stride + t])` for `t` in
+ *        `[0, length)`, summing over `nrows` input rows.
+ *
+ * The rows are accumulated a few at a time, so that the output is read and written
+ * only once per group of rows. The loop over `t` is vectorized.
+ */
+template <typename T>
+DLL_PUBLIC void WeightedRowSum(T *out, const T *in, int64_t in_stride,
+                               const T *weights, int nrows, int64_t length);
+
+}  // namespace audio
+}  // namespace kernels
+}  // namespace dali
+
+#endif  // DALI_KERNELS_AUDIO_MEL_SCALE_MEL_FILTER_WEIGHTS_H_
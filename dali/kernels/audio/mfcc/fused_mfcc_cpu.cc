@@ -0,0 +1,285 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include "dali/kernels/audio/mfcc/fused_mfcc_cpu.h"
+#include <ffts.h>
+#include <algorithm>
+#include <cmath>
+#include <complex>
+#include <cstring>
+#include <vector>
+#include "dali/core/boundary.h"
+#include "dali/kernels/audio/mel_scale/mel_filter_weights.h"
+#include "dali/kernels/signal/fft/ffts_plan_cache.h"
+#include "dali/kernels/signal/dct/table.h"
+#include "dali/kernels/signal/decibel/decibel_calculator.h"
+
+namespace dali {
+namespace kernels {
+namespace audio {
+
+namespace {
+
+inline bool can_use_real_impl(int64_t n) {
+  return is_pow2(n);
+}
+
+inline int64_t size_in_buf(int64_t n) {
+  return can_use_real_impl(n) ? n : 2*n;
+}
+
+inline int64_t size_out_buf(int64_t n) {
+  return can_use_real_impl(n) ? n+2 : 2*n;
+}
+
+}  // namespace
+
+class FusedMfccCpu::Impl {
+ public:
+  Impl(int nfft, const MelFilterBankArgs &mel_args, const signal::dct::DctArgs &dct_args,
+       float lifter)
+  : nfft_(nfft), mel_args_(mel_args), dct_args_(dct_args), lifter_(lifter) {
+    mel_ = GetMelFilterWeights<float>(mel_args_);
+
+    int nfilter = mel_args_.nfilter;
+    int ndct = dct_args_.ndct;
+    dct_table_.resize(nfilter * ndct);
+    signal::dct::FillCosineTable(dct_table_.data(), nfilter, dct_args_);
+    if (lifter_ != 0.0f) {
+      // The liftering is a per-coefficient scaling, so it can be applied to the table directly
+      float ampl_mult = lifter_ / 2;
+      float phase_mult = static_cast<float>(M_PI) / lifter_;
+      for (int k = 0; k < ndct; k++) {
+        float coeff = 1.f + ampl_mult * std::sin(phase_mult * (k + 1));
+        for (int n = 0; n < nfilter; n++)
+          dct_table_[k * nfilter + n] *= coeff;
+      }
+    }
+  }
+
+  bool Matches(int nfft, const MelFilterBankArgs &mel_args, const signal::dct::DctArgs &dct_args,
+               float lifter) const {
+    return nfft == nfft_ && mel_args == mel_args_ && dct_args == dct_args_ && lifter == lifter_;
+  }
+
+  /**
+   * @brief Extracts the window starting at `window_start`, applies the FFT and projects
+   *        the resulting spectrum onto the mel filters.
+   */
+  void MelSpectrum(float *mel_row, ffts_plan_t *plan, float *in_buf, float *out_buf,
+                   const float *samples, int64_t length, int64_t window_start,
+                   const float *window_fn, int window_length, signal::Padding padding,
+                   signal::fft::FftSpectrumType spectrum_type) {
+    bool real_impl = can_use_real_impl(nfft_);
+    int in_step = real_impl ? 1 : 2;
+    if (window_start >= 0 && window_start + window_length <= length) {
+      const float *window = samples + window_start;
+      for (int t = 0; t < window_length; t++)
+        in_buf[t * in_step] = window_fn[t] * window[t];
+    } else {
+      for (int t = 0; t < window_length; t++) {
+        int64_t idx = window_start + t;
+        float value;
+        if (padding == signal::Padding::Reflect)
+          value = samples[boundary::idx_reflect_101(idx, length)];
+        else
+          value = (idx >= 0 && idx < length) ? samples[idx] : 0.0f;
+        in_buf[t * in_step] = window_fn[t] * value;
+      }
+    }
+
+    ffts_execute(plan, in_buf, out_buf);
+
+    // The spectrum is converted to power (or magnitude) in place - the bin `i` is written after
+    // reading the complex value stored at `2*i` and `2*i+1`
+    auto *spectrum = reinterpret_cast<const std::complex<float> *>(out_buf);
+    int nbins = mel_->nbins;
+    if (spectrum_type == signal::fft::FFT_SPECTRUM_MAGNITUDE) {
+      for (int bin = 0; bin < nbins; bin++)
+        out_buf[bin] = std::abs(spectrum[bin]);
+    } else {
+      for (int bin = 0; bin < nbins; bin++)
+        out_buf[bin] = std::norm(spectrum[bin]);
+    }
+
+    const auto &w = *mel_;
+    for (int filter = 0; filter < w.nfilter; filter++) {
+      const float *band = out_buf + w.band_start[filter];
+      const float *weights = w.filter_weights(filter);
+      float acc = 0;
+      for (int i = 0; i < w.band_length[filter]; i++)
+        acc += weights[i] * band[i];
+      mel_row[filter] = acc;
+    }
+  }
+
+  /**
+   * @brief Converts a block of mel spectra to decibels (in place) and writes the (liftered)
+   *        DCT of each of them to the output.
+   */
+  void DecibelsAndDct(float *out, int64_t out_stride, float *mel_block, int64_t nframes,
+                      const signal::MagnitudeToDecibel<float> &dB) {
+    int nfilter = mel_args_.nfilter;
+    int ndct = dct_args_.ndct;
+    for (int64_t i = 0; i < nframes * nfilter; i++)
+      mel_block[i] = dB(mel_block[i]);
+
+    for (int k = 0; k < ndct; k++) {
+      const float *table_row = dct_table_.data() + k * nfilter;
+      float *out_row = out + k * out_stride;
+      for (int64_t t = 0; t < nframes; t++) {
+        const float *mel_row = mel_block + t * nfilter;
+        float acc = 0;
+        for (int n = 0; n < nfilter; n++)
+          acc += mel_row[n] * table_row[n];
+        out_row[t] = acc;
+      }
+    }
+  }
+
+  int nfft() const { return nfft_; }
+  const MelFilterBankArgs &mel_args() const { return mel_args_; }
+  const signal::dct::DctArgs &dct_args() const { return dct_args_; }
+
+ private:
+  int nfft_;
+  MelFilterBankArgs mel_args_;
+  signal::dct::DctArgs dct_args_;
+  float lifter_;
+  std::shared_ptr<const MelFilterWeights<float>> mel_;
+  std::vector<float> dct_table_;
+};
+
+FusedMfccCpu::FusedMfccCpu(signal::fft::FftPlanCacheStats *plan_stats)
+    : plan_stats_(plan_stats) {}
+
+FusedMfccCpu::~FusedMfccCpu() = default;
+
+KernelRequirements FusedMfccCpu::Setup(
+    KernelContext &context,
+    const InTensorCPU<float, 1> &in,
+    const InTensorCPU<float, 1> &window_fn,
+    const FusedMfccArgs &args) {
+  const auto &win = args.window;
+  DALI_ENFORCE(win.window_length > 0, make_string("Invalid window length: ", win.window_length));
+  DALI_ENFORCE(win.window_step > 0, make_string("Invalid window step: ", win.window_step));
+  DALI_ENFORCE(window_fn.shape[0] == win.window_length,
+    "Window function should match the specified window length");
+
+  int nfft = args.nfft > 0 ? args.nfft : win.window_length;
+  DALI_ENFORCE(win.window_length <= nfft, make_string(
+    "Window length (", win.window_length, ") can't be bigger than the FFT size (", nfft, ")"));
+  DALI_ENFORCE(args.spectrum_type == signal::fft::FFT_SPECTRUM_POWER ||
+               args.spectrum_type == signal::fft::FFT_SPECTRUM_MAGNITUDE,
+    "Only power or magnitude spectrum is supported");
+
+  nframes_ = win.num_windows(in.shape[0]);
+  DALI_ENFORCE(nframes_ > 0, make_string("Signal is too short (", in.shape[0], ")"));
+
+  auto mel_args = args.mel;
+  mel_args.nfft = nfft;
+  mel_args.axis = -1;
+  mel_args.freq_high = mel_args.freq_high > 0 ? mel_args.freq_high : mel_args.sample_rate / 2;
+  DALI_ENFORCE(mel_args.nfilter > 0, "Number of mel filters should be > 0");
+
+  auto dct_args = args.dct;
+  dct_args.ndct = dct_args.ndct > 0 ? dct_args.ndct : mel_args.nfilter;
+  DALI_ENFORCE(dct_args.dct_type != 1 || mel_args.nfilter > 1,
+    "DCT type I requires the number of mel filters to be > 1");
+
+  if (!impl_ || !impl_->Matches(nfft, mel_args, dct_args, args.lifter))
+    impl_ = std::make_unique<Impl>(nfft, mel_args, dct_args, args.lifter);
+
+  int64_t mel_frames = args.db.ref_max ? nframes_ : std::min<int64_t>(nframes_, kBlockFrames);
+  ScratchpadEstimator se;
+  se.add<float>(AllocType::Host, size_in_buf(nfft), 32);
+  se.add<float>(AllocType::Host, size_out_buf(nfft), 32);
+  se.add<float>(AllocType::Host, mel_frames * mel_args.nfilter);
+
+  KernelRequirements req;
+  req.scratch_sizes = se.sizes;
+  TensorShape<> out_shape{dct_args.ndct, nframes_};
+  std::vector<TensorShape<DynamicDimensions>> tmp = {out_shape};  // workaround for clang-6 bug
+  req.output_shapes = {TensorListShape<DynamicDimensions>(tmp)};
+  return req;
+}
+
+void FusedMfccCpu::Run(
+    KernelContext &context,
+    const OutTensorCPU<float, 2> &out,
+    const InTensorCPU<float, 1> &in,
+    const InTensorCPU<float, 1> &window_fn,
+    const FusedMfccArgs &args) {
+  DALI_ENFORCE(impl_ != nullptr);
+  assert(out.shape[1] == nframes_);
+  int nfft = impl_->nfft();
+  int nfilter = impl_->mel_args().nfilter;
+  const auto &win = args.window;
+  int window_length = win.window_length;
+  int window_step = win.window_step;
+  int window_center = 0;
+  if (win.padding != signal::Padding::None)
+    window_center = win.window_center < 0 ? window_length / 2 : win.window_center;
+
+  // ffts requires 32-byte aligned memory
+  auto in_buf_sz = size_in_buf(nfft);
+  float *in_buf = context.scratchpad->Allocate<float>(AllocType::Host, in_buf_sz, 32);
+  std::memset(in_buf, 0, in_buf_sz * sizeof(float));
+  float *out_buf = context.scratchpad->Allocate<float>(AllocType::Host, size_out_buf(nfft), 32);
+  auto plan = signal::fft::FftsPlanCache::Instance().Get(nfft, FFTS_FORWARD,
+                                                          can_use_real_impl(nfft), plan_stats_);
+
+  bool ref_max = args.db.ref_max;
+  int64_t mel_frames = ref_max ? nframes_ : std::min<int64_t>(nframes_, kBlockFrames);
+  float *mel = context.scratchpad->Allocate<float>(AllocType::Host, mel_frames * nfilter);
+
+  const float *samples = in.data;
+  int64_t length = in.shape[0];
+
+  for (int64_t block_start = 0; block_start < nframes_; block_start += kBlockFrames) {
+    int64_t block_end = std::min<int64_t>(nframes_, block_start + kBlockFrames);
+    float *mel_block = ref_max ? mel + block_start * nfilter : mel;
+    for (int64_t t = block_start; t < block_end; t++) {
+      impl_->MelSpectrum(mel_block + (t - block_start) * nfilter, plan.get(), in_buf, out_buf,
+                         samples, length, t * window_step - window_center,
+                         window_fn.data, window_length, win.padding, args.spectrum_type);
+    }
+    if (!ref_max) {
+      signal::MagnitudeToDecibel<float> dB(args.db.multiplier, args.db.s_ref, args.db.min_ratio);
+      impl_->DecibelsAndDct(out.data + block_start, nframes_, mel_block,
+                            block_end - block_start, dB);
+    }
+  }
+
+  if (ref_max) {
+    float s_ref = 0.0f;
+    for (int64_t i = 0; i < nframes_ * nfilter; i++) {
+      if (mel[i] > s_ref)
+        s_ref = mel[i];
+    }
+    // avoid division by 0
+    if (s_ref == 0.0f)
+      s_ref = 1.0f;
+    signal::MagnitudeToDecibel<float> dB(args.db.multiplier, s_ref, args.db.min_ratio);
+    for (int64_t block_start = 0; block_start < nframes_; block_start += kBlockFrames) {
+      int64_t block_end = std::min<int64_t>(nframes_, block_start + kBlockFrames);
+      impl_->DecibelsAndDct(out.data + block_start, nframes_, mel + block_start * nfilter,
+                            block_end - block_start, dB);
+    }
+  }
+}
+
+}  // namespace audio
+}  // namespace kernels
+}  // namespace dali
@@ -0,0 +1,105 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_KERNELS_AUDIO_MFCC_FUSED_MFCC_CPU_H_
+#define DALI_KERNELS_AUDIO_MFCC_FUSED_MFCC_CPU_H_
+
+#include <memory>
+#include "dali/core/common.h"
+#include "dali/core/error_handling.h"
+#include "dali/core/format.h"
+#include "dali/core/util.h"
+#include "dali/kernels/kernel.h"
+#include "dali/kernels/audio/mel_scale/mel_filter_bank_args.h"
+#include "dali/kernels/signal/dct/dct_args.h"
+#include "dali/kernels/signal/decibel/to_decibels_args.h"
+#include "dali/kernels/signal/fft/fft_common.h"
+#include "dali/kernels/signal/window/extract_windows_args.h"
+
+namespace dali {
+namespace kernels {
+namespace audio {
+
+struct FusedMfccArgs {
+  /// @brief Window extraction parameters. The axis is ignored - the input is a 1D signal
+  signal::ExtractWindowsArgs window;
+
+  /// @brief Size of the FFT. By default, it's equal to the window length
+  int nfft = -1;
+
+  /// @brief Either FFT_SPECTRUM_POWER or FFT_SPECTRUM_MAGNITUDE
+  signal::fft::FftSpectrumType spectrum_type = signal::fft::FFT_SPECTRUM_POWER;
+
+  /// @brief Mel filter bank parameters. The axis and nfft are ignored
+  MelFilterBankArgs mel;
+
+  /// @brief Decibel conversion parameters
+  signal::ToDecibelsArgs<float> db;
+
+  /// @brief DCT parameters. By default, ndct is equal to the number of mel filters
+  signal::dct::DctArgs dct;
+
+  /// @brief Liftering coefficient (0 means no liftering)
+  float lifter = 0.0f;
+};
+
+/**
+ * @brief Computes MFCCs directly from a 1D signal.
+ *
+ * The result is equivalent to a chain of ExtractWindowsCpu, Fft1DCpu, MelFilterBankCpu,
+ * ToDecibelsCpu and Dct1DCpu (followed by liftering), but instead of producing a full-size
+ * intermediate tensor at every stage, the signal is processed one block of frames at a time:
+ * each window is extracted, transformed and projected onto the mel filters while it's still
+ * in cache and only the (much smaller) mel spectrogram of the block is kept until it's
+ * converted to decibels and transformed with the DCT.
+ *
+ * If the decibel reference is the maximum of the mel spectrogram (`db.ref_max`), the mel
+ * spectrogram of the whole sample is kept and the last two steps are done in a second pass.
+ *
+ * The output layout is (coefficient, frame), as with the chained operators.
+ *
+ * The FFT plans are taken from the process-wide FftsPlanCache. Optionally, the hits and misses
+ * of the cache can be collected in `plan_stats`, passed to the constructor.
+ */
+class DLL_PUBLIC FusedMfccCpu {
+ public:
+  /// @brief Number of frames processed together in one block
+  static constexpr int kBlockFrames = 32;
+
+  DLL_PUBLIC explicit FusedMfccCpu(signal::fft::FftPlanCacheStats *plan_stats = nullptr);
+  DLL_PUBLIC ~FusedMfccCpu();
+
+  DLL_PUBLIC KernelRequirements Setup(KernelContext &context,
+                                      const InTensorCPU<float, 1> &in,
+                                      const InTensorCPU<float, 1> &window_fn,
+                                      const FusedMfccArgs &args);
+
+  DLL_PUBLIC void Run(KernelContext &context,
+                      const OutTensorCPU<float, 2> &out,
+                      const InTensorCPU<float, 1> &in,
+                      const InTensorCPU<float, 1> &window_fn,
+                      const FusedMfccArgs &args);
+
+ private:
+  class Impl;
+  std::unique_ptr<Impl> impl_;
+  int64_t nframes_ = 0;
+  signal::fft::FftPlanCacheStats *plan_stats_ = nullptr;
+};
+
+}  // namespace audio
+}  // namespace kernels
+}  // namespace dali
+
+#endif  // DALI_KERNELS_AUDIO_MFCC_FUSED_MFCC_CPU_H_
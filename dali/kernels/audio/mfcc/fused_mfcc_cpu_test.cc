@@ -0,0 +1,178 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <cmath>
+#include <random>
+#include <vector>
+#include "dali/kernels/audio/mfcc/fused_mfcc_cpu.h"
+#include "dali/kernels/audio/mel_scale/mel_filter_bank_cpu.h"
+#include "dali/kernels/scratch.h"
+#include "dali/kernels/signal/dct/dct_cpu.h"
+#include "dali/kernels/signal/decibel/to_decibels_cpu.h"
+#include "dali/kernels/signal/fft/fft_cpu.h"
+#include "dali/kernels/signal/window/extract_windows_cpu.h"
+#include "dali/kernels/signal/window/window_functions.h"
+#include "dali/test/tensor_test_utils.h"
+
+namespace dali {
+namespace kernels {
+namespace audio {
+namespace test {
+
+namespace {
+
+template <int ndim>
+OutTensorCPU<float, ndim> OutView(std::vector<float> &data, const TensorShape<> &shape) {
+  return OutTensorCPU<float, DynamicDimensions>(data.data(), shape).to_static<ndim>();
+}
+
+template <>
+OutTensorCPU<float, DynamicDimensions> OutView<DynamicDimensions>(std::vector<float> &data,
+                                                                  const TensorShape<> &shape) {
+  return {data.data(), shape};
+}
+
+template <int OutDims, typename Kernel, typename... Args>
+void RunKernel(Kernel &kernel, std::vector<float> &out_data, TensorShape<> &out_shape,
+               const Args &... args) {
+  KernelContext ctx;
+  auto req = kernel.Setup(ctx, args...);
+  out_shape = req.output_shapes[0][0];
+  out_data.resize(volume(out_shape));
+  ScratchpadAllocator scratch_alloc;
+  scratch_alloc.Reserve(req.scratch_sizes);
+  auto scratchpad = scratch_alloc.GetScratchpad();
+  ctx.scratchpad = &scratchpad;
+  kernel.Run(ctx, OutView<OutDims>(out_data, out_shape), args...);
+}
+
+/**
+ * @brief Calculates the MFCCs with the individual kernels, the way the chain of operators does
+ */
+std::vector<float> ChainedMfcc(const InTensorCPU<float, 1> &in,
+                               const InTensorCPU<float, 1> &window_fn,
+                               const FusedMfccArgs &args) {
+  TensorShape<> shape;
+  std::vector<float> windows, spectrogram, mel, db, mfcc;
+
+  signal::ExtractWindowsCpu<float, float, 1> window_kernel;
+  auto window_args = args.window;
+  window_args.axis = 0;
+  RunKernel<2>(window_kernel, windows, shape, in, window_fn, window_args);
+
+  signal::fft::Fft1DCpu<float, float, 2> fft_kernel;
+  signal::fft::FftArgs fft_args;
+  fft_args.nfft = args.nfft;
+  fft_args.spectrum_type = args.spectrum_type;
+  fft_args.transform_axis = 0;
+  auto windows_view = make_tensor_cpu<2>(windows.data(), shape.to_static<2>());
+  RunKernel<2>(fft_kernel, spectrogram, shape, windows_view, fft_args);
+
+  MelFilterBankCpu<float, 2> mel_kernel;
+  auto mel_args = args.mel;
+  mel_args.axis = 0;
+  auto spectrogram_view = make_tensor_cpu<2>(spectrogram.data(), shape.to_static<2>());
+  RunKernel<2>(mel_kernel, mel, shape, spectrogram_view, mel_args);
+
+  signal::ToDecibelsCpu<float> db_kernel;
+  auto mel_view = make_tensor_cpu(mel.data(), shape);
+  RunKernel<DynamicDimensions>(db_kernel, db, shape, mel_view, args.db);
+
+  signal::dct::Dct1DCpu<float, float, 2> dct_kernel;
+  auto db_view = make_tensor_cpu<2>(db.data(), shape.to_static<2>());
+  RunKernel<2>(dct_kernel, mfcc, shape, db_view, args.dct, 0);
+
+  if (args.lifter != 0.0f) {
+    int64_t ndct = shape[0], nframes = shape[1];
+    for (int64_t k = 0; k < ndct; k++) {
+      float phase = static_cast<float>(M_PI) / args.lifter * (k + 1);
+      float coeff = 1.f + args.lifter / 2 * std::sin(phase);
+      for (int64_t t = 0; t < nframes; t++)
+        mfcc[k * nframes + t] *= coeff;
+    }
+  }
+  return mfcc;
+}
+
+}  // namespace
+
+struct FusedMfccTestParams {
+  int64_t length;
+  int window_length, window_step, nfft;
+  signal::Padding padding;
+  bool ref_max;
+  int dct_type;
+  float lifter;
+};
+
+class FusedMfccCpuTest : public ::testing::TestWithParam<FusedMfccTestParams> {};
+
+TEST_P(FusedMfccCpuTest, CompareWithChainedKernels) {
+  auto params = GetParam();
+  std::vector<float> data(params.length);
+  std::mt19937 rng(1234);
+  std::uniform_real_distribution<float> dist(-1, 1);
+  for (auto &x : data)
+    x = dist(rng);
+  auto in = make_tensor_cpu<1>(data.data(), {params.length});
+
+  std::vector<float> window_fn(params.window_length);
+  signal::HannWindow(make_span(window_fn));
+  auto window_fn_view = make_tensor_cpu<1>(window_fn.data(), {params.window_length});
+
+  FusedMfccArgs args;
+  args.window.window_length = params.window_length;
+  args.window.window_step = params.window_step;
+  args.window.padding = params.padding;
+  args.window.window_center = params.padding == signal::Padding::None
+                            ? 0 : params.window_length / 2;
+  args.nfft = params.nfft;
+  args.mel.nfilter = 64;
+  args.mel.sample_rate = 16000;
+  args.mel.freq_high = 8000;
+  args.db.ref_max = params.ref_max;
+  args.db.min_ratio = 1e-10;
+  args.dct.dct_type = params.dct_type;
+  args.dct.ndct = 20;
+  args.lifter = params.lifter;
+
+  auto ref = ChainedMfcc(in, window_fn_view, args);
+
+  FusedMfccCpu kernel;
+  std::vector<float> out;
+  TensorShape<> out_shape;
+  // run twice to check that the kernel can be reused
+  for (int iter = 0; iter < 2; iter++) {
+    RunKernel<2>(kernel, out, out_shape, in, window_fn_view, args);
+    ASSERT_EQ(out.size(), ref.size());
+    EXPECT_EQ(out_shape[0], args.dct.ndct);
+    for (size_t i = 0; i < ref.size(); i++) {
+      ASSERT_NEAR(out[i], ref[i], 1e-3 * std::max(1.0f, std::abs(ref[i])))
+          << "at index " << i;
+    }
+  }
+}
+
+INSTANTIATE_TEST_SUITE_P(FusedMfccCpuTest, FusedMfccCpuTest, ::testing::Values(
+  FusedMfccTestParams{16000, 400, 160, 512, signal::Padding::Reflect, false, 2, 0.0f},
+  FusedMfccTestParams{16000, 400, 160, 512, signal::Padding::Reflect, true, 2, 22.0f},
+  FusedMfccTestParams{10000, 256, 100, 256, signal::Padding::Zero, true, 3, 0.0f},
+  FusedMfccTestParams{10000, 300, 128, 300, signal::Padding::None, false, 1, 0.0f},
+  FusedMfccTestParams{500, 400, 160, 480, signal::Padding::Reflect, true, 4, 10.0f}));
+
+}  // namespace test
+}  // namespace audio
+}  // namespace kernels
+}  // namespace dali
@@ -0,0 +1,152 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_KERNELS_COMMON_SPLIT_SHAPE_H_
+#define DALI_KERNELS_COMMON_SPLIT_SHAPE_H_
+
+#include <algorithm>
+#include <cassert>
+#include <cmath>
+#include <cstdint>
+#include <utility>
+#include "dali/core/tensor_shape.h"
+#include "dali/core/traits.h"
+
+namespace dali {
+namespace kernels {
+
+/**
+ * @brief Default minimum number of elements in a block produced by intra-sample splitting.
+ *
+ * Smaller blocks are not worth the scheduling overhead.
+ */
+constexpr int64_t kMinBlockVolume = 1 << 14;
+
+/**
+ * @brief Default number of tasks per thread that a batch is split into.
+ *
+ * Having a few tasks per thread lets the thread pool even out the differences in the actual
+ * execution time of the tasks.
+ */
+constexpr int kTasksPerThread = 3;
+
+/**
+ * @brief Calculates the number of blocks that a sample should be split into.
+ *
+ * The batch is to be processed in about `num_tasks` tasks of similar cost; the sample gets
+ * the number of tasks proportional to its share in the total cost of the batch.
+ *
+ * @param sample_cost estimated cost of processing the sample
+ * @param total_cost  estimated cost of processing the whole batch
+ * @param num_tasks   the desired number of tasks for the whole batch
+ * @return number of blocks, at least 1
+ */
+inline int64_t NumSampleBlocks(double sample_cost, double total_cost, int num_tasks) {
+  if (sample_cost <= 0 || total_cost <= 0 || num_tasks <= 1)
+    return 1;
+  return std::max<int64_t>(1, std::ceil(sample_cost / total_cost * num_tasks));
+}
+
+/**
+ * @brief Calculates the number of splits along each dimension of the shape.
+ *
+ * The dimensions are split starting from the outermost one, until the number of blocks reaches
+ * `min_nblocks` or the block volume would drop below `min_sz`. Splitting the outer dimensions
+ * first produces blocks that are contiguous (slabs) or nearly so.
+ *
+ * @param split_factor  output; number of blocks along each dimension
+ * @param shape         shape to be split
+ * @param min_nblocks   desired number of blocks
+ * @param min_sz        minimum volume of a block
+ * @param skip_dim_mask bit mask of dimensions which must not be split (e.g. channels)
+ * @return the total number of blocks, i.e. the product of `split_factor`
+ */
+template <typename SplitFactor, typename Shape>
+int64_t split_shape(SplitFactor &split_factor, const Shape &shape, int64_t min_nblocks,
+                    int64_t min_sz = kMinBlockVolume, uint64_t skip_dim_mask = 0) {
+  int ndim = shape.size();
+  resize_if_possible(split_factor, ndim);
+  for (int d = 0; d < ndim; d++)
+    split_factor[d] = 1;
+
+  int64_t nblocks = 1;
+  int64_t blk_vol = volume(shape);
+  for (int d = 0; d < ndim && nblocks < min_nblocks; d++) {
+    if (skip_dim_mask & (uint64_t(1) << d))
+      continue;
+    int64_t max_by_size = blk_vol / std::max<int64_t>(min_sz, 1);
+    if (max_by_size < 2)
+      break;
+    int64_t remaining = (min_nblocks + nblocks - 1) / nblocks;
+    int64_t f = std::min({ remaining, max_by_size, static_cast<int64_t>(shape[d]) });
+    if (f < 2)
+      continue;
+    split_factor[d] = f;
+    nblocks *= f;
+    blk_vol /= f;
+  }
+  return nblocks;
+}
+
+namespace detail {
+
+template <typename Shape, typename SplitFactor, typename Func>
+void ForEachBlockImpl(Shape &start, Shape &end, const Shape &shape,
+                      const SplitFactor &split_factor, int d, Func &func) {
+  if (d == static_cast<int>(shape.size())) {
+    func(static_cast<const Shape &>(start), static_cast<const Shape &>(end));
+    return;
+  }
+  int64_t extent = shape[d];
+  int64_t nsplits = split_factor[d];
+  for (int64_t i = 0; i < nsplits; i++) {
+    start[d] = extent * i / nsplits;
+    end[d] = extent * (i + 1) / nsplits;
+    ForEachBlockImpl(start, end, shape, split_factor, d + 1, func);
+  }
+}
+
+}  // namespace detail
+
+/**
+ * @brief Calls `func(start, end)` for each block of the `shape` split according to `split_factor`
+ *
+ * The blocks are disjoint and cover the whole shape; the extents of the blocks along each
+ * dimension differ by at most 1.
+ */
+template <typename Shape, typename SplitFactor, typename Func>
+void ForEachBlock(const Shape &shape, const SplitFactor &split_factor, Func &&func) {
+  Shape start = shape, end = shape;
+  detail::ForEachBlockImpl(start, end, shape, split_factor, 0, func);
+}
+
+/**
+ * @brief Execution engine which runs the work immediately, in the calling thread
+ *
+ * It has the same interface as ThreadPool, so the kernels' `Schedule` functions can be used
+ * without a thread pool (e.g. in tests).
+ */
+struct SequentialExecutionEngine {
+  template <typename Work>
+  void AddWork(Work &&work, int64_t priority = 0, bool finished_adding_work = false) {
+    work(0);
+  }
+
+  void RunAll(bool wait = true) {}
+};
+
+}  // namespace kernels
+}  // namespace dali
+
+#endif  // DALI_KERNELS_COMMON_SPLIT_SHAPE_H_
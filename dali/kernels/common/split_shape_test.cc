@@ -0,0 +1,80 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <vector>
+#include "dali/kernels/common/split_shape.h"
+
+namespace dali {
+namespace kernels {
+
+TEST(SplitShape, OuterDimsFirst) {
+  TensorShape<3> shape{ 100, 200, 3 };
+  TensorShape<3> split_factor;
+  EXPECT_EQ(split_shape(split_factor, shape, 8, 1), 8);
+  EXPECT_EQ(split_factor, TensorShape<3>(8, 1, 1));
+
+  EXPECT_EQ(split_shape(split_factor, shape, 1000, 1, 0b100), 1000);
+  EXPECT_EQ(split_factor, TensorShape<3>(100, 10, 1));
+}
+
+TEST(SplitShape, MinBlockSize) {
+  TensorShape<3> shape{ 100, 200, 3 };
+  TensorShape<3> split_factor;
+  // each block must have at least 6000 elements, so at most 10 blocks
+  EXPECT_EQ(split_shape(split_factor, shape, 32, 6000), 10);
+  EXPECT_EQ(split_factor, TensorShape<3>(10, 1, 1));
+
+  EXPECT_EQ(split_shape(split_factor, shape, 32, 100000), 1);
+  EXPECT_EQ(split_factor, TensorShape<3>(1, 1, 1));
+}
+
+TEST(SplitShape, SkipDims) {
+  TensorShape<3> shape{ 3, 500, 400 };
+  TensorShape<3> split_factor;
+  EXPECT_EQ(split_shape(split_factor, shape, 16, 1, 0b001), 16);
+  EXPECT_EQ(split_factor, TensorShape<3>(1, 16, 1));
+}
+
+TEST(SplitShape, ForEachBlock) {
+  TensorShape<2> shape{ 10, 7 };
+  TensorShape<2> split_factor{ 3, 2 };
+  std::vector<int> coverage(volume(shape), 0);
+  int nblocks = 0;
+  ForEachBlock(shape, split_factor, [&](const TensorShape<2> &start, const TensorShape<2> &end) {
+    nblocks++;
+    for (int d = 0; d < 2; d++) {
+      int64_t extent = end[d] - start[d];
+      EXPECT_GE(extent, shape[d] / split_factor[d]);
+      EXPECT_LE(extent, shape[d] / split_factor[d] + 1);
+    }
+    for (int64_t y = start[0]; y < end[0]; y++)
+      for (int64_t x = start[1]; x < end[1]; x++)
+        coverage[y * shape[1] + x]++;
+  });
+  EXPECT_EQ(nblocks, 6);
+  for (int c : coverage)
+    EXPECT_EQ(c, 1);
+}
+
+TEST(SplitShape, NumSampleBlocks) {
+  EXPECT_EQ(NumSampleBlocks(100, 100, 24), 24);
+  EXPECT_EQ(NumSampleBlocks(50, 100, 24), 12);
+  EXPECT_EQ(NumSampleBlocks(1, 1000, 24), 1);
+  EXPECT_EQ(NumSampleBlocks(0, 0, 24), 1);
+  EXPECT_EQ(NumSampleBlocks(100, 100, 1), 1);
+}
+
+}  // namespace kernels
+}  // namespace dali
@@ -0,0 +1,185 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <cmath>
+#include <random>
+#include <vector>
+
+#include "dali/kernels/common/utils.h"
+#include "dali/kernels/imgproc/convolution/gaussian_blur_cpu.h"
+#include "dali/kernels/imgproc/convolution/separable_convolution_cpu.h"
+#include "dali/kernels/scratch.h"
+#include "dali/test/tensor_test_utils.h"
+#include "dali/test/test_tensors.h"
+
+namespace dali {
+namespace kernels {
+
+namespace {
+
+int FullWindowSize(float sigma) {
+  return 2 * static_cast<int>(std::ceil(3 * sigma)) + 1;
+}
+
+void InitGaussianWindow(const TensorView<StorageCPU, float, 1> &window, float sigma) {
+  int radius = window.num_elements() / 2;
+  double sum = 0;
+  for (int i = 0; i < window.num_elements(); i++) {
+    double x = i - radius;
+    window.data[i] = std::exp(-x * x / (2 * sigma * sigma));
+    sum += window.data[i];
+  }
+  for (int i = 0; i < window.num_elements(); i++)
+    window.data[i] /= sum;
+}
+
+/**
+ * @brief Random noise with a few step edges, so that both flat and high-contrast
+ *        regions are covered
+ */
+template <int ndim>
+void FillTestImage(const TensorView<StorageCPU, uint8_t, ndim> &image, std::mt19937 &rng) {
+  UniformRandomFill(image, rng, 0, 255);
+  int64_t row = image.shape[ndim - 1] * (ndim > 1 ? image.shape[ndim - 2] : 1);
+  for (int64_t i = 0; i < image.num_elements(); i++) {
+    if ((i % row) < row / 4)
+      image.data[i] = 255;
+    else if ((i % row) < row / 2)
+      image.data[i] = 0;
+  }
+}
+
+template <int axes, bool has_channels>
+void TestMatchesDirect(const TensorShape<axes + has_channels> &shape,
+                       const std::array<float, axes> &sigmas) {
+  constexpr int ndim = axes + has_channels;
+  std::array<int, axes> window_sizes;
+  std::array<TestTensorList<float, 1>, axes> windows;
+  std::array<TensorView<StorageCPU, const float, 1>, axes> window_views;
+  for (int a = 0; a < axes; a++) {
+    window_sizes[a] = FullWindowSize(sigmas[a]);
+    windows[a].reshape(uniform_list_shape<1>(1, {window_sizes[a]}));
+    InitGaussianWindow(windows[a].cpu()[0], sigmas[a]);
+    window_views[a] = windows[a].cpu()[0];
+  }
+
+  TestTensorList<uint8_t, ndim> input;
+  TestTensorList<float, ndim> output, baseline_output;
+  auto data_shape = uniform_list_shape<ndim>(1, shape);
+  input.reshape(data_shape);
+  output.reshape(data_shape);
+  baseline_output.reshape(data_shape);
+  auto in_v = input.cpu()[0];
+  auto out_v = output.cpu()[0];
+  auto baseline_out_v = baseline_output.cpu()[0];
+  std::mt19937 rng;
+  FillTestImage(in_v, rng);
+
+  KernelContext ctx;
+  ScratchpadAllocator scratch_alloc;
+
+  SeparableConvolutionCpu<float, uint8_t, float, axes, has_channels> direct;
+  auto req = direct.Setup(ctx, shape, window_sizes);
+  scratch_alloc.Reserve(req.scratch_sizes);
+  auto scratchpad = scratch_alloc.GetScratchpad();
+  ctx.scratchpad = &scratchpad;
+  direct.Run(ctx, baseline_out_v, in_v, window_views);
+
+  GaussianBlurCpu<float, uint8_t, axes, has_channels> blur;
+  req = blur.Setup(ctx, shape, window_sizes, sigmas);
+  scratch_alloc.Reserve(req.scratch_sizes);
+  scratchpad = scratch_alloc.GetScratchpad();
+  ctx.scratchpad = &scratchpad;
+  blur.Run(ctx, out_v, in_v, window_views, sigmas);
+
+  Check(out_v, baseline_out_v, EqualEps(kRecursiveGaussianMaxError * 255));
+}
+
+}  // namespace
+
+TEST(RecursiveGaussianTest, ImpulseResponse) {
+  for (float sigma : {6.0f, 10.0f, 20.0f, 50.0f}) {
+    int size = 20 * sigma + 1;
+    int center = size / 2;
+    std::vector<float> data(size, 0.0f);
+    data[center] = 1.0f;
+    TensorView<StorageCPU, float, 1> view(data.data(), {size});
+
+    RecursiveGaussianCpu<float, float, 1, 0, false> kernel;
+    KernelContext ctx;
+    auto req = kernel.Setup(ctx, view.shape, FullWindowSize(sigma));
+    ScratchpadAllocator scratch_alloc;
+    scratch_alloc.Reserve(req.scratch_sizes);
+    auto scratchpad = scratch_alloc.GetScratchpad();
+    ctx.scratchpad = &scratchpad;
+    kernel.Run(ctx, view, view, sigma, FullWindowSize(sigma));
+
+    double sum = 0;
+    double peak = 1 / (std::sqrt(2 * M_PI) * sigma);
+    for (int i = 0; i < size; i++) {
+      sum += data[i];
+      double x = i - center;
+      double gaussian = peak * std::exp(-x * x / (2 * sigma * sigma));
+      // the shape is approximated within a few percent of the peak
+      ASSERT_NEAR(data[i], gaussian, 0.04 * peak) << "sigma = " << sigma << ", x = " << x;
+    }
+    EXPECT_NEAR(sum, 1.0, 1e-4) << "sigma = " << sigma;
+  }
+}
+
+TEST(RecursiveGaussianTest, ConstantInput) {
+  TensorShape<3> shape = {40, 70, 3};
+  std::vector<uint8_t> data(volume(shape), 123);
+  TensorView<StorageCPU, uint8_t, 3> view(data.data(), shape);
+  RecursiveGaussianCpu<uint8_t, uint8_t, 3, 0, true> kernel;
+  KernelContext ctx;
+  auto req = kernel.Setup(ctx, shape, 61);
+  ScratchpadAllocator scratch_alloc;
+  scratch_alloc.Reserve(req.scratch_sizes);
+  auto scratchpad = scratch_alloc.GetScratchpad();
+  ctx.scratchpad = &scratchpad;
+  kernel.Run(ctx, view, view, 10.0f, 61);
+  for (auto x : data)
+    ASSERT_EQ(x, 123);
+}
+
+TEST(GaussianBlurCpuTest, Axes1) {
+  TestMatchesDirect<1, true>({500, 3}, {20.0f});
+  TestMatchesDirect<1, false>({300}, {50.0f});
+}
+
+TEST(GaussianBlurCpuTest, Axes2) {
+  TestMatchesDirect<2, true>({120, 150, 3}, {6.0f, 10.0f});
+  TestMatchesDirect<2, false>({200, 90}, {25.0f, 8.0f});
+  // mixed - the direct convolution in the innermost axis
+  TestMatchesDirect<2, true>({160, 100, 3}, {15.0f, 2.0f});
+}
+
+TEST(GaussianBlurCpuTest, Axes3) {
+  TestMatchesDirect<3, true>({30, 40, 50, 3}, {6.0f, 7.0f, 12.0f});
+  TestMatchesDirect<3, false>({40, 20, 50}, {3.0f, 6.0f, 9.0f});
+}
+
+TEST(GaussianBlurCpuTest, SmallSigmaIsDirect) {
+  EXPECT_FALSE(UseRecursiveGaussian(FullWindowSize(5.0f), 5.0f));
+  EXPECT_TRUE(UseRecursiveGaussian(FullWindowSize(6.0f), 6.0f));
+  // truncated window must be applied directly
+  EXPECT_FALSE(UseRecursiveGaussian(31, 10.0f));
+  // the same code as in the separable convolution is used
+  TestMatchesDirect<2, true>({50, 60, 3}, {1.5f, 5.0f});
+}
+
+}  // namespace kernels
+}  // namespace dali
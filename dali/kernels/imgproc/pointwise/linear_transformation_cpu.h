@@ -15,11 +15,17 @@
 #ifndef DALI_KERNELS_IMGPROC_POINTWISE_LINEAR_TRANSFORMATION_CPU_H_
 #define DALI_KERNELS_IMGPROC_POINTWISE_LINEAR_TRANSFORMATION_CPU_H_
 
-#include <vector>
+#include <cstring>
+#include <type_traits>
 #include <utility>
+#include <vector>
+#ifdef __SSE2__
+#include <emmintrin.h>
+#endif
 #include "dali/core/format.h"
 #include "dali/core/convert.h"
 #include "dali/core/geom/box.h"
+#include "dali/core/geom/mat.h"
 #include "dali/kernels/common/block_setup.h"
 #include "dali/kernels/imgproc/surface.h"
 #include "dali/kernels/imgproc/roi.h"
@@ -27,6 +33,73 @@
 namespace dali {
 namespace kernels {
 
+namespace linear_transformation {
+namespace detail {
+
+#ifdef __SSE2__
+
+/**
+ * @brief Tells, whether the vectorized implementation is available for given types and channels
+ */
+template <typename OutputType, typename InputType, int channels_out, int channels_in>
+struct HasSimdImpl : std::integral_constant<bool,
+    channels_out == 3 && channels_in == 3 &&
+    (std::is_same<InputType, uint8_t>::value || std::is_same<InputType, float>::value) &&
+    (std::is_same<OutputType, uint8_t>::value || std::is_same<OutputType, float>::value)> {};
+
+inline void StorePixel3(uint8_t *out, __m128 v) {
+  // Clamping before the conversion makes the rounding and saturation equivalent to ConvertSat,
+  // save for the values that are a hair below .5, which may end up rounded up.
+  v = _mm_min_ps(_mm_max_ps(v, _mm_setzero_ps()), _mm_set1_ps(255.0f));
+  __m128i i32 = _mm_cvttps_epi32(_mm_add_ps(v, _mm_set1_ps(0.5f)));
+  __m128i i16 = _mm_packs_epi32(i32, i32);
+  int32_t u8x4 = _mm_cvtsi128_si32(_mm_packus_epi16(i16, i16));
+  // writes 4 bytes - the caller must make sure that it's safe to do so
+  memcpy(out, &u8x4, sizeof(u8x4));
+}
+
+inline void StorePixel3(float *out, __m128 v) {
+  // writes 4 values - the caller must make sure that it's safe to do so
+  _mm_storeu_ps(out, v);
+}
+
+/**
+ * @brief Applies the affine transform to a row of 3-channel pixels
+ *
+ * The channels are kept in the SSE registers (with a 4th, unused lane) and the matrix is
+ * applied as a weighted sum of its columns. The last pixel is processed with scalar code,
+ * because the vectorized store writes past the pixel.
+ */
+template <typename OutputType, typename InputType>
+void TransformRow3(OutputType *out, const InputType *in, int64_t width,
+                   const mat3 &tmatrix, const vec3 &tvector) {
+  if (width <= 0)
+    return;
+  __m128 col0 = _mm_setr_ps(tmatrix(0, 0), tmatrix(1, 0), tmatrix(2, 0), 0);
+  __m128 col1 = _mm_setr_ps(tmatrix(0, 1), tmatrix(1, 1), tmatrix(2, 1), 0);
+  __m128 col2 = _mm_setr_ps(tmatrix(0, 2), tmatrix(1, 2), tmatrix(2, 2), 0);
+  __m128 offset = _mm_setr_ps(tvector[0], tvector[1], tvector[2], 0);
+  for (int64_t x = 0; x < width - 1; x++, in += 3, out += 3) {
+    __m128 v = _mm_add_ps(_mm_mul_ps(col0, _mm_set1_ps(in[0])),
+                          _mm_mul_ps(col1, _mm_set1_ps(in[1])));
+    v = _mm_add_ps(v, _mm_mul_ps(col2, _mm_set1_ps(in[2])));
+    StorePixel3(out, _mm_add_ps(v, offset));
+  }
+  vec3 v_out = tmatrix * vec3(in[0], in[1], in[2]) + tvector;
+  for (int k = 0; k < 3; k++)
+    out[k] = ConvertSat<OutputType>(v_out[k]);
+}
+
+#else
+
+template <typename OutputType, typename InputType, int channels_out, int channels_in>
+struct HasSimdImpl : std::false_type {};
+
+#endif
+
+}  // namespace detail
+}  // namespace linear_transformation
+
 template <typename OutputType, typename InputType, int channels_out, int channels_in, int ndims>
 class LinearTransformationCpu {
  private:
@@ -60,6 +133,11 @@ class LinearTransformationCpu {
     auto ptr = out.data;
     auto in_width = in.shape[1];
 
+    if (RunSimd(ptr, in, tmatrix, tvector, adjusted_roi,
+                linear_transformation::detail::HasSimdImpl<
+                    OutputType, InputType, channels_out, channels_in>()))
+      return;
+
     for (int y = adjusted_roi.lo.y; y < adjusted_roi.hi.y; y++) {
       auto *row_ptr = &in.data[y * in_width * channels_in];
       for (int x = adjusted_roi.lo.x; x < adjusted_roi.hi.x; x++) {
@@ -74,6 +152,25 @@ class LinearTransformationCpu {
       }
     }
   }
+
+ private:
+  template <typename RoiType>
+  bool RunSimd(OutputType *out, const InTensorCPU<InputType, ndims> &in, const Mat &tmatrix,
+               const Vec &tvector, const RoiType &roi, std::true_type) {
+    auto in_width = in.shape[1];
+    int64_t out_width = roi.hi.x - roi.lo.x;
+    for (int y = roi.lo.y; y < roi.hi.y; y++, out += out_width * channels_out) {
+      const auto *row_ptr = &in.data[(y * in_width + roi.lo.x) * channels_in];
+      linear_transformation::detail::TransformRow3(out, row_ptr, out_width, tmatrix, tvector);
+    }
+    return true;
+  }
+
+  template <typename RoiType>
+  bool RunSimd(OutputType *, const InTensorCPU<InputType, ndims> &, const Mat &,
+               const Vec &, const RoiType &, std::false_type) {
+    return false;
+  }
 };
 
 }  // namespace kernels
@@ -164,6 +164,62 @@ TYPED_TEST(LinearTransformationCpuTest, run_test_with_roi) {
   Check(out, view_as_tensor<float>(mat), EqualUlp());
 }
 
+
+template <typename Out, typename In>
+void TestRgbTransform(const Roi<2> *roi) {
+  constexpr int H = 13, W = 17;
+  std::vector<In> input(H * W * 3);
+  std::mt19937_64 rng(1234);
+  UniformRandomFill(input, rng, 0, 255);
+  TensorShape<3> in_shape = {H, W, 3};
+  InTensorCPU<In, 3> in(input.data(), in_shape);
+  // a color twist-like transform, which saturates some of the values
+  mat3 m = {{{0.9f, 0.5f, -0.2f}, {0.1f, 1.2f, 0.3f}, {-0.4f, 0.2f, 1.1f}}};
+  vec3 v = {-20.5f, 3.25f, 10.f};
+
+  LinearTransformationCpu<Out, In, 3, 3, 3> kernel;
+  KernelContext ctx;
+  auto reqs = kernel.Setup(ctx, in, m, v, roi);
+  auto out_shape = reqs.output_shapes[0][0].template to_static<3>();
+  std::vector<Out> output(volume(out_shape));
+  OutTensorCPU<Out, 3> out(output.data(), out_shape);
+  kernel.Run(ctx, out, in, m, v, roi);
+
+  auto adjusted_roi = AdjustRoi(roi, in_shape);
+  std::vector<Out> ref;
+  for (int y = adjusted_roi.lo.y; y < adjusted_roi.hi.y; y++) {
+    for (int x = adjusted_roi.lo.x; x < adjusted_roi.hi.x; x++) {
+      const In *px = &input[(y * W + x) * 3];
+      vec3 res = m * vec3(px[0], px[1], px[2]) + v;
+      for (int k = 0; k < 3; k++)
+        ref.push_back(ConvertSat<Out>(res[k]));
+    }
+  }
+  ASSERT_EQ(ref.size(), output.size());
+  OutTensorCPU<Out, 3> ref_tv(ref.data(), out_shape);
+  // the vectorized implementation may round the values close to .5 differently
+  Check(out, ref_tv, EqualEps(std::is_integral<Out>::value ? 1 : 1e-4));
+}
+
+TEST(LinearTransformationCpuRgbTest, Uint8) {
+  Roi<2> roi = {{2, 3}, {15, 11}};
+  TestRgbTransform<uint8_t, uint8_t>(nullptr);
+  TestRgbTransform<uint8_t, uint8_t>(&roi);
+}
+
+TEST(LinearTransformationCpuRgbTest, Float) {
+  Roi<2> roi = {{0, 1}, {1, 13}};
+  TestRgbTransform<float, float>(nullptr);
+  TestRgbTransform<float, float>(&roi);
+}
+
+TEST(LinearTransformationCpuRgbTest, MixedTypes) {
+  Roi<2> roi = {{16, 0}, {17, 13}};
+  TestRgbTransform<float, uint8_t>(nullptr);
+  TestRgbTransform<uint8_t, float>(&roi);
+  TestRgbTransform<int16_t, uint8_t>(&roi);  // not vectorized
+}
+
 }  // namespace test
 }  // namespace kernels
 }  // namespace dali
@@ -21,13 +21,13 @@ namespace kernels {
 
 void InitializeResamplingFilter(
     int32_t *out_indices, float *out_coeffs, int out_size,
-    float srcx_0, float scale, const ResamplingFilter &filter) {
+    float srcx_0, float scale, const ResamplingFilter &filter, int first_out_idx) {
 
   srcx_0 += 0.5f * scale - 0.5f - filter.anchor;
   int support = filter.support();
 
   for (int x = 0; x < out_size; x++) {
-    float sx0f = x * scale + srcx_0;
+    float sx0f = (x + first_out_idx) * scale + srcx_0;
     int sx0 = ceilf(sx0f);  // ceiling - below sx0f we assume the filter to be zero
     out_indices[x] = sx0;
     const float f0 = sx0 - sx0f;
@@ -28,9 +28,17 @@ namespace kernels {
 struct FilterWindow;
 struct ResamplingFilter;
 
+/**
+ * @brief Calculates the input indices and filter coefficients for output indices
+ *        `first_out_idx`, ..., `first_out_idx + out_size - 1`
+ *
+ * The results for a range of output indices are identical to the corresponding part of the
+ * results calculated for all output indices.
+ */
 DLL_PUBLIC
 void InitializeResamplingFilter(int32_t *out_indices, float *out_coeffs, int out_size,
-                                float srcx0, float scale, const ResamplingFilter &filter);
+                                float srcx0, float scale, const ResamplingFilter &filter,
+                                int first_out_idx = 0);
 
 /**
  * @brief Calculates a single pixel for horizontal resampling
@@ -15,6 +15,9 @@
 #ifndef DALI_KERNELS_IMGPROC_RESAMPLE_SEPARABLE_CPU_H_
 #define DALI_KERNELS_IMGPROC_RESAMPLE_SEPARABLE_CPU_H_
 
+#include <algorithm>
+#include <vector>
+#include "dali/core/error_handling.h"
 #include "dali/kernels/imgproc/resample/params.h"
 #include "dali/kernels/imgproc/resample/resampling_filters.cuh"
 #include "dali/kernels/imgproc/resample/resampling_impl_cpu.h"
@@ -138,7 +141,29 @@ struct SeparableResampleCPU  {
                            const Input &input,
                            const ResamplingParamsND<spatial_ndim> &params) {
     setup.Setup(input.shape, params);
+    slab = {};
+    return GetRequirements();
+  }
 
+  /**
+   * @brief Sets up the resampling of a slab of the output - the range
+   *        [slab_start, slab_end) of the outermost spatial dimension.
+   *
+   * The slab is calculated with the same source coordinates, filters and processing order
+   * as the whole output, so the result is bit-identical to the corresponding part of the
+   * output of an unsplit resampling. Only the part of the input which affects the slab
+   * is processed. Nearest neighbour resampling cannot be split.
+   */
+  KernelRequirements Setup(KernelContext &context,
+                           const Input &input,
+                           const ResamplingParamsND<spatial_ndim> &params,
+                           int slab_start, int slab_end) {
+    setup.Setup(input.shape, params);
+    SetupSlab(slab_start, slab_end);
+    return GetRequirements();
+  }
+
+  KernelRequirements GetRequirements() const {
     TensorShape<tensor_ndim> out_shape =
       shape_cat(vec2shape(setup.desc.out_shape()), setup.desc.channels);
 
@@ -236,17 +261,74 @@ struct SeparableResampleCPU  {
       float *coeffs = static_cast<float*>(static_cast<void*>(indices + out_size));
       int support = desc.filter[axis].support();
 
+      bool slab_axis = axis == spatial_ndim - 1;
       InitializeResamplingFilter(indices, coeffs, out_size,
                                  desc.origin[axis], desc.scale[axis],
-                                 desc.filter[axis]);
+                                 desc.filter[axis], slab_axis ? slab.out_start : 0);
+      if (slab_axis && slab.in_start) {
+        // the input of this pass starts at the first row used by the slab
+        for (int i = 0; i < out_size; i++)
+          indices[i] -= slab.in_start;
+      }
 
       ResampleAxis(out, in, indices, coeffs, support, axis);
     }
   }
 
+  /**
+   * @brief Narrows down the setup of the whole output to a slab of the outermost
+   *        spatial dimension.
+   */
+  void SetupSlab(int slab_start, int slab_end) {
+    constexpr int axis = spatial_ndim - 1;  // the outermost dimension, in vec order
+    auto &desc = setup.desc;
+    DALI_ENFORCE(slab_start >= 0 && slab_start < slab_end && slab_end <= desc.out_shape()[axis],
+                 make_string("Invalid output slab [", slab_start, ", ", slab_end,
+                             ") for output extent ", desc.out_shape()[axis]));
+    for (int a = 0; a < spatial_ndim; a++) {
+      DALI_ENFORCE(desc.filter_type[a] != ResamplingFilterType::Nearest,
+                   "Nearest neighbour resampling cannot be split into slabs");
+    }
+
+    int out_size = slab_end - slab_start;
+    int support = desc.filter[axis].support();
+    std::vector<int32_t> indices(out_size);
+    std::vector<float> coeffs(out_size * support);
+    InitializeResamplingFilter(indices.data(), coeffs.data(), out_size,
+                               desc.origin[axis], desc.scale[axis], desc.filter[axis],
+                               slab_start);
+    auto range = std::minmax_element(indices.begin(), indices.end());
+    // The input range is narrowed down only on the sides where the filter doesn't need
+    // to be clamped to the input - otherwise the clamped reads would change.
+    int in_size = desc.in_shape()[axis];
+    int in_start = std::max(0, std::min(in_size - 1, *range.first));
+    int in_end = std::max(in_start + 1, std::min(in_size, *range.second + support));
+
+    slab.out_start = slab_start;
+    slab.in_start = in_start;
+
+    desc.in_offset() += in_start * desc.strides[0][axis - 1];
+    desc.in_shape()[axis] = in_end - in_start;
+    int slab_pass = 0;
+    while (desc.order[slab_pass] != axis)
+      slab_pass++;
+    // the intermediate buffers before the slab axis is resampled contain the input range
+    for (int i = 0; i < num_tmp_buffers; i++)
+      desc.tmp_shape(i)[axis] = i < slab_pass ? in_end - in_start : out_size;
+    desc.out_shape()[axis] = out_size;
+    setup.memory = setup.GetMemoryRequirements(desc);
+  }
+
   using ResamplingSetup = ResamplingSetupSingleImage<spatial_ndim>;
   ResamplingSetup setup;
   static constexpr int num_tmp_buffers = ResamplingSetup::num_tmp_buffers;
+
+  struct {
+    /// The first output index of the slab along the outermost spatial dimension
+    int out_start = 0;
+    /// The first input index used by the slab, relative to the input ROI
+    int in_start = 0;
+  } slab;
 };
 
 }  // namespace resampling
@@ -0,0 +1,176 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_KERNELS_IMGPROC_WARP_SAMPLE_ROW_CPU_H_
+#define DALI_KERNELS_IMGPROC_WARP_SAMPLE_ROW_CPU_H_
+
+#include <cstdint>
+#include <type_traits>
+#ifdef __SSE2__
+#include <emmintrin.h>
+#endif
+#include "dali/core/geom/vec.h"
+#include "dali/kernels/imgproc/sampler.h"
+
+namespace dali {
+namespace kernels {
+namespace warp {
+
+/**
+ * @brief Samples `n` consecutive output pixels at source locations `src`, `src + dsdx`, ...
+ *
+ * The locations are accumulated the same way as in the generic affine warp, so that
+ * the results don't depend on the implementation used.
+ */
+template <DALIInterpType interp, typename Out, typename In, typename BorderValue>
+void SampleRow(Out *out, int n, vec2 src, vec2 dsdx,
+               const Sampler2D<interp, In> &sampler, const BorderValue &border) {
+  int c = sampler.surface.channels;
+  for (int x = 0; x < n; x++, src += dsdx)
+    sampler(&out[c * x], src, border);
+}
+
+#ifdef __SSE2__
+
+namespace detail {
+
+/**
+ * @brief Tells, whether the vectorized linear sampling is available for given types
+ */
+template <typename Out, typename In>
+struct HasSimdRowSampler : std::integral_constant<bool,
+    (std::is_same<In, uint8_t>::value || std::is_same<In, float>::value) &&
+    (std::is_same<Out, uint8_t>::value || std::is_same<Out, float>::value)> {};
+
+inline void StoreLanes(uint8_t *out, int stride, __m128 v) {
+  // Clamping before the conversion makes the rounding and saturation equivalent to ConvertSat,
+  // save for the values that are a hair below .5, which may end up rounded up.
+  v = _mm_min_ps(_mm_max_ps(v, _mm_setzero_ps()), _mm_set1_ps(255.0f));
+  alignas(16) int32_t values[4];
+  _mm_store_si128(reinterpret_cast<__m128i *>(values),
+                  _mm_cvttps_epi32(_mm_add_ps(v, _mm_set1_ps(0.5f))));
+  for (int i = 0; i < 4; i++)
+    out[i * stride] = values[i];
+}
+
+inline void StoreLanes(float *out, int stride, __m128 v) {
+  alignas(16) float values[4];
+  _mm_store_ps(values, v);
+  for (int i = 0; i < 4; i++)
+    out[i * stride] = values[i];
+}
+
+/**
+ * @brief Samples 4 pixels with linear interpolation, when all of them are far enough from
+ *        the edges of the surface not to need any border handling.
+ *
+ * The pixels are processed in the SSE lanes. The computations are the same as in Sampler2D,
+ * so the results are identical, save for the rounding described in StoreLanes.
+ *
+ * @return false, if any of the pixels needs border handling; the output is not written then.
+ */
+template <typename Out, typename In>
+bool SampleLinear4(Out *out, const vec2 *src, const Surface2D<const In> &surface) {
+  __m128 half = _mm_set1_ps(0.5f);
+  __m128 x = _mm_sub_ps(_mm_setr_ps(src[0].x, src[1].x, src[2].x, src[3].x), half);
+  __m128 y = _mm_sub_ps(_mm_setr_ps(src[0].y, src[1].y, src[2].y, src[3].y), half);
+  // 0 <= x < width - 1 means that both x0 and x0 + 1 are within the surface; NaNs fail, too
+  __m128 inside = _mm_and_ps(
+      _mm_and_ps(_mm_cmpge_ps(x, _mm_setzero_ps()),
+                 _mm_cmplt_ps(x, _mm_set1_ps(surface.size.x - 1))),
+      _mm_and_ps(_mm_cmpge_ps(y, _mm_setzero_ps()),
+                 _mm_cmplt_ps(y, _mm_set1_ps(surface.size.y - 1))));
+  if (_mm_movemask_ps(inside) != 0xF)
+    return false;
+
+  // the coordinates are non-negative, so truncation is the same as floor
+  __m128i x0 = _mm_cvttps_epi32(x);
+  __m128i y0 = _mm_cvttps_epi32(y);
+  __m128 qx = _mm_sub_ps(x, _mm_cvtepi32_ps(x0));
+  __m128 px = _mm_sub_ps(_mm_set1_ps(1.0f), qx);
+  __m128 qy = _mm_sub_ps(y, _mm_cvtepi32_ps(y0));
+
+  alignas(16) int32_t ix[4], iy[4];
+  _mm_store_si128(reinterpret_cast<__m128i *>(ix), x0);
+  _mm_store_si128(reinterpret_cast<__m128i *>(iy), y0);
+  const In *p[4];
+  for (int i = 0; i < 4; i++)
+    p[i] = surface.data + static_cast<int64_t>(iy[i]) * surface.strides.y
+                        + static_cast<int64_t>(ix[i]) * surface.strides.x;
+  const int dx = surface.strides.x, dy = surface.strides.y;
+
+  for (int c = 0; c < surface.channels; c++) {
+    int offset = c * surface.channel_stride;
+    __m128 s00 = _mm_setr_ps(p[0][offset], p[1][offset], p[2][offset], p[3][offset]);
+    offset += dx;
+    __m128 s01 = _mm_setr_ps(p[0][offset], p[1][offset], p[2][offset], p[3][offset]);
+    offset += dy - dx;
+    __m128 s10 = _mm_setr_ps(p[0][offset], p[1][offset], p[2][offset], p[3][offset]);
+    offset += dx;
+    __m128 s11 = _mm_setr_ps(p[0][offset], p[1][offset], p[2][offset], p[3][offset]);
+    __m128 s0 = _mm_add_ps(_mm_mul_ps(s00, px), _mm_mul_ps(s01, qx));
+    __m128 s1 = _mm_add_ps(_mm_mul_ps(s10, px), _mm_mul_ps(s11, qx));
+    StoreLanes(out + c, surface.channels, _mm_add_ps(s0, _mm_mul_ps(_mm_sub_ps(s1, s0), qy)));
+  }
+  return true;
+}
+
+template <typename Out, typename In, typename BorderValue>
+void SampleRowLinear(Out *out, int n, vec2 src, vec2 dsdx,
+                     const Sampler2D<DALI_INTERP_LINEAR, In> &sampler, const BorderValue &border,
+                     std::true_type) {
+  int c = sampler.surface.channels;
+  vec2 lane_src[4];
+  int x = 0;
+  for (; x + 4 <= n; x += 4) {
+    for (int i = 0; i < 4; i++, src += dsdx)
+      lane_src[i] = src;
+    if (!SampleLinear4(&out[c * x], lane_src, sampler.surface)) {
+      for (int i = 0; i < 4; i++)
+        sampler(&out[c * (x + i)], lane_src[i], border);
+    }
+  }
+  for (; x < n; x++, src += dsdx)
+    sampler(&out[c * x], src, border);
+}
+
+template <typename Out, typename In, typename BorderValue>
+void SampleRowLinear(Out *out, int n, vec2 src, vec2 dsdx,
+                     const Sampler2D<DALI_INTERP_LINEAR, In> &sampler, const BorderValue &border,
+                     std::false_type) {
+  SampleRow(out, n, src, dsdx, sampler, border);
+}
+
+}  // namespace detail
+
+/**
+ * @brief Samples `n` consecutive output pixels at source locations `src`, `src + dsdx`, ...
+ *
+ * For uint8 and float, the pixels are sampled in groups of 4 with SSE, except for the groups
+ * that need border handling.
+ */
+template <typename Out, typename In, typename BorderValue>
+void SampleRow(Out *out, int n, vec2 src, vec2 dsdx,
+               const Sampler2D<DALI_INTERP_LINEAR, In> &sampler, const BorderValue &border) {
+  detail::SampleRowLinear(out, n, src, dsdx, sampler, border,
+                          detail::HasSimdRowSampler<Out, In>());
+}
+
+#endif  // __SSE2__
+
+}  // namespace warp
+}  // namespace kernels
+}  // namespace dali
+
+#endif  // DALI_KERNELS_IMGPROC_WARP_SAMPLE_ROW_CPU_H_
@@ -21,10 +21,12 @@
 #include "dali/core/geom/transform.h"
 #include "dali/core/static_switch.h"
 #include "dali/kernels/kernel.h"
+#include "dali/kernels/common/split_shape.h"
 #include "dali/kernels/imgproc/warp/mapping_traits.h"
 #include "dali/kernels/imgproc/sampler.h"
 #include "dali/kernels/imgproc/warp/map_coords.h"
 #include "dali/kernels/imgproc/warp/affine.h"
+#include "dali/kernels/imgproc/warp/sample_row_cpu.h"
 
 namespace dali {
 namespace kernels {
@@ -77,14 +79,54 @@ class WarpCPU {
       const TensorShape<spatial_ndim> &out_size,
       DALIInterpType interp = DALI_INTERP_LINEAR,
       const BorderType &border = {}) {
-    Mapping mapping(mapping_params);
+    SequentialExecutionEngine engine;
+    Schedule(context, output, input, mapping_params, out_size, interp, border, engine, 1);
+  }
 
+  /**
+   * @brief Schedules the warping of one tensor in an execution engine (e.g. ThreadPool)
+   *
+   * The output is split into up to `nblocks` slabs of rows (or planes and rows, in 3D), each of
+   * them at least `min_blk_sz` elements large, which are added to the engine as separate tasks,
+   * with their volume as priority. The work is not run - it's up to the caller to call `RunAll`.
+   */
+  template <typename ExecutionEngine>
+  void Schedule(
+      KernelContext &context,
+      const OutTensorCPU<OutputType, tensor_ndim> &output,
+      const InTensorCPU<InputType, tensor_ndim> &input,
+      const MappingParams &mapping_params,
+      const TensorShape<spatial_ndim> &out_size,
+      DALIInterpType interp,
+      const BorderType &border,
+      ExecutionEngine &exec_engine,
+      int64_t nblocks,
+      int64_t min_blk_sz = kMinBlockVolume) {
     assert(output.shape == shape_cat(out_size, input.shape[channel_dim]));
 
-    VALUE_SWITCH(interp, static_interp, (DALI_INTERP_NN, DALI_INTERP_LINEAR),
-      (RunImpl<static_interp>(context, output, input, mapping, border);),
-      (DALI_FAIL("Unsupported interpolation type"))
-    ); // NOLINT
+    if (interp != DALI_INTERP_NN && interp != DALI_INTERP_LINEAR)
+      DALI_FAIL("Unsupported interpolation type");
+
+    // The rows are not split, so that the affine fast path can step through them
+    uint64_t skip_dim_mask = (uint64_t(1) << (spatial_ndim - 1)) | (uint64_t(1) << channel_dim);
+    TensorShape<tensor_ndim> split_factor;
+    split_shape(split_factor, output.shape, nblocks, min_blk_sz, skip_dim_mask);
+
+    ForEachBlock(output.shape, split_factor,
+      [&](const TensorShape<tensor_ndim> &blk_start, const TensorShape<tensor_ndim> &blk_end) {
+        int64_t blk_volume = 1;
+        for (int d = 0; d < tensor_ndim; d++)
+          blk_volume *= blk_end[d] - blk_start[d];
+        exec_engine.AddWork([=](int) {
+          KernelContext blk_context = context;
+          Mapping mapping(mapping_params);
+          VALUE_SWITCH(interp, static_interp, (DALI_INTERP_NN, DALI_INTERP_LINEAR),
+            (RunImpl<static_interp>(blk_context, output, input, mapping, blk_start, blk_end,
+                                    border);),
+            ()
+          ); // NOLINT
+        }, blk_volume);
+      });
   }
 
  private:
@@ -94,16 +136,17 @@ class WarpCPU {
       const OutTensorCPU<OutputType, 3> &output,
       const InTensorCPU<InputType, 3> &input,
       Mapping_ &mapping,
+      const TensorShape<tensor_ndim> &blk_start,
+      const TensorShape<tensor_ndim> &blk_end,
       BorderType border = {}) {
     int out_w = output.shape[1];
-    int out_h = output.shape[0];
     int c     = output.shape[2];
 
     Surface2D<const InputType> in = as_surface_channel_last(input);
 
     Sampler2D<static_interp, InputType> sampler(in);
 
-    for (int y = 0; y < out_h; y++) {
+    for (int y = blk_start[0]; y < blk_end[0]; y++) {
       OutputType *out_row = output(y, 0);
       for (int x = 0; x < out_w; x++) {
         auto src = warp::map_coords(mapping, ivec2(x, y));
@@ -118,18 +161,18 @@ class WarpCPU {
       const OutTensorCPU<OutputType, 4> &output,
       const InTensorCPU<InputType, 4> &input,
       Mapping_ &mapping,
+      const TensorShape<tensor_ndim> &blk_start,
+      const TensorShape<tensor_ndim> &blk_end,
       BorderType border = {}) {
     int out_w = output.shape[2];
-    int out_h = output.shape[1];
-    int out_d = output.shape[0];
     int c     = output.shape[3];
 
     Surface2D<const InputType> in = as_surface_channel_last(input);
 
     Sampler2D<static_interp, InputType> sampler(in);
 
-    for (int z = 0; z < out_d; z++) {
-      for (int y = 0; y < out_h; y++) {
+    for (int z = blk_start[0]; z < blk_end[0]; z++) {
+      for (int y = blk_start[1]; y < blk_end[1]; y++) {
         OutputType *out_row = output(z, y, 0);
         for (int x = 0; x < out_w; x++) {
           auto src = warp::map_coords(mapping, ivec3(x, y, z));
@@ -146,9 +189,10 @@ class WarpCPU {
       const OutTensorCPU<OutputType, 3> &output,
       const InTensorCPU<InputType, 3> &input,
       AffineMapping<2> &mapping,
+      const TensorShape<tensor_ndim> &blk_start,
+      const TensorShape<tensor_ndim> &blk_end,
       BorderType border = {}) {
     int out_w = output.shape[1];
-    int out_h = output.shape[0];
     int c     = output.shape[2];
 
     Surface2D<const InputType> in = as_surface_channel_last(input);
@@ -164,15 +208,13 @@ class WarpCPU {
     constexpr int tile_w = 256;
     vec2 dsdx_tile = tile_w * dsdx;
 
-    for (int y = 0; y < out_h; y++) {
+    for (int y = blk_start[0]; y < blk_end[0]; y++) {
       OutputType *out_row = output(y, 0);
       auto src_tile = warp::map_coords(mapping, ivec2(0, y));
       for (int x_tile = 0; x_tile < out_w; x_tile += tile_w, src_tile += dsdx_tile) {
         int x_tile_end = std::min(x_tile + tile_w, out_w);
-        auto src = src_tile;
-        for (int x = x_tile; x < x_tile_end; x++, src += dsdx) {
-          sampler(&out_row[c*x], src, border);
-        }
+        // uses SIMD, where available
+        warp::SampleRow(&out_row[c*x_tile], x_tile_end - x_tile, src_tile, dsdx, sampler, border);
       }
     }
   }
@@ -184,10 +226,10 @@ class WarpCPU {
       const OutTensorCPU<OutputType, 4> &output,
       const InTensorCPU<InputType, 4> &input,
       AffineMapping<3> &mapping,
+      const TensorShape<tensor_ndim> &blk_start,
+      const TensorShape<tensor_ndim> &blk_end,
       BorderType border = {}) {
     int out_w = output.shape[2];
-    int out_h = output.shape[1];
-    int out_d = output.shape[0];
     int c     = output.shape[3];
 
     Surface3D<const InputType> in = as_surface_channel_last(input);
@@ -203,8 +245,8 @@ class WarpCPU {
     constexpr int tile_w = 256;
     vec3 dsdx_tile = tile_w * dsdx;
 
-    for (int z = 0; z < out_d; z++) {
-      for (int y = 0; y < out_h; y++) {
+    for (int z = blk_start[0]; z < blk_end[0]; z++) {
+      for (int y = blk_start[1]; y < blk_end[1]; y++) {
         OutputType *out_row = output(z, y, 0);
         auto src_tile = warp::map_coords(mapping, ivec3(0, y, z));
         for (int x_tile = 0; x_tile < out_w; x_tile += tile_w, src_tile += dsdx_tile) {
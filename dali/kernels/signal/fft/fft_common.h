@@ -15,7 +15,9 @@
 #ifndef DALI_KERNELS_SIGNAL_FFT_FFT_COMMON_H_
 #define DALI_KERNELS_SIGNAL_FFT_FFT_COMMON_H_
 
+#include <atomic>
 #include <complex>
+#include <cstdint>
 
 namespace dali {
 namespace kernels {
@@ -31,6 +33,17 @@ enum FftSpectrumType {
 
 using complexf = std::complex<float>;
 
+/**
+ * @brief FFT plan cache hit/miss counters
+ *
+ * Can be passed to the CPU kernels using the plan cache (see FftsPlanCache), to collect
+ * the statistics of a single operator.
+ */
+struct FftPlanCacheStats {
+  std::atomic<int64_t> hits{0};
+  std::atomic<int64_t> misses{0};
+};
+
 }  // namespace fft
 }  // namespace signal
 }  // namespace kernels
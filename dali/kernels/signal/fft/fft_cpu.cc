@@ -28,6 +28,10 @@ namespace kernels {
 namespace signal {
 namespace fft {
 
+template <typename OutputType, typename InputType, int Dims>
+Fft1DCpu<OutputType, InputType, Dims>::Fft1DCpu(FftPlanCacheStats *plan_stats)
+    : plan_stats_(plan_stats) {}
+
 template <typename OutputType, typename InputType, int Dims>
 Fft1DCpu<OutputType, InputType, Dims>::~Fft1DCpu() = default;
 
@@ -37,7 +41,7 @@ KernelRequirements Fft1DCpu<OutputType, InputType, Dims>::Setup(
     const InTensorCPU<InputType, Dims> &in,
     const FftArgs &args) {
   if (!impl_ || args != args_) {
-    impl_ = std::make_unique<impl::Fft1DImplFfts<OutputType, InputType, Dims>>();
+    impl_ = std::make_unique<impl::Fft1DImplFfts<OutputType, InputType, Dims>>(plan_stats_);
     args_ = args;
   }
   return impl_->Setup(context, in, args);
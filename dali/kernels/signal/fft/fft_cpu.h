@@ -103,6 +103,8 @@ class DLL_PUBLIC FftImpl {
  *
  * @param args.transform_axis Axis along which the FFT transformation will be calculated
  *
+ * The FFT plans are taken from the process-wide FftsPlanCache. Optionally, the hits and misses
+ * of the cache can be collected in `plan_stats`, passed to the constructor.
  */
 template <typename OutputType = std::complex<float>,  typename InputType = float, int Dims = 2>
 class DLL_PUBLIC Fft1DCpu {
@@ -114,6 +116,7 @@ class DLL_PUBLIC Fft1DCpu {
              || std::is_same<OutputType, std::complex<float>>::value,
     "Data types other than float are not yet supported");
 
+  DLL_PUBLIC explicit Fft1DCpu(FftPlanCacheStats *plan_stats = nullptr);
   DLL_PUBLIC ~Fft1DCpu();
 
   DLL_PUBLIC KernelRequirements Setup(KernelContext &context,
@@ -124,10 +127,12 @@ class DLL_PUBLIC Fft1DCpu {
                       const OutTensorCPU<OutputType, Dims> &out,
                       const InTensorCPU<InputType, Dims> &in,
                       const FftArgs &args);
+
  private:
   using Impl = impl::FftImpl<OutputType, InputType, Dims>;
   std::unique_ptr<Impl> impl_;
   FftArgs args_;
+  FftPlanCacheStats *plan_stats_ = nullptr;
 };
 
 }  // namespace fft
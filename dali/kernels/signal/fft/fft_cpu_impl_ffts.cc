@@ -83,17 +83,7 @@ KernelRequirements Fft1DImplFfts<OutputType, InputType, Dims>::Setup(
 
   out_shape[transform_axis_] = nfft / 2 + 1;
   req.output_shapes = {TensorListShape<DynamicDimensions>({out_shape})};
-
-  if (!plan_ || nfft != nfft_) {
-    if (can_use_real_impl(nfft)) {
-      plan_ = {ffts_init_1d_real(nfft, FFTS_FORWARD), ffts_free};
-    } else {
-      plan_ = {ffts_init_1d(nfft, FFTS_FORWARD), ffts_free};
-    }
-    DALI_ENFORCE(plan_ != nullptr, "Could not initialize ffts plan");
-    nfft_ = nfft;
-  }
-
+  nfft_ = nfft;
   return req;
 }
 
@@ -110,6 +100,9 @@ void Fft1DImplFfts<OutputType, InputType, Dims>::Run(
   assert(nfft_ > 0);
   assert(n <= nfft_);
   bool use_real_impl = can_use_real_impl(nfft_);
+  // The plan is taken from the process-wide cache for the duration of the call, so that
+  // kernel instances (e.g. one per sample) don't need to create their own plans
+  auto plan = FftsPlanCache::Instance().Get(nfft_, FFTS_FORWARD, use_real_impl, plan_stats_);
 
   auto in_buf_sz = size_in_buf(nfft_);
   // ffts requires 32-byte aligned memory
@@ -129,7 +122,7 @@ void Fft1DImplFfts<OutputType, InputType, Dims>::Run(
   ForAxis(
     out.data, in.data, out_shape.data(), out_strides.data(), in_shape.data(), in_strides.data(),
     transform_axis_, out.dim(),
-    [this, &args, use_real_impl, out_buf, in_buf](
+    [this, &args, &plan, use_real_impl, out_buf, in_buf](
       OutputType *out_data, const InputType *in_data,
       int64_t out_size, int64_t out_stride, int64_t in_size, int64_t in_stride) {
         int64_t in_idx = 0;
@@ -146,7 +139,7 @@ void Fft1DImplFfts<OutputType, InputType, Dims>::Run(
           }
         }
 
-        ffts_execute(plan_.get(), in_buf, out_buf);
+        ffts_execute(plan.get(), in_buf, out_buf);
 
         // For complex impl, out_buf_sz contains the whole spectrum,
         // for real impl, the second half of the spectrum is ommited
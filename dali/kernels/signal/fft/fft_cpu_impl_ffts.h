@@ -24,6 +24,7 @@
 #include "dali/core/util.h"
 #include "dali/kernels/kernel.h"
 #include "dali/kernels/signal/fft/fft_cpu.h"
+#include "dali/kernels/signal/fft/ffts_plan_cache.h"
 
 namespace dali {
 namespace kernels {
@@ -41,6 +42,11 @@ class DLL_PUBLIC Fft1DImplFfts : public FftImpl<OutputType, InputType, Dims> {
              || std::is_same<OutputType, std::complex<float>>::value,
     "Data types other than float are not yet supported");
 
+  /**
+   * @param plan_stats optional, counters of the FFT plan cache hits and misses to update
+   */
+  explicit Fft1DImplFfts(FftPlanCacheStats *plan_stats = nullptr) : plan_stats_(plan_stats) {}
+
   DLL_PUBLIC KernelRequirements Setup(KernelContext &context,
                                       const InTensorCPU<InputType, Dims> &in,
                                       const FftArgs &args) override;
@@ -49,9 +55,9 @@ class DLL_PUBLIC Fft1DImplFfts : public FftImpl<OutputType, InputType, Dims> {
                       const OutTensorCPU<OutputType, Dims> &out,
                       const InTensorCPU<InputType, Dims> &in,
                       const FftArgs &args) override;
+
  private:
-  using FftsPlanPtr = std::unique_ptr<ffts_plan_t, decltype(&ffts_free)>;
-  FftsPlanPtr plan_{nullptr, ffts_free};
+  FftPlanCacheStats *plan_stats_ = nullptr;
   int nfft_ = -1;
   int transform_axis_ = -1;
 };
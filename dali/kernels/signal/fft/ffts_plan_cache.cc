@@ -0,0 +1,97 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include "dali/kernels/signal/fft/ffts_plan_cache.h"
+#include <utility>
+#include "dali/core/error_handling.h"
+#include "dali/core/format.h"
+
+namespace dali {
+namespace kernels {
+namespace signal {
+namespace fft {
+
+void FftsPlanCache::PlanHandle::reset() {
+  if (entry_.plan && cache_)
+    cache_->Return(std::move(entry_));
+  entry_.plan.reset();
+  cache_ = nullptr;
+}
+
+FftsPlanCache &FftsPlanCache::Instance() {
+  static FftsPlanCache cache;
+  return cache;
+}
+
+FftsPlanCache::PlanHandle FftsPlanCache::Get(int64_t size, int direction, bool real,
+                                             FftPlanCacheStats *stats) {
+  PlanKey key{size, direction, real};
+  {
+    std::lock_guard<std::mutex> guard(mtx_);
+    for (auto it = idle_.begin(); it != idle_.end(); ++it) {
+      if (it->key == key) {
+        CacheEntry entry = std::move(*it);
+        idle_.erase(it);
+        stats_.hits++;
+        if (stats)
+          stats->hits++;
+        return {this, std::move(entry)};
+      }
+    }
+  }
+
+  // Creating the plan doesn't require the lock
+  stats_.misses++;
+  if (stats)
+    stats->misses++;
+  FftsPlanPtr plan{nullptr, ffts_free};
+  if (real)
+    plan = {ffts_init_1d_real(size, direction), ffts_free};
+  else
+    plan = {ffts_init_1d(size, direction), ffts_free};
+  DALI_ENFORCE(plan != nullptr, make_string("Could not initialize ffts plan of size ", size));
+  return {this, CacheEntry{key, std::move(plan)}};
+}
+
+void FftsPlanCache::Return(CacheEntry entry) {
+  std::lock_guard<std::mutex> guard(mtx_);
+  idle_.push_front(std::move(entry));
+  Trim();
+}
+
+void FftsPlanCache::Trim() {
+  while (idle_.size() > capacity_)
+    idle_.pop_back();
+}
+
+void FftsPlanCache::SetCapacity(size_t capacity) {
+  std::lock_guard<std::mutex> guard(mtx_);
+  capacity_ = capacity;
+  Trim();
+}
+
+size_t FftsPlanCache::size() const {
+  std::lock_guard<std::mutex> guard(mtx_);
+  return idle_.size();
+}
+
+void FftsPlanCache::Clear() {
+  std::lock_guard<std::mutex> guard(mtx_);
+  idle_.clear();
+}
+
+}  // namespace fft
+}  // namespace signal
+}  // namespace kernels
+}  // namespace dali
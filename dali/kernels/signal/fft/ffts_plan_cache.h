@@ -0,0 +1,164 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_KERNELS_SIGNAL_FFT_FFTS_PLAN_CACHE_H_
+#define DALI_KERNELS_SIGNAL_FFT_FFTS_PLAN_CACHE_H_
+
+#include <ffts.h>
+#include <cstdint>
+#include <list>
+#include <memory>
+#include <mutex>
+#include <utility>
+#include "dali/core/api_helper.h"
+#include "dali/core/common.h"
+#include "dali/kernels/signal/fft/fft_common.h"
+
+namespace dali {
+namespace kernels {
+namespace signal {
+namespace fft {
+
+/**
+ * @brief Process-wide, thread-safe cache of ffts plans
+ *
+ * The plans are keyed by (size, direction, real/complex). ffts plans keep internal buffers
+ * (e.g. for the real transforms), so a plan can't be executed by several threads at a time.
+ * For this reason, the plans are lent: `Get` gives exclusive ownership of a plan until
+ * the returned handle is destroyed, after which the plan is returned to the cache.
+ *
+ * The cache keeps at most `capacity()` idle plans. When exceeded, the least recently used
+ * ones are destroyed.
+ */
+class DLL_PUBLIC FftsPlanCache {
+ private:
+  using FftsPlanPtr = std::unique_ptr<ffts_plan_t, decltype(&ffts_free)>;
+
+  struct PlanKey {
+    int64_t size;
+    int direction;
+    bool real;
+
+    bool operator==(const PlanKey &other) const {
+      return size == other.size && direction == other.direction && real == other.real;
+    }
+  };
+
+  struct CacheEntry {
+    PlanKey key;
+    FftsPlanPtr plan;
+  };
+
+ public:
+  static constexpr size_t kDefaultCapacity = 64;
+
+  /**
+   * @brief Exclusive ownership of a plan; returns the plan to the cache on destruction
+   */
+  class DLL_PUBLIC PlanHandle {
+   public:
+    PlanHandle() = default;
+    PlanHandle(PlanHandle &&) = default;
+    PlanHandle &operator=(PlanHandle &&other) {
+      if (this != &other) {
+        reset();
+        cache_ = other.cache_;
+        entry_ = std::move(other.entry_);
+        other.cache_ = nullptr;
+      }
+      return *this;
+    }
+    ~PlanHandle() {
+      reset();
+    }
+
+    ffts_plan_t *get() const {
+      return entry_.plan.get();
+    }
+
+    explicit operator bool() const {
+      return entry_.plan != nullptr;
+    }
+
+    void reset();
+
+   private:
+    friend class FftsPlanCache;
+    PlanHandle(FftsPlanCache *cache, CacheEntry entry)
+    : cache_(cache), entry_(std::move(entry)) {}
+
+    FftsPlanCache *cache_ = nullptr;
+    CacheEntry entry_{{0, 0, false}, {nullptr, ffts_free}};
+  };
+
+  static FftsPlanCache &Instance();
+
+  explicit FftsPlanCache(size_t capacity = kDefaultCapacity) : capacity_(capacity) {}
+
+  DISABLE_COPY_MOVE_ASSIGN(FftsPlanCache);
+
+  /**
+   * @brief Returns a 1D plan of given size and direction (FFTS_FORWARD or FFTS_BACKWARD)
+   *
+   * If there's no idle plan with matching parameters, a new one is created.
+   *
+   * @param real  if true, a real-to-complex (or complex-to-real) plan is created
+   * @param stats optional, additional counters to update
+   */
+  PlanHandle Get(int64_t size, int direction, bool real, FftPlanCacheStats *stats = nullptr);
+
+  /**
+   * @brief Sets the maximum number of idle plans kept in the cache
+   */
+  void SetCapacity(size_t capacity);
+
+  size_t capacity() const {
+    return capacity_;
+  }
+
+  /**
+   * @brief Number of idle plans currently kept in the cache
+   */
+  size_t size() const;
+
+  /**
+   * @brief Destroys all the idle plans
+   */
+  void Clear();
+
+  int64_t hits() const {
+    return stats_.hits;
+  }
+
+  int64_t misses() const {
+    return stats_.misses;
+  }
+
+ private:
+  void Return(CacheEntry entry);
+  void Trim();
+
+  mutable std::mutex mtx_;
+  /// Idle plans, the most recently used first
+  std::list<CacheEntry> idle_;
+  size_t capacity_;
+  FftPlanCacheStats stats_;
+};
+
+}  // namespace fft
+}  // namespace signal
+}  // namespace kernels
+}  // namespace dali
+
+#endif  // DALI_KERNELS_SIGNAL_FFT_FFTS_PLAN_CACHE_H_
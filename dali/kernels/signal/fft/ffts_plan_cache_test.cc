@@ -0,0 +1,115 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <thread>
+#include <vector>
+#include "dali/kernels/signal/fft/ffts_plan_cache.h"
+
+namespace dali {
+namespace kernels {
+namespace signal {
+namespace fft {
+namespace test {
+
+TEST(FftsPlanCacheTest, ReuseReleasedPlan) {
+  FftsPlanCache cache;
+  FftPlanCacheStats stats;
+  ffts_plan_t *plan_ptr = nullptr;
+  {
+    auto plan = cache.Get(512, FFTS_FORWARD, true, &stats);
+    ASSERT_TRUE(plan);
+    plan_ptr = plan.get();
+    EXPECT_EQ(cache.size(), 0u);
+  }
+  EXPECT_EQ(cache.size(), 1u);
+  EXPECT_EQ(stats.misses, 1);
+  EXPECT_EQ(stats.hits, 0);
+
+  auto plan = cache.Get(512, FFTS_FORWARD, true, &stats);
+  EXPECT_EQ(plan.get(), plan_ptr);
+  EXPECT_EQ(stats.hits, 1);
+  EXPECT_EQ(cache.hits(), 1);
+  EXPECT_EQ(cache.misses(), 1);
+
+  // different kind of plan
+  auto complex_plan = cache.Get(512, FFTS_FORWARD, false, &stats);
+  EXPECT_NE(complex_plan.get(), plan_ptr);
+  auto other_size = cache.Get(256, FFTS_FORWARD, true, &stats);
+  EXPECT_NE(other_size.get(), plan_ptr);
+  EXPECT_EQ(stats.misses, 3);
+}
+
+TEST(FftsPlanCacheTest, ExclusiveOwnership) {
+  FftsPlanCache cache;
+  auto plan1 = cache.Get(300, FFTS_FORWARD, false);
+  auto plan2 = cache.Get(300, FFTS_FORWARD, false);
+  EXPECT_NE(plan1.get(), plan2.get());
+  EXPECT_EQ(cache.misses(), 2);
+  plan1.reset();
+  plan2.reset();
+  EXPECT_EQ(cache.size(), 2u);
+}
+
+TEST(FftsPlanCacheTest, LRUEviction) {
+  FftsPlanCache cache(2);
+  ffts_plan_t *ptr64 = nullptr, *ptr256 = nullptr;
+  {
+    auto plan64 = cache.Get(64, FFTS_FORWARD, true);
+    auto plan128 = cache.Get(128, FFTS_FORWARD, true);
+    auto plan256 = cache.Get(256, FFTS_FORWARD, true);
+    ptr64 = plan64.get();
+    ptr256 = plan256.get();
+    plan128.reset();
+    plan64.reset();
+    plan256.reset();  // 128 is the least recently used
+  }
+  EXPECT_EQ(cache.size(), 2u);
+  EXPECT_EQ(cache.Get(64, FFTS_FORWARD, true).get(), ptr64);
+  EXPECT_EQ(cache.Get(256, FFTS_FORWARD, true).get(), ptr256);
+  EXPECT_EQ(cache.hits(), 2);
+  cache.Get(128, FFTS_FORWARD, true);
+  EXPECT_EQ(cache.misses(), 4);
+
+  cache.SetCapacity(1);
+  EXPECT_EQ(cache.size(), 1u);
+  cache.Clear();
+  EXPECT_EQ(cache.size(), 0u);
+}
+
+TEST(FftsPlanCacheTest, MultipleThreads) {
+  FftsPlanCache cache;
+  FftPlanCacheStats stats;
+  const int nthreads = 4, niters = 100;
+  std::vector<std::thread> threads;
+  for (int t = 0; t < nthreads; t++) {
+    threads.emplace_back([&]() {
+      for (int i = 0; i < niters; i++) {
+        auto plan = cache.Get(64 << (i % 3), FFTS_FORWARD, true, &stats);
+        ASSERT_TRUE(plan);
+      }
+    });
+  }
+  for (auto &t : threads)
+    t.join();
+  EXPECT_EQ(stats.hits + stats.misses, nthreads * niters);
+  EXPECT_LE(stats.misses, 3 * nthreads);
+  EXPECT_LE(cache.size(), 3u * nthreads);
+}
+
+}  // namespace test
+}  // namespace fft
+}  // namespace signal
+}  // namespace kernels
+}  // namespace dali
@@ -23,6 +23,7 @@
 #include "dali/core/convert.h"
 #include "dali/core/error_handling.h"
 #include "dali/kernels/kernel.h"
+#include "dali/kernels/common/split_shape.h"
 
 namespace dali {
 namespace kernels {
@@ -291,6 +292,26 @@ class SliceCPU {
            OutTensorCPU<OutputType, Dims> &out,
            const InTensorCPU<InputType, Dims> &in,
            const SliceArgs<OutputType, Dims> &slice_args) {
+    SequentialExecutionEngine engine;
+    Schedule(context, out, in, slice_args, engine, 1);
+  }
+
+  /**
+   * @brief Schedules the slicing of one sample in an execution engine (e.g. ThreadPool)
+   *
+   * The output is split into up to `nblocks` blocks, each of them at least `min_blk_sz`
+   * elements large, which are added to the engine as separate tasks, with their volume as
+   * priority. The work is not run - it's up to the caller to call `RunAll`; `slice_args`
+   * must stay alive until then.
+   */
+  template <typename ExecutionEngine>
+  void Schedule(KernelContext &context,
+                OutTensorCPU<OutputType, Dims> &out,
+                const InTensorCPU<InputType, Dims> &in,
+                const SliceArgs<OutputType, Dims> &slice_args,
+                ExecutionEngine &exec_engine,
+                int64_t nblocks,
+                int64_t min_blk_sz = kMinBlockVolume) {
     const auto &in_shape = in.shape;
     const auto &out_shape = out.shape;
     const auto &anchor = slice_args.anchor;
@@ -312,10 +333,26 @@ class SliceCPU {
         "Multi-channel fill value does not match the number of channels in the input");
     }
 
-    SliceKernel(out_ptr, in_ptr,
-                in_strides, out_strides,
-                anchor, in_shape, out_shape,
-                fill_values, channel_dim);
+    // The channel dimension is not split, so that the blocks use the whole fill_values
+    uint64_t skip_dim_mask = channel_dim >= 0 ? uint64_t(1) << channel_dim : 0;
+    TensorShape<Dims> split_factor;
+    split_shape(split_factor, out_shape, nblocks, min_blk_sz, skip_dim_mask);
+
+    // Each block is a slice of its own, with the anchor moved by the block's offset
+    ForEachBlock(out_shape, split_factor,
+      [&](const TensorShape<Dims> &blk_start, const TensorShape<Dims> &blk_end) {
+        TensorShape<Dims> blk_anchor, blk_shape;
+        OutputType *blk_out_ptr = out_ptr;
+        for (int d = 0; d < Dims; d++) {
+          blk_anchor[d] = anchor[d] + blk_start[d];
+          blk_shape[d] = blk_end[d] - blk_start[d];
+          blk_out_ptr += blk_start[d] * out_strides[d];
+        }
+        exec_engine.AddWork([=](int) {
+          SliceKernel(blk_out_ptr, in_ptr, in_strides, out_strides, blk_anchor, in_shape,
+                      blk_shape, fill_values, channel_dim);
+        }, volume(blk_shape));
+      });
   }
 };
 
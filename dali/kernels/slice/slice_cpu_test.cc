@@ -59,10 +59,18 @@ class SliceCPUTest : public SliceTest<TestArgs> {
       auto &kernel = kernels[i];
       auto out_tv = out_tlv[i];
       auto in_tv = test_data_cpu[i];
-      kernel.Run(ctx, out_tv, in_tv, slice_args[i]);
+      if (nblocks_ > 1) {
+        // tiny blocks, to exercise splitting on small test data
+        SequentialExecutionEngine engine;
+        kernel.Schedule(ctx, out_tv, in_tv, slice_args[i], engine, nblocks_, 1);
+      } else {
+        kernel.Run(ctx, out_tv, in_tv, slice_args[i]);
+      }
     }
     EXPECT_NO_FATAL_FAILURE(Check(output_data.cpu(), expected_output.cpu()));
   }
+
+  int nblocks_ = 1;
 };
 
 TYPED_TEST_SUITE(SliceCPUTest, SLICE_TEST_TYPES);
@@ -71,6 +79,11 @@ TYPED_TEST(SliceCPUTest, All) {
   this->Run();
 }
 
+TYPED_TEST(SliceCPUTest, Blocks) {
+  this->nblocks_ = 7;
+  this->Run();
+}
+
 template <typename TestArgs>
 class SliceCPUTest_CpuOnlyTests : public SliceCPUTest<TestArgs> {};
 
@@ -80,5 +93,10 @@ TYPED_TEST(SliceCPUTest_CpuOnlyTests, All) {
   this->Run();
 }
 
+TYPED_TEST(SliceCPUTest_CpuOnlyTests, Blocks) {
+  this->nblocks_ = 7;
+  this->Run();
+}
+
 }  // namespace kernels
 }  // namespace dali
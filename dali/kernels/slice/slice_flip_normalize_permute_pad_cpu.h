@@ -15,6 +15,7 @@
 #ifndef DALI_KERNELS_SLICE_SLICE_FLIP_NORMALIZE_PERMUTE_PAD_CPU_H_
 #define DALI_KERNELS_SLICE_SLICE_FLIP_NORMALIZE_PERMUTE_PAD_CPU_H_
 
+#include <memory>
 #include <utility>
 #include <vector>
 #include "dali/core/common.h"
@@ -22,6 +23,7 @@
 #include "dali/core/error_handling.h"
 #include "dali/core/static_switch.h"
 #include "dali/kernels/kernel.h"
+#include "dali/kernels/common/split_shape.h"
 #include "dali/kernels/slice/slice_flip_normalize_permute_pad_common.h"
 #include "dali/kernels/slice/slice_kernel_utils.h"
 #include "dali/util/half.hpp"
@@ -261,15 +263,69 @@ class SliceFlipNormalizePermutePadCpu {
            const OutTensorCPU<OutputType, Dims> &out,
            const InTensorCPU<InputType, Dims> &in,
            const Args &orig_args) {
-    auto args = detail::ProcessArgs(orig_args, in.shape);
-    auto *mean = args.mean.empty() ? nullptr : args.mean.data();
-    auto *inv_stddev = args.inv_stddev.empty() ? nullptr : args.inv_stddev.data();
-    SmallVector<OutputType, 4> fill_values;
+    SequentialExecutionEngine engine;
+    Schedule(context, out, in, orig_args, engine, 1);
+  }
+
+  /**
+   * @brief Schedules the processing of one sample in an execution engine (e.g. ThreadPool)
+   *
+   * The output is split into up to `nblocks` blocks, each of them at least `min_blk_sz`
+   * elements large, which are added to the engine as separate tasks, with their volume as
+   * priority. The work is not run - it's up to the caller to call `RunAll`.
+   */
+  template <typename ExecutionEngine>
+  void Schedule(KernelContext &context,
+                const OutTensorCPU<OutputType, Dims> &out,
+                const InTensorCPU<InputType, Dims> &in,
+                const Args &orig_args,
+                ExecutionEngine &exec_engine,
+                int64_t nblocks,
+                int64_t min_blk_sz = kMinBlockVolume) {
+    struct BlockArgs {
+      detail::SliceFlipNormalizePermutePadProcessedArgs<Dims> args;
+      SmallVector<OutputType, 4> fill_values;
+    };
+    // shared by all the blocks; released when the last one completes
+    auto blk_args = std::make_shared<BlockArgs>();
+    auto &args = blk_args->args;
+    args = detail::ProcessArgs(orig_args, in.shape);
     for (auto value : args.fill_values)
-      fill_values.push_back(static_cast<OutputType>(value));
-    SliceFlipNormalizePermutePadKernel(out.data, in.data + args.input_offset, args.in_strides,
-                                       args.out_strides, args.anchor, args.in_shape, args.out_shape,
-                                       fill_values.data(), mean, inv_stddev, args.channel_dim);
+      blk_args->fill_values.push_back(static_cast<OutputType>(value));
+
+    // The channel dimension is not split, so that the blocks use all per-channel arguments
+    uint64_t skip_dim_mask = args.channel_dim >= 0 ? uint64_t(1) << args.channel_dim : 0;
+    TensorShape<Dims> split_factor;
+    split_shape(split_factor, args.out_shape, nblocks, min_blk_sz, skip_dim_mask);
+
+    OutputType *out_ptr = out.data;
+    const InputType *in_ptr = in.data + args.input_offset;
+    ForEachBlock(args.out_shape, split_factor,
+      [&](const TensorShape<Dims> &blk_start, const TensorShape<Dims> &blk_end) {
+        TensorShape<Dims> blk_anchor, blk_shape;
+        OutputType *blk_out_ptr = out_ptr;
+        const InputType *blk_in_ptr = in_ptr;
+        for (int d = 0; d < Dims; d++) {
+          blk_shape[d] = blk_end[d] - blk_start[d];
+          blk_out_ptr += blk_start[d] * args.out_strides[d];
+          // The input pointer is moved, even if it goes out of bounds - the kernel moves it
+          // through the padded region as well
+          blk_in_ptr += blk_start[d] * args.in_strides[d];
+          // The anchor is expressed in the input (not flipped) coordinates
+          blk_anchor[d] = args.in_strides[d] < 0
+                        ? args.anchor[d] + args.out_shape[d] - blk_end[d]
+                        : args.anchor[d] + blk_start[d];
+        }
+        exec_engine.AddWork([blk_args, blk_out_ptr, blk_in_ptr, blk_anchor, blk_shape](int) {
+          auto &args = blk_args->args;
+          auto *mean = args.mean.empty() ? nullptr : args.mean.data();
+          auto *inv_stddev = args.inv_stddev.empty() ? nullptr : args.inv_stddev.data();
+          SliceFlipNormalizePermutePadKernel(
+              blk_out_ptr, blk_in_ptr, args.in_strides, args.out_strides, blk_anchor,
+              args.in_shape, blk_shape, blk_args->fill_values.data(), mean, inv_stddev,
+              args.channel_dim);
+        }, volume(blk_shape));
+      });
   }
 };
 
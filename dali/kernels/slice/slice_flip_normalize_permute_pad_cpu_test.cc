@@ -67,10 +67,18 @@ class SliceFlipNormalizePermutePadCpuTest : public SliceFlipNormalizePermutePadT
       auto &kernel = kernels[i];
       auto out_tv = out_tlv[i];
       auto in_tv = test_data_cpu[i];
-      kernel.Run(ctx, out_tv, in_tv, args[i]);
+      if (nblocks_ > 1) {
+        // tiny blocks, to exercise splitting on small test data
+        SequentialExecutionEngine engine;
+        kernel.Schedule(ctx, out_tv, in_tv, args[i], engine, nblocks_, 1);
+      } else {
+        kernel.Run(ctx, out_tv, in_tv, args[i]);
+      }
     }
     EXPECT_NO_FATAL_FAILURE(Check(output_data.cpu(), expected_output.cpu(), EqualEps(1e-6)));
   }
+
+  int nblocks_ = 1;
 };
 
 TYPED_TEST_SUITE(SliceFlipNormalizePermutePadCpuTest, SLICE_FLIP_NORMALIZE_PERMUTE_TEST_TYPES);
@@ -79,6 +87,11 @@ TYPED_TEST(SliceFlipNormalizePermutePadCpuTest, All) {
   this->Run();
 }
 
+TYPED_TEST(SliceFlipNormalizePermutePadCpuTest, Blocks) {
+  this->nblocks_ = 7;
+  this->Run();
+}
+
 template <typename TestArgs>
 class SliceFlipNormalizePermutePadCpuTest_CpuOnlyTests
   : public SliceFlipNormalizePermutePadCpuTest<TestArgs> {};
@@ -90,5 +103,10 @@ TYPED_TEST(SliceFlipNormalizePermutePadCpuTest_CpuOnlyTests, All) {
   this->Run();
 }
 
+TYPED_TEST(SliceFlipNormalizePermutePadCpuTest_CpuOnlyTests, Blocks) {
+  this->nblocks_ = 7;
+  this->Run();
+}
+
 }  // namespace kernels
 }  // namespace dali
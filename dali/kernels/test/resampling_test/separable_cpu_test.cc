@@ -14,8 +14,10 @@
 
 #include <gtest/gtest.h>
 #include <opencv2/imgcodecs.hpp>
+#include <random>
 #include "dali/kernels/test/test_data.h"
 #include "dali/test/tensor_test_utils.h"
+#include "dali/test/test_tensors.h"
 #include "dali/kernels/test/resampling_test/resampling_test_params.h"
 #include "dali/kernels/imgproc/resample/separable_cpu.h"
 #include "dali/kernels/imgproc/resample_cpu.h"
@@ -153,6 +155,131 @@ static std::vector<ResamplingTestEntry> CropResampleTests = {
 INSTANTIATE_TEST_SUITE_P(Basic, ResamplingTestCPU, ::testing::ValuesIn(ResampleTests));
 INSTANTIATE_TEST_SUITE_P(Crop , ResamplingTestCPU, ::testing::ValuesIn(CropResampleTests));
 
+namespace {
+
+/**
+ * @brief Resamples the input as a whole and in slabs and checks that the results are identical
+ */
+template <typename Out, int ndim>
+void TestSlabsMatchWhole(const TensorShape<ndim> &in_shape,
+                         const ResamplingParamsND<ndim - 1> &params,
+                         int num_slabs) {
+  constexpr int spatial_ndim = ndim - 1;
+  TestTensorList<uint8_t, ndim> in_list;
+  in_list.reshape(uniform_list_shape<ndim>(1, in_shape));
+  auto in = in_list.cpu()[0];
+  std::mt19937_64 rng(1234);
+  UniformRandomFill(in, rng, 0, 255);
+
+  KernelContext context;
+  ScratchpadAllocator scratch_alloc;
+  SeparableResampleCPU<Out, uint8_t, spatial_ndim> resample;
+  auto req = resample.Setup(context, in, params);
+  auto out_shape = req.output_shapes[0].template tensor_shape<ndim>(0);
+  TestTensorList<Out, ndim> whole_list, slabs_list;
+  whole_list.reshape(uniform_list_shape<ndim>(1, out_shape));
+  slabs_list.reshape(uniform_list_shape<ndim>(1, out_shape));
+  auto whole = whole_list.cpu()[0];
+  auto slabs = slabs_list.cpu()[0];
+
+  scratch_alloc.Reserve(req.scratch_sizes);
+  auto scratchpad = scratch_alloc.GetScratchpad();
+  context.scratchpad = &scratchpad;
+  resample.Run(context, whole, in, params);
+
+  int extent = out_shape[0];
+  int64_t slice_volume = volume(out_shape.last(spatial_ndim));
+  for (int i = 0; i < num_slabs; i++) {
+    int start = extent * i / num_slabs;
+    int end = extent * (i + 1) / num_slabs;
+    if (start == end)
+      continue;
+    SeparableResampleCPU<Out, uint8_t, spatial_ndim> slab_resample;
+    auto slab_req = slab_resample.Setup(context, in, params, start, end);
+    ASSERT_EQ(slab_req.output_shapes[0][0][0], end - start);
+    scratch_alloc.Reserve(slab_req.scratch_sizes);
+    auto slab_scratchpad = scratch_alloc.GetScratchpad();
+    context.scratchpad = &slab_scratchpad;
+    auto slab = slabs;
+    slab.data += start * slice_volume;
+    slab.shape[0] = end - start;
+    slab_resample.Run(context, slab, in, params);
+  }
+
+  Check(slabs, whole);
+}
+
+ResamplingParams MakeParams(int output_size, FilterDesc filter) {
+  ResamplingParams p;
+  p.output_size = output_size;
+  p.min_filter = p.mag_filter = filter;
+  return p;
+}
+
+}  // namespace
+
+TEST(SeparableResampleCPU, SlabsMatchWhole2D) {
+  FilterDesc filters[] = {
+    ResamplingFilterType::Linear, ResamplingFilterType::Triangular,
+    ResamplingFilterType::Cubic, ResamplingFilterType::Lanczos3,
+    ResamplingFilterType::Gaussian
+  };
+  for (auto filter : filters) {
+    SCOPED_TRACE(FilterName(filter.type));
+    // downscaling and upscaling, different processing orders
+    ResamplingParams2D down = { MakeParams(97, filter), MakeParams(120, filter) };
+    ResamplingParams2D up = { MakeParams(411, filter), MakeParams(173, filter) };
+    ResamplingParams2D mixed = { MakeParams(411, filter), MakeParams(60, filter) };
+    for (auto &params : { down, up, mixed }) {
+      TestSlabsMatchWhole<float>(TensorShape<3>{301, 257, 3}, params, 7);
+      TestSlabsMatchWhole<uint8_t>(TensorShape<3>{301, 257, 3}, params, 4);
+    }
+    // region of interest, also flipped
+    ResamplingParams2D roi = down;
+    roi[0].roi = ResamplingParams::ROI(20.5f, 250.25f);
+    roi[1].roi = ResamplingParams::ROI(5.0f, 200.0f);
+    TestSlabsMatchWhole<float>(TensorShape<3>{301, 257, 3}, roi, 5);
+    roi[0].roi = ResamplingParams::ROI(280.0f, 10.0f);
+    TestSlabsMatchWhole<float>(TensorShape<3>{301, 257, 3}, roi, 5);
+    // more slabs than input rows
+    ResamplingParams2D magnify = { MakeParams(200, filter), MakeParams(30, filter) };
+    TestSlabsMatchWhole<float>(TensorShape<3>{10, 40, 1}, magnify, 33);
+  }
+}
+
+TEST(SeparableResampleCPU, SlabsMatchWhole3D) {
+  FilterDesc filters[] = {
+    ResamplingFilterType::Linear, ResamplingFilterType::Cubic, ResamplingFilterType::Lanczos3
+  };
+  for (auto filter : filters) {
+    SCOPED_TRACE(FilterName(filter.type));
+    ResamplingParams3D down = {
+      MakeParams(23, filter), MakeParams(50, filter), MakeParams(31, filter)
+    };
+    ResamplingParams3D up = {
+      MakeParams(71, filter), MakeParams(45, filter), MakeParams(64, filter)
+    };
+    for (auto &params : { down, up }) {
+      TestSlabsMatchWhole<float>(TensorShape<4>{40, 37, 52, 2}, params, 6);
+      TestSlabsMatchWhole<uint8_t>(TensorShape<4>{40, 37, 52, 2}, params, 3);
+    }
+    ResamplingParams3D roi = down;
+    roi[0].roi = ResamplingParams::ROI(35.5f, 3.0f);
+    TestSlabsMatchWhole<float>(TensorShape<4>{40, 37, 52, 2}, roi, 4);
+  }
+}
+
+TEST(SeparableResampleCPU, SlabNearestNotSupported) {
+  TestTensorList<uint8_t, 3> in_list;
+  in_list.reshape(uniform_list_shape<3>(1, TensorShape<3>{40, 30, 3}));
+  ResamplingParams2D params = {
+    MakeParams(20, ResamplingFilterType::Nearest), MakeParams(20, ResamplingFilterType::Linear)
+  };
+  SeparableResampleCPU<uint8_t, uint8_t, 2> resample;
+  KernelContext context;
+  EXPECT_THROW(resample.Setup(context, in_list.cpu()[0], params, 0, 10), std::runtime_error);
+}
+
 }  // namespace resample_test
 }  // namespace kernels
 }  // namespace dali
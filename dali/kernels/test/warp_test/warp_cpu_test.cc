@@ -15,6 +15,9 @@
 #include <gtest/gtest.h>
 #include <opencv2/imgcodecs.hpp>
 #include <opencv2/imgproc.hpp>
+#include <cmath>
+#include <cstring>
+#include <random>
 #include <string>
 #include <vector>
 #include "dali/kernels/imgproc/warp_cpu.h"
@@ -147,5 +150,86 @@ TEST(WarpCPU, Affine_RotateScale) {
   }
 }
 
+namespace {
+
+template <int spatial_ndim>
+void TestAffineBlocks(const TensorShape<spatial_ndim + 1> &in_shape,
+                      const AffineMapping<spatial_ndim> &mapping) {
+  using Kernel = WarpCPU<AffineMapping<spatial_ndim>, spatial_ndim, uint8_t, uint8_t, uint8_t>;
+  Kernel warp;
+  std::mt19937_64 rng(1234);
+  TestTensorList<uint8_t, spatial_ndim + 1> in;
+  in.reshape(uniform_list_shape<spatial_ndim + 1>(1, in_shape));
+  auto in_tv = in.cpu()[0];
+  UniformRandomFill(in_tv, rng, 0, 255);
+
+  auto out_size = in_shape.template first<spatial_ndim>();
+  KernelContext ctx = {};
+  auto req = warp.Setup(ctx, in_tv, mapping, out_size, DALI_INTERP_LINEAR, 42);
+  TestTensorList<uint8_t, spatial_ndim + 1> ref, out;
+  ref.reshape(req.output_shapes[0].template to_static<spatial_ndim + 1>());
+  out.reshape(req.output_shapes[0].template to_static<spatial_ndim + 1>());
+  warp.Run(ctx, ref.cpu()[0], in_tv, mapping, out_size, DALI_INTERP_LINEAR, 42);
+  for (int nblocks : { 2, 5, 64 }) {
+    memset(out.cpu()[0].data, 0, out.cpu()[0].num_elements());
+    SequentialExecutionEngine engine;
+    warp.Schedule(ctx, out.cpu()[0], in_tv, mapping, out_size, DALI_INTERP_LINEAR, 42,
+                  engine, nblocks, 1);
+    Check(out.cpu()[0], ref.cpu()[0]);
+  }
+}
+
+template <typename Out, typename In, typename BorderValue>
+void TestSampleRow(int channels, const BorderValue &border) {
+  std::mt19937_64 rng(4321);
+  TestTensorList<In, 3> in;
+  in.reshape(uniform_list_shape<3>(1, { 37, 53, channels }));
+  auto in_tv = in.cpu()[0];
+  UniformRandomFill(in_tv, rng, 0, 255);
+  Surface2D<const In> surface = as_surface_channel_last(in_tv);
+  Sampler2D<DALI_INTERP_LINEAR, In> sampler(surface);
+
+  // the rows cross the edges of the input, so that some groups of pixels need border handling
+  int n = 101;
+  std::vector<Out> out(n * channels), ref(n * channels);
+  for (float angle : { 0.0f, 0.4f, 1.7f, -2.9f }) {
+    vec2 dsdx(std::cos(angle), std::sin(angle));
+    for (float y = -5.3f; y < 45; y += 3.1f) {
+      vec2 src(-10.2f, y);
+      warp::SampleRow(out.data(), n, src, dsdx, sampler, border);
+      // the generic implementation, selected with explicit interpolation type
+      warp::SampleRow<DALI_INTERP_LINEAR>(ref.data(), n, src, dsdx, sampler, border);
+      for (int i = 0; i < n * channels; i++) {
+        // the rounding may differ for the values a hair below .5
+        ASSERT_NEAR(out[i], ref[i], std::is_integral<Out>::value ? 1 : 0)
+          << "at pixel " << i / channels << ", channel " << i % channels
+          << ", angle = " << angle << ", y = " << y;
+      }
+    }
+  }
+}
+
+}  // namespace
+
+TEST(WarpCPU, SampleRow) {
+  TestSampleRow<uint8_t, uint8_t>(3, BorderClamp());
+  TestSampleRow<uint8_t, uint8_t>(1, uint8_t(42));
+  TestSampleRow<float, uint8_t>(3, uint8_t(42));
+  TestSampleRow<float, float>(4, BorderClamp());
+  TestSampleRow<uint8_t, float>(3, 42.0f);
+  TestSampleRow<int16_t, int16_t>(2, BorderClamp());
+}
+
+TEST(WarpCPU, Affine_Blocks) {
+  auto tr2 = translation(vec2(20, 10)) * rotation2D(0.3f) * scaling(vec2(0.8f, 1.2f));
+  TestAffineBlocks<2>({ 123, 97, 3 }, AffineMapping2D(sub<2, 3>(tr2, 0, 0)));
+  mat3x4 tr3 = {{
+    { 0.9f, 0.1f, 0,    1 },
+    { 0,    1.1f, 0.2f, -3 },
+    { 0.1f, 0,    0.8f, 2 }
+  }};
+  TestAffineBlocks<3>({ 29, 31, 37, 2 }, AffineMapping3D(tr3));
+}
+
 }  // namespace kernels
 }  // namespace dali
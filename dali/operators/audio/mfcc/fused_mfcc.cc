@@ -0,0 +1,287 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include "dali/operators/audio/mfcc/fused_mfcc.h"
+#include <cmath>
+#include <string>
+#include <vector>
+#include "dali/kernels/signal/window/window_functions.h"
+#include "dali/pipeline/data/views.h"
+
+namespace dali {
+
+DALI_SCHEMA(FusedMFCC)
+  .DocStr(R"code(Computes Mel Frequency Cepstral Coefficients (MFCC) directly from a 1D signal
+(for example, audio).
+
+The result is equivalent to the chain of :meth:`Spectrogram`, :meth:`MelFilterBank`,
+:meth:`ToDecibels` and :meth:`MFCC` (with ``axis=0``), but the signal is processed one block of
+frames at a time, without producing the full-size spectrogram and mel spectrogram, which is
+considerably faster.
+
+Input data is expected to be one channel (shape being ``(nsamples,)``, ``(nsamples, 1)``, or
+``(1, nsamples)``) of type float32. The output has the shape ``(n_mfcc, nframes)``.)code")
+  .NumInput(1)
+  .NumOutput(1)
+  .AddOptionalArg<int>("nfft",
+    R"code(Size of the FFT.
+
+If a value is not provided, ``window_length`` is used.)code",
+    nullptr)
+  .AddOptionalArg("window_length",
+    R"code(Window size in number of samples.)code",
+    512)
+  .AddOptionalArg("window_step",
+    R"code(Step betweeen the STFT windows in number of samples.)code",
+    256)
+  .AddOptionalArg("window_fn",
+    R"code(Samples of the window function that will be multiplied to each extracted window.
+
+If a value is provided, it should be a list of floating point numbers of size ``window_length``.
+If a value is not provided, a Hann window will be used.)code",
+    std::vector<float>{})
+  .AddOptionalArg("power",
+    R"code(Exponent of the magnitude of the spectrum.
+
+Supported values:
+
+- ``1`` - amplitude,
+- ``2`` - power (faster to compute).
+)code",
+    2)
+  .AddOptionalArg("center_windows",
+    R"code(Indicates whether extracted windows should be padded so that the window function is
+centered at multiples of ``window_step``.)code",
+    true)
+  .AddOptionalArg("reflect_padding",
+    R"code(Indicates the padding policy when sampling outside the bounds of the signal.
+
+If set to True, the signal is mirrored with respect to the boundary, otherwise the signal
+is padded with zeros.)code",
+    true)
+  .AddOptionalArg("nfilter",
+    R"code(Number of mel filters.)code",
+    128)
+  .AddOptionalArg("sample_rate",
+    R"code(Sampling rate of the audio signal.)code",
+    44100.0f)
+  .AddOptionalArg("freq_low",
+    R"code(The minimum frequency.)code",
+    0.0f)
+  .AddOptionalArg("freq_high",
+    R"code(The maximum frequency.
+
+If this value is not provided, ``sample_rate /2`` is used.)code",
+    0.0f)
+  .AddOptionalArg("mel_normalize",
+    R"code(Determines whether to normalize the triangular filter weights by the width
+of their frequency bands.
+
+Equivalent to the ``normalize`` argument of :meth:`MelFilterBank`.)code",
+    true)
+  .AddOptionalArg<std::string>("mel_formula",
+    R"code(Determines the formula that will be used to convert frequencies from hertz to mel
+and from mel to hertz (``slaney`` or ``htk``).
+
+See :meth:`MelFilterBank` for details.)code",
+    "slaney")
+  .AddOptionalArg("multiplier",
+    R"code(Factor by which the logarithm of the mel spectrogram is multiplied.)code",
+    10.0f)
+  .AddOptionalArg("reference",
+    R"code(Reference magnitude for the decibel conversion.
+
+If a value is not provided, the maximum of the mel spectrogram (calculated on a per-sample basis)
+will be used as reference.)code",
+    0.0f)
+  .AddOptionalArg("cutoff_db",
+    R"code(Minimum or cut-off ratio in dB.
+
+Any value below this value will saturate.)code",
+    -200.0f)
+  .AddOptionalArg("n_mfcc",
+    R"code(Number of MFCC coefficients.)code",
+    20)
+  .AddOptionalArg("dct_type",
+    R"code(Discrete Cosine Transform type.
+
+The supported types are 1, 2, 3, 4. See :meth:`MFCC` for details.)code",
+    2)
+  .AddOptionalArg("dct_normalize",
+    R"code(If set to True, the DCT uses an ortho-normal basis.
+
+Equivalent to the ``normalize`` argument of :meth:`MFCC`.
+
+.. note::
+  Normalization is not supported when dct_type=1.)code",
+    false)
+  .AddOptionalArg("lifter",
+    R"code(Cepstral filtering coefficient, which is also known as the liftering coefficient.
+
+See :meth:`MFCC` for details.)code",
+    0.0f);
+
+FusedMFCC::FusedMFCC(const OpSpec &spec)
+    : Operator<CPUBackend>(spec)
+    , window_fn_(spec.GetRepeatedArgument<float>("window_fn")) {
+  using kernels::signal::Padding;
+  auto &win = args_.window;
+  win.window_length = spec.GetArgument<int>("window_length");
+  win.window_step = spec.GetArgument<int>("window_step");
+  DALI_ENFORCE(win.window_length > 0, make_string("Invalid window length: ", win.window_length));
+  DALI_ENFORCE(win.window_step > 0, make_string("Invalid window step: ", win.window_step));
+  if (spec.GetArgument<bool>("center_windows")) {
+    win.window_center = win.window_length / 2;
+    win.padding = spec.GetArgument<bool>("reflect_padding") ? Padding::Reflect : Padding::Zero;
+  } else {
+    win.window_center = 0;
+    win.padding = Padding::None;
+  }
+  win.axis = 0;
+
+  if (window_fn_.empty()) {
+    window_fn_.resize(win.window_length);
+    kernels::signal::HannWindow(make_span(window_fn_));
+  }
+  DALI_ENFORCE(window_fn_.size() == static_cast<size_t>(win.window_length),
+    "Window function should match the specified `window_length`");
+
+  args_.nfft = spec.HasArgument("nfft") ? spec.GetArgument<int>("nfft") : win.window_length;
+  DALI_ENFORCE(win.window_length <= args_.nfft, make_string("Window length (", win.window_length,
+    ") can't be bigger than the FFT size (", args_.nfft, ")"));
+  int power = spec.GetArgument<int>("power");
+  switch (power) {
+    case 1:
+      args_.spectrum_type = kernels::signal::fft::FFT_SPECTRUM_MAGNITUDE;
+      break;
+    case 2:
+      args_.spectrum_type = kernels::signal::fft::FFT_SPECTRUM_POWER;
+      break;
+    default:
+      DALI_FAIL(make_string("`power` can be only 1 (energy) or 2 (power), received ", power));
+  }
+
+  auto &mel = args_.mel;
+  mel.nfilter = spec.GetArgument<int>("nfilter");
+  DALI_ENFORCE(mel.nfilter > 0, "number of filters should be > 0");
+  mel.sample_rate = spec.GetArgument<float>("sample_rate");
+  DALI_ENFORCE(mel.sample_rate > 0.0f, "sample rate should be > 0");
+  mel.freq_low = spec.GetArgument<float>("freq_low");
+  DALI_ENFORCE(mel.freq_low >= 0.0f, "freq_low should be >= 0");
+  mel.freq_high = spec.GetArgument<float>("freq_high");
+  if (mel.freq_high <= 0.0f)
+    mel.freq_high = 0.5f * mel.sample_rate;
+  DALI_ENFORCE(mel.freq_high > mel.freq_low && mel.freq_high <= mel.sample_rate,
+    "freq_high should be within the range (freq_low, sample_rate/2]");
+  auto mel_formula = spec.GetArgument<std::string>("mel_formula");
+  if (mel_formula == "htk") {
+    mel.mel_formula = kernels::audio::MelScaleFormula::HTK;
+  } else if (mel_formula == "slaney") {
+    mel.mel_formula = kernels::audio::MelScaleFormula::Slaney;
+  } else {
+    DALI_FAIL(make_string("Unsupported mel_formula value \"", mel_formula,
+      "\". Supported values are: \"slaney\", \"htk\""));
+  }
+  mel.normalize = spec.GetArgument<bool>("mel_normalize");
+
+  auto &db = args_.db;
+  db.multiplier = spec.GetArgument<float>("multiplier");
+  db.ref_max = !spec.HasArgument("reference");
+  if (!db.ref_max) {
+    db.s_ref = spec.GetArgument<float>("reference");
+    DALI_ENFORCE(db.s_ref != 0, "`reference` argument can't be zero");
+  }
+  auto cutoff_db = spec.GetArgument<float>("cutoff_db");
+  db.min_ratio = std::pow(10.0f, cutoff_db / db.multiplier);
+  if (db.min_ratio == 0)
+    db.min_ratio = std::nextafter(0.0f, 1.0f);
+
+  auto &dct = args_.dct;
+  dct.ndct = spec.GetArgument<int>("n_mfcc");
+  DALI_ENFORCE(dct.ndct > 0, "number of MFCCs should be > 0");
+  dct.dct_type = spec.GetArgument<int>("dct_type");
+  DALI_ENFORCE(dct.dct_type >= 1 && dct.dct_type <= 4,
+    make_string("Unsupported DCT type: ", dct.dct_type, ". Supported types are: 1, 2, 3, 4."));
+  dct.normalize = spec.GetArgument<bool>("dct_normalize");
+  if (dct.normalize) {
+    DALI_ENFORCE(dct.dct_type != 1, "Ortho-normalization is not supported for DCT type I.");
+  }
+
+  args_.lifter = spec.GetArgument<float>("lifter");
+
+  RegisterDiagnostic("fft_plan_cache_hits", &fft_plan_cache_hits_);
+  RegisterDiagnostic("fft_plan_cache_misses", &fft_plan_cache_misses_);
+}
+
+bool FusedMFCC::SetupImpl(std::vector<OutputDesc> &output_desc, const HostWorkspace &ws) {
+  const auto &input = ws.InputRef<CPUBackend>(0);
+  auto in_shape = input.shape();
+  int nsamples = input.size();
+  auto nthreads = ws.GetThreadPool().size();
+  DALI_ENFORCE(input.type().id() == DALI_FLOAT,
+    make_string("Unsupported data type: ", input.type().id()));
+
+  // Check that input is 1-D (allowing having extra dims with extent 1)
+  if (in_shape.sample_dim() > 1) {
+    for (int i = 0; i < in_shape.num_samples(); i++) {
+      auto shape = in_shape.tensor_shape(i);
+      auto n = volume(shape);
+      for (auto extent : shape) {
+        DALI_ENFORCE(extent == 1 || extent == n, make_string("Input data must be 1D or all "
+          "but one dimensions must be degenerate (extent 1). Got: ", shape));
+      }
+    }
+  }
+
+  kmgr_.Initialize<Kernel>(&plan_stats_);
+  kmgr_.Resize<Kernel>(nthreads, nsamples);
+  output_desc.resize(1);
+  output_desc[0].type = TypeInfo::Create<float>();
+  output_desc[0].shape.resize(nsamples, 2);
+
+  kernels::KernelContext ctx;
+  auto window_fn = make_tensor_cpu<1>(window_fn_.data(), window_fn_.size());
+  for (int i = 0; i < nsamples; i++) {
+    auto signal = make_tensor_cpu<1>(input[i].data<float>(), {input[i].size()});
+    auto &req = kmgr_.Setup<Kernel>(i, ctx, signal, window_fn, args_);
+    output_desc[0].shape.set_tensor_shape(i, req.output_shapes[0][0].shape);
+  }
+  return true;
+}
+
+void FusedMFCC::RunImpl(HostWorkspace &ws) {
+  const auto &input = ws.InputRef<CPUBackend>(0);
+  auto &output = ws.OutputRef<CPUBackend>(0);
+  auto out_shape = output.shape();
+  int nsamples = input.size();
+  auto &thread_pool = ws.GetThreadPool();
+  auto window_fn = make_tensor_cpu<1>(window_fn_.data(), window_fn_.size());
+
+  for (int i = 0; i < nsamples; i++) {
+    thread_pool.AddWork(
+      [this, &input, &output, window_fn, i](int thread_id) {
+        kernels::KernelContext ctx;
+        auto signal = make_tensor_cpu<1>(input[i].data<float>(), {input[i].size()});
+        kmgr_.Run<Kernel>(thread_id, i, ctx, view<float, 2>(output[i]), signal, window_fn,
+                          args_);
+      }, input[i].size());
+  }
+  thread_pool.RunAll();
+  fft_plan_cache_hits_ = plan_stats_.hits;
+  fft_plan_cache_misses_ = plan_stats_.misses;
+}
+
+DALI_REGISTER_OPERATOR(FusedMFCC, FusedMFCC, CPU);
+
+}  // namespace dali
@@ -0,0 +1,58 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_OPERATORS_AUDIO_MFCC_FUSED_MFCC_H_
+#define DALI_OPERATORS_AUDIO_MFCC_FUSED_MFCC_H_
+
+#include <vector>
+#include "dali/core/common.h"
+#include "dali/kernels/kernel_manager.h"
+#include "dali/kernels/audio/mfcc/fused_mfcc_cpu.h"
+#include "dali/pipeline/operator/common.h"
+#include "dali/pipeline/operator/operator.h"
+
+namespace dali {
+
+/**
+ * @brief Computes MFCCs from a 1D signal in a single pass.
+ *
+ * Equivalent to Spectrogram -> MelFilterBank -> ToDecibels -> MFCC, without the full-size
+ * intermediate spectrogram and mel spectrogram tensors.
+ */
+class FusedMFCC : public Operator<CPUBackend> {
+ public:
+  explicit FusedMFCC(const OpSpec &spec);
+
+ protected:
+  bool CanInferOutputs() const override { return true; }
+  bool SetupImpl(std::vector<OutputDesc> &output_desc, const HostWorkspace &ws) override;
+  void RunImpl(HostWorkspace &ws) override;
+
+  USE_OPERATOR_MEMBERS();
+  using Operator<CPUBackend>::RunImpl;
+
+ private:
+  using Kernel = kernels::audio::FusedMfccCpu;
+
+  kernels::KernelManager kmgr_;
+  kernels::audio::FusedMfccArgs args_;
+  std::vector<float> window_fn_;
+  kernels::signal::fft::FftPlanCacheStats plan_stats_;
+  int64_t fft_plan_cache_hits_ = 0;
+  int64_t fft_plan_cache_misses_ = 0;
+};
+
+}  // namespace dali
+
+#endif  // DALI_OPERATORS_AUDIO_MFCC_FUSED_MFCC_H_
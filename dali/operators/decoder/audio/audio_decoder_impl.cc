@@ -13,6 +13,7 @@
 // limitations under the License.
 
 #include "dali/operators/decoder/audio/audio_decoder_impl.h"
+#include <algorithm>
 #include "dali/kernels/signal/downmixing.h"
 
 namespace dali {
@@ -29,13 +30,31 @@ std::pair<int64_t, int64_t> ProcessOffsetAndLength(const AudioMetadata &meta,
     length = static_cast<int64_t>(length_sec * meta.sample_rate);
   }
 
-  // Limit the duration to the bounds of the input
+  // Limit the offset and the duration to the bounds of the input
+  offset = std::min(offset, meta.length);
   if ((offset + length) > meta.length) {
     length = meta.length - offset;
   }
   return {offset, length};
 }
 
+std::pair<int64_t, int64_t> DecodeScratchSize(const AudioMetadata &meta, float target_sample_rate,
+                                              bool downmix) {
+  bool should_resample = target_sample_rate > 0 && meta.sample_rate != target_sample_rate;
+  bool should_downmix = meta.channels > 1 && downmix;
+  int64_t decode_scratch_sz = 0, resample_scratch_sz = 0;
+  if (should_downmix) {
+    // decoded in chunks and downmixed either to the output or to the input of resampling
+    decode_scratch_sz = std::min(meta.length, kDecodeChunkFrames) * meta.channels;
+    if (should_resample)
+      resample_scratch_sz = meta.length;
+  } else if (should_resample) {
+    // the resampling kernel needs the whole signal, decoded to float
+    decode_scratch_sz = meta.length * meta.channels;
+  }
+  return {decode_scratch_sz, resample_scratch_sz};
+}
+
 TensorShape<> DecodedAudioShape(const AudioMetadata &meta, float target_sample_rate, bool downmix) {
   bool should_resample = target_sample_rate > 0 && meta.sample_rate != target_sample_rate;
   bool should_downmix = meta.channels > 1 && downmix;
@@ -71,34 +90,46 @@ void DecodeAudio(TensorView<StorageCPU, T, DynamicDimensions> audio, AudioDecode
 
   assert(decode_scratch_mem.size() > 0 &&
          "Dowmixing or resampling is required but decoder scratch memory is empty.");
-  assert(decode_scratch_mem.size() % meta.channels == 0 &&
-         "Expected to decode full audio frames only.");
-  assert(decode_scratch_mem.size() <= meta.length * meta.channels &&
-         "Requested to decode more data than available.");
-  int64_t decoded_audio_len = decode_scratch_mem.size() / meta.channels;
-  if (should_resample && should_downmix) {
+
+  if (!should_downmix) {  // resample only
+    assert(decode_scratch_mem.size() >= meta.length * meta.channels &&
+           "Resampling without downmixing requires the whole signal in the decoder scratch.");
+    int64_t ret = decoder.DecodeFrames(decode_scratch_mem.data(), meta.length);
+    DALI_ENFORCE(ret == meta.length, make_string("Error decoding audio file ", audio_filepath));
+    resampler.Resample(audio.data, 0, audio.shape[0], target_sample_rate, decode_scratch_mem.data(),
+                       meta.length, meta.sample_rate, meta.channels);
+    return;
+  }
+
+  if (should_resample) {
     // When downmixing, we need an extra buffer for the input of resampling
-    assert(resample_scratch_mem.size() == decoded_audio_len &&
+    assert(resample_scratch_mem.size() >= meta.length &&
            "Downmixing and resampling is required but resampler scratch is either empty or doesn't "
            "have the expected size");
+  } else {
+    assert(audio.shape[0] == meta.length && "Unexpected output length.");
   }
 
-  int64_t ret = decoder.DecodeFrames(decode_scratch_mem.data(), decoded_audio_len);
-  DALI_ENFORCE(ret == decoded_audio_len, make_string("Error decoding audio file ", audio_filepath));
+  // Decode and downmix in chunks, so that the decoder scratch doesn't need to hold the
+  // whole multichannel signal
+  int64_t chunk_frames = decode_scratch_mem.size() / meta.channels;
+  assert(chunk_frames > 0 && "Decoder scratch can't hold a single frame.");
+  for (int64_t pos = 0; pos < meta.length; pos += chunk_frames) {
+    int64_t nframes = std::min(chunk_frames, meta.length - pos);
+    int64_t ret = decoder.DecodeFrames(decode_scratch_mem.data(), nframes);
+    DALI_ENFORCE(ret == nframes, make_string("Error decoding audio file ", audio_filepath));
+    if (should_resample) {
+      kernels::signal::Downmix(resample_scratch_mem.data() + pos, decode_scratch_mem.data(),
+                               nframes, meta.channels);
+    } else {
+      kernels::signal::Downmix(audio.data + pos, decode_scratch_mem.data(), nframes,
+                               meta.channels);
+    }
+  }
 
-  if (should_resample && should_downmix) {
-    kernels::signal::Downmix(resample_scratch_mem.data(), decode_scratch_mem.data(),
-                             decoded_audio_len, meta.channels);
+  if (should_resample) {
     resampler.Resample(audio.data, 0, audio.shape[0], target_sample_rate,
-                       resample_scratch_mem.data(), decoded_audio_len, meta.sample_rate, 1);
-  } else if (should_resample) {  // No downmix
-    resampler.Resample(audio.data, 0, audio.shape[0], target_sample_rate, decode_scratch_mem.data(),
-                       decoded_audio_len, meta.sample_rate, meta.channels);
-  } else if (should_downmix) {  // downmix only
-    kernels::signal::Downmix(audio.data, decode_scratch_mem.data(), decoded_audio_len,
-                             meta.channels);
-  } else {
-    assert(false && "Logic error. This should never happen.");
+                       resample_scratch_mem.data(), meta.length, meta.sample_rate, 1);
   }
 }
 
@@ -24,13 +24,20 @@
 
 namespace dali {
 
+/**
+ * @brief Number of frames decoded at a time, when the decoded data can be processed in chunks
+ *        (e.g. when downmixing)
+ */
+constexpr int64_t kDecodeChunkFrames = 1 << 15;
+
 /**
  * @brief Converts offset and length in seconds to offset and lenght in number of samples
  *        according with the audio metadata
  * @param meta Audio metadata
  * @param offset_sec offset, in seconds (optional)
  * @param length_sec length, in seconds. If a negative value is provided, whole buffer is assumed
- * @returns pair containing offset and length in number of samples
+ * @returns pair containing offset and length in number of samples. Both are clamped to the
+ *          bounds of the input
  */
 DLL_PUBLIC std::pair<int64_t, int64_t> ProcessOffsetAndLength(const AudioMetadata &meta,
                                                               double offset_sec = 0,
@@ -47,19 +54,34 @@ DLL_PUBLIC std::pair<int64_t, int64_t> ProcessOffsetAndLength(const AudioMetadat
 DLL_PUBLIC TensorShape<> DecodedAudioShape(const AudioMetadata &meta, float target_sample_rate = -1,
                                            bool downmix = true);
 
+/**
+ * @brief Returns the sizes (in number of float elements) of the scratch buffers required by
+ *        ``DecodeAudio``
+ * @param meta Audio metadata. ``meta.length`` is the number of frames to be decoded
+ * @param target_sample_rate If a positive number is provided, it represent the target sampling rate
+ * @param downmix If set to true, the audio channels are expected to be downmixed
+ * @returns pair containing the size of the decode scratch and the resample scratch
+ *
+ * @remarks When downmixing, the audio is decoded in chunks of ``kDecodeChunkFrames`` frames,
+ *          so that the decode scratch doesn't depend on the length of the audio. Resampling
+ *          without downmixing still requires the whole decoded signal.
+ */
+DLL_PUBLIC std::pair<int64_t, int64_t> DecodeScratchSize(const AudioMetadata &meta,
+                                                         float target_sample_rate = -1,
+                                                         bool downmix = true);
+
 /**
  * @brief Decodes audio data, with optional downmixing and resampling
  * @param audio Destination buffer. The function will decode as many audio samples as the shape of this argument
- * @param decoder Decoder object.
- * @param meta Audio metadata.
+ * @param decoder Decoder object. Decoding starts at the current position of the decoder, so that
+ *                a region of the audio can be decoded by seeking to its beginning first.
+ * @param meta Audio metadata. ``meta.length`` is the number of frames to be decoded.
  * @param resampler Resampler instance used if resampling is required
  * @param decode_scratch_mem Scratch memory used for decoding, when decoding can't be done directly to the output buffer.
- *                           If downmixing or resampling is required, this buffer should have a positive length, representing
- *                           decoded audio length at the original sampling rate: ``length * nchannels``
- * @param resample_scratch_mem Scratch memory used for the input of resampling.
- *                             If resampling is required, the buffer should have a positive length, representing the 
- *                             decoded audio length, ``length`` if downmixing is enabled, or the decoded audio length including
- *                             channels, ``length * nchannels``, otherwise.
+ *                           Its size should be at least the one returned by ``DecodeScratchSize``. When downmixing,
+ *                           the audio is decoded in chunks of ``decode_scratch_mem.size() / nchannels`` frames.
+ * @param resample_scratch_mem Scratch memory used for the input of resampling, when downmixing is also required.
+ *                             Its size should be at least the one returned by ``DecodeScratchSize``.
  * @param target_sample_rate If a positive value is provided, the signal will be resampled except when its original sampling rate
  *                           is equal to the target.
  * @param downmix If true, the audio channes will be downmixed to a single one
@@ -13,8 +13,12 @@
 // limitations under the License.
 
 #include <gtest/gtest.h>
+#include <algorithm>
+#include <string>
 #include <utility>
+#include <vector>
 #include "dali/operators/decoder/audio/audio_decoder_impl.h"
+#include "dali/core/convert.h"
 
 namespace dali {
 namespace test {
@@ -52,5 +56,145 @@ TEST(AudioDecoderImpl, ProcessOffsetAndLength) {
   }
 }
 
+TEST(AudioDecoderImpl, ProcessOffsetAndLengthOutOfBounds) {
+  AudioMetadata meta{16000, 16000, 1};  // 1s at 16kHz
+  std::pair<int64_t, int64_t> empty_at_end{16000, 0};
+  ASSERT_EQ(empty_at_end, ProcessOffsetAndLength(meta, 2.0, 1.0));
+  ASSERT_EQ(empty_at_end, ProcessOffsetAndLength(meta, 2.0, -1.0));
+}
+
+namespace {
+
+/**
+ * @brief Produces a known, multichannel signal and counts the decoded frames
+ */
+class TestAudioDecoder : public AudioDecoderBase {
+ public:
+  TestAudioDecoder(int64_t length, int channels) : length_(length), channels_(channels) {}
+
+  static float Value(int64_t frame, int channel) {
+    return ((frame * 7 + channel * 13) % 101) / 101.0f - 0.5f;
+  }
+
+  int64_t decoded_frames = 0;
+  int64_t max_frames_per_call = 0;
+
+ private:
+  int64_t SeekFramesImpl(int64_t nframes, int whence) override {
+    pos_ = whence == SEEK_SET ? nframes : pos_ + nframes;
+    return pos_;
+  }
+
+  template <typename T>
+  ptrdiff_t Fill(T *output, int64_t nframes) {
+    nframes = std::min(nframes, length_ - pos_);
+    for (int64_t i = 0; i < nframes; i++, pos_++)
+      for (int c = 0; c < channels_; c++)
+        output[i * channels_ + c] = ConvertSatNorm<T>(Value(pos_, c));
+    decoded_frames += nframes;
+    max_frames_per_call = std::max(max_frames_per_call, nframes);
+    return nframes;
+  }
+
+  ptrdiff_t DecodeImpl(span<float> output) override {
+    return Fill(output.data(), output.size() / channels_) * channels_;
+  }
+  ptrdiff_t DecodeImpl(span<int16_t> output) override {
+    return Fill(output.data(), output.size() / channels_) * channels_;
+  }
+  ptrdiff_t DecodeImpl(span<int32_t> output) override {
+    return Fill(output.data(), output.size() / channels_) * channels_;
+  }
+  ptrdiff_t DecodeFramesImpl(float *output, int64_t nframes) override {
+    return Fill(output, nframes);
+  }
+  ptrdiff_t DecodeFramesImpl(int16_t *output, int64_t nframes) override {
+    return Fill(output, nframes);
+  }
+  ptrdiff_t DecodeFramesImpl(int32_t *output, int64_t nframes) override {
+    return Fill(output, nframes);
+  }
+
+  AudioMetadata OpenImpl(span<const char>) override {
+    return Meta();
+  }
+  AudioMetadata OpenFromFileImpl(const std::string &) override {
+    return Meta();
+  }
+  void CloseImpl() override {}
+
+  AudioMetadata Meta() {
+    pos_ = 0;
+    return {length_, 16000, channels_, true};
+  }
+
+  int64_t length_;
+  int channels_;
+  int64_t pos_ = 0;
+};
+
+}  // namespace
+
+TEST(AudioDecoderImpl, DecodeRegionDownmixChunked) {
+  int64_t total_length = 3 * kDecodeChunkFrames + 123;
+  int channels = 3;
+  TestAudioDecoder decoder(total_length, channels);
+  AudioMetadata meta = decoder.OpenFromFile("test.wav");
+
+  int64_t offset, length;
+  std::tie(offset, length) = ProcessOffsetAndLength(meta, 0.25, -1.0);
+  ASSERT_EQ(offset, 4000);
+  decoder.SeekFrames(offset, SEEK_SET);
+  meta.length = length;
+
+  auto shape = DecodedAudioShape(meta, -1.0f, true);
+  ASSERT_EQ(shape, TensorShape<>(length));
+
+  int64_t decode_scratch_sz, resample_scratch_sz;
+  std::tie(decode_scratch_sz, resample_scratch_sz) = DecodeScratchSize(meta, -1.0f, true);
+  EXPECT_EQ(decode_scratch_sz, kDecodeChunkFrames * channels);
+  EXPECT_EQ(resample_scratch_sz, 0);
+
+  std::vector<float> out(length), decode_scratch(decode_scratch_sz);
+  kernels::signal::resampling::Resampler resampler;
+  DecodeAudio<float>(make_tensor_cpu(out.data(), shape), decoder, meta, resampler,
+                     make_span(decode_scratch), {}, -1.0f, true, "test.wav");
+
+  EXPECT_EQ(decoder.decoded_frames, length);
+  EXPECT_LE(decoder.max_frames_per_call, kDecodeChunkFrames);
+  for (int64_t i = 0; i < length; i++) {
+    float ref = 0;
+    for (int c = 0; c < channels; c++)
+      ref += TestAudioDecoder::Value(offset + i, c);
+    ref /= channels;
+    ASSERT_NEAR(out[i], ref, 1e-6f) << " at " << i;
+  }
+}
+
+TEST(AudioDecoderImpl, DecodeRegionNoConversion) {
+  int channels = 2;
+  TestAudioDecoder decoder(16000, channels);
+  AudioMetadata meta = decoder.OpenFromFile("test.wav");
+
+  int64_t offset, length;
+  std::tie(offset, length) = ProcessOffsetAndLength(meta, 0.5, 0.25);
+  decoder.SeekFrames(offset, SEEK_SET);
+  meta.length = length;
+
+  auto shape = DecodedAudioShape(meta, -1.0f, false);
+  ASSERT_EQ(shape, TensorShape<>(4000, channels));
+  std::pair<int64_t, int64_t> no_scratch{0, 0};
+  EXPECT_EQ(no_scratch, DecodeScratchSize(meta, -1.0f, false));
+
+  std::vector<float> out(volume(shape));
+  kernels::signal::resampling::Resampler resampler;
+  DecodeAudio<float>(make_tensor_cpu(out.data(), shape), decoder, meta, resampler,
+                     {}, {}, -1.0f, false, "test.wav");
+  EXPECT_EQ(decoder.decoded_frames, length);
+  for (int64_t i = 0; i < length; i++)
+    for (int c = 0; c < channels; c++)
+      ASSERT_EQ(out[i * channels + c], TestAudioDecoder::Value(offset + i, c));
+}
+
 }  // namespace test
 }  // namespace dali
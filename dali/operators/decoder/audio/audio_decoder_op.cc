@@ -13,6 +13,7 @@
 // limitations under the License.
 
 #include "dali/operators/decoder/audio/audio_decoder_op.h"
+#include <tuple>
 #include "dali/operators/decoder/audio/audio_decoder_impl.h"
 #include "dali/pipeline/operator/op_schema.h"
 #include "dali/pipeline/data/views.h"
@@ -44,7 +45,17 @@ Supported types: ``INT16``, ``INT32``, ``FLOAT``.)code", DALI_FLOAT)
 the highest.
 
 0 gives 3 lobes of the sinc filter, 50 gives 16 lobes, and 100 gives 64 lobes.)code",
-          50.0f, false);
+          50.0f, false)
+  .AddOptionalArg<float>("offset", R"code(Offset, in seconds, from the beginning of the audio
+to the start of the decoded region.
+
+Only the requested region is decoded - the decoder seeks to the offset instead of decoding
+and discarding the preceding audio. If the offset exceeds the length of the audio, the output
+is empty.)code", nullptr, true)
+  .AddOptionalArg<float>("duration", R"code(Duration, in seconds, of the decoded region.
+
+If not specified, or negative, the audio is decoded until its end. The duration is clamped
+to the end of the audio.)code", nullptr, true);
 
 DALI_REGISTER_OPERATOR(AudioDecoder, AudioDecoderCpu, CPU);
 
@@ -53,6 +64,14 @@ AudioDecoderCpu::SetupImpl(std::vector<OutputDesc> &output_desc, const workspace
   GetPerSampleArgument<float>(target_sample_rates_, "sample_rate", ws);
   auto &input = ws.template InputRef<Backend>(0);
   const auto batch_size = input.shape().num_samples();
+  if (has_offset_)
+    GetPerSampleArgument<float>(offsets_, "offset", ws);
+  else
+    offsets_.assign(batch_size, 0.0f);
+  if (has_duration_)
+    GetPerSampleArgument<float>(durations_, "duration", ws);
+  else
+    durations_.assign(batch_size, -1.0f);
 
   for (int i = 0; i < batch_size; i++) {
     DALI_ENFORCE(input.shape()[i].size() == 1, "Raw input must be 1D encoded byte data");
@@ -75,6 +94,12 @@ AudioDecoderCpu::SetupImpl(std::vector<OutputDesc> &output_desc, const workspace
     auto &meta = sample_meta_[i] =
         decoders_[i]->Open({reinterpret_cast<const char *>(input[i].raw_mutable_data()),
                             input[i].shape().num_elements()});
+    int64_t offset, length;
+    std::tie(offset, length) = ProcessOffsetAndLength(meta, offsets_[i], durations_[i]);
+    // Only the requested region is decoded
+    if (offset > 0)
+      decoders_[i]->SeekFrames(offset, SEEK_SET);
+    meta.length = length;
     TensorShape<> data_sample_shape = DecodedAudioShape(
         meta, use_resampling_ ? target_sample_rates_[i] : -1.0f, downmix_);
     shape_data.set_tensor_shape(i, data_sample_shape);
@@ -93,18 +118,8 @@ AudioDecoderCpu::DecodeSample(const TensorView<StorageCPU, OutputType, DynamicDi
                               int thread_idx, int sample_idx) {
   auto &meta = sample_meta_[sample_idx];
   float target_sr = use_resampling_ ? target_sample_rates_[sample_idx] : meta.sample_rate;
-  bool should_resample = target_sr != meta.sample_rate;
-  bool should_downmix = meta.channels > 1 && downmix_;
-  int64_t decode_scratch_sz = 0;
-  int64_t resample_scratch_sz = 0;
-  if (should_resample || should_downmix)
-    decode_scratch_sz = meta.length * meta.channels;
-
-  // resample scratch is used to prepare a single or multiple (depending if
-  // downmixing is needed) channel float input, required by the resampling
-  // kernel
-  if (should_resample)
-    resample_scratch_sz = should_downmix ? meta.length : meta.length * meta.channels;
+  int64_t decode_scratch_sz, resample_scratch_sz;
+  std::tie(decode_scratch_sz, resample_scratch_sz) = DecodeScratchSize(meta, target_sr, downmix_);
 
   auto &scratch_decoder = scratch_decoder_[thread_idx];
   scratch_decoder.resize(decode_scratch_sz);
@@ -112,8 +127,6 @@ AudioDecoderCpu::DecodeSample(const TensorView<StorageCPU, OutputType, DynamicDi
   auto &scratch_resampler = scratch_resampler_[thread_idx];
   scratch_resampler.resize(resample_scratch_sz);
 
-  // TODO(janton): handle offset and duration
-
   DecodeAudio<OutputType>(
     audio, *decoders_[sample_idx], meta, resampler_,
     {scratch_decoder.data(), decode_scratch_sz},
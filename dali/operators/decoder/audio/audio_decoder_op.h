@@ -41,7 +41,9 @@ class AudioDecoderCpu : public Operator<CPUBackend> {
           output_type_(spec.GetArgument<DALIDataType>("dtype")),
           downmix_(spec.GetArgument<bool>("downmix")),
           use_resampling_(spec.HasArgument("sample_rate") || spec.HasTensorArgument("sample_rate")),
-          quality_(spec.GetArgument<float>("quality")) {
+          quality_(spec.GetArgument<float>("quality")),
+          has_offset_(spec.HasArgument("offset") || spec.HasTensorArgument("offset")),
+          has_duration_(spec.HasArgument("duration") || spec.HasTensorArgument("duration")) {
     if (use_resampling_) {
       double q = quality_;
       DALI_ENFORCE(q >= 0 && q <= 100, "Resampling quality must be in [0..100] range");
@@ -86,6 +88,8 @@ class AudioDecoderCpu : public Operator<CPUBackend> {
   DALIDataType output_type_ = DALI_NO_TYPE, decode_type_ = DALI_NO_TYPE;
   const bool downmix_ = false, use_resampling_ = false;
   const float quality_ = 50.0f;
+  const bool has_offset_ = false, has_duration_ = false;
+  std::vector<float> offsets_, durations_;
   std::vector<std::string> files_names_;
   std::vector<AudioMetadata> sample_meta_;
   std::vector<vector<float>> scratch_decoder_;
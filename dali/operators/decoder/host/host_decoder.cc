@@ -36,16 +36,16 @@ void HostDecoder::RunImpl(SampleWorkspace &ws) {
     img = ImageFactory::CreateImage(input.data<uint8>(), input.size(), output_type_);
     img->SetCropWindowGenerator(GetCropWindowGenerator(ws.data_idx()));
     img->SetUseFastIdct(use_fast_idct_);
-    img->Decode();
+    // The decoders which support it write directly to the output
+    img->Decode(dtype_, [&output, this](const Image::Shape &shape) {
+      output.set_type(TypeTable::GetTypeInfo(dtype_));
+      output.Resize(shape);
+      return output.raw_mutable_data();
+    });
   } catch (std::exception &e) {
     DALI_FAIL(e.what() + ". File: " + file_name);
   }
-  const auto decoded = img->GetImage();
-  const auto shape = img->GetShape();
-  output.Resize(shape);
   output.SetLayout("HWC");
-  unsigned char *out_data = output.mutable_data<unsigned char>();
-  std::memcpy(out_data, decoded.get(), volume(shape));
 }
 
 DALI_REGISTER_OPERATOR(ImageDecoder, HostDecoder, CPU);
@@ -29,6 +29,7 @@ class HostDecoder : public Operator<CPUBackend> {
   explicit inline HostDecoder(const OpSpec &spec) :
       Operator<CPUBackend>(spec),
       output_type_(spec.GetArgument<DALIImageType>("output_type")),
+      dtype_(spec.GetArgument<DALIDataType>("dtype")),
       c_(IsColor(output_type_) ? 3 : 1),
       use_fast_idct_(spec.GetArgument<bool>("use_fast_idct"))
   {}
@@ -48,6 +49,7 @@ class HostDecoder : public Operator<CPUBackend> {
   }
 
   DALIImageType output_type_;
+  DALIDataType dtype_;
   int c_;
   bool use_fast_idct_ = false;
 };
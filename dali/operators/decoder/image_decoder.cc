@@ -26,6 +26,17 @@ DALI_SCHEMA(ImageDecoderAttr)
   .AddOptionalArg("output_type",
       R"code(The color space of the output image.)code",
       DALI_RGB)
+  .AddOptionalArg("dtype",
+      R"code(Output data type of the image.
+
+Supported types: ``UINT8``, ``UINT16`` and ``FLOAT``. The floating point output is normalized
+to the ``[0, 1]`` range, and the 8-bit samples are scaled to the full range of ``UINT16``.
+The 16-bit PNG and TIFF images are decoded with full precision when ``UINT16`` or ``FLOAT``
+is requested.
+
+.. note::
+  Types other than ``UINT8`` are supported only by the ``cpu`` backend.)code",
+      DALI_UINT8)
 // TODO(janton): Remove this when we remove the old nvJPEGDecoder implementation (DALI-971)
 #if !defined(NVJPEG_DECOUPLED_API)
   .AddOptionalArg("use_batched_decode",
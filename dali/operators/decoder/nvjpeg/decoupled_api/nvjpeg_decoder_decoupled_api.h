@@ -71,6 +71,8 @@ class nvJPEGDecoder : public Operator<MixedBackend>, CachedDecoderImpl {
     nvjpeg2k_thread_(1,
                      spec.GetArgument<int>("device_id"),
                      spec.GetArgument<bool>("affine")) {
+    DALI_ENFORCE(spec.GetArgument<DALIDataType>("dtype") == DALI_UINT8,
+      "Only the uint8 output is supported by the ``mixed`` backend.");
 #if NVJPEG_VER_MAJOR >= 11
     // if hw_decoder_load is not present in the schema (crop/sliceDecoder) then it is not supported
     if (spec_.GetSchema().HasArgument("hw_decoder_load")) {
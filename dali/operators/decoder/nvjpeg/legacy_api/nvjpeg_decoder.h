@@ -157,6 +157,9 @@ class nvJPEGDecoder : public Operator<MixedBackend>, CachedDecoderImpl {
     batched_output_(batch_size_),
     device_id_(spec.GetArgument<int>("device_id")),
     thread_pool_(max_streams_, device_id_, true /* pin threads */) {
+      DALI_ENFORCE(spec.GetArgument<DALIDataType>("dtype") == DALI_UINT8,
+        "Only the uint8 output is supported by the ``mixed`` backend.");
+
       // Setup the allocator struct to use our internal allocator
       nvjpegDevAllocator_t allocator;
       allocator.dev_malloc = &memory::DeviceNew;
@@ -43,6 +43,7 @@ DALI_SCHEMA(Cast)
   .NumOutput(1)
   .AllowSequences()
   .SupportVolumetric()
+  .SupportVariableBatchSize()
   .AddArg("dtype",
       R"code(Output data type.)code",
       DALI_DATA_TYPE);
@@ -84,6 +84,7 @@ Here is a practical example, considering the table defined above::
   .NumOutput(1)
   .AllowSequences()
   .SupportVolumetric()
+  .SupportVariableBatchSize()
   .AddOptionalArg("dtype",
     R"code(Output data type.)code",
     DALI_FLOAT)
@@ -231,15 +231,18 @@ void Pad<CPUBackend>::RunImpl(workspace_t<CPUBackend> &ws) {
       using Kernel = kernels::SliceCPU<T, T, Dims>;
       using Args = kernels::SliceArgs<T, Dims>;
 
+      auto &kernel_sample_args = any_cast<std::vector<Args>&>(kernel_sample_args_);
+      int64_t total_size = out_shape.num_elements();
+      int num_tasks = thread_pool.size() * kernels::kTasksPerThread;
       for (int i = 0; i < nsamples; i++) {
-        thread_pool.AddWork(
-          [this, &input, &output, i](int thread_id) {
-            kernels::KernelContext ctx;
-            auto in_view = view<const T, Dims>(input[i]);
-            auto out_view = view<T, Dims>(output[i]);
-            auto &kernel_sample_args = any_cast<std::vector<Args>&>(kernel_sample_args_);
-            kmgr_.Run<Kernel>(thread_id, i, ctx, out_view, in_view, kernel_sample_args[i]);
-          }, out_shape.tensor_size(i));
+        kernels::KernelContext ctx;
+        auto in_view = view<const T, Dims>(input[i]);
+        auto out_view = view<T, Dims>(output[i]);
+        // Large samples are split into blocks, so that all the threads can be used
+        int64_t nblocks = kernels::NumSampleBlocks(out_shape.tensor_size(i), total_size,
+                                                   num_tasks);
+        kmgr_.Get<Kernel>(i).Schedule(ctx, out_view, in_view, kernel_sample_args[i],
+                                      thread_pool, nblocks);
       }
       thread_pool.RunAll();
     ), DALI_FAIL(make_string("Unsupported number of dimensions ", ndim)));  // NOLINT
@@ -77,14 +77,17 @@ void SliceBaseCpu<OutputType, InputType, Dims>::RunImpl(workspace_t<CPUBackend>
   int nsamples = input.size();
   auto& thread_pool = ws.GetThreadPool();
   auto out_shape = output.shape();
+  int64_t total_size = out_shape.num_elements();
+  int num_tasks = thread_pool.size() * kernels::kTasksPerThread;
   for (int sample_idx = 0; sample_idx < nsamples; sample_idx++) {
-    thread_pool.AddWork(
-      [this, &input, &output, sample_idx](int thread_id) {
-        auto in_view = view<const InputType, Dims>(input[sample_idx]);
-        auto out_view = view<OutputType, Dims>(output[sample_idx]);
-        kernels::KernelContext ctx;
-        kmgr_.Run<Kernel>(thread_id, sample_idx, ctx, out_view, in_view, args_[sample_idx]);
-      }, out_shape.tensor_size(sample_idx));
+    auto in_view = view<const InputType, Dims>(input[sample_idx]);
+    auto out_view = view<OutputType, Dims>(output[sample_idx]);
+    kernels::KernelContext ctx;
+    // Large samples are split into blocks, so that all the threads can be used
+    int64_t nblocks = kernels::NumSampleBlocks(out_shape.tensor_size(sample_idx), total_size,
+                                               num_tasks);
+    kmgr_.Get<Kernel>(sample_idx).Schedule(ctx, out_view, in_view, args_[sample_idx],
+                                           thread_pool, nblocks);
   }
   thread_pool.RunAll();
   output.SetLayout(input.GetLayout());
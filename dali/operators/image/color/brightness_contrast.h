@@ -45,6 +45,22 @@ constexpr float HalfRange() {
     : 0.5f;
 }
 
+inline float FullRange(DALIDataType type) {
+  float range = 1.0f;
+  TYPE_SWITCH(type, type2id, T, (uint8_t, int8_t, uint16_t, int16_t, int32_t, float16, float), (
+      range = FullRange<T>();
+  ), DALI_FAIL(make_string("Unsupported type: ", type)));  // NOLINT
+  return range;
+}
+
+inline float HalfRange(DALIDataType type) {
+  float range = 0.5f;
+  TYPE_SWITCH(type, type2id, T, (uint8_t, int8_t, uint16_t, int16_t, int32_t, float16, float), (
+      range = HalfRange<T>();
+  ), DALI_FAIL(make_string("Unsupported type: ", type)));  // NOLINT
+  return range;
+}
+
 }  // namespace detail
 }  // namespace brightness_contrast
 
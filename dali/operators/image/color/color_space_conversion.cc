@@ -22,6 +22,7 @@ DALI_SCHEMA(ColorSpaceConversion)
     .DocStr(R"code(Converts between various image color models.)code")
     .NumInput(1)
     .NumOutput(1)
+    .SupportVariableBatchSize()
     .InputLayout("HWC")
     .AddArg("image_type",
         R"code(The color space of the input image.)code",
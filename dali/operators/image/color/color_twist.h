@@ -84,6 +84,34 @@ inline mat3 sat_mat(float saturation) {
   return ret;
 }
 
+
+/**
+ * Composes transformation matrix for the combined hue, saturation, value, brightness
+ * and contrast adjustment
+ */
+inline mat3 twist_mat(float hue, float saturation, float value, float brightness,
+                      float contrast) {
+  return mat3(brightness) * mat3(contrast) *
+         Yiq2Rgb * hue_mat(hue) * sat_mat(saturation) * mat3(value) * Rgb2Yiq;
+}
+
+
+/**
+ * Calculates the offset that accompanies `twist_mat`; the contrast is adjusted around
+ * the `half_range` (grey) value
+ */
+inline float twist_offset(float half_range, float brightness, float contrast) {
+  return (half_range - half_range * contrast) * brightness;
+}
+
+
+/**
+ * The grey value (i.e. the contrast center) for the images of given type
+ */
+inline float half_range(DALIDataType type) {
+  return type == DALI_FLOAT16 || type == DALI_FLOAT || type == DALI_FLOAT64 ? 0.5f : 128.f;
+}
+
 }  // namespace color
 
 
@@ -149,11 +177,7 @@ class ColorTwistBase : public Operator<Backend> {
         ? output_type_arg_
         : in_type;
 
-    if (in_type == DALI_FLOAT16 || in_type == DALI_FLOAT || in_type == DALI_FLOAT64) {
-      half_range_ = 0.5f;
-    } else {
-      half_range_ = 128.f;
-    }
+    half_range_ = color::half_range(in_type);
   }
 
 
@@ -169,10 +193,8 @@ class ColorTwistBase : public Operator<Backend> {
     tmatrices_.resize(size);
     toffsets_.resize(size);
     for (size_t i = 0; i < size; i++) {
-      tmatrices_[i] =
-               mat3(brightness_[i]) * mat3(contrast_[i]) *
-               Yiq2Rgb * hue_mat(hue_[i]) * sat_mat(saturation_[i]) * mat3(value_[i]) * Rgb2Yiq;
-      toffsets_[i] = (half_range_ - half_range_ * contrast_[i]) * brightness_[i];
+      tmatrices_[i] = twist_mat(hue_[i], saturation_[i], value_[i], brightness_[i], contrast_[i]);
+      toffsets_[i] = twist_offset(half_range_, brightness_[i], contrast_[i]);
     }
   }
 
@@ -0,0 +1,197 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <cmath>
+#include "dali/operators/image/color/fused_color_transform.h"
+#include "dali/core/static_switch.h"
+#include "dali/kernels/imgproc/pointwise/linear_transformation_cpu.h"
+#include "dali/operators/image/color/brightness_contrast.h"
+#include "dali/operators/image/color/color_twist.h"
+#include "dali/pipeline/data/views.h"
+
+namespace dali {
+namespace {
+
+template <typename Out, typename In>
+using TheKernel = kernels::LinearTransformationCpu<Out, In, 3, 3, 3>;
+
+OpSchema &AddStageArguments(OpSchema &schema) {
+  for (int k = 0; k < color::kMaxFusedStages; k++) {
+    auto name = [k](const std::string &arg) { return color::stage_arg_name(arg, k); };
+    schema
+        .AddOptionalArg(name(color::kHue), "Hue delta of the stage, in degrees.", 0.0f, true)
+        .AddOptionalArg(name(color::kSaturation), "Saturation multiplier of the stage.",
+                        1.0f, true)
+        .AddOptionalArg(name(color::kValue), "Value multiplier of the stage.", 1.0f, true)
+        .AddOptionalArg(name(color::kBrightness), "Brightness multiplier of the stage.",
+                        1.0f, true)
+        .AddOptionalArg(name(color::kContrast), "Contrast multiplier of the stage.", 1.0f, true)
+        .AddOptionalArg(name(color::kBrightnessShift), "Brightness shift of the stage.",
+                        0.0f, true)
+        .AddOptionalArg(name(color::kContrastCenter), R"code(Contrast center of the stage.
+
+When not set, the half of the stage input type's positive range is used.)code", 0.5f)
+        .AddOptionalArg(name(color::kOutputType), R"code(Output data type of the stage.
+
+If not set, the stage input type is used.)code", DALI_NO_TYPE);
+  }
+  return schema;
+}
+
+}  // namespace
+
+DALI_SCHEMA(FusedColorTransform)
+    .DocStr(R"code(Applies a chain of color operators as a single affine transform.
+
+The operator is inserted by the pipeline in place of a chain of CPU color operators
+(``Hsv``, ``Hue``, ``Saturation``, ``Brightness``, ``Contrast``, ``ColorTwist`` and
+``BrightnessContrast``), when the color operator fusion is enabled. The arguments of the k-th
+operator in the chain are passed with a ``_k`` suffix.
+
+The results of the intermediate operators are neither rounded nor clamped.)code")
+    .NumInput(1)
+    .NumOutput(1)
+    .AddArg(color::kStages, R"code(Names of the fused operators, in the order of application.)code",
+            DALI_STRING_VEC)
+    .AddParent("FusedColorTransformStages")
+    .InputLayout(0, "HWC")
+    .SupportVariableBatchSize()
+    .MakeInternal();
+
+// The per-stage arguments are added in a loop, so they are kept in a separate schema
+static OpSchema *fused_color_transform_stages_schema =
+    &AddStageArguments(SchemaRegistry::RegisterSchema("FusedColorTransformStages"));
+
+DALI_REGISTER_OPERATOR(FusedColorTransform, FusedColorTransformCpu, CPU);
+
+
+FusedColorTransformCpu::FusedColorTransformCpu(const OpSpec &spec)
+    : Operator<CPUBackend>(spec)
+    , stages_(spec.GetRepeatedArgument<std::string>(color::kStages)) {
+  DALI_ENFORCE(!stages_.empty() && static_cast<int>(stages_.size()) <= color::kMaxFusedStages,
+               make_string("The number of fused stages must be between 1 and ",
+                           color::kMaxFusedStages, "; got ", stages_.size()));
+  for (int k = 0; k < static_cast<int>(stages_.size()); k++) {
+    stage_types_.push_back(
+        spec.GetArgument<DALIDataType>(color::stage_arg_name(color::kOutputType, k)));
+    auto center_arg = color::stage_arg_name(color::kContrastCenter, k);
+    contrast_centers_.push_back(spec.HasArgument(center_arg)
+                                ? spec.GetArgument<float>(center_arg)
+                                : std::nanf(""));
+  }
+  kernel_manager_.Resize(num_threads_, batch_size_);
+}
+
+
+void FusedColorTransformCpu::DetermineTransformation(const HostWorkspace &ws) {
+  using color::stage_arg_name;
+  int nsamples = ws.InputRef<CPUBackend>(0).shape().num_samples();
+  tmatrices_.assign(nsamples, mat3::eye());
+  toffsets_.assign(nsamples, vec3());
+
+  DALIDataType stage_in = ws.InputRef<CPUBackend>(0).type().id();
+  for (int k = 0; k < static_cast<int>(stages_.size()); k++) {
+    DALIDataType stage_out = stage_types_[k] != DALI_NO_TYPE ? stage_types_[k] : stage_in;
+    GetPerSampleArgument(brightness_, stage_arg_name(color::kBrightness, k), ws, nsamples);
+    GetPerSampleArgument(contrast_, stage_arg_name(color::kContrast, k), ws, nsamples);
+
+    if (stages_[k] == "BrightnessContrast") {
+      GetPerSampleArgument(brightness_shift_, stage_arg_name(color::kBrightnessShift, k), ws,
+                           nsamples);
+      float center = std::isnan(contrast_centers_[k])
+                   ? brightness_contrast::detail::HalfRange(stage_in)
+                   : contrast_centers_[k];
+      float brightness_range = brightness_contrast::detail::FullRange(stage_out);
+      for (int i = 0; i < nsamples; i++) {
+        // see BrightnessContrastOp::OpArgsToKernelArgs
+        float multiplier = brightness_[i] * contrast_[i];
+        float addend = brightness_shift_[i] * brightness_range +
+                       brightness_[i] * (center - contrast_[i] * center);
+        tmatrices_[i] = mat3(multiplier) * tmatrices_[i];
+        toffsets_[i] = multiplier * toffsets_[i] + addend;
+      }
+    } else {
+      GetPerSampleArgument(hue_, stage_arg_name(color::kHue, k), ws, nsamples);
+      GetPerSampleArgument(saturation_, stage_arg_name(color::kSaturation, k), ws, nsamples);
+      GetPerSampleArgument(value_, stage_arg_name(color::kValue, k), ws, nsamples);
+      float half_range = color::half_range(stage_in);
+      for (int i = 0; i < nsamples; i++) {
+        mat3 m = color::twist_mat(hue_[i], saturation_[i], value_[i], brightness_[i],
+                                  contrast_[i]);
+        tmatrices_[i] = m * tmatrices_[i];
+        toffsets_[i] = m * toffsets_[i] + color::twist_offset(half_range, brightness_[i],
+                                                              contrast_[i]);
+      }
+    }
+    stage_in = stage_out;
+  }
+  output_type_ = stage_in;
+}
+
+
+bool FusedColorTransformCpu::SetupImpl(std::vector<OutputDesc> &output_desc,
+                                       const HostWorkspace &ws) {
+  const auto &input = ws.template InputRef<CPUBackend>(0);
+  output_desc.resize(1);
+  DetermineTransformation(ws);
+  TYPE_SWITCH(input.type().id(), type2id, InputType, (uint8_t, int16_t, int32_t, float, float16), (
+      TYPE_SWITCH(output_type_, type2id, OutputType, (uint8_t, int16_t, int32_t, float, float16), (
+          {
+              using Kernel = TheKernel<OutputType, InputType>;
+              kernel_manager_.Initialize<Kernel>();
+              kernels::KernelContext ctx;
+              int nsamples = input.shape().num_samples();
+              TensorListShape<> shapes(nsamples, 3);
+              for (int i = 0; i < nsamples; i++) {
+                const auto tvin = view<const InputType, 3>(input[i]);
+                const auto reqs = kernel_manager_.Setup<Kernel>(i, ctx, tvin, tmatrices_[i],
+                                                                toffsets_[i]);
+                shapes.set_tensor_shape(i, reqs.output_shapes[0].tensor_shape(0));
+              }
+              TypeInfo type;
+              type.SetType<OutputType>(output_type_);
+              output_desc[0] = {shapes, type};
+          }
+      ), DALI_FAIL(make_string("Unsupported output type: ", output_type_)))  // NOLINT
+  ), DALI_FAIL(make_string("Unsupported input type: ", input.type().id())))  // NOLINT
+  return true;
+}
+
+
+void FusedColorTransformCpu::RunImpl(HostWorkspace &ws) {
+  const auto &input = ws.template InputRef<CPUBackend>(0);
+  auto &output = ws.template OutputRef<CPUBackend>(0);
+  auto out_shape = output.shape();
+  output.SetLayout(input.GetLayout());
+  auto &tp = ws.GetThreadPool();
+  TYPE_SWITCH(input.type().id(), type2id, InputType, (uint8_t, int16_t, int32_t, float, float16), (
+      TYPE_SWITCH(output_type_, type2id, OutputType, (uint8_t, int16_t, int32_t, float, float16), (
+          {
+              using Kernel = TheKernel<OutputType, InputType>;
+              for (int i = 0; i < input.shape().num_samples(); i++) {
+                tp.AddWork([&, i](int thread_id) {
+                  kernels::KernelContext ctx;
+                  auto tvin = view<const InputType, 3>(input[i]);
+                  auto tvout = view<OutputType, 3>(output[i]);
+                  kernel_manager_.Run<Kernel>(thread_id, i, ctx, tvout, tvin,
+                                              tmatrices_[i], toffsets_[i]);
+                }, out_shape.tensor_size(i));
+              }
+          }
+      ), DALI_FAIL(make_string("Unsupported output type: ", output_type_)))  // NOLINT
+  ), DALI_FAIL(make_string("Unsupported input type: ", input.type().id())))  // NOLINT
+  tp.RunAll();
+}
+
+}  // namespace dali
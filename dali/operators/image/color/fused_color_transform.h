@@ -0,0 +1,96 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_OPERATORS_IMAGE_COLOR_FUSED_COLOR_TRANSFORM_H_
+#define DALI_OPERATORS_IMAGE_COLOR_FUSED_COLOR_TRANSFORM_H_
+
+#include <string>
+#include <vector>
+#include "dali/core/format.h"
+#include "dali/core/geom/mat.h"
+#include "dali/kernels/kernel_manager.h"
+#include "dali/pipeline/operator/operator.h"
+
+namespace dali {
+namespace color {
+
+/**
+ * Names of the arguments of FusedColorTransform, which are not used by ColorTwist
+ */
+const std::string kStages = "stages";                    // NOLINT
+const std::string kBrightnessShift = "brightness_shift";  // NOLINT
+const std::string kContrastCenter = "contrast_center";   // NOLINT
+
+/**
+ * Maximum number of operators fused into a single FusedColorTransform
+ */
+constexpr int kMaxFusedStages = 4;
+
+/**
+ * Name of the argument of FusedColorTransform, which holds the `arg` of the `stage`-th
+ * fused operator
+ */
+inline std::string stage_arg_name(const std::string &arg, int stage) {
+  return make_string(arg, "_", stage);
+}
+
+}  // namespace color
+
+
+/**
+ * @brief Applies a chain of CPU color operators as a single affine transform
+ *
+ * The operator is not meant to be used directly - it's inserted by the pipeline in place of
+ * a chain of color operators (see `Pipeline::EnableColorOpFusion`). The arguments of the
+ * k-th operator in the chain are passed with a `_k` suffix; the names of the operators
+ * are listed in `stages`.
+ */
+class FusedColorTransformCpu : public Operator<CPUBackend> {
+ public:
+  explicit FusedColorTransformCpu(const OpSpec &spec);
+
+  using Operator<CPUBackend>::RunImpl;
+
+  ~FusedColorTransformCpu() override = default;
+
+  DISABLE_COPY_MOVE_ASSIGN(FusedColorTransformCpu);
+
+ protected:
+  bool CanInferOutputs() const override {
+    return true;
+  }
+
+  bool SetupImpl(std::vector<OutputDesc> &output_desc, const HostWorkspace &ws) override;
+
+  void RunImpl(HostWorkspace &ws) override;
+
+ private:
+  /**
+   * @brief Composes the transforms of the stages, for each sample
+   */
+  void DetermineTransformation(const HostWorkspace &ws);
+
+  std::vector<std::string> stages_;
+  std::vector<DALIDataType> stage_types_;
+  std::vector<float> contrast_centers_;
+  std::vector<float> hue_, saturation_, value_, brightness_, contrast_, brightness_shift_;
+  std::vector<mat3> tmatrices_;
+  std::vector<vec3> toffsets_;
+  DALIDataType output_type_ = DALI_NO_TYPE;
+  kernels::KernelManager kernel_manager_;
+};
+
+}  // namespace dali
+
+#endif  // DALI_OPERATORS_IMAGE_COLOR_FUSED_COLOR_TRANSFORM_H_
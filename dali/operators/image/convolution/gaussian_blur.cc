@@ -19,7 +19,7 @@
 #include <vector>
 
 #include "dali/core/static_switch.h"
-#include "dali/kernels/imgproc/convolution/separable_convolution_cpu.h"
+#include "dali/kernels/imgproc/convolution/gaussian_blur_cpu.h"
 #include "dali/kernels/kernel_manager.h"
 #include "dali/operators/image/convolution/gaussian_blur.h"
 #include "dali/pipeline/data/views.h"
@@ -56,6 +56,12 @@ For example, with ``HWC`` input, you can provide ``sigma=1.0`` or ``sigma=(1.0,
 there are two data axes, H and W.
 
 The same input can be provided as per-sample tensors.
+
+.. note::
+  On the CPU, for the axes with sigma of at least 6 and a window that is not truncated (that is,
+  of size at least ``2 * ceil(3 * sigma) + 1``), a recursive approximation of the Gaussian
+  is used instead of the convolution. Its cost doesn't depend on the sigma and the results
+  differ from the convolution by less than 2% of the input range.
 )code")
     .NumInput(1)
     .NumOutput(1)
@@ -118,7 +124,7 @@ DimDesc ParseAndValidateDim(int ndim, TensorLayout layout) {
 template <typename Out, typename In, int axes, bool has_channels>
 class GaussianBlurOpCpu : public OpImplBase<CPUBackend> {
  public:
-  using Kernel = kernels::SeparableConvolutionCpu<Out, In, float, axes, has_channels>;
+  using Kernel = kernels::GaussianBlurCpu<Out, In, axes, has_channels>;
   static constexpr int ndim = Kernel::ndim;
 
   explicit GaussianBlurOpCpu(const OpSpec& spec, const DimDesc& dim_desc)
@@ -143,7 +149,8 @@ class GaussianBlurOpCpu : public OpImplBase<CPUBackend> {
       windows_[i].PrepareWindows(params_[i]);
       // We take only last `ndim` siginificant dimensions to handle sequences as well
       auto elem_shape = input[i].shape().template last<ndim>();
-      auto& req = kmgr_.Setup<Kernel>(i, ctx_, elem_shape, params_[i].window_sizes);
+      auto& req = kmgr_.Setup<Kernel>(i, ctx_, elem_shape, params_[i].window_sizes,
+                                      params_[i].sigmas);
       // The shape of data stays untouched
       output_desc[0].shape.set_tensor_shape(i, input[i].shape());
     }
@@ -180,7 +187,8 @@ class GaussianBlurOpCpu : public OpImplBase<CPUBackend> {
               // I need a context for that particular run (or rather matching the thread &
               // scratchpad)
               auto ctx = ctx_;
-              kmgr_.Run<Kernel>(thread_id, sample_idx, ctx, out_view, in_view, gaussian_windows);
+              kmgr_.Run<Kernel>(thread_id, sample_idx, ctx, out_view, in_view, gaussian_windows,
+                                params_[sample_idx].sigmas);
             }, elem_volume);
       }
     }
@@ -120,15 +120,18 @@ void CropMirrorNormalize<CPUBackend>::RunImpl(HostWorkspace &ws) {
         using Kernel = kernels::SliceFlipNormalizePermutePadCpu<OutputType, InputType, Dims>;
         using Args = kernels::SliceFlipNormalizePermutePadArgs<Dims>;
         auto &kernel_sample_args = any_cast<std::vector<Args>&>(kernel_sample_args_);
+        int64_t total_size = out_shape.num_elements();
+        int num_tasks = thread_pool.size() * kernels::kTasksPerThread;
         for (int sample_id = 0; sample_id < nsamples; sample_id++) {
-          thread_pool.AddWork(
-            [this, &input, &output, &kernel_sample_args, sample_id](int thread_id) {
-              auto in_view = view<const InputType, Dims>(input[sample_id]);
-              auto out_view = view<OutputType, Dims>(output[sample_id]);
-              auto &args = kernel_sample_args[sample_id];
-              kernels::KernelContext ctx;
-              kmgr_.Run<Kernel>(thread_id, sample_id, ctx, out_view, in_view, args);
-            }, out_shape.tensor_size(sample_id));
+          auto in_view = view<const InputType, Dims>(input[sample_id]);
+          auto out_view = view<OutputType, Dims>(output[sample_id]);
+          auto &args = kernel_sample_args[sample_id];
+          kernels::KernelContext ctx;
+          // Large samples are split into blocks, so that all the threads can be used
+          int64_t nblocks = kernels::NumSampleBlocks(out_shape.tensor_size(sample_id), total_size,
+                                                     num_tasks);
+          kmgr_.Get<Kernel>(sample_id).Schedule(ctx, out_view, in_view, args, thread_pool,
+                                                nblocks);
         }
       ), DALI_FAIL(make_string("Not supported number of dimensions:", ndim));); // NOLINT
     ), DALI_FAIL(make_string("Not supported output type:", output_type_));); // NOLINT
@@ -17,7 +17,11 @@
 namespace dali {
 
 DALI_SCHEMA(PeekImageShape)
-  .DocStr(R"code(Obtains the shape of the encoded image.)code")
+  .DocStr(R"code(Obtains the shape of the encoded image.
+
+Only the header of the image is parsed - no pixel data is decoded.
+Supported formats: JPEG, PNG, BMP, PNM, TIFF and JPEG 2000.
+The output is ``[height, width, channels]``.)code")
   .NumInput(1)
   .NumOutput(1)
   .AddOptionalArg("type", R"code(Data type, to which the sizes are converted.)code", DALI_INT64);
@@ -83,14 +83,13 @@ class PeekImageShape : public Operator<CPUBackend> {
                       "Input must be 1D encoded jpeg string.");
         DALI_ENFORCE(IsType<uint8>(image.type()),
                       "Input must be stored as uint8 data.");
-        auto img = ImageFactory::CreateImage(image.data<uint8>(), image.size(), {});
-        auto shape = img->PeekShape();
+        auto shape = ImageFactory::PeekShape(image.data<uint8>(), image.size());
         TYPE_SWITCH(output_type_, type2id, type,
                 (int32_t, uint32_t, int64_t, uint64_t, float, double),
           (WriteShape<type>(output[sample_id], shape);),
           (DALI_FAIL(make_string("Unsupported type for Shapes: ", output_type_))));
       }, 0);
-      // the amount of work depends on the image format and exact sample which is unknown here
+      // only the headers are parsed, so the amount of work is roughly the same for all samples
     }
     thread_pool.RunAll();
   }
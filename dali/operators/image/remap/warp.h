@@ -156,19 +156,24 @@ class WarpOpImpl : public OpImplInterface<Backend> {
     ThreadPool &pool = ws.GetThreadPool();
     auto interp_types = param_provider_->InterpTypes();
 
+    int64_t total_size = output.shape.num_elements();
+    int num_tasks = pool.size() * kernels::kTasksPerThread;
+    auto context = GetContext(ws);
     for (int i = 0; i < input_.num_samples(); i++) {
-      pool.AddWork([&, i](int tid) {
-        DALIInterpType interp_type = interp_types.size() > 1 ? interp_types[i] : interp_types[0];
-        auto context = GetContext(ws);
-        kmgr_.Run<Kernel>(
-            tid, i, context,
-            output[i],
-            input_[i],
-            *param_provider_->ParamsCPU()(i),
-            param_provider_->OutputSizes()[i],
-            interp_type,
-            param_provider_->Border());
-      }, output.shape.tensor_size(i));
+      DALIInterpType interp_type = interp_types.size() > 1 ? interp_types[i] : interp_types[0];
+      // Large samples are split into blocks, so that all the threads can be used
+      int64_t nblocks = kernels::NumSampleBlocks(output.shape.tensor_size(i), total_size,
+                                                 num_tasks);
+      kmgr_.Get<Kernel>(i).Schedule(
+          context,
+          output[i],
+          input_[i],
+          *param_provider_->ParamsCPU()(i),
+          param_provider_->OutputSizes()[i],
+          interp_type,
+          param_provider_->Border(),
+          pool,
+          nblocks);
     }
     pool.RunAll();
   }
@@ -23,6 +23,7 @@
 #include <cmath>
 #include <vector>
 #include "dali/operators/image/resize/resize_op_impl.h"
+#include "dali/kernels/common/split_shape.h"
 #include "dali/kernels/imgproc/resample_cpu.h"
 
 namespace dali {
@@ -41,6 +42,9 @@ class ResizeOpImplCPU : public ResizeBase<CPUBackend>::Impl {
   /// Dimensionality of each separate frame. If input contains no channel dimension, one is added
   static constexpr int frame_ndim = spatial_ndim + 1;
 
+  /// Frames are split into slabs of (at least) this many output elements
+  static constexpr int64_t kSlabVolume = 1 << 18;
+
   void Setup(TensorListShape<> &out_shape,
              const TensorListShape<> &in_shape,
              int first_spatial_dim,
@@ -63,14 +67,18 @@ class ResizeOpImplCPU : public ResizeBase<CPUBackend>::Impl {
   }
 
   void SetupKernel() {
-    const int dim = in_shape_.sample_dim();
     kernels::KernelContext ctx;
 
-    for (int i = 0; i < GetNumFrames(); i++) {
+    for (int b = 0; b < GetNumBlocks(); b++) {
+      const FrameBlock &blk = blocks_[b];
       kernels::InTensorCPU<In, frame_ndim> dummy_input;
-      dummy_input.shape = in_shape_[i];
-      kernels::KernelRequirements &req = kmgr_.Setup<Kernel>(i, ctx, dummy_input, params_[i]);
-      assert(req.output_shapes[0][0] == out_shape_[i]);
+      dummy_input.shape = in_shape_[blk.frame_idx];
+      auto &params = params_[blk.frame_idx];
+      bool whole_frame = blk.start == 0 && blk.end == out_shape_[blk.frame_idx][0];
+      kernels::KernelRequirements &req = whole_frame
+          ? kmgr_.Setup<Kernel>(b, ctx, dummy_input, params)
+          : kmgr_.Setup<Kernel>(b, ctx, dummy_input, params, blk.start, blk.end);
+      assert(req.output_shapes[0][0][0] == blk.end - blk.start);
     }
   }
 
@@ -84,34 +92,87 @@ class ResizeOpImplCPU : public ResizeBase<CPUBackend>::Impl {
 
     ThreadPool &tp = ws.GetThreadPool();
 
-    for (int i = 0; i < GetNumFrames(); i++) {
-      auto work = [&, i](int tid) {
+    for (int b = 0; b < GetNumBlocks(); b++) {
+      auto work = [&, b](int tid) {
         kernels::KernelContext ctx;
-        auto out_frame = out_frames_view[i];
-        auto in_frame = in_frames_view[i];
-        kmgr_.Run<Kernel>(tid, i, ctx, out_frame, in_frame, params_[i]);
+        const FrameBlock &blk = blocks_[b];
+        auto out_frame = out_frames_view[blk.frame_idx];
+        auto in_frame = in_frames_view[blk.frame_idx];
+        // the block is a slab of the output frame - it's contiguous
+        auto out_block = out_frame;
+        out_block.data += blk.start * volume(out_frame.shape.last(frame_ndim - 1));
+        out_block.shape[0] = blk.end - blk.start;
+        kmgr_.Run<Kernel>(tid, b, ctx, out_block, in_frame, params_[blk.frame_idx]);
       };
-
-      double out_size = volume(out_frames_view.shape.tensor_shape_span(i));
-      double in_size = volume(in_frames_view.shape.tensor_shape_span(i));
-      double cost = 0;
-      double root = 1.0 / spatial_ndim;
-      for (int i = 0; i < spatial_ndim; i++) {
-        // Approximation for isotropic scaling - each resize stage takes time
-        // proportional to the output size of the stage, and the scaling volume ratio
-        // is divided equally (geometrically) among stages. Hence, the weighted
-        // geometric mean of rank spatial_ndim_.
-        //
-        // NOTE: This does not account for cost of antialiasing!
-        cost += std::pow(std::pow(out_size, spatial_ndim - i) * pow(in_size, i), root);
-      }
-      tp.AddWork(work, std::llround(cost));
+      tp.AddWork(work, std::llround(blocks_[b].cost));
     }
     tp.RunAll();
   }
 
-  void OnNumFramesUpdated() {
+  double FrameCost(int frame_idx) const {
+    double out_size = volume(out_shape_.tensor_shape_span(frame_idx));
+    double in_size = volume(in_shape_.tensor_shape_span(frame_idx));
+    double cost = 0;
+    double root = 1.0 / spatial_ndim;
+    for (int i = 0; i < spatial_ndim; i++) {
+      // Approximation for isotropic scaling - each resize stage takes time
+      // proportional to the output size of the stage, and the scaling volume ratio
+      // is divided equally (geometrically) among stages. Hence, the weighted
+      // geometric mean of rank spatial_ndim_.
+      //
+      // NOTE: This does not account for cost of antialiasing!
+      cost += std::pow(std::pow(out_size, spatial_ndim - i) * pow(in_size, i), root);
+    }
+    return cost;
+  }
+
+  /**
+   * @brief Splits large frames into slabs along the outermost spatial dimension
+   *
+   * Each slab is resized by a separate kernel instance, which processes only the part of
+   * the input which affects the slab. The source coordinates, filters and processing order
+   * are the same as for the whole frame, so the result is identical to an unsplit resize.
+   *
+   * The number of slabs depends only on the frame itself, not on the number of threads or
+   * the rest of the batch.
+   * Nearest neighbour resampling is not split - it's cheap and its source coordinates are
+   * accumulated from the first row.
+   */
+  void SplitFrames() {
     int N = GetNumFrames();
+    blocks_.clear();
+    for (int i = 0; i < N; i++) {
+      auto frame_shape = out_shape_[i];
+      double cost = FrameCost(i);
+      int64_t nblocks = CanSplit(params_[i]) ? volume(frame_shape) / kSlabVolume : 1;
+      TensorShape<frame_ndim> split_factor;
+      // only the outermost dimension is split
+      kernels::split_shape(split_factor, frame_shape, nblocks, kSlabVolume, ~uint64_t(1));
+      int64_t out_extent = frame_shape[0];
+      kernels::ForEachBlock(frame_shape, split_factor,
+        [&](const TensorShape<frame_ndim> &start, const TensorShape<frame_ndim> &end) {
+          FrameBlock blk;
+          blk.frame_idx = i;
+          blk.start = start[0];
+          blk.end = end[0];
+          blk.cost = out_extent > 0 ? cost * (blk.end - blk.start) / out_extent : 0;
+          blocks_.push_back(blk);
+        });
+    }
+  }
+
+  static bool CanSplit(const ResamplingParamsND<spatial_ndim> &params) {
+    for (auto &p : params) {
+      if (p.min_filter.type == kernels::ResamplingFilterType::Nearest ||
+          p.mag_filter.type == kernels::ResamplingFilterType::Nearest)
+        return false;
+    }
+    return true;
+  }
+
+  void OnNumFramesUpdated() {
+    SplitFrames();
+    int N = GetNumBlocks();
     if (static_cast<int>(kmgr_.NumInstances()) < N)
       kmgr_.Resize<Kernel>(kmgr_.NumThreads(), N);
   }
@@ -120,10 +181,23 @@ class ResizeOpImplCPU : public ResizeBase<CPUBackend>::Impl {
     return in_shape_.num_samples();
   }
 
+  int GetNumBlocks() const {
+    return blocks_.size();
+  }
+
+  /// A slab of an output frame, resized by a separate kernel instance
+  struct FrameBlock {
+    int frame_idx;
+    int64_t start, end;  // extent along the outermost spatial dimension of the output
+    double cost;
+  };
+
   kernels::KernelManager &kmgr_;
 
   TensorListShape<frame_ndim> in_shape_, out_shape_;
   std::vector<ResamplingParamsND<spatial_ndim>> params_;
+
+  std::vector<FrameBlock> blocks_;
 };
 
 }  // namespace dali
@@ -138,6 +138,21 @@ preprocessed COCO annotations.)code",
     std::string())
   .DeprecateArgInFavorOf("dump_meta_files_path",
                          "save_preprocessed_annotations_dir")  // deprecated since 0.28dev
+  .AddOptionalArg("aspect_ratio_buckets",
+      R"code(If a value greater than 0 is provided, the samples are ordered by the aspect ratio of
+the images (taken from the ``width`` and ``height`` fields of the annotations), so that the images
+in a batch have similar aspect ratios and require little padding after resizing.
+
+The samples are divided into ``aspect_ratio_buckets`` buckets of similar aspect ratio. With
+``shuffle_after_epoch=True``, the samples are shuffled within the buckets and the order of the
+batches is shuffled after each epoch. Otherwise, the samples are returned in the order of increasing
+aspect ratio. Each shard reads a contiguous part of the same global order, so for the best results
+the number of samples in a shard should be a multiple of the batch size.
+
+This option cannot be used together with ``random_shuffle``. When reading
+``preprocessed_annotations``, they must have been saved by a version of DALI which supports
+this option.)code",
+      0)
   .AdditionalOutputsFn([](const OpSpec& spec) {
       return OutPolygonMasksEnabled(spec) * 2 +
              OutPixelwiseMasksEnabled(spec) +
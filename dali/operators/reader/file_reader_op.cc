@@ -98,6 +98,27 @@ This argument is mutually exclusive with ``file_list``.)", nullptr)
 ``files`` argument.
 
 If not used, sequential 0-based indices are used as labels)", nullptr)
+  .AddOptionalArg("aspect_ratio_buckets",
+      R"(If a value greater than 0 is provided, the samples are ordered by the aspect ratio of
+the images, read from ``shape_index``, so that the images in a batch have similar aspect ratios
+and require little padding after resizing.
+
+The samples are divided into ``aspect_ratio_buckets`` buckets of similar aspect ratio. With
+``shuffle_after_epoch=True``, the samples are shuffled within the buckets and the order of the
+batches is shuffled after each epoch. Otherwise, the samples are returned in the order of increasing
+aspect ratio. Each shard reads a contiguous part of the same global order, so for the best results
+the number of samples in a shard should be a multiple of the batch size.
+
+This option cannot be used together with ``random_shuffle``.)",
+      0)
+  .AddOptionalArg<string>("shape_index",
+      R"(Path to a text file with the shapes of the images, used by ``aspect_ratio_buckets``.
+
+The file contains one whitespace-separated ``filename height width channels`` entry per line,
+where the file names are the same as the ones listed by the reader (relative to ``file_root``).
+Such an index can be created, without decoding the images, with ``tools/image_shape_index.py``.
+The files missing from the index are grouped together, at the beginning of the order.)",
+      nullptr)
   .AddParent("LoaderBase");
 
 }  // namespace dali
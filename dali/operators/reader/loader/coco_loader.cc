@@ -415,6 +415,7 @@ void CocoLoader::SavePreprocessedAnnotations(const std::string &path,
   SaveToFile(labels_, path + "/labels.dat");
   SaveToFile(counts_, path + "/counts.dat");
   SaveToFile(image_id_pairs, path + "/filenames.dat");
+  SaveToFile(aspect_ratios_, path + "/aspect_ratios.dat");
 
   if (output_polygon_masks_ || output_pixelwise_masks_) {
     SaveToFile(polygon_data_, path + "/polygon_data.dat");
@@ -450,6 +451,7 @@ void CocoLoader::ParsePreprocessedAnnotations() {
   LoadFromFile(labels_, path + "/labels.dat");
   LoadFromFile(counts_, path + "/counts.dat");
   LoadFromFile(image_label_pairs_, path + "/filenames.dat");
+  LoadFromFile(aspect_ratios_, path + "/aspect_ratios.dat");
 
   if (output_polygon_masks_ || output_pixelwise_masks_) {
     LoadFromFile(polygon_data_, path + "/polygon_data.dat");
@@ -591,6 +593,9 @@ void CocoLoader::ParseJsonAnnotations() {
         }
       }
 
+      aspect_ratios_.push_back(image_info.height_ > 0
+                               ? static_cast<float>(image_info.width_) / image_info.height_
+                               : 0.0f);
       image_label_pairs_.emplace_back(std::move(image_info.filename_), new_image_id);
       new_image_id++;
     }
@@ -180,7 +180,12 @@ class DLL_PUBLIC CocoLoader : public FileLabelLoader {
     }
 
     DALI_ENFORCE(Size() > 0, "No files found.");
-    if (shuffle_) {
+    if (aspect_ratio_buckets_ > 0) {
+      DALI_ENFORCE(aspect_ratios_.size() == image_label_pairs_.size(),
+          "The preprocessed annotations don't contain the aspect ratios of the images, which "
+          "are required by `aspect_ratio_buckets`. Please, preprocess the annotations again.");
+      BucketSamples(kDaliDataloaderSeed, false);
+    } else if (shuffle_) {
       // seeded with hardcoded value to get
       // the same sequence on every shard
       std::mt19937 g(kDaliDataloaderSeed);
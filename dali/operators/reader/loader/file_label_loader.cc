@@ -12,7 +12,14 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
+#include <cassert>
+#include <cctype>
+#include <fstream>
 #include <memory>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
 
 #include "dali/core/common.h"
 #include "dali/operators/reader/loader/file_label_loader.h"
@@ -77,6 +84,72 @@ void FileLabelLoader::ReadSample(ImageLabelWrapper &image_label) {
   image_label.image.SetMeta(meta);
 }
 
+void FileLabelLoader::LoadAspectRatios() {
+  DALI_ENFORCE(has_shape_index_arg_, "`aspect_ratio_buckets` requires a `shape_index`.");
+  std::ifstream s(shape_index_);
+  DALI_ENFORCE(s.is_open(), "Cannot open: " + shape_index_);
+
+  // The index contains lines: `<relative path> <height> <width> <channels>`.
+  // The path can contain spaces, so the line is parsed backwards.
+  std::unordered_map<string, float> index;
+  string line;
+  for (int n = 1; std::getline(s, line); n++) {
+    int i = static_cast<int>(line.size()) - 1;
+    for (; i >= 0 && isspace(line[i]); i--) {}
+    if (i < 0)  // empty line - skip
+      continue;
+    int64_t dims[3];
+    int field = 2;
+    for (; field >= 0; field--) {
+      int end = i + 1;
+      for (; i >= 0 && isdigit(line[i]); i--) {}
+      if (i + 1 == end)
+        break;
+      dims[field] = std::stoll(line.substr(i + 1, end - i - 1));
+      for (; i >= 0 && isspace(line[i]); i--) {}
+    }
+    DALI_ENFORCE(field < 0 && i >= 0,
+                 make_string("Incorrect format of the shape index \"", shape_index_, "\":", n,
+                             " expected file name followed by height, width and number of "
+                             "channels; got: ", line));
+    int64_t h = dims[0], w = dims[1];
+    index[line.substr(0, i + 1)] = h > 0 ? static_cast<float>(w) / h : 0.0f;
+  }
+
+  // Samples missing from the index get the aspect ratio of 0 and are grouped together
+  int64_t missing = 0;
+  aspect_ratios_.resize(image_label_pairs_.size());
+  for (size_t i = 0; i < image_label_pairs_.size(); i++) {
+    auto it = index.find(image_label_pairs_[i].first);
+    if (it == index.end()) {
+      aspect_ratios_[i] = 0.0f;
+      missing++;
+    } else {
+      aspect_ratios_[i] = it->second;
+    }
+  }
+  if (missing > 0) {
+    DALI_WARN(make_string(missing, " out of ", image_label_pairs_.size(),
+                          " files were not found in the shape index \"", shape_index_, "\"."));
+  }
+}
+
+void FileLabelLoader::BucketSamples(int64_t seed, bool shuffle) {
+  assert(aspect_ratios_.size() == image_label_pairs_.size());
+  auto order = BucketedOrder(make_cspan(aspect_ratios_), aspect_ratio_buckets_, batch_size_,
+                             shuffle, seed);
+  vector<std::pair<string, int>> pairs;
+  vector<float> aspect_ratios;
+  pairs.reserve(order.size());
+  aspect_ratios.reserve(order.size());
+  for (auto idx : order) {
+    pairs.push_back(std::move(image_label_pairs_[idx]));
+    aspect_ratios.push_back(aspect_ratios_[idx]);
+  }
+  image_label_pairs_ = std::move(pairs);
+  aspect_ratios_ = std::move(aspect_ratios);
+}
+
 Index FileLabelLoader::SizeImpl() {
   return static_cast<Index>(image_label_pairs_.size());
 }
@@ -29,6 +29,7 @@
 #include "dali/core/common.h"
 #include "dali/operators/reader/loader/loader.h"
 #include "dali/operators/reader/loader/filesystem.h"
+#include "dali/operators/reader/loader/metadata_cache.h"
 #include "dali/util/file.h"
 
 namespace dali {
@@ -46,7 +47,8 @@ class DLL_PUBLIC FileLabelLoader : public Loader<CPUBackend, ImageLabelWrapper>
     : Loader<CPUBackend, ImageLabelWrapper>(spec),
       shuffle_after_epoch_(shuffle_after_epoch),
       current_index_(0),
-      current_epoch_(0) {
+      current_epoch_(0),
+      metadata_cache_(spec, "file_label_loader") {
 
       vector<string> files;
       vector<int> labels;
@@ -55,6 +57,8 @@ class DLL_PUBLIC FileLabelLoader : public Loader<CPUBackend, ImageLabelWrapper>
       has_labels_arg_ = spec.TryGetRepeatedArgument(labels, "labels");
       has_file_list_arg_ = spec.TryGetArgument(file_list_, "file_list");
       has_file_root_arg_ = spec.TryGetArgument(file_root_, "file_root");
+      spec.TryGetArgument(aspect_ratio_buckets_, "aspect_ratio_buckets");
+      has_shape_index_arg_ = spec.TryGetArgument(shape_index_, "shape_index");
 
       DALI_ENFORCE(has_file_root_arg_ || has_files_arg_ || has_file_list_arg_,
         "``file_root`` argument is required when not using ``files`` or ``file_list``.");
@@ -106,6 +110,13 @@ class DLL_PUBLIC FileLabelLoader : public Loader<CPUBackend, ImageLabelWrapper>
       if (shuffle_after_epoch_) {
         stick_to_shard_ = true;
       }
+
+      DALI_ENFORCE(aspect_ratio_buckets_ >= 0, "`aspect_ratio_buckets` must not be negative");
+      if (aspect_ratio_buckets_ > 0) {
+        DALI_ENFORCE(!shuffle_, "`aspect_ratio_buckets` cannot be used with `random_shuffle`. "
+                     "Use `shuffle_after_epoch` to shuffle the samples within the buckets.");
+        batch_size_ = spec.GetArgument<int>("batch_size");
+      }
     if (!dont_use_mmap_) {
       mmap_reserver_ = FileStream::MappingReserver(
                                   static_cast<unsigned int>(initial_buffer_fill_));
@@ -121,7 +132,22 @@ class DLL_PUBLIC FileLabelLoader : public Loader<CPUBackend, ImageLabelWrapper>
 
   void PrepareMetadataImpl() override {
     if (image_label_pairs_.empty()) {
-      if (!has_file_list_arg_ && !has_files_arg_) {
+      if (metadata_cache_.IsEnabled()) {
+        metadata_cache_.AddKey("file_root", file_root_);
+        if (has_file_list_arg_) {
+          metadata_cache_.AddFile(file_list_);
+        } else {
+          metadata_cache_.AddDirectory(file_root_);
+        }
+      }
+      bool from_cache = metadata_cache_.Load([&](std::istream &is) {
+        vector<std::pair<string, int>> pairs;
+        metadata_cache::Read(is, pairs);
+        image_label_pairs_ = std::move(pairs);
+      });
+      if (from_cache) {
+        // the file list was restored from the metadata cache
+      } else if (!has_file_list_arg_ && !has_files_arg_) {
         image_label_pairs_ = filesystem::traverse_directories(file_root_);
       } else if (has_file_list_arg_) {
         // load (path, label) pairs from list
@@ -164,10 +190,18 @@ class DLL_PUBLIC FileLabelLoader : public Loader<CPUBackend, ImageLabelWrapper>
 
         DALI_ENFORCE(s.eof(), "Wrong format of file_list: " + file_list_);
       }
+      if (!from_cache) {
+        metadata_cache_.Store([&](std::ostream &os) {
+          metadata_cache::Write(os, image_label_pairs_);
+        });
+      }
     }
     DALI_ENFORCE(Size() > 0, "No files found.");
 
-    if (shuffle_) {
+    if (aspect_ratio_buckets_ > 0) {
+      LoadAspectRatios();
+      BucketSamples(kDaliDataloaderSeed, false);
+    } else if (shuffle_) {
       // seeded with hardcoded value to get
       // the same sequence on every shard
       std::mt19937 g(kDaliDataloaderSeed);
@@ -176,6 +210,18 @@ class DLL_PUBLIC FileLabelLoader : public Loader<CPUBackend, ImageLabelWrapper>
     Reset(true);
   }
 
+  /**
+   * @brief Fills `aspect_ratios_` with the aspect ratios (width / height) of the samples,
+   *        taken from the `shape_index`
+   */
+  void LoadAspectRatios();
+
+  /**
+   * @brief Orders the samples (and their aspect ratios), so that the samples in a batch have
+   *        similar aspect ratios; optionally shuffles them within the buckets
+   */
+  void BucketSamples(int64_t seed, bool shuffle);
+
   void Reset(bool wrap_to_shard) override {
     if (wrap_to_shard) {
       current_index_ = start_index(shard_id_, num_shards_, Size());
@@ -186,8 +232,12 @@ class DLL_PUBLIC FileLabelLoader : public Loader<CPUBackend, ImageLabelWrapper>
     current_epoch_++;
 
     if (shuffle_after_epoch_) {
-      std::mt19937 g(kDaliDataloaderSeed + current_epoch_);
-      std::shuffle(image_label_pairs_.begin(), image_label_pairs_.end(), g);
+      if (aspect_ratio_buckets_ > 0) {
+        BucketSamples(kDaliDataloaderSeed + current_epoch_, true);
+      } else {
+        std::mt19937 g(kDaliDataloaderSeed + current_epoch_);
+        std::shuffle(image_label_pairs_.begin(), image_label_pairs_.end(), g);
+      }
     }
   }
 
@@ -196,16 +246,24 @@ class DLL_PUBLIC FileLabelLoader : public Loader<CPUBackend, ImageLabelWrapper>
 
   string file_root_, file_list_;
   vector<std::pair<string, int>> image_label_pairs_;
+  /// Aspect ratios of the samples in `image_label_pairs_`; used only for bucketing
+  vector<float> aspect_ratios_;
+
+  string shape_index_;
+  int aspect_ratio_buckets_ = 0;
+  int batch_size_ = 1;
 
   bool has_files_arg_     = false;
   bool has_labels_arg_    = false;
   bool has_file_list_arg_ = false;
   bool has_file_root_arg_ = false;
+  bool has_shape_index_arg_ = false;
 
   bool shuffle_after_epoch_;
   Index current_index_;
   int current_epoch_;
   FileStream::MappingReserver mmap_reserver_;
+  MetadataCache metadata_cache_;
 };
 
 }  // namespace dali
@@ -71,7 +71,20 @@ the file in memory.
 
 Mapping provides a small performance benefit when accessing a local file system, but most network file
 systems, do not provide optimum performance.
-)code", false);
+)code", false)
+.AddOptionalArg("metadata_cache_dir",
+      R"code(Directory used to cache the dataset metadata (such as file lists or parsed manifests)
+between runs.
+
+When set, the metadata prepared by the reader is stored in this directory and reused by later
+instances of the reader that use the same arguments, which makes building the pipeline
+faster for large datasets. An entry is invalidated when any of the files it was built from
+(for example, ``file_list`` or the ``file_root`` directory) is modified.
+The cache is disabled when the argument is empty.
+
+.. note::
+  Only some readers support the metadata cache. The argument is ignored by the others.)code",
+      std::string());
 
 size_t start_index(const size_t shard_id,
                    const size_t shard_num,
@@ -32,6 +32,7 @@
 #include "dali/pipeline/operator/op_spec.h"
 #include "dali/pipeline/data/tensor.h"
 #include "dali/operators/decoder/cache/image_cache_factory.h"
+#include "dali/util/io_stats.h"
 
 namespace dali {
 
@@ -122,6 +123,8 @@ class Loader {
       PrepareMetadata();
     }
     DomainTimeRange tr("[DALI][Loader] ReadOne", DomainTimeRange::kGreen1);
+    // the reads done by the file streams are reported to this loader
+    IOStatsScope io_stats_scope(&io_stats_);
     // perform an initial buffer fill if it hasn't already happened
     if (!initial_buffer_filled_) {
       DomainTimeRange tr("[DALI][Loader] Filling initial buffer", DomainTimeRange::kBlue1);
@@ -250,6 +253,18 @@ class Loader {
     return stick_to_shard_;
   }
 
+  /**
+   * @brief I/O statistics of the reads done by the loader; the epochs are counted when the
+   *        loader wraps around its shard
+   */
+  IOStats &GetIOStats() {
+    return io_stats_;
+  }
+
+  const IOStats &GetIOStats() const {
+    return io_stats_;
+  }
+
  protected:
   virtual Index SizeImpl() = 0;
 
@@ -292,6 +307,9 @@ class Loader {
       Index curr_elms = shards_.back().end;
       shards_.push_back({curr_elms, curr_elms});
     }
+    // the last sample of the shard has been read
+    if (IsNextShardRelative(read_sample_counter_, virtual_shard_id_))
+      io_stats_.EndEpoch();
   }
 
   bool ShouldSkipImage(const ImageCache::ImageKey& key) {
@@ -306,7 +324,10 @@ class Loader {
       if (image_cache_factory.IsInitialized(device_id_))
         cache_ = image_cache_factory.Get(device_id_);
     });
-    return cache_ && cache_->IsCached(key);
+    bool cached = cache_ && cache_->IsCached(key);
+    if (cached)
+      io_stats_.RecordCacheHit();
+    return cached;
   }
 
   std::vector<LoadTargetUniquePtr> sample_buffer_;
@@ -378,6 +399,8 @@ class Loader {
   };
 
   std::deque<ShardBoundaries> shards_;
+
+  IOStats io_stats_;
 };
 
 template<typename T, typename... Args>
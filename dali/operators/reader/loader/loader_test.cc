@@ -13,7 +13,16 @@
 // limitations under the License.
 
 #include <gtest/gtest.h>
+#include <stdlib.h>
+#include <unistd.h>
+#include <cstdio>
+#include <fstream>
+#include <algorithm>
 #include <memory>
+#include <set>
+#include <string>
+#include <utility>
+#include <vector>
 
 #include "dali/core/common.h"
 #include "dali/pipeline/data/backend.h"
@@ -25,6 +34,8 @@
 #include "dali/operators/reader/loader/recordio_loader.h"
 #include "dali/operators/reader/loader/indexed_file_loader.h"
 #include "dali/operators/reader/loader/coco_loader.h"
+#include "dali/operators/reader/loader/metadata_cache.h"
+#include "dali/operators/reader/loader/utils.h"
 
 #if BUILD_LMDB_ENABLED
 #include "dali/operators/reader/loader/lmdb.h"
@@ -153,6 +164,53 @@ TYPED_TEST(DataLoadStoreTest, LoaderTest) {
   }
 }
 
+TYPED_TEST(DataLoadStoreTest, FileLabelLoaderMetadataCache) {
+  std::string tmpl = "/tmp/metadata_cache_test_XXXXXX";
+  std::string tmp_dir = mkdtemp(&tmpl[0]);
+
+  auto make_reader = [&]() {
+    return std::make_shared<FileLabelLoader>(
+        OpSpec("FileReader")
+        .AddArg("file_root", loader_test_image_folder)
+        .AddArg("batch_size", 32)
+        .AddArg("device_id", 0)
+        .AddArg("metadata_cache_dir", tmp_dir));
+  };
+
+  auto reader1 = make_reader();
+  reader1->PrepareMetadata();
+
+  MetadataCache cache(OpSpec("FileReader").AddArg("metadata_cache_dir", tmp_dir),
+                      "file_label_loader");
+  cache.AddKey("file_root", loader_test_image_folder);
+  cache.AddDirectory(loader_test_image_folder);
+  std::vector<std::pair<std::string, int>> cached;
+  ASSERT_TRUE(cache.Load([&](std::istream &is) { metadata_cache::Read(is, cached); }));
+  EXPECT_EQ(static_cast<Index>(cached.size()), reader1->Size());
+
+  auto reader2 = make_reader();
+  reader2->PrepareMetadata();
+  ASSERT_EQ(reader1->Size(), reader2->Size());
+  for (int i = 0; i < 11; ++i) {
+    auto sample1 = reader1->ReadOne(false);
+    auto sample2 = reader2->ReadOne(false);
+    EXPECT_EQ(sample1->label, sample2->label);
+    EXPECT_EQ(sample1->image.GetSourceInfo(), sample2->image.GetSourceInfo());
+  }
+
+  // a corrupted entry is ignored and the metadata is built from scratch
+  {
+    std::ofstream os(cache.EntryPath(), std::ios::binary | std::ios::trunc);
+    os << "garbage";
+  }
+  auto reader3 = make_reader();
+  reader3->PrepareMetadata();
+  EXPECT_EQ(reader1->Size(), reader3->Size());
+
+  std::remove(cache.EntryPath().c_str());
+  rmdir(tmp_dir.c_str());
+}
+
 TYPED_TEST(DataLoadStoreTest, LoaderTestFail) {
   shared_ptr<dali::FileLabelLoader> reader(
       new FileLabelLoader(OpSpec("FileReader")
@@ -162,6 +220,99 @@ TYPED_TEST(DataLoadStoreTest, LoaderTestFail) {
   ASSERT_THROW(reader->PrepareMetadata(), std::runtime_error);
 }
 
+TEST(BucketedOrderTest, SortedAndShuffledWithinBuckets) {
+  std::vector<float> keys(100);
+  for (int i = 0; i < 100; i++)
+    keys[i] = (i * 37) % 100;  // a permutation of 0..99
+
+  auto sorted = BucketedOrder(make_cspan(keys), 4, 8, false, 123);
+  ASSERT_EQ(sorted.size(), keys.size());
+  for (size_t i = 1; i < sorted.size(); i++)
+    EXPECT_LE(keys[sorted[i - 1]], keys[sorted[i]]);
+
+  auto order = BucketedOrder(make_cspan(keys), 4, 8, true, 123);
+  EXPECT_EQ(order, BucketedOrder(make_cspan(keys), 4, 8, true, 123));
+  EXPECT_NE(order, BucketedOrder(make_cspan(keys), 4, 8, true, 124));
+  EXPECT_NE(order, sorted);
+  std::set<int64_t> unique(order.begin(), order.end());
+  EXPECT_EQ(unique.size(), keys.size());
+
+  // Each full batch comes from a single bucket of 25 keys (unless it spans a bucket boundary),
+  // so the keys in a batch differ by less than the size of two buckets
+  for (size_t b = 0; b + 8 <= order.size(); b += 8) {
+    auto minmax = std::minmax_element(order.begin() + b, order.begin() + b + 8,
+                                      [&](int64_t x, int64_t y) { return keys[x] < keys[y]; });
+    EXPECT_LT(keys[*minmax.second] - keys[*minmax.first], 50);
+  }
+}
+
+class BucketedFileLabelLoader : public FileLabelLoader {
+ public:
+  using FileLabelLoader::FileLabelLoader;
+  const vector<std::pair<string, int>> &samples() const { return image_label_pairs_; }
+  void NextEpoch() { Reset(true); }
+};
+
+TYPED_TEST(DataLoadStoreTest, FileLoaderAspectRatioBuckets) {
+  std::vector<std::string> files;
+  char tmp_name[] = "/tmp/dali_shape_index_XXXXXX";
+  int fd = mkstemp(tmp_name);
+  ASSERT_GE(fd, 0);
+  close(fd);
+  {
+    std::ofstream index(tmp_name);
+    for (int i = 0; i < 64; i++) {
+      files.push_back(make_string("dir ", i % 3, "/img", i, ".jpg"));
+      if (i != 5)  // one file is missing from the index
+        index << files.back() << " " << 100 << " " << 50 + (i * 29) % 64 * 5 << " 3\n";
+    }
+  }
+
+  auto make_reader = [&](int shard_id) {
+    return std::make_shared<BucketedFileLabelLoader>(
+        OpSpec("FileReader")
+        .AddArg("files", files)
+        .AddArg("shape_index", std::string(tmp_name))
+        .AddArg("aspect_ratio_buckets", 4)
+        .AddArg("shard_id", shard_id)
+        .AddArg("num_shards", 2)
+        .AddArg("batch_size", 8)
+        .AddArg("device_id", 0), true);
+  };
+  auto reader0 = make_reader(0);
+  auto reader1 = make_reader(1);
+  reader0->PrepareMetadata();
+  reader1->PrepareMetadata();
+  std::remove(tmp_name);
+  ASSERT_EQ(reader0->Size(), 64);
+
+  auto width = [&](const std::pair<string, int> &sample) {
+    int i = sample.second;  // the labels are the indices in `files`
+    return i == 5 ? 0 : 50 + (i * 29) % 64 * 5;
+  };
+
+  vector<std::pair<string, int>> prev;
+  for (int epoch = 0; epoch < 3; epoch++) {
+    auto &samples = reader0->samples();
+    // all the shards use the same global order
+    EXPECT_EQ(samples, reader1->samples());
+    EXPECT_NE(samples, prev);
+    // 4 buckets of 16 samples (widths spanning 75 pixels) - each batch of 8 comes from
+    // a single bucket; the sample missing from the index has a width of 0 and is in the first one
+    for (int b = 0; b < 64; b += 8) {
+      int lo = width(samples[b]), hi = lo;
+      for (int i = b; i < b + 8; i++) {
+        lo = std::min(lo, width(samples[i]));
+        hi = std::max(hi, width(samples[i]));
+      }
+      EXPECT_LE(hi - lo, 120) << "epoch " << epoch << " batch " << b / 8;
+    }
+    prev = samples;
+    reader0->NextEpoch();
+    reader1->NextEpoch();
+  }
+}
+
 #if 0
 TYPED_TEST(DataLoadStoreTest, CachedLMDBTest) {
   shared_ptr<dali::LMDBLoader> reader(
@@ -0,0 +1,154 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <dirent.h>
+#include <errno.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#include <algorithm>
+#include <cstdio>
+#include <cstring>
+#include <fstream>
+#include <iomanip>
+#include <sstream>
+#include <string>
+#include <vector>
+
+#include "dali/operators/reader/loader/metadata_cache.h"
+#include "dali/operators/reader/loader/filesystem.h"
+
+namespace dali {
+
+namespace {
+
+constexpr char kMetadataCacheMagic[] = "DALIMETA";
+constexpr uint32_t kMetadataCacheVersion = 1;
+
+uint64_t Fnv1a64(const std::string &str) {
+  uint64_t hash = 0xcbf29ce484222325ull;
+  for (unsigned char c : str) {
+    hash ^= c;
+    hash *= 0x100000001b3ull;
+  }
+  return hash;
+}
+
+std::string FileSignature(const std::string &path) {
+  struct stat st;
+  if (stat(path.c_str(), &st) != 0)
+    return make_string(path, ":missing");
+  return make_string(path, ":", st.st_size, ":", st.st_mtime);
+}
+
+}  // namespace
+
+MetadataCache::MetadataCache(const OpSpec &spec, std::string loader_name)
+    : loader_name_(std::move(loader_name)) {
+  spec.TryGetArgument(dir_, "metadata_cache_dir");
+  key_ = make_string(loader_name_, "\n");
+}
+
+void MetadataCache::AddFile(const std::string &path) {
+  key_ += FileSignature(path);
+  key_ += "\n";
+}
+
+void MetadataCache::AddDirectory(const std::string &path) {
+  AddFile(path);
+  DIR *dir = opendir(path.c_str());
+  if (!dir)
+    return;
+  std::vector<std::string> subdirs;
+  dirent *entry;
+  while ((entry = readdir(dir))) {
+    if (strcmp(entry->d_name, ".") == 0 || strcmp(entry->d_name, "..") == 0)
+      continue;
+    std::string full_path = path + filesystem::dir_sep + entry->d_name;
+    struct stat st;
+    if (stat(full_path.c_str(), &st) == 0 && S_ISDIR(st.st_mode))
+      subdirs.push_back(std::move(full_path));
+  }
+  closedir(dir);
+  // readdir order is unspecified
+  std::sort(subdirs.begin(), subdirs.end());
+  for (auto &subdir : subdirs)
+    AddFile(subdir);
+}
+
+std::string MetadataCache::EntryPath() const {
+  std::stringstream ss;
+  ss << dir_ << filesystem::dir_sep << loader_name_ << "_"
+     << std::hex << std::setw(16) << std::setfill('0') << Fnv1a64(key_) << ".dali_meta";
+  return ss.str();
+}
+
+bool MetadataCache::Load(const std::function<void(std::istream &)> &read) const {
+  if (!IsEnabled())
+    return false;
+  auto path = EntryPath();
+  std::ifstream is(path, std::ios::binary);
+  if (!is.is_open())
+    return false;
+  try {
+    char magic[sizeof(kMetadataCacheMagic)] = {};
+    is.read(magic, sizeof(kMetadataCacheMagic) - 1);
+    uint32_t version = 0;
+    metadata_cache::Read(is, version);
+    if (std::string(magic) != kMetadataCacheMagic || version != kMetadataCacheVersion)
+      return false;
+    std::string key;
+    metadata_cache::Read(is, key);
+    if (key != key_)
+      return false;  // hash collision or stale entry - rebuild
+    read(is);
+    return true;
+  } catch (const std::exception &e) {
+    DALI_WARN(make_string("Ignoring corrupted metadata cache entry \"", path, "\": ", e.what()));
+    return false;
+  }
+}
+
+void MetadataCache::Store(const std::function<void(std::ostream &)> &write) const {
+  if (!IsEnabled())
+    return;
+  if (mkdir(dir_.c_str(), 0755) != 0 && errno != EEXIST) {
+    DALI_WARN(make_string("Could not create the metadata cache directory \"", dir_, "\""));
+    return;
+  }
+  auto path = EntryPath();
+  auto tmp_path = make_string(path, ".tmp.", getpid());
+  {
+    std::ofstream os(tmp_path, std::ios::binary | std::ios::trunc);
+    if (!os.is_open()) {
+      DALI_WARN(make_string("Could not write the metadata cache entry \"", tmp_path, "\""));
+      return;
+    }
+    os.write(kMetadataCacheMagic, sizeof(kMetadataCacheMagic) - 1);
+    metadata_cache::Write(os, kMetadataCacheVersion);
+    metadata_cache::Write(os, key_);
+    write(os);
+    if (!os.good()) {
+      os.close();
+      std::remove(tmp_path.c_str());
+      DALI_WARN(make_string("Could not write the metadata cache entry \"", tmp_path, "\""));
+      return;
+    }
+  }
+  if (std::rename(tmp_path.c_str(), path.c_str()) != 0) {
+    std::remove(tmp_path.c_str());
+    DALI_WARN(make_string("Could not write the metadata cache entry \"", path, "\""));
+  }
+}
+
+}  // namespace dali
@@ -0,0 +1,154 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_OPERATORS_READER_LOADER_METADATA_CACHE_H_
+#define DALI_OPERATORS_READER_LOADER_METADATA_CACHE_H_
+
+#include <functional>
+#include <istream>
+#include <ostream>
+#include <string>
+#include <type_traits>
+#include <utility>
+#include <vector>
+
+#include "dali/core/common.h"
+#include "dali/core/error_handling.h"
+#include "dali/pipeline/operator/op_spec.h"
+
+namespace dali {
+
+/**
+ * @brief On-disk cache of the metadata that a Loader prepares in PrepareMetadataImpl,
+ *        such as file lists, indices or parsed manifests.
+ *
+ * The cache is enabled with the `metadata_cache_dir` argument of the reader.
+ * A cache entry is identified by a key, which consists of the loader name, the arguments
+ * that affect the metadata and the signatures (size and modification time) of the files that
+ * the metadata was built from. The key is stored in the entry and an entry is only used if its
+ * key matches exactly, so modifying any of the source files invalidates the cached metadata.
+ */
+class DLL_PUBLIC MetadataCache {
+ public:
+  MetadataCache(const OpSpec &spec, std::string loader_name);
+
+  bool IsEnabled() const {
+    return !dir_.empty();
+  }
+
+  /**
+   * @brief Adds a named value (typically a reader argument) to the key
+   */
+  template <typename T>
+  void AddKey(const std::string &name, const T &value) {
+    key_ += make_string(name, "=", value, "\n");
+  }
+
+  /**
+   * @brief Adds the path, size and modification time of the file to the key
+   */
+  void AddFile(const std::string &path);
+
+  /**
+   * @brief Adds the signatures of the directory and its immediate subdirectories to the key
+   */
+  void AddDirectory(const std::string &path);
+
+  /**
+   * @brief Reads the entry with the matching key, if it exists.
+   *
+   * @return true if the entry was found and `read` completed successfully
+   */
+  bool Load(const std::function<void(std::istream &)> &read) const;
+
+  /**
+   * @brief Writes the entry. The entry is written to a temporary file first, which is then
+   *        renamed, so concurrent writers and readers never see partially written entries.
+   *        Failures are reported as warnings - the cache is only an optimization.
+   */
+  void Store(const std::function<void(std::ostream &)> &write) const;
+
+  const std::string &Key() const {
+    return key_;
+  }
+
+  std::string EntryPath() const;
+
+ private:
+  std::string dir_;
+  std::string loader_name_;
+  std::string key_;
+};
+
+namespace metadata_cache {
+
+template <typename T>
+std::enable_if_t<std::is_trivially_copyable<T>::value>
+Write(std::ostream &os, const T &value) {
+  os.write(reinterpret_cast<const char *>(&value), sizeof(T));
+}
+
+template <typename T>
+std::enable_if_t<std::is_trivially_copyable<T>::value>
+Read(std::istream &is, T &value) {
+  is.read(reinterpret_cast<char *>(&value), sizeof(T));
+  DALI_ENFORCE(is.good(), "Unexpected end of the metadata cache entry");
+}
+
+inline void Write(std::ostream &os, const std::string &str) {
+  Write(os, static_cast<uint64_t>(str.size()));
+  os.write(str.data(), str.size());
+}
+
+inline void Read(std::istream &is, std::string &str) {
+  uint64_t size = 0;
+  Read(is, size);
+  str.resize(size);
+  is.read(&str[0], size);
+  DALI_ENFORCE(is.good() || size == 0, "Unexpected end of the metadata cache entry");
+}
+
+template <typename A, typename B>
+void Write(std::ostream &os, const std::pair<A, B> &p) {
+  Write(os, p.first);
+  Write(os, p.second);
+}
+
+template <typename A, typename B>
+void Read(std::istream &is, std::pair<A, B> &p) {
+  Read(is, p.first);
+  Read(is, p.second);
+}
+
+template <typename T>
+void Write(std::ostream &os, const std::vector<T> &v) {
+  Write(os, static_cast<uint64_t>(v.size()));
+  for (auto &elem : v)
+    Write(os, elem);
+}
+
+template <typename T>
+void Read(std::istream &is, std::vector<T> &v) {
+  uint64_t size = 0;
+  Read(is, size);
+  v.resize(size);
+  for (auto &elem : v)
+    Read(is, elem);
+}
+
+}  // namespace metadata_cache
+
+}  // namespace dali
+
+#endif  // DALI_OPERATORS_READER_LOADER_METADATA_CACHE_H_
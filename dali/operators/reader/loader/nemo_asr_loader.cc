@@ -12,8 +12,15 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
-#include <string>
+#include <algorithm>
+#include <future>
+#include <iterator>
 #include <numeric>
+#include <sstream>
+#include <string>
+#include <tuple>
+#include <utility>
+#include <vector>
 #include "dali/core/common.h"
 #include "dali/core/error_handling.h"
 #include "dali/operators/decoder/audio/generic_decoder.h"
@@ -68,20 +75,105 @@ void ParseManifest(std::vector<NemoAsrEntry> &entries, std::istream& manifest_fi
   }
 }
 
+void ParseManifestParallel(std::vector<NemoAsrEntry> &entries, const std::string &manifest,
+                           double min_duration, double max_duration, int num_threads,
+                           size_t min_chunk_size) {
+  // Split the manifest into chunks of whole lines, roughly one per thread
+  size_t chunk_size = std::max(manifest.size() / std::max(num_threads, 1), min_chunk_size);
+  std::vector<std::pair<size_t, size_t>> chunks;
+  for (size_t start = 0; start < manifest.size(); ) {
+    size_t end = std::min(start + chunk_size, manifest.size());
+    end = manifest.find('\n', end);
+    end = end == std::string::npos ? manifest.size() : end + 1;
+    chunks.emplace_back(start, end);
+    start = end;
+  }
+
+  if (chunks.size() <= 1) {
+    std::istringstream ss(manifest);
+    ParseManifest(entries, ss, min_duration, max_duration);
+    return;
+  }
+
+  std::vector<std::vector<NemoAsrEntry>> chunk_entries(chunks.size());
+  std::vector<std::future<void>> futures;
+  futures.reserve(chunks.size());
+  for (size_t i = 0; i < chunks.size(); i++) {
+    futures.push_back(std::async(std::launch::async, [&, i]() {
+      std::istringstream ss(manifest.substr(chunks[i].first, chunks[i].second - chunks[i].first));
+      ParseManifest(chunk_entries[i], ss, min_duration, max_duration);
+    }));
+  }
+  for (auto &f : futures)
+    f.get();  // rethrows parsing errors
+
+  size_t total = entries.size();
+  for (auto &chunk : chunk_entries)
+    total += chunk.size();
+  entries.reserve(total);
+  for (auto &chunk : chunk_entries)
+    std::move(chunk.begin(), chunk.end(), std::back_inserter(entries));
+}
+
 }  // namespace detail
 
+bool NemoAsrLoader::LoadCachedManifest() {
+  if (!metadata_cache_.IsEnabled())
+    return false;
+  metadata_cache_.AddKey("min_duration", min_duration_);
+  metadata_cache_.AddKey("max_duration", max_duration_);
+  for (auto &manifest_filepath : manifest_filepaths_)
+    metadata_cache_.AddFile(manifest_filepath);
+  return metadata_cache_.Load([&](std::istream &is) {
+    uint64_t n = 0;
+    metadata_cache::Read(is, n);
+    std::vector<NemoAsrEntry> entries(n);
+    for (auto &entry : entries) {
+      metadata_cache::Read(is, entry.audio_filepath);
+      metadata_cache::Read(is, entry.duration);
+      metadata_cache::Read(is, entry.offset);
+      metadata_cache::Read(is, entry.text);
+    }
+    entries_ = std::move(entries);
+  });
+}
+
+void NemoAsrLoader::StoreCachedManifest() const {
+  metadata_cache_.Store([&](std::ostream &os) {
+    metadata_cache::Write(os, static_cast<uint64_t>(entries_.size()));
+    for (auto &entry : entries_) {
+      metadata_cache::Write(os, entry.audio_filepath);
+      metadata_cache::Write(os, entry.duration);
+      metadata_cache::Write(os, entry.offset);
+      metadata_cache::Write(os, entry.text);
+    }
+  });
+}
+
 void NemoAsrLoader::PrepareMetadataImpl() {
-  for (auto &manifest_filepath : manifest_filepaths_) {
-    std::ifstream fstream(manifest_filepath);
-    DALI_ENFORCE(fstream,
-                 make_string("Could not open NEMO ASR manifest file: \"", manifest_filepath, "\""));
-    detail::ParseManifest(entries_, fstream, min_duration_, max_duration_);
+  if (!LoadCachedManifest()) {
+    std::string manifest;
+    for (auto &manifest_filepath : manifest_filepaths_) {
+      std::ifstream fstream(manifest_filepath, std::ios::binary);
+      DALI_ENFORCE(fstream, make_string("Could not open NEMO ASR manifest file: \"",
+                                        manifest_filepath, "\""));
+      fstream.seekg(0, std::ios::end);
+      manifest.resize(fstream.tellg());
+      fstream.seekg(0, std::ios::beg);
+      fstream.read(&manifest[0], manifest.size());
+      detail::ParseManifestParallel(entries_, manifest, min_duration_, max_duration_,
+                                    num_threads_);
+    }
+    StoreCachedManifest();
   }
   shuffled_indices_.resize(entries_.size());
   std::iota(shuffled_indices_.begin(), shuffled_indices_.end(), 0);
 
   DALI_ENFORCE(Size() > 0, "No files found.");
-  if (shuffle_) {
+  if (duration_buckets_ > 0) {
+    // sorted by duration; shuffled in Reset if shuffle_after_epoch is set
+    BucketIndices(kDaliDataloaderSeed, false);
+  } else if (shuffle_) {
     // seeded with hardcoded value to get
     // the same sequence on every shard
     std::mt19937 g(kDaliDataloaderSeed);
@@ -90,13 +182,43 @@ void NemoAsrLoader::PrepareMetadataImpl() {
   Reset(true);
 }
 
+void NemoAsrLoader::BucketIndices(int64_t seed, bool shuffle) {
+  // Samples are ordered by duration, so that the consecutive samples, which form a batch,
+  // have a similar length and require little padding. Samples without a known duration
+  // are grouped together at the beginning.
+  // The samples are assigned to the shards first (randomly, when shuffling) and the range of
+  // each shard is ordered separately, so that the batches start at the beginning of the shard
+  // rather than straddling two batches of a global order.
+  std::vector<size_t> samples(entries_.size());
+  std::iota(samples.begin(), samples.end(), 0);
+  if (shuffle) {
+    std::mt19937 g(seed);
+    std::shuffle(samples.begin(), samples.end(), g);
+  }
+  for (int shard = 0; shard < num_shards_; shard++) {
+    int64_t begin = start_index(shard, num_shards_, Size());
+    int64_t end = start_index(shard + 1, num_shards_, Size());
+    std::vector<double> durations(end - begin);
+    for (int64_t i = begin; i < end; i++)
+      durations[i - begin] = entries_[samples[i]].duration;
+    auto order = BucketedOrder(make_cspan(durations), duration_buckets_, batch_size_,
+                               shuffle, seed);
+    for (int64_t i = begin; i < end; i++)
+      shuffled_indices_[i] = samples[begin + order[i - begin]];
+  }
+}
+
 void NemoAsrLoader::Reset(bool wrap_to_shard) {
   current_index_ = wrap_to_shard ? start_index(shard_id_, num_shards_, Size()) : 0;
   current_epoch_++;
 
   if (shuffle_after_epoch_) {
-    std::mt19937 g(kDaliDataloaderSeed + current_epoch_);
-    std::shuffle(shuffled_indices_.begin(), shuffled_indices_.end(), g);
+    if (duration_buckets_ > 0) {
+      BucketIndices(kDaliDataloaderSeed + current_epoch_, true);
+    } else {
+      std::mt19937 g(kDaliDataloaderSeed + current_epoch_);
+      std::shuffle(shuffled_indices_.begin(), shuffled_indices_.end(), g);
+    }
   }
 }
 
@@ -111,21 +233,10 @@ void NemoAsrLoader::ReadAudio(Tensor<CPUBackend> &audio,
                               AudioDecoderBase &decoder,
                               std::vector<float> &decode_scratch,
                               std::vector<float> &resample_scratch) {
-  bool should_resample = sample_rate_ > 0 && audio_meta.sample_rate != sample_rate_;
-  bool should_downmix = audio_meta.channels > 1 && downmix_;
-
-  int64_t decode_scratch_sz = 0;
-  if (should_resample || should_downmix)
-    decode_scratch_sz = audio_meta.length * audio_meta.channels;
+  int64_t decode_scratch_sz, resample_scratch_sz;
+  std::tie(decode_scratch_sz, resample_scratch_sz) =
+      DecodeScratchSize(audio_meta, sample_rate_, downmix_);
   decode_scratch.resize(decode_scratch_sz);
-
-  // resample scratch is used to prepare a single or multiple (depending if
-  // downmixing is needed) channel float input, required by the resampling
-  // kernel
-  int64_t resample_scratch_sz = 0;
-  if (should_resample)
-    resample_scratch_sz =
-        should_downmix ? audio_meta.length : audio_meta.length * audio_meta.channels;
   resample_scratch.resize(resample_scratch_sz);
 
   DecodeAudio<OutputType>(
@@ -157,9 +268,14 @@ void NemoAsrLoader::ReadSample(AsrSample& sample) {
   int64_t offset, length;
   std::tie(offset, length) =
       ProcessOffsetAndLength(meta, entry.offset, entry.duration);
+  // The offset is clamped to the length of the audio, so it may leave nothing to decode
+  DALI_ENFORCE(length > 0, make_string("The requested audio region is empty: offset ",
+      entry.offset, " s is not within the ", meta.length / static_cast<double>(meta.sample_rate),
+      " s long audio ", entry.audio_filepath));
+  assert(length <= meta.length && "Unexpected length");
+  // Only the requested region is decoded
   if (offset > 0)
-    sample.decoder().SeekFrames(offset);
-  assert(0 < length && length <= meta.length && "Unexpected length");
+    sample.decoder().SeekFrames(offset, SEEK_SET);
   meta.length = length;
 
   sample.shape_ = DecodedAudioShape(meta, sample_rate_, downmix_);
@@ -29,6 +29,7 @@
 #include "dali/operators/decoder/audio/audio_decoder.h"
 #include "dali/operators/decoder/audio/audio_decoder_impl.h"
 #include "dali/operators/reader/loader/file_label_loader.h"
+#include "dali/operators/reader/loader/metadata_cache.h"
 #include "dali/pipeline/util/thread_pool.h"
 
 namespace dali {
@@ -91,6 +92,19 @@ DLL_PUBLIC void ParseManifest(std::vector<NemoAsrEntry> &entries, std::istream &
                               double min_duration = kDefaultDuration,
                               double max_duration = kDefaultDuration);
 
+/**
+ * @brief Parses the manifest in chunks of lines, in parallel.
+ *
+ * The entries are appended in the order in which they appear in the manifest.
+ * Manifests smaller than `min_chunk_size` are parsed on the calling thread.
+ */
+DLL_PUBLIC void ParseManifestParallel(std::vector<NemoAsrEntry> &entries,
+                                      const std::string &manifest,
+                                      double min_duration = kDefaultDuration,
+                                      double max_duration = kDefaultDuration,
+                                      int num_threads = 1,
+                                      size_t min_chunk_size = 1 << 20);
+
 }  // namespace detail
 
 class DLL_PUBLIC NemoAsrLoader : public Loader<CPUBackend, AsrSample> {
@@ -106,8 +120,11 @@ class DLL_PUBLIC NemoAsrLoader : public Loader<CPUBackend, AsrSample> {
         min_duration_(spec.GetArgument<float>("min_duration")),
         max_duration_(spec.GetArgument<float>("max_duration")),
         num_threads_(std::max(1, spec.GetArgument<int>("num_threads"))),
+        batch_size_(spec.GetArgument<int>("batch_size")),
+        duration_buckets_(spec.GetArgument<int>("duration_buckets")),
         decode_scratch_(num_threads_),
-        resample_scratch_(num_threads_) {
+        resample_scratch_(num_threads_),
+        metadata_cache_(spec, "nemo_asr_loader") {
     DALI_ENFORCE(!manifest_filepaths_.empty(), "``manifest_filepaths`` can not be empty");
     /*
      * Those options are mutually exclusive as `shuffle_after_epoch` will make every shard looks
@@ -119,6 +136,10 @@ class DLL_PUBLIC NemoAsrLoader : public Loader<CPUBackend, AsrSample> {
       DALI_FAIL("`shuffle_after_epoch` and `stick_to_shard` can't be provided together");
     if (shuffle_after_epoch_ && shuffle_)
       DALI_FAIL("`shuffle_after_epoch` and `random_shuffle` can't be provided together");
+    DALI_ENFORCE(duration_buckets_ >= 0, "`duration_buckets` must not be negative");
+    if (duration_buckets_ > 0 && shuffle_)
+      DALI_FAIL("`duration_buckets` can't be used with `random_shuffle`, because the shuffling "
+                "buffer mixes samples from different buckets. Use `shuffle_after_epoch` instead");
     /*
      * Imply `stick_to_shard` from  `shuffle_after_epoch`
      */
@@ -142,6 +163,20 @@ class DLL_PUBLIC NemoAsrLoader : public Loader<CPUBackend, AsrSample> {
   void Reset(bool wrap_to_shard) override;
 
  private:
+  /**
+   * @brief Restores the parsed manifest entries from the metadata cache, if available
+   */
+  bool LoadCachedManifest();
+  void StoreCachedManifest() const;
+
+  /**
+   * @brief Orders the samples of each shard by duration and, if `shuffle` is set, shuffles
+   *        them within `duration_buckets_` buckets and then shuffles the order of whole batches
+   *
+   * When shuffling, the samples are randomly assigned to the shards first.
+   */
+  void BucketIndices(int64_t seed, bool shuffle);
+
   template <typename OutputType>
   void ReadAudio(Tensor<CPUBackend> &audio,
                  const AudioMetadata &audio_meta,
@@ -165,9 +200,12 @@ class DLL_PUBLIC NemoAsrLoader : public Loader<CPUBackend, AsrSample> {
   double min_duration_;
   double max_duration_;
   int num_threads_;
+  int batch_size_;
+  int duration_buckets_;
   kernels::signal::resampling::Resampler resampler_;
   std::vector<std::vector<float>> decode_scratch_;
   std::vector<std::vector<float>> resample_scratch_;
+  MetadataCache metadata_cache_;
 };
 
 }  // namespace dali
@@ -13,7 +13,9 @@
 // limitations under the License.
 
 #include <gtest/gtest.h>
+#include <algorithm>
 #include <cstdio>
+#include <set>
 #include <utility>
 #include <sstream>
 #include <string>
@@ -76,6 +78,32 @@ TEST(NemoAsrLoaderTest, ParseManifest) {
   EXPECT_EQ("path/to/audio1.wav", entries[0].audio_filepath);
 }
 
+TEST(NemoAsrLoaderTest, ParseManifestParallel) {
+  std::stringstream ss;
+  for (int i = 0; i < 1000; i++) {
+    ss << "{\"audio_filepath\": \"path/to/audio" << i << ".wav\", \"duration\": "
+       << 0.01 * i << ", \"text\": \"transcript " << i << "\"}\n";
+  }
+  std::string manifest = ss.str();
+
+  std::vector<NemoAsrEntry> ref;
+  detail::ParseManifest(ref, ss, 1.0, 8.0);
+  ASSERT_EQ(701, ref.size());
+
+  for (int num_threads : {1, 3, 8}) {
+    for (size_t min_chunk_size : {1, 100, 1 << 20}) {
+      std::vector<NemoAsrEntry> entries;
+      detail::ParseManifestParallel(entries, manifest, 1.0, 8.0, num_threads, min_chunk_size);
+      ASSERT_EQ(ref.size(), entries.size());
+      for (size_t i = 0; i < ref.size(); i++) {
+        EXPECT_EQ(ref[i].audio_filepath, entries[i].audio_filepath);
+        EXPECT_EQ(ref[i].duration, entries[i].duration);
+        EXPECT_EQ(ref[i].text, entries[i].text);
+      }
+    }
+  }
+}
+
 TEST(NemoAsrLoaderTest, ParseNonAsciiTransript) {
   using TestData = std::pair<std::string, std::vector<uint8_t>>;
 
@@ -389,6 +417,171 @@ TEST(NemoAsrLoaderTest, ReadSample_OffsetAndDuration) {
   ASSERT_EQ(0, std::remove(manifest_filepath.c_str()));
 }
 
+TEST(NemoAsrLoaderTest, ReadSample_OffsetPastTheEnd) {
+  std::string wav_path = make_string(audio_data_root, "dziendobry.wav");
+  std::string decoded_path = make_string(audio_data_root, "dziendobry.txt");
+  std::ifstream file(decoded_path.c_str());
+  std::vector<int16_t> ref_data{std::istream_iterator<int16_t>(file),
+                                std::istream_iterator<int16_t>()};
+  int64_t ref_frames = ref_data.size() / 2;
+  double end_sec = (ref_frames + 0.5) / original_sample_rate;
 
-}  // namespace dali
+  std::string manifest_filepath = "/tmp/nemo_asr_manifest_XXXXXX";
+  tempfile(manifest_filepath);
+  // just at the end of the audio and far past it
+  for (double offset_sec : {end_sec, 1000.0}) {
+    std::ofstream f(manifest_filepath);
+    f << "{\"audio_filepath\": \"" << wav_path << "\", \"offset\": " << offset_sec
+      << ", \"duration\": 0.5}";
+    f.close();
+
+    auto spec = OpSpec("NemoAsrReader")
+          .AddArg("manifest_filepaths", std::vector<std::string>{manifest_filepath})
+          .AddArg("downmix", false)
+          .AddArg("dtype", DALI_INT16)
+          .AddArg("num_threads", 4)
+          .AddArg("batch_size", 32)
+          .AddArg("device_id", -1);
 
+    NemoAsrLoader loader(spec);
+    loader.PrepareMetadata();
+    AsrSample sample;
+    ASSERT_THROW(loader.ReadSample(sample), std::runtime_error);
+  }
+  ASSERT_EQ(0, std::remove(manifest_filepath.c_str()));
+}
+
+TEST(NemoAsrLoaderTest, DurationBuckets) {
+  std::string manifest_filepath =
+      "/tmp/nemo_asr_manifest_XXXXXX";  // XXXXXX is replaced in tempfile()
+  tempfile(manifest_filepath);
+
+  const int batch_size = 4;
+  const int nbuckets = 4;
+  const int nsamples = batch_size * nbuckets;
+  std::vector<int> durations_ms(nsamples);
+  for (int i = 0; i < nsamples; i++)
+    durations_ms[i] = 100 + 100 * ((i * 7) % nsamples);  // distinct, not sorted
+  {
+    std::ofstream f(manifest_filepath);
+    for (int d : durations_ms) {
+      f << "{\"audio_filepath\": \"" << make_string(audio_data_root, "dziendobry.wav") << "\""
+        << ", \"duration\": " << d / 1000.0 << "}\n";
+    }
+  }
+  auto sorted_durations = durations_ms;
+  std::sort(sorted_durations.begin(), sorted_durations.end());
+
+  for (bool shuffle_after_epoch : {false, true}) {
+    auto spec = OpSpec("NemoAsrReader")
+                    .AddArg("manifest_filepaths", std::vector<std::string>{manifest_filepath})
+                    .AddArg("duration_buckets", nbuckets)
+                    .AddArg("shuffle_after_epoch", shuffle_after_epoch)
+                    .AddArg("batch_size", batch_size)
+                    .AddArg("device_id", -1);
+    NemoAsrLoader loader(spec);
+    loader.PrepareMetadata();
+    ASSERT_EQ(nsamples, loader.Size());
+
+    std::vector<int64_t> lengths;
+    for (int i = 0; i < nsamples; i++) {
+      AsrSample sample;
+      loader.ReadSample(sample);
+      lengths.push_back(sample.shape()[0]);
+    }
+    auto sorted_lengths = lengths;
+    std::sort(sorted_lengths.begin(), sorted_lengths.end());
+    if (!shuffle_after_epoch) {
+      EXPECT_EQ(sorted_lengths, lengths);
+    }
+    // every batch contains the samples from a single bucket
+    for (int b = 0; b < nsamples / batch_size; b++) {
+      std::set<int64_t> buckets;
+      for (int i = b * batch_size; i < (b + 1) * batch_size; i++) {
+        auto rank = std::lower_bound(sorted_lengths.begin(), sorted_lengths.end(), lengths[i]) -
+                    sorted_lengths.begin();
+        buckets.insert(rank / (nsamples / nbuckets));
+      }
+      EXPECT_EQ(1, buckets.size());
+    }
+  }
+
+  {
+    auto spec = OpSpec("NemoAsrReader")
+                    .AddArg("manifest_filepaths", std::vector<std::string>{manifest_filepath})
+                    .AddArg("duration_buckets", nbuckets)
+                    .AddArg("random_shuffle", true)
+                    .AddArg("batch_size", batch_size)
+                    .AddArg("device_id", -1);
+    ASSERT_THROW(NemoAsrLoader loader(spec), std::runtime_error);
+  }
+
+  ASSERT_EQ(0, std::remove(manifest_filepath.c_str()));
+}
+
+TEST(NemoAsrLoaderTest, DurationBucketsSharded) {
+  std::string manifest_filepath =
+      "/tmp/nemo_asr_manifest_XXXXXX";  // XXXXXX is replaced in tempfile()
+  tempfile(manifest_filepath);
+
+  // the shards are not a multiple of the batch size
+  const int batch_size = 4;
+  const int nbuckets = 3;
+  const int num_shards = 2;
+  const int shard_size = 18;
+  const int nsamples = shard_size * num_shards;
+  {
+    std::ofstream f(manifest_filepath);
+    for (int i = 0; i < nsamples; i++) {
+      int d = 40 + 40 * ((i * 7) % nsamples);  // distinct, not sorted
+      f << "{\"audio_filepath\": \"" << make_string(audio_data_root, "dziendobry.wav") << "\""
+        << ", \"duration\": " << d / 1000.0 << "}\n";
+    }
+  }
+
+  for (bool shuffle_after_epoch : {false, true}) {
+    std::set<int64_t> all_lengths;
+    for (int shard_id = 0; shard_id < num_shards; shard_id++) {
+      auto spec = OpSpec("NemoAsrReader")
+                      .AddArg("manifest_filepaths", std::vector<std::string>{manifest_filepath})
+                      .AddArg("duration_buckets", nbuckets)
+                      .AddArg("shuffle_after_epoch", shuffle_after_epoch)
+                      .AddArg("shard_id", shard_id)
+                      .AddArg("num_shards", num_shards)
+                      .AddArg("batch_size", batch_size)
+                      .AddArg("device_id", -1);
+      NemoAsrLoader loader(spec);
+      loader.PrepareMetadata();
+
+      std::vector<int64_t> lengths;
+      for (int i = 0; i < shard_size; i++) {
+        AsrSample sample;
+        loader.ReadSample(sample);
+        lengths.push_back(sample.shape()[0]);
+        all_lengths.insert(sample.shape()[0]);
+      }
+      auto sorted_lengths = lengths;
+      std::sort(sorted_lengths.begin(), sorted_lengths.end());
+      if (!shuffle_after_epoch) {
+        EXPECT_EQ(sorted_lengths, lengths);
+      }
+      // the batches start at the beginning of the shard, so every full batch contains
+      // the samples from at most two adjacent buckets of the shard
+      for (int b = 0; b < shard_size / batch_size; b++) {
+        std::vector<int64_t> ranks;
+        for (int i = b * batch_size; i < (b + 1) * batch_size; i++) {
+          ranks.push_back(std::lower_bound(sorted_lengths.begin(), sorted_lengths.end(),
+                                           lengths[i]) - sorted_lengths.begin());
+        }
+        auto minmax = std::minmax_element(ranks.begin(), ranks.end());
+        EXPECT_LT(*minmax.second - *minmax.first, 2 * shard_size / nbuckets);
+      }
+    }
+    // the shards are disjoint
+    EXPECT_EQ(nsamples, all_lengths.size());
+  }
+
+  ASSERT_EQ(0, std::remove(manifest_filepath.c_str()));
+}
+
+}  // namespace dali
@@ -15,9 +15,14 @@
 #ifndef DALI_OPERATORS_READER_LOADER_UTILS_H_
 #define DALI_OPERATORS_READER_LOADER_UTILS_H_
 
+#include <algorithm>
+#include <cstdint>
+#include <numeric>
+#include <random>
 #include <vector>
 #include <string>
 #include "dali/core/api_helper.h"
+#include "dali/core/span.h"
 
 namespace dali {
 
@@ -41,6 +46,53 @@ DLL_PUBLIC bool HasExtension(std::string filepath, const std::vector<std::string
  */
 DLL_PUBLIC bool HasKnownExtension(const std::string &filepath);
 
+/**
+ * @brief Returns an order of the samples, in which the consecutive samples (which form a batch)
+ *        have similar keys (e.g. duration or aspect ratio), so that little padding is needed.
+ *
+ * The samples are sorted by the key. If `shuffle` is set, the sorted samples are divided into
+ * `nbuckets` buckets of equal size, the samples are shuffled within the buckets, and then
+ * the order of whole batches of `batch_size` samples is shuffled (the last, incomplete batch
+ * stays at the end).
+ * The result depends only on the arguments, so all the shards compute the same order.
+ *
+ * @return permutation of the sample indices
+ */
+template <typename Key>
+std::vector<int64_t> BucketedOrder(span<const Key> keys, int nbuckets, int batch_size,
+                                   bool shuffle, int64_t seed) {
+  int64_t n = keys.size();
+  std::vector<int64_t> order(n);
+  std::iota(order.begin(), order.end(), 0);
+  std::stable_sort(order.begin(), order.end(),
+                   [&](int64_t a, int64_t b) {
+                     return keys[a] < keys[b];
+                   });
+  if (!shuffle || n == 0)
+    return order;
+
+  std::mt19937 g(seed);
+  int64_t nb = std::max<int64_t>(1, std::min<int64_t>(nbuckets, n));
+  for (int64_t b = 0; b < nb; b++) {
+    std::shuffle(order.begin() + n * b / nb, order.begin() + n * (b + 1) / nb, g);
+  }
+
+  // Only the full batches are shuffled - the incomplete one stays at the end, so that
+  // it doesn't shift the boundaries of the batches which follow it
+  int64_t nbatches = n / batch_size;
+  std::vector<int64_t> batch_order(nbatches);
+  std::iota(batch_order.begin(), batch_order.end(), 0);
+  std::shuffle(batch_order.begin(), batch_order.end(), g);
+  std::vector<int64_t> result;
+  result.reserve(n);
+  for (auto batch : batch_order) {
+    auto begin = order.begin() + batch * batch_size;
+    result.insert(result.end(), begin, begin + batch_size);
+  }
+  result.insert(result.end(), order.begin() + nbatches * batch_size, order.end());
+  return result;
+}
+
 }  // namespace dali
 
 #endif  // DALI_OPERATORS_READER_LOADER_UTILS_H_
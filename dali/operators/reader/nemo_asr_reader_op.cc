@@ -34,8 +34,8 @@ Example manifest file::
     Only ``audio_filepath`` is field mandatory. If ``duration`` is not specified, the whole audio file will be used. A missing ``text`` field
     will produce an empty string as a text.
 
-.. warning::
-    Handling of ``duration`` and ``offset`` fields is not yet implemented. The current implementation always reads the whole audio file.
+If ``offset`` and/or ``duration`` are specified, only the requested region of the audio file is decoded - the reader
+seeks to the offset instead of decoding and discarding the preceding audio.
 
 This reader produces between 1 and 3 outputs:
 
@@ -85,6 +85,22 @@ in seconds, of the audio samples.
 
 Samples with a duration longer than this value will be ignored.)code",
     0.0f)
+  .AddOptionalArg("duration_buckets",
+    R"code(If a value greater than 0 is provided, the samples are ordered by the ``duration``
+field of the manifest, so that the samples in a batch have similar lengths and require little
+padding.
+
+The samples are divided into ``duration_buckets`` buckets of similar duration. With
+``shuffle_after_epoch=True``, the samples are shuffled within the buckets and the order of the
+batches is shuffled after each epoch. Otherwise, the samples are returned in the order of increasing
+duration.
+
+When the data is sharded, the samples are assigned to the shards first (randomly, with
+``shuffle_after_epoch=True``) and the samples of each shard are ordered separately, so the batches
+of every shard are formed from its own buckets.
+
+This option cannot be used together with ``random_shuffle``.)code",
+    0)
   .AddOptionalArg<bool>("normalize_text", "Normalize text.", nullptr)
   .DeprecateArg("normalize_text")  // deprecated since 0.28dev
   .AdditionalOutputsFn([](const OpSpec& spec) {
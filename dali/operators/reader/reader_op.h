@@ -16,6 +16,7 @@
 #define DALI_OPERATORS_READER_READER_OP_H_
 
 #include <atomic>
+#include <chrono>
 #include <condition_variable>
 #include <memory>
 #include <string>
@@ -25,6 +26,8 @@
 #include <unordered_map>
 
 #include "dali/core/nvtx.h"
+#include "dali/core/tracer.h"
+#include "dali/util/io_stats.h"
 #include "dali/operators/reader/loader/loader.h"
 #include "dali/operators/reader/parser/parser.h"
 #include "dali/pipeline/operator/operator.h"
@@ -94,10 +97,17 @@ class DataReader : public Operator<Backend> {
   // Main prefetch work loop
   void PrefetchWorker() {
     DeviceGuard g(device_id_);
+    Tracer::SetThreadName("[DALI] reader prefetch");
     ProducerWait();
     while (!finished_) {
       try {
+        // page faults are sampled per batch - reading the counters is a system call
+        int64_t major_start, minor_start, major_end, minor_end;
+        IOStats::ThreadPageFaults(&major_start, &minor_start);
         Prefetch();
+        IOStats::ThreadPageFaults(&major_end, &minor_end);
+        if (loader_)
+          loader_->GetIOStats().RecordPageFaults(major_end - major_start, minor_end - minor_start);
       } catch (const std::exception& e) {
         ProducerStop(std::current_exception());
         return;
@@ -198,6 +208,11 @@ class DataReader : public Operator<Backend> {
     ret.shard_id = loader_->GetShardId();
     ret.pad_last_batch = loader_->PadLastBatch();
     ret.stick_to_shard = loader_->StickToShard();
+    const auto &io_stats = loader_->GetIOStats();
+    ret.io_total = io_stats.Total();
+    ret.io_current_epoch = io_stats.CurrentEpoch();
+    ret.io_last_epoch = io_stats.LastEpoch();
+    ret.io_epochs_completed = io_stats.EpochsCompleted();
     return ret;
   }
 
@@ -282,16 +297,31 @@ class DataReader : public Operator<Backend> {
   }
 
   void ProducerWait() {
+    auto start = std::chrono::steady_clock::now();
     std::unique_lock<std::mutex> lock(prefetch_access_mutex_);
     producer_.wait(lock, [&]() { return finished_ || !IsPrefetchQueueFull(); });
+    lock.unlock();
+    RecordWaitTime(start, &IOStats::RecordProducerWait);
   }
 
   void ConsumerWait() {
     DomainTimeRange tr("[DALI][DataReader] ConsumerWait #" + to_string(curr_batch_consumer_),
                  DomainTimeRange::kMagenta);
+    auto start = std::chrono::steady_clock::now();
     std::unique_lock<std::mutex> prefetch_lock(prefetch_access_mutex_);
     consumer_.wait(prefetch_lock, [this]() { return finished_ || !IsPrefetchQueueEmpty(); });
     if (prefetch_error_) std::rethrow_exception(prefetch_error_);
+    prefetch_lock.unlock();
+    RecordWaitTime(start, &IOStats::RecordConsumerWait);
+  }
+
+  void RecordWaitTime(std::chrono::steady_clock::time_point start,
+                      void (IOStats::*record)(int64_t)) {
+    if (!loader_)
+      return;
+    int64_t wait_time = std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now() - start).count();
+    (loader_->GetIOStats().*record)(wait_time);
   }
 
   void ConsumerAdvanceQueue() {
@@ -70,7 +70,7 @@ bool PowerSpectrum<CPUBackend>::SetupImpl(std::vector<OutputDesc> &output_desc,
   using OutputType = float;
   VALUE_SWITCH(in_shape.sample_dim(), Dims, FFT_SUPPORTED_NDIMS, (
     using FftKernel = kernels::signal::fft::Fft1DCpu<OutputType, InputType, Dims>;
-    kmgr_.Initialize<FftKernel>();
+    kmgr_.Initialize<FftKernel>(&plan_stats_);
     kmgr_.Resize<FftKernel>(nthreads, nsamples);
     output_desc[0].type = TypeInfo::Create<OutputType>();
     output_desc[0].shape.resize(nsamples, Dims);
@@ -109,6 +109,8 @@ void PowerSpectrum<CPUBackend>::RunImpl(workspace_t<CPUBackend> &ws) {
   ), DALI_FAIL(make_string("Not supported number of dimensions: ", in_shape.size())));  // NOLINT
 
   thread_pool.RunAll();
+  fft_plan_cache_hits_ = plan_stats_.hits;
+  fft_plan_cache_misses_ = plan_stats_.misses;
 }
 
 DALI_REGISTER_OPERATOR(PowerSpectrum, PowerSpectrum<CPUBackend>, CPU);
@@ -44,6 +44,8 @@ class PowerSpectrum : public Operator<Backend> {
         DALI_FAIL(make_string("Power argument should be either `2` for power spectrum or `1` "
           "for complex magnitude. Received: ", power));
     }
+    this->RegisterDiagnostic("fft_plan_cache_hits", &fft_plan_cache_hits_);
+    this->RegisterDiagnostic("fft_plan_cache_misses", &fft_plan_cache_misses_);
   }
 
  protected:
@@ -56,6 +58,9 @@ class PowerSpectrum : public Operator<Backend> {
 
   kernels::KernelManager kmgr_;
   kernels::signal::fft::FftArgs fft_args_;
+  kernels::signal::fft::FftPlanCacheStats plan_stats_;
+  int64_t fft_plan_cache_hits_ = 0;
+  int64_t fft_plan_cache_misses_ = 0;
 };
 
 }  // namespace dali
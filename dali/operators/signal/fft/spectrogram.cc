@@ -13,6 +13,7 @@
 // limitations under the License.
 
 #include <memory>
+#include <utility>
 #include <vector>
 #include "dali/operators/signal/fft/spectrogram.h"
 #include "dali/kernels/kernel_manager.h"
@@ -96,6 +97,10 @@ struct SpectrogramImplCpu : OpImplBase<CPUBackend> {
   bool SetupImpl(std::vector<OutputDesc> &output_desc, const workspace_t<CPUBackend> &ws) override;
   void RunImpl(workspace_t<CPUBackend> &ws) override;
 
+  // Registered as diagnostics of the operator
+  int64_t fft_plan_cache_hits = 0;
+  int64_t fft_plan_cache_misses = 0;
+
  private:
   int window_length_ = -1;
   int window_step_ = -1;
@@ -115,6 +120,7 @@ struct SpectrogramImplCpu : OpImplBase<CPUBackend> {
 
   kernels::KernelManager kmgr_fft_;
   kernels::signal::fft::FftArgs fft_args_;
+  kernels::signal::fft::FftPlanCacheStats plan_stats_;
 };
 
 namespace {
@@ -204,7 +210,7 @@ bool SpectrogramImplCpu::SetupImpl(std::vector<OutputDesc> &out_desc,
       make_string("Signal is too short (", signal_length, ") for sample ", sample_id));
   }
 
-  kmgr_fft_.Initialize<FftKernel>();
+  kmgr_fft_.Initialize<FftKernel>(&plan_stats_);
   kmgr_fft_.Resize<FftKernel>(nthreads, nsamples);
   FillFftArgs(fft_args_, power_, window_length_, nfft_, WindowsDims);
 
@@ -276,12 +282,18 @@ void SpectrogramImplCpu::RunImpl(workspace_t<CPUBackend> &ws) {
   }
 
   thread_pool.RunAll();
+  fft_plan_cache_hits = plan_stats_.hits;
+  fft_plan_cache_misses = plan_stats_.misses;
 }
 
 template <>
 Spectrogram<CPUBackend>::Spectrogram(const OpSpec &spec)
-    : Operator<CPUBackend>(spec)
-    , impl_(std::make_unique<SpectrogramImplCpu>(spec)) {}
+    : Operator<CPUBackend>(spec) {
+  auto impl = std::make_unique<SpectrogramImplCpu>(spec);
+  RegisterDiagnostic("fft_plan_cache_hits", &impl->fft_plan_cache_hits);
+  RegisterDiagnostic("fft_plan_cache_misses", &impl->fft_plan_cache_misses);
+  impl_ = std::move(impl);
+}
 
 DALI_REGISTER_OPERATOR(Spectrogram, Spectrogram<CPUBackend>, CPU);
 
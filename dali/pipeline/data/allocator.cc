@@ -12,10 +12,213 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
+#include <stdlib.h>
+#include <sys/mman.h>
+#include <algorithm>
+#include <condition_variable>
+#include <cstdlib>
+#include <mutex>
+#include <new>
+#include <set>
+#include <thread>
+#include <vector>
+#include "dali/core/device_guard.h"
 #include "dali/pipeline/data/allocator.h"
 
 namespace dali {
 
+namespace {
+
+constexpr size_t kHugePageSize = 2 << 20;
+constexpr size_t kDefaultCacheLimit = static_cast<size_t>(1) << 30;  // 1 GiB
+
+/**
+ * @brief Ordinary host memory; optionally requests transparent huge pages for large blocks
+ */
+class host_memory_resource : public mm::memory_resource {
+ public:
+  explicit host_memory_resource(bool huge_pages) : huge_pages_(huge_pages) {}
+
+ private:
+  void *do_allocate(size_t bytes, size_t alignment) override {
+    bool use_huge_pages = huge_pages_ && bytes >= kHugePageSize;
+    if (use_huge_pages) {
+      alignment = std::max(alignment, kHugePageSize);
+      bytes = align_up(bytes, kHugePageSize);
+    }
+    alignment = std::max(alignment, sizeof(void *));
+    void *ptr = nullptr;
+    if (posix_memalign(&ptr, alignment, bytes) != 0)
+      throw std::bad_alloc();
+#ifdef MADV_HUGEPAGE
+    if (use_huge_pages)
+      madvise(ptr, bytes, MADV_HUGEPAGE);  // only a hint - ignore failures
+#endif
+    return ptr;
+  }
+
+  void do_deallocate(void *ptr, size_t, size_t) override {
+    free(ptr);
+  }
+
+  bool huge_pages_;
+};
+
+class pinned_memory_resource : public mm::memory_resource {
+  void *do_allocate(size_t bytes, size_t) override {
+    void *ptr = nullptr;
+    CUDA_CALL(cudaMallocHost(&ptr, bytes));
+    return ptr;
+  }
+
+  void do_deallocate(void *ptr, size_t, size_t) override {
+    CUDA_DTOR_CALL(cudaFreeHost(ptr));
+  }
+};
+
+/**
+ * @brief Pinned memory may still be used by asynchronous copies when it's freed -
+ *        the freed blocks are reused only after all devices which used the pool are
+ *        synchronized, which is what cudaFreeHost would do anyway.
+ *
+ * The synchronization is done in a background thread, so that neither allocation nor
+ * deallocation waits for the devices; until then, the allocations are served from
+ * the blocks which are already available or from the upstream resource.
+ */
+class pinned_pool_resource : public mm::size_class_resource<> {
+ public:
+  pinned_pool_resource(mm::memory_resource *upstream, const mm::size_class_options &opt)
+  : mm::size_class_resource<>(upstream, opt) {
+    worker_ = std::thread([this]() { ReclaimLoop(); });
+  }
+
+  ~pinned_pool_resource() {
+    {
+      std::lock_guard<std::mutex> guard(worker_mtx_);
+      stop_ = true;
+    }
+    worker_cv_.notify_one();
+    worker_.join();
+  }
+
+ protected:
+  void *do_allocate(size_t bytes, size_t alignment) override {
+    MarkCurrentDevice();
+    return mm::size_class_resource<>::do_allocate(bytes, alignment);
+  }
+
+  void do_deallocate(void *ptr, size_t bytes, size_t alignment) override {
+    MarkCurrentDevice();
+    mm::size_class_resource<>::do_deallocate(ptr, bytes, alignment);
+  }
+
+  /**
+   * @brief Synchronizes every device which was current when the pool was used
+   *
+   * The pool is shared by the whole process, so synchronizing only the current device
+   * would not be enough.
+   */
+  void synchronize() override {
+    std::vector<int> devices;
+    {
+      std::lock_guard<std::mutex> guard(devices_mtx_);
+      devices.assign(devices_.begin(), devices_.end());
+    }
+    DeviceGuard dg;
+    for (int device : devices) {
+      CUDA_CALL(cudaSetDevice(device));
+      CUDA_CALL(cudaDeviceSynchronize());
+    }
+  }
+
+  void on_deferred() override {
+    {
+      std::lock_guard<std::mutex> guard(worker_mtx_);
+      reclaim_pending_ = true;
+    }
+    worker_cv_.notify_one();
+  }
+
+ private:
+  void MarkCurrentDevice() {
+    int device = 0;
+    if (cudaGetDevice(&device) != cudaSuccess)
+      return;
+    std::lock_guard<std::mutex> guard(devices_mtx_);
+    devices_.insert(device);
+  }
+
+  void ReclaimLoop() {
+    std::unique_lock<std::mutex> lock(worker_mtx_);
+    for (;;) {
+      worker_cv_.wait(lock, [&]() { return stop_ || reclaim_pending_; });
+      if (stop_)
+        return;
+      reclaim_pending_ = false;
+      lock.unlock();
+      try {
+        reclaim_deferred();
+      } catch (const std::exception &) {
+        // The devices can't be synchronized (e.g. the CUDA runtime is shutting down) -
+        // the blocks remain deferred and are not reused.
+      }
+      lock.lock();
+    }
+  }
+
+  std::mutex devices_mtx_;
+  std::set<int> devices_;
+
+  std::mutex worker_mtx_;
+  std::condition_variable worker_cv_;
+  bool reclaim_pending_ = false;
+  bool stop_ = false;
+  std::thread worker_;
+};
+
+size_t GetEnvSize(const char *name, size_t default_value) {
+  if (const char *value = std::getenv(name))
+    return std::strtoull(value, nullptr, 10);
+  return default_value;
+}
+
+bool GetEnvFlag(const char *name, bool default_value) {
+  if (const char *value = std::getenv(name))
+    return std::atoi(value) != 0;
+  return default_value;
+}
+
+mm::size_class_options HostPoolOptions(bool pinned) {
+  mm::size_class_options opt;
+  if (!GetEnvFlag("DALI_HOST_POOL", true))
+    opt.max_class_size = 0;  // all allocations go directly to upstream
+  if (pinned) {
+    opt.max_cached_bytes = GetEnvSize("DALI_PINNED_POOL_CACHE_LIMIT", kDefaultCacheLimit);
+    opt.deferred_reuse = true;
+    opt.reclaim_on_allocate = false;  // the deferred blocks are reclaimed in the background
+  } else {
+    opt.max_cached_bytes = GetEnvSize("DALI_HOST_POOL_CACHE_LIMIT", kDefaultCacheLimit);
+  }
+  return opt;
+}
+
+}  // namespace
+
+mm::size_class_resource<> &GetHostMemoryPool(bool pinned) {
+  // The pools are intentionally leaked - the buffers held by static objects
+  // may be freed after the pools would have been destroyed.
+  if (pinned) {
+    static auto *upstream = new pinned_memory_resource();
+    static auto *pool = new pinned_pool_resource(upstream, HostPoolOptions(true));
+    return *pool;
+  } else {
+    static auto *upstream = new host_memory_resource(
+        GetEnvFlag("DALI_HOST_POOL_HUGE_PAGES", false));
+    static auto *pool = new mm::size_class_resource<>(upstream, HostPoolOptions(false));
+    return *pool;
+  }
+}
+
 // Define the CPU & GPU allocator registries
 DALI_DEFINE_OPTYPE_REGISTRY(GPUAllocator, GPUAllocator);
 DALI_DEFINE_OPTYPE_REGISTRY(CPUAllocator, CPUAllocator);
@@ -16,10 +16,28 @@
 #define DALI_PIPELINE_DATA_ALLOCATOR_H_
 
 #include "dali/core/cuda_utils.h"
+#include "dali/core/mm/size_class_resource.h"
 #include "dali/pipeline/operator/operator_factory.h"
 
 namespace dali {
 
+/**
+ * @brief Returns the process-wide memory pool which backs the default CPU allocator
+ *        (or the pinned CPU allocator, if `pinned` is true).
+ *
+ * The pool keeps the freed blocks in size class free lists and reuses them, which avoids
+ * calling malloc/free or cudaMallocHost/cudaFreeHost when buffers are resized.
+ * It is configured with the following environment variables:
+ *  - DALI_HOST_POOL - set to 0 to disable pooling
+ *  - DALI_HOST_POOL_CACHE_LIMIT - the maximum number of bytes kept in the ordinary host memory
+ *    pool (default: 1 GiB)
+ *  - DALI_PINNED_POOL_CACHE_LIMIT - the maximum number of bytes kept in the pinned memory pool
+ *    (default: no limit)
+ *  - DALI_HOST_POOL_HUGE_PAGES - set to 1 to request transparent huge pages for large blocks
+ *    of ordinary host memory
+ */
+DLL_PUBLIC mm::size_class_resource<> &GetHostMemoryPool(bool pinned);
+
 /**
  * @brief Base class for all user-defined allocators. Defines
  * the interface that must be implemented by all allocators.
@@ -85,11 +103,11 @@ class CPUAllocator : public AllocatorBase {
   ~CPUAllocator() override = default;
 
   void New(void **ptr, size_t bytes) override {
-    *ptr = ::operator new(bytes);
+    *ptr = GetHostMemoryPool(false).allocate(bytes);
   }
 
-  void Delete(void *ptr, size_t /* unused */) override {
-    ::operator delete(ptr);
+  void Delete(void *ptr, size_t bytes) override {
+    GetHostMemoryPool(false).deallocate(ptr, bytes);
   }
 };
 
@@ -108,11 +126,11 @@ class PinnedCPUAllocator : public CPUAllocator {
   ~PinnedCPUAllocator() override = default;
 
   void New(void **ptr, size_t bytes) override {
-    CUDA_CALL(cudaMallocHost(ptr, bytes));
+    *ptr = GetHostMemoryPool(true).allocate(bytes);
   }
 
-  void Delete(void *ptr, size_t /* unused */) override {
-    CUDA_CALL(cudaFreeHost(ptr));
+  void Delete(void *ptr, size_t bytes) override {
+    GetHostMemoryPool(true).deallocate(ptr, bytes);
   }
 };
 
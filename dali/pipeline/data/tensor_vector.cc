@@ -121,6 +121,16 @@ void TensorVector<Backend>::Resize(const TensorListShape<> &new_shape, const Typ
 }
 
 
+template <typename Backend>
+void TensorVector<Backend>::SetSize(int new_size) {
+  DALI_ENFORCE(new_size >= 0, make_string("Incorrect size: ", new_size));
+  DALI_ENFORCE(state_ == State::noncontiguous,
+               "Changing the number of tensors is only allowed for non-contiguous TensorVector. "
+               "Use Resize instead.");
+  resize_tensors(new_size);
+}
+
+
 template <typename Backend>
 void TensorVector<Backend>::set_type(const TypeInfo &new_type) {
   type_ = new_type;
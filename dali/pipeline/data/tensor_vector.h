@@ -123,6 +123,12 @@ class DLL_PUBLIC TensorVector {
 
   DLL_PUBLIC void Resize(const TensorListShape<> &new_shape, const TypeInfo &new_type);
 
+  /**
+   * @brief Changes the number of tensors, keeping the shapes and allocations of the
+   *        remaining ones. Only allowed for non-contiguous TensorVector.
+   */
+  void SetSize(int new_size);
+
   void set_type(const TypeInfo &new_type);
 
   const TypeInfo &type() const;
@@ -16,6 +16,7 @@
 #define DALI_PIPELINE_EXECUTOR_EXECUTOR_H_
 
 #include <atomic>
+#include <chrono>
 #include <map>
 #include <memory>
 #include <queue>
@@ -23,6 +24,7 @@
 #include <utility>
 #include <vector>
 #include <unordered_map>
+#include <unordered_set>
 #include <mutex>
 
 #include "dali/core/common.h"
@@ -53,6 +55,38 @@ struct DLL_PUBLIC ExecutorMeta {
   size_t max_reserved;
 };
 using ExecutorMetaMap = std::unordered_map<std::string, std::vector<ExecutorMeta>>;
+/// Integer diagnostic values of each operator (e.g. cache hits), keyed by the name of the operator
+using ExecutorCountersMap = std::unordered_map<std::string, std::map<std::string, int64_t>>;
+
+/**
+ * @brief Utilization of the thread pool by a CPU operator
+ *
+ * Parallel efficiency is the time the threads spent working on the operator's tasks divided by
+ * the time they were available to it (wall time of the run times the number of threads).
+ * Low efficiency means that the work is not spread evenly (e.g. a single large sample).
+ */
+struct DLL_PUBLIC ExecutorParallelStats {
+  /// parallel efficiency of the most recent run of the operator
+  double last_efficiency = 0;
+  /// total time spent by the threads on the operator's tasks, in nanoseconds
+  int64_t busy_time = 0;
+  /// total wall time of the operator's runs times the number of threads, in nanoseconds
+  int64_t available_time = 0;
+
+  /// parallel efficiency accumulated over all the runs of the operator
+  double efficiency() const {
+    return available_time > 0 ? static_cast<double>(busy_time) / available_time : 0;
+  }
+};
+/// Thread pool utilization of the CPU operators, keyed by the name of the operator
+using ExecutorParallelStatsMap = std::unordered_map<std::string, ExecutorParallelStats>;
+/**
+ * @brief Number of bytes per sample to preallocate for each output of an operator,
+ *        keyed by the position of the operator in the graph and its schema name
+ *        (e.g. "3:Flip"), so that the hints match the same graph in another pipeline,
+ *        regardless of the (possibly generated) names of the operators
+ */
+using ExecutorMemoryHints = std::unordered_map<std::string, std::vector<int64_t>>;
 
 namespace detail {
 // This is stream callback used on GPU stream to indicate that GPU work for this
@@ -79,6 +113,12 @@ class DLL_PUBLIC ExecutorBase {
   DLL_PUBLIC virtual void SetCompletionCallback(ExecutorCallback cb) = 0;
   DLL_PUBLIC virtual void EnableMemoryStats(bool enable_memory_stats = false) = 0;
   DLL_PUBLIC virtual ExecutorMetaMap GetExecutorMeta() = 0;
+  DLL_PUBLIC virtual ExecutorCountersMap GetExecutorCounters() = 0;
+  DLL_PUBLIC virtual ExecutorParallelStatsMap GetExecutorParallelStats() = 0;
+  DLL_PUBLIC virtual void SetThreadLimit(int num_threads) = 0;
+  DLL_PUBLIC virtual void SetMemoryHints(ExecutorMemoryHints hints) = 0;
+  DLL_PUBLIC virtual ExecutorMemoryHints GetRecordedMemoryHints() = 0;
+  DLL_PUBLIC virtual void SetMemoryBudget(size_t budget) = 0;
 
  protected:
   // virtual to allow the TestPruneWholeGraph test in gcc
@@ -121,6 +161,32 @@ class DLL_PUBLIC Executor : public ExecutorBase, public WorkspacePolicy, public
   DLL_PUBLIC void EnableMemoryStats(bool enable_memory_stats = false) override {
     enable_memory_stats_ = enable_memory_stats;
   }
+  /**
+   * @brief Sets the sizes of the operator outputs (e.g. the maximum sizes recorded in
+   *        the executor statistics of a previous run), which are preallocated at Build.
+   *
+   * The hints take precedence over smaller `bytes_per_sample_hint` values of the operators.
+   * Build fails if any of the hints doesn't match an operator of the graph.
+   * Must be called before Build.
+   */
+  DLL_PUBLIC void SetMemoryHints(ExecutorMemoryHints hints) override {
+    memory_hints_ = std::move(hints);
+  }
+  /**
+   * @brief Returns the maximum sizes of the operator outputs recorded in the memory
+   *        statistics, in the form accepted by SetMemoryHints
+   */
+  DLL_PUBLIC ExecutorMemoryHints GetRecordedMemoryHints() override;
+  /**
+   * @brief Limits the host memory taken by the outputs of the operators (in all the queues)
+   *        to `budget` bytes; 0 means no limit.
+   *
+   * When the limit is exceeded, either by the preallocation at Build or by an operator
+   * growing its outputs, an error is raised instead of letting the process swap.
+   */
+  DLL_PUBLIC void SetMemoryBudget(size_t budget) override {
+    memory_budget_ = budget;
+  }
   DLL_PUBLIC void Build(OpGraph *graph, vector<string> output_names) override;
   DLL_PUBLIC void Init() override {}
   DLL_PUBLIC void RunCPU() override;
@@ -131,6 +197,11 @@ class DLL_PUBLIC Executor : public ExecutorBase, public WorkspacePolicy, public
   DLL_PUBLIC void ReleaseOutputs() override;
   DLL_PUBLIC void SetCompletionCallback(ExecutorCallback cb) override;
   DLL_PUBLIC ExecutorMetaMap GetExecutorMeta() override;
+  DLL_PUBLIC ExecutorCountersMap GetExecutorCounters() override;
+  DLL_PUBLIC ExecutorParallelStatsMap GetExecutorParallelStats() override;
+  DLL_PUBLIC void SetThreadLimit(int num_threads) override {
+    thread_pool_.SetThreadLimit(num_threads);
+  }
 
   DLL_PUBLIC void ShutdownQueue() {
     QueuePolicy::SignalStop();
@@ -208,6 +279,60 @@ class DLL_PUBLIC Executor : public ExecutorBase, public WorkspacePolicy, public
       }
   }
 
+  inline void FillCounters(const OpNode &op_node, const std::string &op_name) {
+    if (enable_memory_stats_) {
+      auto counters = op_node.op->GetDiagnostics<int64_t>();
+      if (counters.empty())
+        return;
+      std::lock_guard<std::mutex> lck(counters_mutex_);
+      counters_[op_name] = std::move(counters);
+    }
+  }
+
+  /**
+   * @brief Updates the host memory taken by the outputs of the operator in the given queue
+   *        and raises an error if the memory budget is exceeded
+   */
+  template <typename W>
+  void CheckMemoryBudget(W &ws, const std::string &op_name, int queue_idx) {
+    if (memory_budget_ == 0)
+      return;
+    size_t op_usage = 0;
+    for (int i = 0; i < ws.NumOutput(); ++i) {
+      if (ws.template OutputIsType<CPUBackend>(i))
+        op_usage += ws.template OutputRef<CPUBackend>(i).capacity();
+    }
+    std::lock_guard<std::mutex> lck(host_memory_mutex_);
+    auto &usage = host_memory_usage_[make_string(op_name, ':', queue_idx)];
+    host_memory_total_ += op_usage - usage;
+    usage = op_usage;
+    DALI_ENFORCE(host_memory_total_ <= memory_budget_, make_string(
+        "The outputs of the operators take ", host_memory_total_, " bytes of host memory, "
+        "which exceeds the memory budget of ", memory_budget_, " bytes. The outputs of ",
+        op_name, " take ", op_usage, " bytes."));
+  }
+
+  /**
+   * @brief Records the utilization of the thread pool by a CPU operator
+   *
+   * @param busy_time time spent by the threads on the operator's tasks, in nanoseconds
+   * @param wall_time duration of the operator's run, in nanoseconds
+   */
+  inline void FillParallelStats(const std::string &op_name, int64_t busy_time,
+                                int64_t wall_time) {
+    if (enable_memory_stats_) {
+      // operators which don't use the thread pool are not reported
+      if (busy_time <= 0 || wall_time <= 0)
+        return;
+      int64_t available_time = wall_time * thread_pool_.thread_limit();
+      std::lock_guard<std::mutex> lck(parallel_stats_mutex_);
+      auto &stats = parallel_stats_[op_name];
+      stats.last_efficiency = static_cast<double>(busy_time) / available_time;
+      stats.busy_time += busy_time;
+      stats.available_time += available_time;
+    }
+  }
+
   void HandleError(const std::string &stage, const OpNode &op_node, const std::string &message) {
     // handle internal Operator names that start with underscore
     const auto &op_name =
@@ -239,11 +364,33 @@ class DLL_PUBLIC Executor : public ExecutorBase, public WorkspacePolicy, public
 
   void PruneUnusedGraphNodes() override;
 
+  /**
+   * @brief The name under which the statistics of the operator are reported
+   */
+  static std::string StatsName(const OpNode &node) {
+    switch (node.op_type) {
+      case OpType::CPU:
+        return "CPU_" + node.instance_name;
+      case OpType::MIXED:
+        return "MIXED_" + node.instance_name;
+      default:
+        return "GPU_" + node.instance_name;
+    }
+  }
+
+  /**
+   * @brief The key of the memory hints of the operator - its position in the graph and
+   *        its schema name
+   */
+  static std::string MemoryHintKey(const OpNode &node) {
+    return make_string(node.id, ':', node.spec.name());
+  }
+
   virtual std::vector<int> GetTensorQueueSizes(const OpGraph &graph);
 
   virtual void SetupOutputInfo(const OpGraph &graph);
 
-  std::vector<int> GetMemoryHints(const OpNode &node);
+  std::vector<int64_t> GetMemoryHints(const OpNode &node);
 
   void PrepinData(std::vector<tensor_data_store_queue_t> &tensor_to_store_queue,
                   const OpGraph &graph);
@@ -337,6 +484,15 @@ class DLL_PUBLIC Executor : public ExecutorBase, public WorkspacePolicy, public
   std::mutex cpu_memory_stats_mutex_;
   std::mutex mixed_memory_stats_mutex_;
   std::mutex gpu_memory_stats_mutex_;
+  ExecutorCountersMap counters_;
+  std::mutex counters_mutex_;
+  ExecutorParallelStatsMap parallel_stats_;
+  std::mutex parallel_stats_mutex_;
+  ExecutorMemoryHints memory_hints_;
+  size_t memory_budget_ = 0;
+  std::unordered_map<std::string, size_t> host_memory_usage_;
+  size_t host_memory_total_ = 0;
+  std::mutex host_memory_mutex_;
 
  private:
   template <typename InputRef>
@@ -350,6 +506,68 @@ class DLL_PUBLIC Executor : public ExecutorBase, public WorkspacePolicy, public
     return true;
   }
 
+  template <typename Workspace>
+  static int GetInputBatchSize(const Workspace &ws, int input_idx) {
+    if (ws.template InputIsType<CPUBackend>(input_idx)) {
+      return ws.template InputRef<CPUBackend>(input_idx).ntensor();
+    } else {
+      return ws.template InputRef<GPUBackend>(input_idx).ntensor();
+    }
+  }
+
+  /**
+   * @brief Calculates the number of samples that the operator processes in this iteration.
+   *
+   * Operators without inputs produce full batches. Otherwise, the batch size is taken from
+   * the inputs - regular and argument inputs alike - which must all have the same number
+   * of samples. Batches smaller than `batch_size_` are only allowed for operators that
+   * support variable batch size.
+   */
+  template <typename Workspace>
+  int CalculateBatchSize(const OpNode &op_node, const Workspace &ws) {
+    const auto &spec = op_node.op->GetSpec();
+    int batch_size = -1;
+    std::string first_input;
+    auto check_input = [&](int input_batch_size, const std::string &input_name) {
+      if (batch_size < 0) {
+        batch_size = input_batch_size;
+        first_input = input_name;
+        return;
+      }
+      DALI_ENFORCE(input_batch_size == batch_size,
+                   make_string("All inputs of an operator must have the same number of samples. ",
+                               first_input, " has ", batch_size, " samples, while ", input_name,
+                               " has ", input_batch_size, "."));
+    };
+    for (int i = 0; i < spec.NumRegularInput(); i++)
+      check_input(GetInputBatchSize(ws, i), make_string("Input ", i));
+    for (const auto &arg : spec.ArgumentInputs())
+      check_input(ws.ArgumentInput(arg.first).ntensor(),
+                  make_string("Argument input \"", arg.first, "\""));
+    if (batch_size < 0)
+      return batch_size_;
+    DALI_ENFORCE(batch_size > 0 && batch_size <= batch_size_,
+                 make_string("Invalid number of samples in the input: ", batch_size,
+                             ". Expected a value between 1 and the maximum batch size (",
+                             batch_size_, ")."));
+    DALI_ENFORCE(batch_size == batch_size_ || spec.GetSchema().SupportsVariableBatchSize(),
+                 make_string("The operator doesn't support variable batch size. Got ",
+                             batch_size, " samples, while the pipeline batch size is ",
+                             batch_size_, "."));
+    return batch_size;
+  }
+
+  template <typename Backend>
+  static void SetOutputBatchSize(TensorVector<Backend> &output, int batch_size) {
+    if (static_cast<int>(output.ntensor()) != batch_size)
+      output.SetSize(batch_size);
+  }
+
+  template <typename Backend>
+  static void SetOutputBatchSize(TensorList<Backend> &, int) {
+    // TensorList outputs are always resized by the operator as a whole
+  }
+
   template <typename Workspace>
   void RunHelper(OpNode &op_node, Workspace &ws) {
     auto &output_desc = op_node.output_desc;
@@ -357,6 +575,7 @@ class DLL_PUBLIC Executor : public ExecutorBase, public WorkspacePolicy, public
     output_desc.clear();
     const auto &spec = op.GetSpec();
     const auto &schema = spec.GetSchema();
+    ws.SetBatchSize(CalculateBatchSize(op_node, ws));
     SmallVector<int, 16> empty_layout_in_idxs;
     for (int i = 0; i < spec.NumRegularInput(); i++) {
       bool had_empty_layout = false;
@@ -392,6 +611,16 @@ class DLL_PUBLIC Executor : public ExecutorBase, public WorkspacePolicy, public
                    "Operator::Setup returned false indicating that it cannot calculate shape and "
                    "type information for Operator outputs. In that case CanInferOutputs should "
                    "always return false.");
+      // operators with inputs fill one output sample per input sample
+      if (spec.NumInput() > 0) {
+        for (int i = 0; i < ws.NumOutput(); i++) {
+          if (ws.template OutputIsType<CPUBackend>(i)) {
+            SetOutputBatchSize(ws.template OutputRef<CPUBackend>(i), ws.GetRequestedBatchSize());
+          } else {
+            SetOutputBatchSize(ws.template OutputRef<GPUBackend>(i), ws.GetRequestedBatchSize());
+          }
+        }
+      }
     }
     op.Run(ws);
 
@@ -428,6 +657,36 @@ ExecutorMetaMap Executor<WorkspacePolicy, QueuePolicy>::GetExecutorMeta() {
   return ret;
 }
 
+template <typename WorkspacePolicy, typename QueuePolicy>
+ExecutorMemoryHints Executor<WorkspacePolicy, QueuePolicy>::GetRecordedMemoryHints() {
+  ExecutorMemoryHints ret;
+  if (!graph_)
+    return ret;
+  auto meta = GetExecutorMeta();
+  for (int i = 0; i < graph_->NumOp(); i++) {
+    auto &node = graph_->Node(i);
+    auto stats = meta.find(StatsName(node));
+    if (stats == meta.end())
+      continue;
+    auto &hints = ret[MemoryHintKey(node)];
+    for (auto &output : stats->second)
+      hints.push_back(output.max_reserved);
+  }
+  return ret;
+}
+
+template <typename WorkspacePolicy, typename QueuePolicy>
+ExecutorCountersMap Executor<WorkspacePolicy, QueuePolicy>::GetExecutorCounters() {
+  std::lock_guard<std::mutex> lock(counters_mutex_);
+  return counters_;
+}
+
+template <typename WorkspacePolicy, typename QueuePolicy>
+ExecutorParallelStatsMap Executor<WorkspacePolicy, QueuePolicy>::GetExecutorParallelStats() {
+  std::lock_guard<std::mutex> lock(parallel_stats_mutex_);
+  return parallel_stats_;
+}
+
 template <typename WorkspacePolicy, typename QueuePolicy>
 void Executor<WorkspacePolicy, QueuePolicy>::Build(OpGraph *graph, vector<string> output_names) {
   DALI_ENFORCE(graph != nullptr, "Input graph is nullptr.");
@@ -516,8 +775,16 @@ void Executor<WorkspacePolicy, QueuePolicy>::RunCPU() {
     DomainTimeRange tr("[DALI][CPU op] " + op_node.instance_name, DomainTimeRange::kBlue1);
 
     try {
+      int64_t busy_start = thread_pool_.BusyTime();
+      auto start = std::chrono::steady_clock::now();
       RunHelper(op_node, ws);
+      int64_t wall_time = std::chrono::duration_cast<std::chrono::nanoseconds>(
+          std::chrono::steady_clock::now() - start).count();
       FillStats(cpu_memory_stats_, ws, "CPU_" + op_node.instance_name, cpu_memory_stats_mutex_);
+      FillCounters(op_node, "CPU_" + op_node.instance_name);
+      FillParallelStats("CPU_" + op_node.instance_name, thread_pool_.BusyTime() - busy_start,
+                        wall_time);
+      CheckMemoryBudget(ws, "CPU_" + op_node.instance_name, cpu_idxs[OpType::CPU]);
     } catch (std::exception &e) {
       HandleError("CPU", op_node, e.what());
     } catch (...) {
@@ -565,6 +832,8 @@ void Executor<WorkspacePolicy, QueuePolicy>::RunMixed() {
         RunHelper(op_node, ws);
         FillStats(mixed_memory_stats_, ws,  "MIXED_" + op_node.instance_name,
                   mixed_memory_stats_mutex_);
+        FillCounters(op_node, "MIXED_" + op_node.instance_name);
+        CheckMemoryBudget(ws, "MIXED_" + op_node.instance_name, mixed_idxs[OpType::MIXED]);
         if (ws.has_stream() && ws.has_event()) {
           CUDA_CALL(cudaEventRecord(ws.event(), ws.stream()));
         }
@@ -631,6 +900,7 @@ void Executor<WorkspacePolicy, QueuePolicy>::RunGPU() {
             DomainTimeRange::knvGreen);
         RunHelper(op_node, ws);
         FillStats(gpu_memory_stats_, ws, "GPU_" + op_node.instance_name, gpu_memory_stats_mutex_);
+        FillCounters(op_node, "GPU_" + op_node.instance_name);
         if (ws.has_event()) {
           CUDA_CALL(cudaEventRecord(ws.event(), ws.stream()));
         }
@@ -857,9 +1127,11 @@ void Executor<WorkspacePolicy, QueuePolicy>::PresizeData(
   DeviceGuard g(device_id_);
   DomainTimeRange tr("[DALI][Executor] PresizeData");
 
-  auto should_reserve = [](auto &storage, Index hint, StorageDevice dev) -> bool {
+  // Non-pinned CPU buffers are only preallocated when the operator has its own hint
+  auto should_reserve = [](auto &storage, Index hint, StorageDevice dev,
+                           bool op_hint) -> bool {
     if (dev == StorageDevice::CPU) {
-      return hint && storage->is_pinned();
+      return hint && (storage->is_pinned() || op_hint);
     }
     return hint;
   };
@@ -875,9 +1147,14 @@ void Executor<WorkspacePolicy, QueuePolicy>::PresizeData(
 
   // To avoid handling the arguments several times for each operator that
   // has more than one output, we go over the operators instead of tensors
+  size_t host_memory = 0;
+  size_t matched_hints = 0;
   for (int i = 0; i < graph.NumOp(); i++) {
     auto &node = graph.Node(i);
     auto hints = GetMemoryHints(node);
+    bool recorded_hint = memory_hints_.count(MemoryHintKey(node)) > 0;
+    matched_hints += recorded_hint;
+    bool op_hint = node.spec.HasArgument("bytes_per_sample_hint") || recorded_hint;
     VALUE_SWITCH(node.op_type, op_type_static,
         (OpType::CPU, OpType::MIXED, OpType::GPU),
     (
@@ -890,24 +1167,46 @@ void Executor<WorkspacePolicy, QueuePolicy>::PresizeData(
         (
           auto& queue = get_queue<op_type_static, dev_static>(tensor_to_store_queue[tensor.id]);
           for (auto storage : queue) {
-            if (should_reserve(storage, hint, dev_static)) {
+            if (should_reserve(storage, hint, dev_static, op_hint)) {
               reserve_batch(storage, *node.op, hint, batch_size_);
             }
             if (node.op->CanInferOutputs()) {
               storage->SetContiguous(true);
             }
+            if (dev_static == StorageDevice::CPU) {
+              host_memory += storage->capacity();
+            }
           }
         ), DALI_FAIL("Invalid StorageDevice"));  // NOLINT(whitespace/parens)
       }
     ), DALI_FAIL("Invalid op type"));  // NOLINT(whitespace/parens)
   }
+  if (matched_hints < memory_hints_.size()) {
+    std::unordered_set<std::string> keys;
+    for (int i = 0; i < graph.NumOp(); i++)
+      keys.insert(MemoryHintKey(graph.Node(i)));
+    for (auto &hint : memory_hints_) {
+      DALI_ENFORCE(keys.count(hint.first), make_string(
+          "The memory hints don't match the graph: there is no operator \"", hint.first,
+          "\". The hints can only be used with the graph they were recorded for."));
+    }
+  }
+  DALI_ENFORCE(memory_budget_ == 0 || host_memory <= memory_budget_, make_string(
+      "The preallocated outputs of the operators take ", host_memory, " bytes of host memory, "
+      "which exceeds the memory budget of ", memory_budget_, " bytes."));
 }
 
 template <typename WorkspacePolicy, typename QueuePolicy>
-std::vector<int> Executor<WorkspacePolicy, QueuePolicy>::GetMemoryHints(const OpNode &node) {
-  std::vector<int> hints;
-  GetSingleOrRepeatedArg(node.spec, hints, "bytes_per_sample_hint", node.spec.NumOutput());
-  std::replace(hints.begin(), hints.end(), 0, static_cast<int>(bytes_per_sample_hint_));
+std::vector<int64_t> Executor<WorkspacePolicy, QueuePolicy>::GetMemoryHints(const OpNode &node) {
+  std::vector<int> spec_hints;
+  GetSingleOrRepeatedArg(node.spec, spec_hints, "bytes_per_sample_hint", node.spec.NumOutput());
+  std::replace(spec_hints.begin(), spec_hints.end(), 0, static_cast<int>(bytes_per_sample_hint_));
+  std::vector<int64_t> hints(spec_hints.begin(), spec_hints.end());
+  auto recorded = memory_hints_.find(MemoryHintKey(node));
+  if (recorded != memory_hints_.end()) {
+    for (size_t i = 0; i < hints.size() && i < recorded->second.size(); i++)
+      hints[i] = std::max(hints[i], recorded->second[i]);
+  }
   return hints;
 }
 
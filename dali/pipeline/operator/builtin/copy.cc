@@ -37,6 +37,7 @@ DALI_SCHEMA(Copy)
   .NumInput(1)
   .NumOutput(1)
   .AllowSequences()
-  .SupportVolumetric();
+  .SupportVolumetric()
+  .SupportVariableBatchSize();
 
 }  // namespace dali
@@ -32,14 +32,12 @@ void ExternalSource<CPUBackend>::RunImpl(HostWorkspace &ws) {
     const auto &shapes = tensor_vector_elm.front()->shape();
     output.Resize(shapes, tensor_vector_elm.front()->type());
 
-    for (int sample_id = 0; sample_id < batch_size_; ++sample_id) {
-      thread_pool.AddWork([&ws, sample_id, &tensor_vector_elm] (int tid) {
-        Tensor<CPUBackend> &output_tensor = ws.Output<CPUBackend>(0, sample_id);
-        // HostWorkspace doesn't have any stream
-        cudaStream_t stream = 0;
-        output_tensor.Copy((*tensor_vector_elm.front())[sample_id], stream);
-      }, shapes.tensor_size(sample_id));
-    }
+    ScheduleSamples(thread_pool, shapes, [&ws, &tensor_vector_elm](int sample_id, int tid) {
+      Tensor<CPUBackend> &output_tensor = ws.Output<CPUBackend>(0, sample_id);
+      // HostWorkspace doesn't have any stream
+      cudaStream_t stream = 0;
+      output_tensor.Copy((*tensor_vector_elm.front())[sample_id], stream);
+    });
     thread_pool.RunAll();
     // as we copy element by element and the output is contiguous we need to set layout
     // for the whole output not each element(view)
@@ -60,6 +58,7 @@ DALI_SCHEMA(_ExternalSource)
   for details.)code")
   .NumInput(0)
   .NumOutput(1)
+  .SupportVariableBatchSize()
   .AddOptionalArg("blocking",
       R"code(Whether external source should block until data is available or just
 fail when it is not)code", true)
@@ -94,6 +93,7 @@ should match the number of dimensions expected by the next operator in the pipel
 where the last dimension represents the different channels).)code")
   .NumInput(0)
   .NumOutput(1)
+  .SupportVariableBatchSize()
   .AddOptionalArg("blocking",
       R"code(Whether external source should block until data is available or just
 fail when it is not)code", false)
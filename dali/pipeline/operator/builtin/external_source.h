@@ -380,10 +380,11 @@ class ExternalSource : public Operator<Backend> {
       DALI_WARN("Warning: Loading GPU-originated data into CPU "
                 "ExternalSource operator is discouraged and might be inefficient.");
     }
-    DALI_ENFORCE(OperatorBase::batch_size_ == static_cast<int>(batch.ntensor()),
-                 make_string("Data list provided to ExternalSource needs to have batch_size = ",
-                             OperatorBase::batch_size_, " length, found ", batch.ntensor(),
-                             " samples."));
+    DALI_ENFORCE(batch.ntensor() > 0 &&
+                 static_cast<int>(batch.ntensor()) <= OperatorBase::batch_size_,
+                 make_string("Data list provided to ExternalSource needs to have at least one "
+                             "and at most batch_size = ", OperatorBase::batch_size_,
+                             " samples, found ", batch.ntensor(), " samples."));
     // Note: If we create a GPU source, we will need to figure
     // out what stream we want to do this copy in. CPU we can
     // pass anything as it is ignored.
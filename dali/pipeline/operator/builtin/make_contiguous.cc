@@ -19,18 +19,15 @@ namespace dali {
 void MakeContiguousCPU::RunImpl(HostWorkspace &ws) {
   auto &input = ws.template InputRef<CPUBackend>(0);
   auto &output = ws.template OutputRef<CPUBackend>(0);
-  int batch_size = input.ntensor();
   output.SetLayout(input.GetLayout());
   auto shapes = input.shape();
 
   auto &thread_pool = ws.GetThreadPool();
-  for (int sample_id = 0; sample_id < batch_size; ++sample_id) {
-    thread_pool.AddWork([sample_id, &input, &output] (int tid) {
-      // HostWorkspace doesn't have any stream
-      cudaStream_t stream = 0;
-      output[sample_id].Copy(input[sample_id], stream);
-    }, shapes.tensor_size(sample_id));
-  }
+  ScheduleSamples(thread_pool, shapes, [&input, &output](int sample_id, int tid) {
+    // HostWorkspace doesn't have any stream
+    cudaStream_t stream = 0;
+    output[sample_id].Copy(input[sample_id], stream);
+  });
   thread_pool.RunAll();
 }
 
@@ -40,6 +37,7 @@ DALI_SCHEMA(MakeContiguous)
   .DocStr(R"code(Move input batch to a contiguous representation, more suitable for execution on the GPU)code")
   .NumInput(1)
   .NumOutput(1)
+  .SupportVariableBatchSize()
   .MakeInternal();
 
 }  // namespace dali
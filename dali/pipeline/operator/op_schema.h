@@ -300,6 +300,18 @@ graph even if its outputs are not used.)code", false);
     return *this;
   }
 
+  /**
+   * @brief Notes that the operator can process batches with fewer samples than the
+   * `batch_size` of the pipeline.
+   *
+   * Such operators must take the number of samples from the workspace
+   * (see `GetRequestedBatchSize`) or from the shape of their inputs instead of `batch_size_`.
+   */
+  DLL_PUBLIC inline OpSchema& SupportVariableBatchSize() {
+    support_variable_batch_size_ = true;
+    return *this;
+  }
+
   /**
    * @brief Notes that this operator is internal to DALI backend (and shouldn't be exposed in Python API)
    */
@@ -714,6 +726,10 @@ graph even if its outputs are not used.)code", false);
     return support_volumetric_;
   }
 
+  DLL_PUBLIC inline bool SupportsVariableBatchSize() const {
+    return support_variable_batch_size_;
+  }
+
   DLL_PUBLIC inline bool IsInternal() const {
     return is_internal_;
   }
@@ -908,6 +924,8 @@ graph even if its outputs are not used.)code", false);
 
   bool support_volumetric_ = false;
 
+  bool support_variable_batch_size_ = false;
+
   bool allow_sequences_ = false;
   bool is_sequence_operator_ = false;
 
@@ -16,6 +16,7 @@
 #define DALI_PIPELINE_OPERATOR_OPERATOR_H_
 
 #include <algorithm>
+#include <map>
 #include <memory>
 #include <string>
 #include <utility>
@@ -36,6 +37,7 @@
 #include "dali/pipeline/util/backend2workspace_map.h"
 #include "dali/pipeline/workspace/device_workspace.h"
 #include "dali/pipeline/workspace/sample_workspace.h"
+#include "dali/util/io_stats.h"
 
 namespace dali {
 
@@ -46,6 +48,10 @@ struct DLL_PUBLIC ReaderMeta {
   int shard_id = -1;              // shard id of given reader
   int pad_last_batch = -1;        // if given reader should pad last batch
   int stick_to_shard = -1;        // if given reader should stick to its shard
+  IOCounters io_total;            // I/O statistics, cumulative
+  IOCounters io_current_epoch;    // I/O statistics of the epoch in progress
+  IOCounters io_last_epoch;       // I/O statistics of the last completed epoch
+  int64_t io_epochs_completed = 0;
 
   DLL_PUBLIC operator bool() const {
     return epoch_size != -1 && epoch_size_padded != -1 && number_of_shards != -1 &&
@@ -197,6 +203,19 @@ class DLL_PUBLIC OperatorBase {
     }
   }
 
+  /**
+   * @brief Returns the current values of all the diagnostic parameters of type T, by name
+   */
+  template<typename T>
+  std::map<std::string, T> GetDiagnostics() const {
+    std::map<std::string, T> ret;
+    for (const auto &entry : diagnostics_) {
+      if (auto *val = any_cast<T *>(&entry.second))
+        ret.emplace(entry.first, **val);
+    }
+    return ret;
+  }
+
 
  protected:
   /**
@@ -316,14 +335,22 @@ class Operator<CPUBackend> : public OperatorBase {
     // allowing for fallback to old per-sample implementations.
 
     auto &thread_pool = ws.GetThreadPool();
-    for (int data_idx = 0; data_idx < batch_size_; ++data_idx) {
-      thread_pool.AddWork([this, &ws, data_idx](int tid) {
+    int curr_batch_size = ws.GetRequestedBatchSize() > 0 ? ws.GetRequestedBatchSize()
+                                                         : batch_size_;
+    // The size of the first input is the best cost estimate available here;
+    // samples of equal cost are processed in order
+    auto sample_cost = [&ws](int data_idx) -> int64_t {
+      if (ws.NumInput() == 0 || !ws.template InputIsType<CPUBackend>(0))
+        return 0;
+      return ws.template InputRef<CPUBackend>(0)[data_idx].size();
+    };
+    ScheduleSamplesByCost(thread_pool, curr_batch_size, sample_cost,
+      [this, &ws](int data_idx, int tid) {
         SampleWorkspace sample;
         ws.GetSample(&sample, data_idx, tid);
         this->SetupSharedSampleParams(sample);
         this->RunImpl(sample);
-      }, -data_idx);  // -data_idx for FIFO order
-    }
+      });
     thread_pool.RunAll();
   }
 
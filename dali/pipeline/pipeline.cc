@@ -20,6 +20,7 @@
 #include <algorithm>
 #include <functional>
 #include <memory>
+#include <set>
 
 #include "dali/pipeline/executor/async_pipelined_executor.h"
 #include "dali/pipeline/executor/async_separated_pipelined_executor.h"
@@ -394,6 +395,125 @@ void Pipeline::AddToOpSpecs(const std::string &inst_name, const OpSpec &spec, in
   logical_ids_[logical_id].push_back(op_specs_.size() - 1);
 }
 
+namespace {
+
+/**
+ * @brief Operators that can be replaced with FusedColorTransform.
+ *
+ * BrightnessContrast is not limited to 3-channel images, so it's only fused together with
+ * the other ones.
+ */
+const std::set<std::string> &FusableColorOps() {
+  static const std::set<std::string> ops = {
+    "Hsv", "Hue", "Saturation", "Brightness", "Contrast", "ColorTwist", "BrightnessContrast"
+  };
+  return ops;
+}
+
+/**
+ * @brief Moves the arguments of the color operator `stage` to the `fused` spec, as the arguments
+ *        of the k-th stage (`<name>_<k>`, see FusedColorTransform)
+ */
+void AddFusedColorStage(OpSpec &fused, const OpSpec &stage, int k) {
+  for (const char *arg : {"hue", "saturation", "value", "brightness", "contrast",
+                          "brightness_shift", "contrast_center"}) {
+    std::string stage_arg = make_string(arg, "_", k);
+    auto arg_input = stage.ArgumentInputs().find(arg);
+    if (arg_input != stage.ArgumentInputs().end()) {
+      fused.AddArgumentInput(stage_arg, stage.InputName(arg_input->second));
+    } else if (stage.HasArgument(arg)) {
+      fused.AddArg(stage_arg, stage.GetArgument<float>(arg));
+    }
+  }
+  // the default output type differs between the operators, so it's always passed explicitly
+  fused.AddArg(make_string("dtype_", k), stage.GetArgument<DALIDataType>("dtype"));
+}
+
+}  // namespace
+
+std::vector<bool> Pipeline::FuseColorOps(const vector<std::pair<string, string>> &output_names) {
+  std::vector<bool> absorbed(op_specs_.size(), false);
+  const OpSchema *fused_schema = SchemaRegistry::TryGetSchema("FusedColorTransform");
+  if (!fused_schema)
+    return absorbed;
+  int max_stages = 0;
+  while (fused_schema->HasArgument(make_string("dtype_", max_stages)))
+    max_stages++;
+
+  // Data nodes consumed only once, as a regular input, can be fused away
+  std::map<string, int> num_uses;
+  std::map<string, size_t> consumer;
+  for (size_t i = 0; i < op_specs_.size(); i++) {
+    const OpSpec &spec = op_specs_[i].spec;
+    for (int j = 0; j < spec.NumInput(); j++) {
+      num_uses[spec.InputName(j)]++;
+      if (!spec.IsArgumentInput(j))
+        consumer[spec.InputName(j)] = i;
+    }
+  }
+  for (auto &out : output_names)
+    num_uses[out.first]++;
+
+  auto is_fusable = [&](size_t i) {
+    const OpSpec &spec = op_specs_[i].spec;
+    return FusableColorOps().count(spec.name()) &&
+           spec.GetArgument<string>("device") == "cpu" &&
+           spec.NumRegularInput() == 1 && spec.NumOutput() == 1 &&
+           !spec.GetArgument<bool>("preserve") &&
+           logical_ids_[op_specs_[i].logical_id].size() == 1;
+  };
+
+  std::vector<int> next(op_specs_.size(), -1), prev(op_specs_.size(), -1);
+  for (size_t i = 0; i < op_specs_.size(); i++) {
+    if (!is_fusable(i))
+      continue;
+    const string &out = op_specs_[i].spec.OutputName(0);
+    if (num_uses[out] != 1 || !consumer.count(out) || !is_fusable(consumer[out]))
+      continue;
+    next[i] = consumer[out];
+    prev[consumer[out]] = i;
+  }
+
+  auto fuse = [&](const std::vector<int> &chain) {
+    bool any_rgb_op = false;
+    for (int i : chain)
+      any_rgb_op |= op_specs_[i].spec.name() != "BrightnessContrast";
+    if (chain.size() < 2 || !any_rgb_op)
+      return;
+    auto &first = op_specs_[chain.front()].spec;
+    auto &last = op_specs_[chain.back()];
+    OpSpec fused("FusedColorTransform");
+    fused.AddArg("device", "cpu");
+    fused.AddInput(first.InputName(0), "cpu");
+    std::vector<std::string> stages;
+    for (size_t k = 0; k < chain.size(); k++) {
+      const OpSpec &stage = op_specs_[chain[k]].spec;
+      AddFusedColorStage(fused, stage, k);
+      stages.push_back(stage.name());
+    }
+    fused.AddArg("stages", stages);
+    fused.AddOutput(last.spec.OutputName(0), "cpu");
+    last.spec = fused;
+    for (size_t k = 0; k + 1 < chain.size(); k++)
+      absorbed[chain[k]] = true;
+  };
+
+  for (size_t i = 0; i < op_specs_.size(); i++) {
+    if (prev[i] >= 0 || next[i] < 0)
+      continue;  // not the beginning of a chain
+    std::vector<int> chain;
+    for (int op = i; op >= 0; op = next[op]) {
+      if (static_cast<int>(chain.size()) == max_stages) {
+        fuse(chain);
+        chain.clear();
+      }
+      chain.push_back(op);
+    }
+    fuse(chain);
+  }
+  return absorbed;
+}
+
 inline int GetMemoryHint(OpSpec &spec, int index) {
   if (!spec.HasArgument("bytes_per_sample_hint"))
     return 0;
@@ -442,13 +562,28 @@ void Pipeline::Build(vector<std::pair<string, string>> output_names) {
                           num_threads_, device_id_, bytes_per_sample_hint_, set_affinity_,
                           max_num_stream_, default_cuda_stream_priority_, prefetch_queue_depth_);
   executor_->EnableMemoryStats(enable_memory_stats_);
+  executor_->SetMemoryHints(memory_hints_);
+  executor_->SetMemoryBudget(memory_budget_);
   executor_->Init();
+  if (enable_tracing_ && !tracing_active_) {
+    Tracer::Get().Enable();
+    tracing_active_ = true;
+  }
+
+  std::vector<bool> absorbed;
+  if (fuse_color_ops_)
+    absorbed = FuseColorOps(output_names);
 
   // Creating the graph
-  for (auto& name_op_spec : op_specs_) {
+  for (size_t op_idx = 0; op_idx < op_specs_.size(); op_idx++) {
+    auto& name_op_spec = op_specs_[op_idx];
     string& inst_name = name_op_spec.instance_name;
     OpSpec op_spec = name_op_spec.spec;
     PrepareOpSpec(&op_spec, name_op_spec.logical_id);
+    // The operators absorbed by the fused ones still draw their seeds, so that the remaining
+    // operators get the same seeds as they would without the fusion
+    if (!absorbed.empty() && absorbed[op_idx])
+      continue;
     try {
       graph_.AddOp(op_spec, inst_name);
     } catch (std::exception &e) {
@@ -771,6 +906,12 @@ const std::string &Pipeline::output_device(int id) const {
   return output_names_[id].second;
 }
 
+void Pipeline::SetThreadLimit(int num_threads) {
+  DALI_ENFORCE(built_,
+      "\"Build()\" must be called prior to calling \"SetThreadLimit()\".");
+  executor_->SetThreadLimit(num_threads);
+}
+
 int Pipeline::num_outputs() const {
   DALI_ENFORCE(built_,
       "\"Build()\" must be called prior to calling \"num_outputs()\".");
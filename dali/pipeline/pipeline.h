@@ -25,6 +25,7 @@
 #include <vector>
 
 #include "dali/core/common.h"
+#include "dali/core/tracer.h"
 #include "dali/pipeline/executor/executor.h"
 #include "dali/pipeline/data/backend.h"
 #include "dali/pipeline/data/tensor.h"
@@ -102,7 +103,10 @@ class DLL_PUBLIC Pipeline {
                       int max_num_stream = -1, int default_cuda_stream_priority = 0,
                       int64_t seed = -1);
 
-  DLL_PUBLIC ~Pipeline() = default;
+  DLL_PUBLIC ~Pipeline() {
+    if (tracing_active_)
+      Tracer::Get().Disable();
+  }
 
   /**
    * @brief Creates a placeholder for an external input with the given name
@@ -304,6 +308,64 @@ class DLL_PUBLIC Pipeline {
     }
   }
 
+  /**
+   * @brief Sets the number of bytes per sample to preallocate for the operator outputs,
+   *        as returned by GetMemoryHints of a pipeline with the same graph.
+   *
+   * Must be called before Build()
+   */
+  DLL_PUBLIC void SetMemoryHints(ExecutorMemoryHints memory_hints) {
+    DALI_ENFORCE(!built_, "Memory hints must be set before the pipeline is built.");
+    memory_hints_ = std::move(memory_hints);
+  }
+
+  /**
+   * @brief Limits the host memory taken by the operator outputs to `budget` bytes; exceeding
+   *        the limit is reported as an error. 0 means no limit.
+   *
+   * Must be called before Build()
+   */
+  DLL_PUBLIC void SetMemoryBudget(size_t budget) {
+    DALI_ENFORCE(!built_, "Memory budget must be set before the pipeline is built.");
+    memory_budget_ = budget;
+  }
+
+  /**
+   * @brief Enables recording of the execution trace (see Tracer) once the pipeline is built.
+   *        The trace is recorded as long as the pipeline exists.
+   *
+   * Must be called before Build()
+   */
+  DLL_PUBLIC void EnableTracing(bool enable_tracing = true) {
+    DALI_ENFORCE(!built_, "Tracing must be enabled before the pipeline is built.");
+    enable_tracing_ = enable_tracing;
+  }
+
+  /**
+   * @brief Returns the recorded execution trace as a JSON document in the Chrome trace format
+   *
+   * The tracer is shared by all the pipelines in the process - the events of all the pipelines
+   * with tracing enabled are included.
+   */
+  DLL_PUBLIC std::string ExportTrace() const {
+    DALI_ENFORCE(tracing_active_, "Tracing is not enabled for this pipeline. "
+                 "Enable it before building the pipeline.");
+    return Tracer::Get().ExportChromeTrace();
+  }
+
+  /**
+   * @brief Enables replacing the chains of CPU color operators (Hsv, Hue, Saturation,
+   *        Brightness, Contrast, ColorTwist, BrightnessContrast) with a single
+   *        FusedColorTransform operator, which applies the composed transform in one pass.
+   *
+   * The results of the intermediate operators are neither rounded nor clamped.
+   * Must be called before Build()
+   */
+  DLL_PUBLIC void EnableColorOpFusion(bool enable = true) {
+    DALI_ENFORCE(!built_, "Color operator fusion must be enabled before the pipeline is built.");
+    fuse_color_ops_ = enable;
+  }
+
   /**
    * @brief Obtains the executor statistics
    */
@@ -315,6 +377,42 @@ class DLL_PUBLIC Pipeline {
     }
   }
 
+  /**
+   * @brief Obtains the maximum sizes of the operator outputs recorded in the executor
+   *        statistics, keyed by the position of the operator in the graph and its schema name
+   */
+  DLL_PUBLIC ExecutorMemoryHints GetMemoryHints() {
+    if (executor_) {
+      return executor_->GetRecordedMemoryHints();
+    } else {
+      return {};
+    }
+  }
+
+  /**
+   * @brief Obtains the integer diagnostic values reported by the operators (e.g. cache hits),
+   *        collected along with the executor statistics
+   */
+  DLL_PUBLIC ExecutorCountersMap GetExecutorCounters() {
+    if (executor_) {
+      return executor_->GetExecutorCounters();
+    } else {
+      return {};
+    }
+  }
+
+  /**
+   * @brief Obtains the thread pool utilization (parallel efficiency) of the CPU operators,
+   *        collected along with the executor statistics
+   */
+  DLL_PUBLIC ExecutorParallelStatsMap GetExecutorParallelStats() {
+    if (executor_) {
+      return executor_->GetExecutorParallelStats();
+    } else {
+      return {};
+    }
+  }
+
   /**
    * @brief Set queue sizes for Pipeline using Separated Queues
    *
@@ -414,6 +512,15 @@ class DLL_PUBLIC Pipeline {
    */
   DLL_PUBLIC inline int num_threads() const { return num_threads_; }
 
+  /**
+   * @brief Limits the number of the worker threads running the CPU operators to `num_threads`,
+   *        without recreating the thread pool. The limit can be changed between the iterations
+   *        and it is clamped to [1, num_threads()].
+   *
+   * Must be called after Build()
+   */
+  DLL_PUBLIC void SetThreadLimit(int num_threads);
+
   /**
    * @brief Returns the GPU device number used by the pipeline
    */
@@ -484,6 +591,14 @@ class DLL_PUBLIC Pipeline {
 
   void PropagateMemoryHint(OpNode &node);
 
+  /**
+   * @brief Replaces the chains of color operators in op_specs_ with FusedColorTransform
+   *
+   * The fused operator takes the place of the last operator in the chain.
+   * @return The mask of the entries in op_specs_ which were absorbed by a fused operator
+   */
+  std::vector<bool> FuseColorOps(const vector<std::pair<string, string>> &output_names);
+
   // Helper for hybrid decoder split_stages special handling
   inline void AddSplitHybridDecoder(OpSpec &spec, const std::string &inst_name, int logical_id);
 
@@ -507,6 +622,11 @@ class DLL_PUBLIC Pipeline {
   int next_internal_logical_id_ = -1;
   QueueSizes prefetch_queue_depth_;
   bool enable_memory_stats_ = false;
+  ExecutorMemoryHints memory_hints_;
+  size_t memory_budget_ = 0;
+  bool enable_tracing_ = false;
+  bool tracing_active_ = false;
+  bool fuse_color_ops_ = false;
 
   std::vector<int64_t> seed_;
   int original_seed_;
@@ -12,6 +12,8 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
+#include <algorithm>
+#include <chrono>
 #include <cstdlib>
 #include <utility>
 #include "dali/pipeline/util/thread_pool.h"
@@ -26,7 +28,7 @@ namespace dali {
 
 ThreadPool::ThreadPool(int num_thread, int device_id, bool set_affinity)
     : threads_(num_thread), running_(true), work_complete_(true), adding_work_(false)
-    , active_threads_(0) {
+    , active_threads_(0), thread_limit_(num_thread) {
   DALI_ENFORCE(num_thread > 0, "Thread pool must have non-zero size");
 #if NVML_ENABLED
   // only for the CPU pipeline
@@ -58,8 +60,14 @@ ThreadPool::~ThreadPool() {
 }
 
 void ThreadPool::AddWork(Work work, int64_t priority, bool finished_adding_work) {
+  std::string trace_name;
+  if (Tracer::Get().enabled()) {
+    const char *name = TraceScope::CurrentName();
+    if (name)
+      trace_name = name;
+  }
   std::lock_guard<std::mutex> lock(mutex_);
-  work_queue_.push({priority, std::move(work)});
+  work_queue_.push({priority, work_seq_++, std::move(work), std::move(trace_name)});
   work_complete_ = false;
   adding_work_ = !finished_adding_work;
 }
@@ -67,7 +75,7 @@ void ThreadPool::AddWork(Work work, int64_t priority, bool finished_adding_work)
 void ThreadPool::DoWorkWithID(Work work, int64_t priority) {
   AddWork(std::move(work), priority, true);
   // Signal a thread to complete the work
-  condition_.notify_one();
+  WakeOne();
 }
 
 // Blocks until all work issued to the thread pool is complete
@@ -93,7 +101,7 @@ void ThreadPool::RunAll(bool wait) {
     std::lock_guard<std::mutex> lock(mutex_);
     adding_work_ = false;
   }
-  condition_.notify_one();  // other threads will be waken up if needed
+  WakeOne();  // other threads will be waken up if needed
   if (wait) {
     WaitForWork();
   }
@@ -103,6 +111,36 @@ int ThreadPool::size() const {
   return threads_.size();
 }
 
+void ThreadPool::SetThreadLimit(int num_threads) {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    thread_limit_ = std::max(1, std::min<int>(num_threads, threads_.size()));
+  }
+  // the threads which were enabled might have some work waiting for them
+  condition_.notify_all();
+}
+
+int ThreadPool::thread_limit() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return thread_limit_;
+}
+
+void ThreadPool::WakeOne() {
+  bool limited;
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    limited = thread_limit_ < static_cast<int>(threads_.size());
+  }
+  if (limited)
+    condition_.notify_all();
+  else
+    condition_.notify_one();
+}
+
+int64_t ThreadPool::BusyTime() const {
+  return busy_time_.load();
+}
+
 std::vector<std::thread::id> ThreadPool::GetThreadIds() const {
   std::vector<std::thread::id> tids;
   tids.reserve(threads_.size());
@@ -114,6 +152,7 @@ std::vector<std::thread::id> ThreadPool::GetThreadIds() const {
 
 void ThreadPool::ThreadMain(int thread_id, int device_id, bool set_affinity) {
   DeviceGuard g(device_id);
+  Tracer::SetThreadName(make_string("[DALI] thread pool #", thread_id));
   try {
 #if NVML_ENABLED
     if (set_affinity) {
@@ -141,13 +180,17 @@ void ThreadPool::ThreadMain(int thread_id, int device_id, bool set_affinity) {
   while (running_) {
     // Block on the condition to wait for work
     std::unique_lock<std::mutex> lock(mutex_);
-    condition_.wait(lock, [this] { return !running_ || (!work_queue_.empty() && !adding_work_); });
+    condition_.wait(lock, [this, thread_id] {
+      return !running_ ||
+             (!work_queue_.empty() && !adding_work_ && thread_id < thread_limit_);
+    });
     // If we're no longer running, exit the run loop
     if (!running_) break;
 
     // Get work from the queue & mark
     // this thread as active
-    Work work = std::move(work_queue_.top().second);
+    Work work = std::move(work_queue_.top().work);
+    std::string trace_name = work_queue_.top().trace_name;
     work_queue_.pop();
     bool should_wake_next = !work_queue_.empty();
     ++active_threads_;
@@ -156,13 +199,15 @@ void ThreadPool::ThreadMain(int thread_id, int device_id, bool set_affinity) {
     lock.unlock();
 
     if (should_wake_next) {
-      condition_.notify_one();
+      WakeOne();
     }
 
     // If an error occurs, we save it in tl_errors_. When
     // WaitForWork is called, we will check for any errors
     // in the threads and return an error if one occured.
+    auto start = std::chrono::steady_clock::now();
     try {
+      TraceScope trace(trace_name.empty() ? "[DALI][Thread pool] work" : trace_name.c_str());
       work(thread_id);
     } catch (std::exception &e) {
       lock.lock();
@@ -173,6 +218,8 @@ void ThreadPool::ThreadMain(int thread_id, int device_id, bool set_affinity) {
       tl_errors_[thread_id].push("Caught unknown exception");
       lock.unlock();
     }
+    busy_time_ += std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now() - start).count();
 
     // Mark this thread as idle & check for complete work
     lock.lock();
@@ -17,6 +17,7 @@
 
 #include <cstdlib>
 #include <utility>
+#include <atomic>
 #include <condition_variable>
 #include <functional>
 #include <mutex>
@@ -25,6 +26,8 @@
 #include <vector>
 #include <string>
 #include "dali/core/common.h"
+#include "dali/core/tensor_shape.h"
+#include "dali/core/tracer.h"
 
 
 namespace dali {
@@ -43,6 +46,10 @@ class DLL_PUBLIC ThreadPool {
    *        The work only gets queued and it will only start after invoking
    *        `RunAll` (wakes up all threads to complete all remaining works) or
    *        `DoWorkWithID` (wakes up a single thread to complete one work unit).
+   *        Work with higher priority is picked up first; work items with equal priority
+   *        are picked up in the order in which they were added.
+   *        When tracing is enabled, the execution of the work is recorded under the name of
+   *        the innermost trace scope active in the calling thread (typically, the operator).
    * @remarks if finished_adding_work == true, the thread pool will proceed picking
    *          tasks from its queue, otherwise it will hold execution until `RunAll`
    *          is invoked.
@@ -69,19 +76,52 @@ class DLL_PUBLIC ThreadPool {
 
   DLL_PUBLIC int size() const;
 
+  /**
+   * @brief Limits the number of threads picking up the work to `num_threads`
+   *        (clamped to [1, size()]). The other threads are kept idle until the limit
+   *        is raised again. The work which is already running is not interrupted.
+   */
+  DLL_PUBLIC void SetThreadLimit(int num_threads);
+
+  /**
+   * @brief The number of threads which can pick up the work (see SetThreadLimit)
+   */
+  DLL_PUBLIC int thread_limit() const;
+
   DLL_PUBLIC std::vector<std::thread::id> GetThreadIds() const;
 
+  /**
+   * @brief Total time (in nanoseconds) that the threads spent executing the work,
+   *        summed over all threads, since the thread pool was created.
+   *
+   * The difference of two readings, divided by the elapsed wall time and the number of threads,
+   * gives the parallel efficiency of the work done in between.
+   */
+  DLL_PUBLIC int64_t BusyTime() const;
+
   DISABLE_COPY_MOVE_ASSIGN(ThreadPool);
 
  private:
   DLL_PUBLIC void ThreadMain(int thread_id, int device_id, bool set_affinity);
 
+  /**
+   * @brief Wakes up a thread to pick up the work. When some of the threads are disabled,
+   *        a single notification could be consumed by a thread which can't take the work,
+   *        so all of them are woken up.
+   */
+  void WakeOne();
+
   vector<std::thread> threads_;
 
-  using PrioritizedWork = std::pair<int64_t, Work>;
+  struct PrioritizedWork {
+    int64_t priority;
+    int64_t seq;  // order of addition - makes the work with equal priority FIFO
+    Work work;
+    std::string trace_name;  // only set when tracing is enabled
+  };
   struct SortByPriority {
     bool operator() (const PrioritizedWork &a, const PrioritizedWork &b) {
-      return a.first < b.first;
+      return a.priority < b.priority || (a.priority == b.priority && a.seq > b.seq);
     }
   };
   std::priority_queue<PrioritizedWork, std::vector<PrioritizedWork>, SortByPriority> work_queue_;
@@ -90,7 +130,10 @@ class DLL_PUBLIC ThreadPool {
   bool work_complete_;
   bool adding_work_;
   int active_threads_;
-  std::mutex mutex_;
+  int thread_limit_;
+  int64_t work_seq_ = 0;
+  std::atomic<int64_t> busy_time_{0};
+  mutable std::mutex mutex_;
   std::condition_variable condition_;
   std::condition_variable completed_;
 
@@ -98,6 +141,44 @@ class DLL_PUBLIC ThreadPool {
   vector<std::queue<string>> tl_errors_;
 };
 
+/**
+ * @brief Queues the per-sample work of a batch, so that the most expensive samples are
+ *        processed first.
+ *
+ * Starting with the largest tasks (longest processing time first) prevents a single large
+ * sample from being picked up last and keeping one thread busy while the others are idle.
+ * Samples with equal cost are processed in order.
+ *
+ * @param pool        thread pool (or any object with a compatible `AddWork`)
+ * @param num_samples number of samples in the batch
+ * @param cost        `cost(sample_idx)` - estimated cost of processing the sample
+ * @param work        `work(sample_idx, thread_idx)` - the work to be done for each sample
+ *
+ * @remarks The work is only queued - `RunAll` must be called to execute it.
+ */
+template <typename Pool, typename SampleCost, typename SampleWork>
+void ScheduleSamplesByCost(Pool &pool, int num_samples, SampleCost &&cost, SampleWork &&work) {
+  for (int i = 0; i < num_samples; i++) {
+    int64_t sample_cost = cost(i);
+    pool.AddWork([work, i](int thread_idx) {
+      TraceScope::SetSampleRange(i, i + 1);
+      work(i, thread_idx);
+    }, sample_cost);
+  }
+}
+
+/**
+ * @brief Queues the per-sample work of a batch, the samples with the largest volume first
+ *
+ * @see ScheduleSamplesByCost
+ */
+template <typename Pool, typename Shape, typename SampleWork>
+void ScheduleSamples(Pool &pool, const Shape &shape, SampleWork &&work) {
+  ScheduleSamplesByCost(pool, shape.num_samples(), [&](int i) {
+    return volume(shape.tensor_shape_span(i));
+  }, std::forward<SampleWork>(work));
+}
+
 }  // namespace dali
 
 #endif  // DALI_PIPELINE_UTIL_THREAD_POOL_H_
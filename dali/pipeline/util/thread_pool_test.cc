@@ -15,6 +15,11 @@
 #include "dali/pipeline/util/thread_pool.h"
 #include <gtest/gtest.h>
 #include <atomic>
+#include <chrono>
+#include <mutex>
+#include <set>
+#include <thread>
+#include <vector>
 
 namespace dali {
 
@@ -67,6 +72,98 @@ TEST(ThreadPool, AddWorkWithPriority) {
   ASSERT_EQ(((1+1) << 3) + 1, count);
 }
 
+TEST(ThreadPool, ThreadLimit) {
+  ThreadPool tp(8, 0, false);
+  EXPECT_EQ(tp.thread_limit(), 8);
+  tp.SetThreadLimit(2);
+  EXPECT_EQ(tp.thread_limit(), 2);
+
+  std::mutex mtx;
+  std::set<int> used_threads;
+  std::atomic<int> count{0};
+  auto work = [&](int thread_id) {
+    {
+      std::lock_guard<std::mutex> lock(mtx);
+      used_threads.insert(thread_id);
+    }
+    std::this_thread::sleep_for(std::chrono::microseconds(100));
+    count++;
+  };
+  for (int i = 0; i < 64; i++) {
+    tp.AddWork(work);
+  }
+  tp.RunAll();
+  EXPECT_EQ(count, 64);
+  for (int thread_id : used_threads)
+    EXPECT_LT(thread_id, 2);
+
+  // DoWorkWithID must not get stuck waking up the disabled threads
+  for (int i = 0; i < 64; i++) {
+    tp.DoWorkWithID(work);
+  }
+  tp.WaitForWork();
+  EXPECT_EQ(count, 128);
+
+  tp.SetThreadLimit(100);
+  EXPECT_EQ(tp.thread_limit(), 8);
+  tp.SetThreadLimit(0);
+  EXPECT_EQ(tp.thread_limit(), 1);
+}
+
+TEST(ThreadPool, EqualPriorityFIFO) {
+  ThreadPool tp(1, 0, false);
+  std::vector<int> order;
+  for (int i = 0; i < 10; i++) {
+    tp.AddWork([&order, i](int thread_id) { order.push_back(i); }, i < 5 ? 1 : 2);
+  }
+  tp.RunAll();
+  EXPECT_EQ(order, std::vector<int>({5, 6, 7, 8, 9, 0, 1, 2, 3, 4}));
+}
+
+TEST(ThreadPool, ScheduleSamplesLargestFirst) {
+  ThreadPool tp(1, 0, false);
+  TensorListShape<2> shape = {{ {3, 4}, {10, 10}, {1, 1}, {5, 20}, {2, 6} }};
+  std::vector<int> order;
+  ScheduleSamples(tp, shape, [&order](int sample_idx, int thread_idx) {
+    order.push_back(sample_idx);
+  });
+  tp.RunAll();
+  // sample 0 and 4 have equal volume - they're processed in order
+  EXPECT_EQ(order, std::vector<int>({1, 3, 0, 4, 2}));
+}
+
+TEST(ThreadPool, BusyTime) {
+  ThreadPool tp(4, 0, false);
+  int64_t start = tp.BusyTime();
+  for (int i = 0; i < 8; i++) {
+    tp.AddWork([](int thread_id) {
+      std::this_thread::sleep_for(std::chrono::milliseconds(5));
+    });
+  }
+  tp.RunAll();
+  EXPECT_GE(tp.BusyTime() - start, 8 * 5000000);
+}
+
+TEST(ThreadPool, Tracing) {
+  ThreadPool tp(2, 0, false);
+  TensorListShape<1> shape = {{ {3}, {5}, {4} }};
+  Tracer::Get().Enable();
+  {
+    TraceScope op("my op");
+    ScheduleSamples(tp, shape, [](int sample_idx, int thread_idx) {});
+    tp.RunAll();
+  }
+  Tracer::Get().Disable();
+  std::set<int> samples;
+  for (auto &event : Tracer::Get().Events()) {
+    if (event.name == "my op" && event.sample_begin >= 0) {
+      EXPECT_EQ(event.sample_end, event.sample_begin + 1);
+      samples.insert(event.sample_begin);
+    }
+  }
+  EXPECT_EQ(samples, std::set<int>({0, 1, 2}));
+}
+
 }  // namespace test
 
 }  // namespace dali
@@ -122,6 +122,19 @@ class WorkspaceBase : public ArgumentWorkspace {
     gpu_outputs_index_.clear();
   }
 
+  /**
+   * @brief Returns the number of samples that the operator should process in the current
+   * iteration. It may be smaller than the `batch_size` of the pipeline if the operator
+   * supports variable batch size. Returns 0 if it was not set.
+   */
+  int GetRequestedBatchSize() const {
+    return batch_size_;
+  }
+
+  void SetBatchSize(int batch_size) {
+    batch_size_ = batch_size;
+  }
+
   template <typename Backend>
   typename InputType<Backend>::element_type& InputRef(int idx) const {
     return *InputHandle(idx, Backend{});
@@ -459,6 +472,9 @@ class WorkspaceBase : public ArgumentWorkspace {
   // that tensor in the {cpu, gpu}_inputs_ vector.
   vector<InOutMeta> input_index_map_, output_index_map_;
 
+  // Number of samples to process in the current iteration
+  int batch_size_ = 0;
+
  private:
   inline const InOutMeta& FetchAtIndex(const vector<InOutMeta>& index_map, int idx) const {
     DALI_ENFORCE(idx >= 0 && idx < (int) index_map.size(),
@@ -18,11 +18,13 @@
 #include "dali/pipeline/operator/op_schema.h"
 #include "dali/pipeline/operator/op_spec.h"
 #include "dali/pipeline/pipeline.h"
+#include "dali/pipeline/data/allocator.h"
 #include "dali/pipeline/data/tensor.h"
 #include "dali/pipeline/data/tensor_list.h"
 #include "dali/python/python3_compat.h"
 #include "dali/util/user_stream.h"
 #include "dali/operators/reader/parser/tfrecord_parser.h"
+#include "dali/image/image_factory.h"
 #include "dali/plugin/plugin_manager.h"
 #include "dali/util/half.hpp"
 #include "dali/core/device_guard.h"
@@ -1049,6 +1051,39 @@ void ExposeBufferPolicyFunctions(py::module &m) {
   m.def("GetHostBufferShrinkThreshold", Buffer<CPUBackend>::GetShrinkThreshold);
   m.def("GetHostBufferGrowthFactor", Buffer<CPUBackend>::GetGrowthFactor);
   m.def("GetDeviceBufferGrowthFactor", Buffer<GPUBackend>::GetGrowthFactor);
+
+  m.def("GetHostMemoryPoolStats", [](bool pinned) {
+    auto stats = GetHostMemoryPool(pinned).get_stats();
+    py::dict d;
+    d["hits"] = stats.hits;
+    d["misses"] = stats.misses;
+    d["upstream_bytes"] = stats.upstream_bytes;
+    d["peak_upstream_bytes"] = stats.peak_upstream_bytes;
+    d["cached_bytes"] = stats.cached_bytes;
+    return d;
+  }, "pinned"_a = false,
+  R"code(Returns the statistics of the memory pool which backs the host (or pinned, if
+``pinned=True``) memory allocations, as a dictionary with the following keys:
+
+- ``hits`` - number of allocations served from the pool,
+- ``misses`` - number of allocations which required allocating new memory,
+- ``upstream_bytes`` - total size of the memory allocated by the pool, including cached blocks,
+- ``peak_upstream_bytes`` - peak value of ``upstream_bytes``,
+- ``cached_bytes`` - size of the free memory kept in the pool for reuse.)code");
+
+  m.def("ResetHostMemoryPoolStats", [](bool pinned) {
+    GetHostMemoryPool(pinned).reset_stats();
+  }, "pinned"_a = false);
+
+  m.def("SetHostMemoryPoolCacheLimit", [](size_t max_bytes, bool pinned) {
+    GetHostMemoryPool(pinned).set_max_cached_bytes(max_bytes);
+  }, "max_bytes"_a, "pinned"_a = false,
+  "Sets the maximum size of the free memory kept in the host (or pinned) memory pool.");
+
+  m.def("ReleaseHostMemoryPool", [](bool pinned) {
+    GetHostMemoryPool(pinned).release_cached();
+  }, "pinned"_a = false,
+  "Frees the memory cached in the host (or pinned) memory pool.");
 }
 
 py::dict DeprecatedArgMetaToDict(const DeprecatedArgDef & meta) {
@@ -1059,6 +1094,23 @@ py::dict DeprecatedArgMetaToDict(const DeprecatedArgDef & meta) {
   return d;
 }
 
+py::dict IOCountersToDict(const IOCounters &counters) {
+  py::dict d;
+  d["bytes_read"] = counters.bytes_read;
+  d["read_calls"] = counters.read_calls;
+  d["read_time_ns"] = counters.read_time;
+  py::list histogram;
+  for (auto count : counters.read_latency_histogram)
+    histogram.append(count);
+  d["read_latency_histogram"] = histogram;
+  d["major_page_faults"] = counters.major_page_faults;
+  d["minor_page_faults"] = counters.minor_page_faults;
+  d["cache_hits"] = counters.cache_hits;
+  d["consumer_wait_time_ns"] = counters.consumer_wait_time;
+  d["producer_wait_time_ns"] = counters.producer_wait_time;
+  return d;
+}
+
 py::dict ReaderMetaToDict(const ReaderMeta &meta) {
   py::dict d;
   d["epoch_size"] = meta.epoch_size;
@@ -1067,10 +1119,17 @@ py::dict ReaderMetaToDict(const ReaderMeta &meta) {
   d["shard_id"] = meta.shard_id;
   d["pad_last_batch"] = meta.pad_last_batch;
   d["stick_to_shard"] = meta.stick_to_shard;
+  py::dict io_stats;
+  io_stats["total"] = IOCountersToDict(meta.io_total);
+  io_stats["current_epoch"] = IOCountersToDict(meta.io_current_epoch);
+  io_stats["last_epoch"] = IOCountersToDict(meta.io_last_epoch);
+  io_stats["epochs_completed"] = meta.io_epochs_completed;
+  d["io_stats"] = io_stats;
   return d;
 }
 
-py::dict ExecutorMetaToDict(const ExecutorMetaMap &meta) {
+py::dict ExecutorMetaToDict(const ExecutorMetaMap &meta, const ExecutorCountersMap &counters,
+                            const ExecutorParallelStatsMap &parallel_stats) {
   py::dict d;
   for (const auto &stat : meta) {
     py::dict op_dict;
@@ -1088,6 +1147,16 @@ py::dict ExecutorMetaToDict(const ExecutorMetaMap &meta) {
     op_dict["max_real_memory_size"] = max_real_memory_size;
     op_dict["reserved_memory_size"] = reserved_memory_size;
     op_dict["max_reserved_memory_size"] = max_reserved_memory_size;
+    auto op_counters = counters.find(stat.first);
+    if (op_counters != counters.end()) {
+      for (const auto &counter : op_counters->second)
+        op_dict[counter.first.c_str()] = counter.second;
+    }
+    auto op_parallel_stats = parallel_stats.find(stat.first);
+    if (op_parallel_stats != parallel_stats.end()) {
+      op_dict["parallel_efficiency"] = op_parallel_stats->second.last_efficiency;
+      op_dict["mean_parallel_efficiency"] = op_parallel_stats->second.efficiency();
+    }
     d[stat.first.c_str()] = op_dict;
   }
   return d;
@@ -1117,6 +1186,32 @@ PYBIND11_MODULE(backend_impl, m) {
 
   m.def("GetCxx11AbiFlag", &GetCxx11AbiFlag);
 
+  m.def("PeekImageShape", [](py::buffer encoded) {
+      py::buffer_info info = encoded.request();
+      if (info.itemsize != 1)
+        throw py::value_error("Expected a buffer of bytes with the encoded image.");
+      const auto *data = static_cast<const uint8_t *>(info.ptr);
+      size_t length = info.size;
+      Image::Shape shape;
+      {
+        py::gil_scoped_release interpreter_unlock{};
+        shape = ImageFactory::PeekShape(data, length);
+      }
+      return py::make_tuple(shape[0], shape[1], shape[2]);
+    },
+    R"code(
+    Reads the shape of an encoded image from its header, without decoding it.
+
+    Supported formats: JPEG, PNG, BMP, PNM, TIFF and JPEG 2000.
+    The buffer only needs to contain the beginning of the file, up to the end of
+    the header (for TIFF, up to the end of the first IFD).
+
+    Returns a tuple ``(height, width, channels)``.
+
+    encoded : bytes-like object
+          Encoded image data.
+    )code", "encoded"_a);
+
   // Types
   py::module types_m = m.def_submodule("types");
   types_m.doc() = "Datatypes and options used by DALI";
@@ -1266,12 +1361,43 @@ PYBIND11_MODULE(backend_impl, m) {
     .def("executor_statistics",
         [](Pipeline *p) {
           auto ret = p->GetExecutorMeta();
-          return ExecutorMetaToDict(ret);
+          return ExecutorMetaToDict(ret, p->GetExecutorCounters(),
+                                    p->GetExecutorParallelStats());
+        })
+    .def("memory_hints",
+        [](Pipeline *p) {
+          return p->GetMemoryHints();
         })
     .def("SetQueueSizes",
         [](Pipeline *p, int cpu_size, int gpu_size) {
           p->SetQueueSizes(cpu_size, gpu_size);
         })
+    .def("SetThreadLimit",
+        [](Pipeline *p, int num_threads) {
+          p->SetThreadLimit(num_threads);
+        },
+        "num_threads"_a)
+    .def("SetMemoryHints",
+        [](Pipeline *p, const ExecutorMemoryHints &memory_hints) {
+          p->SetMemoryHints(memory_hints);
+        },
+        "memory_hints"_a)
+    .def("SetMemoryBudget",
+        [](Pipeline *p, size_t budget) {
+          p->SetMemoryBudget(budget);
+        },
+        "budget"_a)
+    .def("EnableTracing",
+        [](Pipeline *p, bool enable_tracing) {
+          p->EnableTracing(enable_tracing);
+        },
+        "enable_tracing"_a = true)
+    .def("ExportTrace", &Pipeline::ExportTrace)
+    .def("EnableColorOpFusion",
+        [](Pipeline *p, bool enable) {
+          p->EnableColorOpFusion(enable);
+        },
+        "enable"_a = true)
     .def("SetOutputNames",
         [](Pipeline *p, const std::vector<std::pair<string, string>>& outputs) {
           p->SetOutputNames(outputs);
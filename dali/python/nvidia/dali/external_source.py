@@ -1,6 +1,9 @@
 # custom wrappers around ops
 from nvidia.dali import backend as _b
+import asyncio
 import inspect
+import queue
+import threading
 import nvidia.dali.types
 
 def _get_batch_shape(data):
@@ -19,9 +22,9 @@ def _get_batch_shape(data):
 
 def _check_data_batch(data, batch_size, layout):
     shape, uniform = _get_batch_shape(data)
-    if len(shape) != batch_size:
+    if len(shape) < 1 or len(shape) > batch_size:
         raise RuntimeError("The external source callback returned an unexpected batch "
-        "size: {} instead of {}".format(len(shape), batch_size))
+        "size: {}. Expected at least 1 and at most {} samples".format(len(shape), batch_size))
 
     if len(shape) > 0:
         dim = len(shape[0])
@@ -72,6 +75,7 @@ class _ExternalSourceGroup(object):
         self.batch = batch
         self.current_iter = 0
         self.current_sample = 0
+        self._loop = None
         if callback is not None:
             if callback.__code__.co_argcount not in [0, 1]:
                 raise TypeError("External source callback must be a callable with 0 or 1 argument")
@@ -93,18 +97,46 @@ class _ExternalSourceGroup(object):
         self.current_iter = 0
         self.current_sample = 0
 
-    def call_and_feed(self, pipeline, batch_size):
+    def get_batch(self, batch_size, loop = None):
+        """Invokes the callback and returns its output for a whole batch.
+
+        If the callback is a coroutine function (``async def``), the coroutines are run to
+        completion in ``loop`` - per-sample coroutines are awaited concurrently.
+        """
         try:
             if self.batch:
                 callback_out = self.callback(*self.callback_args(None))
+                if inspect.iscoroutine(callback_out):
+                    callback_out = self._run_coroutines([callback_out], loop)[0]
             else:
                 callback_out = [self.callback(*self.callback_args(i)) for i in range(batch_size)]
+                if any(inspect.iscoroutine(x) for x in callback_out):
+                    callback_out = self._run_coroutines(callback_out, loop)
             self.current_sample += batch_size
             self.current_iter += 1
         except StopIteration:
             self.reset_indices()
             raise
-
+        return callback_out
+
+    def _run_coroutines(self, coros, loop):
+        async def gather():
+            return await asyncio.gather(*[c if inspect.iscoroutine(c) else _as_coroutine(c)
+                                          for c in coros], return_exceptions = True)
+        if loop is None:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+            loop = self._loop
+        results = loop.run_until_complete(gather())
+        for result in results:
+            if isinstance(result, BaseException):
+                # StopIteration raised in a coroutine is converted to RuntimeError (PEP 479)
+                if isinstance(result, RuntimeError) and isinstance(result.__cause__, StopIteration):
+                    raise StopIteration
+                raise result
+        return results
+
+    def feed(self, pipeline, callback_out, batch_size):
         if self.is_multioutput:
             for op in self.instances:
                 if self.batch:
@@ -118,6 +150,90 @@ class _ExternalSourceGroup(object):
             op = self.instances[0]
             pipeline.feed_input(op._name, data, op._layout, self._cuda_stream, self.use_copy_kernel)
 
+    def call_and_feed(self, pipeline, batch_size):
+        callback_out = self.get_batch(batch_size)
+        self.feed(pipeline, callback_out, batch_size)
+
+async def _as_coroutine(x):
+    return x
+
+def _prefetch_worker(groups, batch_size, out_queue, stop_event):
+    loop = asyncio.new_event_loop()
+    try:
+        while not stop_event.is_set():
+            try:
+                item = ([group.get_batch(batch_size, loop) for group in groups], None)
+            except Exception as e:  # StopIteration included - it's forwarded to the consumer
+                item = (None, e)
+            while not stop_event.is_set():
+                try:
+                    out_queue.put(item, timeout = 0.1)
+                    break
+                except queue.Full:
+                    pass
+            if item[1] is not None:
+                break
+    finally:
+        loop.close()
+
+class _ExternalSourcePrefetcher(object):
+    """Runs the callbacks of external source groups for the upcoming iterations on
+    a background thread and keeps up to ``depth`` iterations of their outputs ready.
+
+    The outputs are returned in order, one list (with one entry per group) per iteration.
+    Exceptions raised by the callbacks (including ``StopIteration``) are re-raised by
+    :meth:`get` in the iteration in which they occurred.
+    """
+    def __init__(self, groups, batch_size, depth):
+        if depth < 1:
+            raise ValueError("Prefetch depth must be positive, got {}".format(depth))
+        self._groups = list(groups)
+        self._batch_size = batch_size
+        self._depth = depth
+        self._queue = None
+        self._stop_event = None
+        self._thread = None
+
+    def _start(self):
+        self._queue = queue.Queue(self._depth)
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target = _prefetch_worker,
+                                        args = (self._groups, self._batch_size, self._queue, self._stop_event),
+                                        daemon = True)
+        self._thread.start()
+
+    def get(self):
+        if self._thread is None:
+            self._start()
+        callback_outs, error = self._queue.get()
+        if error is not None:
+            # the worker exits after an error - it will be restarted on the next call
+            self._thread.join()
+            self._thread = None
+            raise error
+        return callback_outs
+
+    def feed(self, pipeline):
+        callback_outs = self.get()
+        for group, callback_out in zip(self._groups, callback_outs):
+            group.feed(pipeline, callback_out, self._batch_size)
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._queue = None
+
+    def reset(self):
+        self.stop()
+        for group in self._groups:
+            group.reset_indices()
+
+    def __del__(self):
+        self.stop()
+
 def _is_generator_function(x):
     """Checks whether x is a generator function or a callable object
     where __call__ is a generator function"""
@@ -213,6 +329,11 @@ Args
     However, unlike a generator, the function can be used with ``cycle``. In this case, the function
     will be called again when the generator reaches the end of iteration.
 
+    The source can also be a coroutine function (``async def``). The returned coroutine is
+    awaited by DALI - per-sample coroutines of one batch are awaited concurrently. This is most
+    useful together with the ``py_callback_prefetch_depth`` argument of the
+    :class:`nvidia.dali.pipeline.Pipeline`, which moves the callback calls to a background thread.
+
     For GPU inputs, it is a user's responsibility to modify the provided GPU memory content
     only in the provided stream. DALI schedules a copy on this stream, and all work is properly
     queued. If no stream is provided, DALI will use a default, with a best-effort approach at
@@ -22,6 +22,8 @@ from threading import local as tls
 from . import data_node as _data_node
 import warnings
 import ctypes
+import os
+import time
 pipeline_tls = tls()
 
 from .data_node import DataNode
@@ -55,6 +57,11 @@ Parameters
     are invalid - the default value may only be used with
     serialized pipeline (the value stored in serialized pipeline
     is used instead).
+    The batches fed to ExternalSource may contain fewer samples, in which case the operators
+    consuming them process only the samples provided in given iteration. This is
+    supported only by the operators that allow variable batch size - other operators raise
+    an error when they receive a smaller batch. The internal buffers are sized for
+    `batch_size` samples.
 `num_threads` : int, optional, default = -1
     Number of CPU threads used by the pipeline.
     Negative values for this parameter are invalid - the default
@@ -105,13 +112,49 @@ Parameters
 `enable_memory_stats`: bool, optional, default = False
     If DALI should print operator output buffer statistics.
     Usefull for `bytes_per_sample_hint` operator parameter.
+`memory_hints`: dict, optional, default = None
+    The number of bytes per sample to preallocate for the outputs of the operators, as returned
+    by :meth:`memory_hints` of a pipeline with the same graph, run with ``enable_memory_stats``.
+    All the output buffers of the operators are preallocated to these sizes when the pipeline
+    is built, so they don't have to grow during the first iterations. Larger
+    ``bytes_per_sample_hint`` values of the operators take precedence.
+    If the hints don't match the graph, an error is raised when the pipeline is built.
+`memory_budget`: int, optional, default = None
+    The maximum host memory, in bytes, which the outputs of the operators can take (in all
+    the prefetch queues). If the preallocated outputs or the outputs produced while running
+    the pipeline exceed it, an error is raised rather than letting the system swap.
+`enable_tracing`: bool, optional, default = False
+    If True, the execution of the pipeline (the stages of the executor, the operators, the work
+    done by the thread pool - with the indices of the samples processed, the prefetching of
+    the readers) is recorded in a ring buffer, which can be saved with :meth:`export_trace`.
+    Only the most recent events are kept.
+`fuse_color_ops`: bool, optional, default = False
+    If True, chains of CPU color operators (``Hsv``, ``Hue``, ``Saturation``, ``Brightness``,
+    ``Contrast``, ``ColorTwist`` and ``BrightnessContrast``) applied one after another to
+    the same images are replaced by a single operator, which applies the composed
+    transform in one pass. Up to 4 operators are fused together. The operators whose outputs
+    are used elsewhere in the pipeline are not fused.
+    The results of the intermediate operators are neither rounded nor clamped, so the output
+    can differ from that of the separate operators - especially when an intermediate result
+    exceeds the range of its type.
+`py_callback_prefetch_depth`: int, optional, default = 0
+    Number of iterations for which the ``source`` callbacks of ExternalSource operators are run
+    ahead of the pipeline. If positive, the callbacks are invoked on a background thread
+    (coroutine sources are run in an asyncio loop owned by that thread) and their outputs are
+    buffered, so a slow source does not delay scheduling of the pipeline iterations.
+    The callbacks are then called from a thread other than the one that runs the pipeline,
+    in the same order as without prefetching.
+    Value of 0 disables prefetching - the callbacks are called just before each iteration
+    is scheduled.
 """
     def __init__(self, batch_size = -1, num_threads = -1, device_id = -1, seed = -1,
                  exec_pipelined=True, prefetch_queue_depth=2,
                  exec_async=True, bytes_per_sample=0,
                  set_affinity=False, max_streams=-1, default_cuda_stream_priority = 0,
                  *,
-                 enable_memory_stats=False):
+                 enable_memory_stats=False, py_callback_prefetch_depth=0,
+                 memory_hints=None, memory_budget=None, enable_tracing=False,
+                 fuse_color_ops=False):
         self._sinks = []
         self._batch_size = batch_size
         self._num_threads = num_threads
@@ -138,7 +181,13 @@ Parameters
         self._skip_api_check = False
         self._graph_out = None
         self._input_callbacks = None
+        self._input_callback_prefetcher = None
+        self._py_callback_prefetch_depth = py_callback_prefetch_depth
         self._enable_memory_stats = enable_memory_stats
+        self._memory_hints = memory_hints
+        self._memory_budget = memory_budget
+        self._enable_tracing = enable_tracing
+        self._fuse_color_ops = fuse_color_ops
         if type(prefetch_queue_depth) is dict:
             self._exec_separated = True
             self._cpu_queue_size = prefetch_queue_depth["cpu_size"]
@@ -213,11 +262,71 @@ Parameters
 
         ``max_reserved_memory_size``: list of maximum memory sizes per tensor that is reserved for each of the operator outputs
                                   index in the list corresponds to the output index
+
+        CPU operators which use the thread pool also report:
+
+        ``parallel_efficiency``:      fraction of the time available to the threads during the last
+                                      run of the operator which was spent on its work (1.0 means that
+                                      all threads were busy all the time)
+
+        ``mean_parallel_efficiency``: the same, accumulated over all runs of the operator
+
+        Additionally, operators can report integer diagnostic values, for example:
+
+        ``fft_plan_cache_hits``:   number of FFT plans taken from the process-wide plan cache
+                                   (CPU ``Spectrogram``, ``PowerSpectrum``, ``FusedMFCC``)
+
+        ``fft_plan_cache_misses``: number of FFT plans that had to be created
         """
         if not self._built:
             raise RuntimeError("Pipeline must be built first.")
         return self._pipe.executor_statistics()
 
+    def memory_hints(self):
+        """Returns the maximum number of bytes per sample reserved for each output of each
+        operator, as recorded in :meth:`executor_statistics`.
+
+        The result is a dictionary which can be saved (e.g. with :mod:`json`) after a warm-up
+        run and passed as ``memory_hints`` to a new pipeline with the same graph, so its output
+        buffers are preallocated to these sizes. The pipeline must be created with
+        ``enable_memory_stats=True``.
+
+        The operators are identified by their position in the graph and their type
+        (e.g. ``"3:Flip"``) rather than by their names, which are generated for the operators
+        not named explicitly and differ between the pipelines.
+        """
+        if not self._built:
+            raise RuntimeError("Pipeline must be built first.")
+        if not self._enable_memory_stats:
+            raise RuntimeError("Memory hints are collected only when the pipeline is created "
+                               "with `enable_memory_stats=True`.")
+        return self._pipe.memory_hints()
+
+    @staticmethod
+    def _setup_memory_limits(backend_pipe, memory_hints, memory_budget):
+        if memory_hints:
+            backend_pipe.SetMemoryHints({name: [int(h) for h in hints]
+                                         for name, hints in memory_hints.items()})
+        if memory_budget:
+            backend_pipe.SetMemoryBudget(int(memory_budget))
+
+    def export_trace(self, filename):
+        """Saves the recorded execution trace to ``filename`` in the Chrome trace format
+        (JSON), which can be viewed in ``chrome://tracing`` or Perfetto.
+
+        The pipeline must be created with ``enable_tracing=True``. The trace buffer is shared
+        by all the pipelines in the process - the events of all the pipelines with tracing
+        enabled are saved.
+        """
+        if not self._built:
+            raise RuntimeError("Pipeline must be built first.")
+        if not self._enable_tracing:
+            raise RuntimeError("The execution trace is recorded only when the pipeline is "
+                               "created with `enable_tracing=True`.")
+        trace = self._pipe.ExportTrace()
+        with open(filename, "w") as f:
+            f.write(trace)
+
     def reader_meta(self, name = None):
         """Returns provided reader metadata as a dictionary. If no name is provided if provides
         a dictionary with data for all readers as {reader_name : meta}
@@ -236,6 +345,24 @@ Parameters
 
         ``stick_to_shard``:    if given reader should stick to its shard
 
+        ``io_stats``:          I/O statistics of the reader - a dictionary with the counters
+                               accumulated since the reader was created (``total``), in the epoch
+                               in progress (``current_epoch``) and in the last completed epoch
+                               (``last_epoch``), as well as the number of ``epochs_completed``.
+                               The counters are:
+
+            * ``bytes_read``, ``read_calls``, ``read_time_ns`` - reads done by the file streams
+              of the reader (for memory-mapped files, the data is only mapped - see the page
+              faults)
+            * ``read_latency_histogram`` - the number of reads which took less than 1 us (index 0)
+              and [2^(i-1), 2^i) us (index i); the last entry includes all the longer reads
+            * ``major_page_faults``, ``minor_page_faults`` - page faults of the prefetching thread
+            * ``cache_hits`` - samples not read thanks to ``skip_cached_images``
+            * ``consumer_wait_time_ns`` - time the pipeline waited for the reader to prefetch
+              a batch; a large value means that the reader is the bottleneck
+            * ``producer_wait_time_ns`` - time the reader waited for a free slot in its prefetch
+              queue
+
         Parameters
         ----------
         name : str, optional, default = None
@@ -371,6 +498,9 @@ Parameters
         self._pipe.SetExecutionTypes(self._exec_pipelined, self._exec_separated, self._exec_async)
         self._pipe.SetQueueSizes(self._cpu_queue_size, self._gpu_queue_size)
         self._pipe.EnableExecutorMemoryStats(self._enable_memory_stats)
+        self._pipe.EnableTracing(self._enable_tracing)
+        self._pipe.EnableColorOpFusion(self._fuse_color_ops)
+        self._setup_memory_limits(self._pipe, self._memory_hints, self._memory_budget)
 
         if define_graph is not None:
             if self._graph_out is not None:
@@ -454,6 +584,10 @@ Parameters
                 group = op._group
                 groups.add(group)
         self._input_callbacks = list(groups)
+        if self._py_callback_prefetch_depth > 0 and self._input_callbacks:
+            from nvidia.dali.external_source import _ExternalSourcePrefetcher
+            self._input_callback_prefetcher = _ExternalSourcePrefetcher(
+                self._input_callbacks, self._batch_size, self._py_callback_prefetch_depth)
 
     def build(self, define_graph = None):
         """Build the pipeline.
@@ -481,6 +615,183 @@ Parameters
         self._pipe.Build(self._names_and_devices)
         self._built = True
 
+    def autotune(self, iterations = 20, num_threads = None, prefetch_queue_depth = (1, 2, 3, 4),
+                 memory_budget = None, tolerance = 0.05, define_graph = None):
+        """Chooses the number of threads and the prefetch queue depth which maximize
+        the throughput of the pipeline and builds the pipeline with them.
+
+        The pipeline is run with each of the candidate settings, measuring the throughput and
+        the memory used by the operator outputs (collected as in :meth:`executor_statistics`).
+        The thread counts are compared in a single run with the deepest candidate queue, by
+        limiting the number of active threads. Then, each queue depth which fits in
+        the `memory_budget` is tried with the chosen thread count. The smallest setting whose
+        throughput is within `tolerance` of the best one is chosen, so no threads or memory
+        are spent on a negligible gain.
+
+        Must be called instead of :meth:`build`. The inputs of ExternalSource operators must be
+        provided by their ``source`` or in :meth:`iter_setup`. The data consumed while tuning is
+        not returned;
+        the readers and the ``source`` callbacks start anew once the pipeline is built with the
+        chosen configuration. When the pipeline uses separate CPU and GPU queues,
+        only the CPU queue size is tuned. The parameters of the operators (for example
+        ``prefetch_queue_depth`` or ``initial_fill`` of the readers) are not changed.
+
+        Parameters
+        ----------
+        iterations : int, optional, default = 20
+            Number of iterations measured for each candidate setting.
+        num_threads : list of int, optional
+            Candidate thread counts. By default, powers of 2 up to the number of CPUs,
+            and the number of CPUs.
+        prefetch_queue_depth : list of int, optional, default = (1, 2, 3, 4)
+            Candidate prefetch queue depths.
+        memory_budget : int, optional
+            Maximum memory, in bytes, which the operator outputs can take. It is estimated as
+            the memory reserved for the outputs of all operators, times the queue depth.
+        tolerance : float, optional, default = 0.05
+            A setting is considered as good as the best one if its throughput is lower by at
+            most this fraction.
+        define_graph : callable
+            As in :meth:`build`.
+
+        Returns
+        -------
+        A dictionary with the chosen ``num_threads`` and ``prefetch_queue_depth`` (usable as
+        the arguments of the :class:`Pipeline` constructor), the measured ``throughput``
+        (samples per second) and ``memory_estimate`` (in bytes), and a list of all the
+        measurements in ``trials``. It can be serialized with :mod:`json`.
+        """
+        if self._built:
+            raise RuntimeError("Pipeline must not be built before it is tuned.")
+        if iterations < 1:
+            raise ValueError("At least one iteration is needed to tune the pipeline.")
+        if num_threads is None:
+            cpu_count = os.cpu_count() or 1
+            num_threads = [1 << i for i in range(cpu_count.bit_length()) if (1 << i) < cpu_count]
+            num_threads.append(cpu_count)
+        num_threads = sorted(set(num_threads))
+        depths = sorted(set(prefetch_queue_depth))
+        if not num_threads or num_threads[0] < 1:
+            raise ValueError("The candidate thread counts must be positive.")
+        if not depths or depths[0] < 1:
+            raise ValueError("The candidate prefetch queue depths must be positive.")
+
+        saved = (self._num_threads, self._prefetch_queue_depth, self._cpu_queue_size,
+                 self._gpu_queue_size, self._enable_memory_stats, self._api_type)
+        self._enable_memory_stats = True
+        trials = []
+
+        def measure(threads, depth):
+            throughput, stats = self._autotune_measure(iterations)
+            memory = sum(sum(v["reserved_memory_size"]) for v in stats.values()) * depth
+            efficiencies = [v["parallel_efficiency"] for v in stats.values()
+                            if "parallel_efficiency" in v]
+            trial = {"num_threads": threads,
+                     "prefetch_queue_depth": self._autotune_depth_value(depth),
+                     "throughput": throughput,
+                     "memory_estimate": memory}
+            if efficiencies:
+                trial["parallel_efficiency"] = sum(efficiencies) / len(efficiencies)
+            trials.append(trial)
+            return trial
+
+        def best_of(candidates):
+            top = max(t["throughput"] for t in candidates)
+            return next(t for t in candidates if t["throughput"] >= top * (1 - tolerance))
+
+        try:
+            # thread counts - a single pipeline, the number of active threads is limited
+            self._autotune_build(num_threads[-1], depths[-1], define_graph)
+            thread_trials = []
+            for threads in num_threads:
+                self._pipe.SetThreadLimit(threads)
+                thread_trials.append(measure(threads, depths[-1]))
+            best_threads = best_of(thread_trials)["num_threads"]
+            memory_per_batch = thread_trials[-1]["memory_estimate"] // depths[-1]
+
+            # queue depths - each needs a separate pipeline
+            if memory_budget is not None:
+                depths = [d for d in depths if memory_per_batch * d <= memory_budget]
+                if not depths:
+                    raise RuntimeError(("The pipeline needs about {} bytes for each iteration "
+                        "in flight, which does not fit in the memory budget of {} bytes.")
+                        .format(memory_per_batch, memory_budget))
+            depth_trials = []
+            for depth in depths:
+                self._autotune_build(best_threads, depth, define_graph)
+                depth_trials.append(measure(best_threads, depth))
+            chosen = best_of(depth_trials)
+        finally:
+            self._autotune_teardown()
+            (self._num_threads, self._prefetch_queue_depth, self._cpu_queue_size,
+             self._gpu_queue_size, self._enable_memory_stats, self._api_type) = saved
+
+        self._num_threads = chosen["num_threads"]
+        self._set_queue_depth(depths[depth_trials.index(chosen)])
+        self.build(define_graph)
+        return {"num_threads": chosen["num_threads"],
+                "prefetch_queue_depth": chosen["prefetch_queue_depth"],
+                "throughput": chosen["throughput"],
+                "memory_estimate": chosen["memory_estimate"],
+                "trials": trials}
+
+    def _set_queue_depth(self, depth):
+        if self._exec_separated:
+            self._cpu_queue_size = depth
+        else:
+            self._prefetch_queue_depth = depth
+            self._cpu_queue_size = depth
+            self._gpu_queue_size = depth
+
+    def _autotune_depth_value(self, depth):
+        if self._exec_separated:
+            return {"cpu_size": depth, "gpu_size": self._gpu_queue_size}
+        return depth
+
+    def _autotune_build(self, num_threads, depth, define_graph):
+        """Builds a fresh backend pipeline with the given settings"""
+        self._autotune_teardown()
+        self._num_threads = num_threads
+        self._set_queue_depth(depth)
+        self._prepare_graph(define_graph)
+        self._pipe.Build(self._names_and_devices)
+        self._built = True
+
+    def _autotune_teardown(self):
+        """Drops the backend pipeline and resets the iteration state"""
+        if self._input_callback_prefetcher is not None:
+            self._input_callback_prefetcher.reset()
+        elif self._input_callbacks:
+            for group in self._input_callbacks:
+                group.reset_indices()
+        self._input_callback_prefetcher = None
+        self._pipe = None
+        self._built = False
+        self._prepared = False
+        self._first_iter = True
+        self._last_iter = False
+        self._iter = 0
+        self._batches_to_consume = 0
+        self._cpu_batches_to_consume = 0
+        self._gpu_batches_to_consume = 0
+
+    def _autotune_measure(self, iterations):
+        """Returns the throughput (samples per second) over `iterations` and the executor
+        statistics; the queues are filled before the measurement starts"""
+        def run():
+            try:
+                self.run()
+            except StopIteration:
+                self.reset()
+                self.run()
+        for _ in range(self._cpu_queue_size + 1):
+            run()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        elapsed = time.perf_counter() - start
+        return iterations * self._batch_size / elapsed, self._pipe.executor_statistics()
+
     def feed_input(self, data_node, data, layout = None, cuda_stream = None, use_copy_kernel = False):
         """Pass a mutlidimensional array or DLPack (or a list thereof) to an output of ExternalSource.
         In the case of the GPU input, the data must be modified on the same stream as the one
@@ -804,7 +1115,9 @@ Parameters
             self._first_iter = True
             self._last_iter = False
             self._iter = 0
-            if self._input_callbacks:
+            if self._input_callback_prefetcher is not None:
+                self._input_callback_prefetcher.reset()
+            elif self._input_callbacks:
                 for group in self._input_callbacks:
                     group.reset_indices()
 
@@ -892,6 +1205,12 @@ Parameters
                                          pipeline._exec_async)
         pipeline._pipe.SetQueueSizes(pipeline._cpu_queue_size, pipeline._gpu_queue_size)
         pipeline._pipe.EnableExecutorMemoryStats(pipeline._enable_memory_stats)
+        pipeline._enable_tracing = kw.get("enable_tracing", False)
+        pipeline._pipe.EnableTracing(pipeline._enable_tracing)
+        pipeline._fuse_color_ops = kw.get("fuse_color_ops", False)
+        pipeline._pipe.EnableColorOpFusion(pipeline._fuse_color_ops)
+        pipeline._setup_memory_limits(pipeline._pipe, kw.get("memory_hints"),
+                                      kw.get("memory_budget"))
         pipeline._prepared = True
         pipeline._pipe.Build()
         pipeline._built = True
@@ -919,6 +1238,9 @@ Parameters
         self._pipe.SetExecutionTypes(self._exec_pipelined, self._exec_separated, self._exec_async)
         self._pipe.SetQueueSizes(self._cpu_queue_size, self._gpu_queue_size)
         self._pipe.EnableExecutorMemoryStats(self._enable_memory_stats)
+        self._pipe.EnableTracing(self._enable_tracing)
+        self._pipe.EnableColorOpFusion(self._fuse_color_ops)
+        self._setup_memory_limits(self._pipe, self._memory_hints, self._memory_budget)
         self._prepared = True
         self._pipe.Build()
         self._built = True
@@ -965,6 +1287,10 @@ Parameters
         if self._input_callbacks is None:
             return
 
+        if self._input_callback_prefetcher is not None:
+            self._input_callback_prefetcher.feed(self)
+            return
+
         for group in self._input_callbacks:
             group.call_and_feed(self, self._batch_size)
 
@@ -19,6 +19,7 @@ from nvidia.dali import types
 
 from collections import Iterable
 from distutils.version import LooseVersion
+import os
 import warnings
 
 from nvidia.dali_tf_plugin import dali_tf_plugin
@@ -131,14 +132,18 @@ if dataset_compatible_tensorflow():
   from tensorflow.python.data.util import structure
   import functools
 
-  def dataset_options():
+  def dataset_options(autotune=False):
     options = tf.data.Options()
     options.experimental_optimization.apply_default_optimizations = False
-    options.experimental_optimization.autotune = False
+    options.experimental_optimization.autotune = autotune
 
     return options
 
 
+  def _is_autotuned(value):
+    return value == tf.data.experimental.AUTOTUNE
+
+
   class _DALIDatasetV2(dataset_ops.DatasetSource):
     def __init__(
       self,
@@ -154,6 +159,8 @@ if dataset_compatible_tensorflow():
       prefetch_queue_depth = 2,
       cpu_prefetch_queue_depth = 2,
       gpu_prefetch_queue_depth = 2,
+      max_num_threads = None,
+      max_prefetch_queue_depth = 4,
       dtypes=None,
       shapes=None):
 
@@ -176,9 +183,16 @@ if dataset_compatible_tensorflow():
 
       output_classes = nest.map_structure(lambda _: ops.Tensor, output_dtypes)
 
+      if _is_autotuned(prefetch_queue_depth) and exec_separated:
+        raise ValueError("`prefetch_queue_depth` can't be tuned with `exec_separated` set to True.")
+      if max_num_threads is None:
+        max_num_threads = os.cpu_count() or 1
+
       self._pipeline = serialize_pipeline(pipeline)
       self._batch_size = batch_size
       self._num_threads = num_threads
+      self._max_num_threads = max_num_threads
+      self._max_prefetch_queue_depth = max_prefetch_queue_depth
       if device_id is None:
           device_id = types.CPU_ONLY_DEVICE_ID
       self._device_id = device_id
@@ -242,6 +256,8 @@ if dataset_compatible_tensorflow():
         prefetch_queue_depth = self._prefetch_queue_depth,
         cpu_prefetch_queue_depth = self._cpu_prefetch_queue_depth,
         gpu_prefetch_queue_depth = self._gpu_prefetch_queue_depth,
+        max_num_threads = self._max_num_threads,
+        max_prefetch_queue_depth = self._max_prefetch_queue_depth,
         output_shapes = self._output_shapes,
         output_dtypes = self._output_dtypes,
         fail_on_device_mismatch = self._fail_on_device_mismatch)
@@ -260,7 +276,12 @@ if dataset_compatible_tensorflow():
     @functools.wraps(_DALIDatasetV2.__init__)
     def __init__(self, pipeline, **kwargs):
       dataset_impl = _DALIDatasetImpl(pipeline, **kwargs)
-      super(DALIDataset, self).__init__(dataset_impl, dataset_options())
+      # tf.data autotuning is kept enabled when DALI parameters are tuned and for CPU-only
+      # pipelines, so the downstream stages can be tuned as well
+      autotune = _is_autotuned(kwargs.get('num_threads')) or \
+                 _is_autotuned(kwargs.get('prefetch_queue_depth')) or \
+                 ('device_id' in kwargs and kwargs['device_id'] is None)
+      super(DALIDataset, self).__init__(dataset_impl, dataset_options(autotune))
 
 else:
   class DALIDataset:
@@ -278,6 +299,8 @@ else:
       prefetch_queue_depth = 2,
       cpu_prefetch_queue_depth = 2,
       gpu_prefetch_queue_depth = 2,
+      max_num_threads = None,
+      max_prefetch_queue_depth = 4,
       dtypes=None,
       shapes=None):
       raise RuntimeError('DALIDataset is not supported for detected version of TensorFlow.  DALIDataset supports versions: 1.15, 2.0')
@@ -313,6 +336,8 @@ DALIDataset.__doc__ =  """Creates a `DALIDataset` compatible with tf.data.Datase
         batch size of the pipeline.
     `num_threads` : int, optional, default = 4
         number of CPU threads used by the pipeline.
+        When set to `tf.data.experimental.AUTOTUNE`, the number of threads is tuned by tf.data
+        (together with the other stages of the input pipeline), up to `max_num_threads`.
     `device_id` : int, optional, default = 0
         id of GPU used by the pipeline.
         A None value for this parameter means that DALI should not use GPU nor CUDA runtime.
@@ -326,6 +351,8 @@ DALIDataset.__doc__ =  """Creates a `DALIDataset` compatible with tf.data.Datase
         resistant to uneven execution time of each batch, but it also
         consumes more memory for internal buffers.
         Value will be used with `exec_separated` set to False.
+        When set to `tf.data.experimental.AUTOTUNE`, the number of batches prefetched by DALI
+        is tuned by tf.data, up to `max_prefetch_queue_depth`.
     `cpu_prefetch_queue_depth` : int, optional, default = 2
         depth of the executor cpu queue. Deeper queue makes DALI more
         resistant to uneven execution time of each batch, but it also
@@ -336,6 +363,13 @@ DALIDataset.__doc__ =  """Creates a `DALIDataset` compatible with tf.data.Datase
         resistant to uneven execution time of each batch, but it also
         consumes more memory for internal buffers.
         Value will be used with `exec_separated` set to True.
+    `max_num_threads` : int, optional, default = None
+        the size of the DALI thread pool, when `num_threads` is set to
+        `tf.data.experimental.AUTOTUNE`. By default, the number of CPUs.
+    `max_prefetch_queue_depth` : int, optional, default = 4
+        depth of the executor queue, when `prefetch_queue_depth` is set to
+        `tf.data.experimental.AUTOTUNE`. All the buffers are allocated, even if
+        fewer batches are prefetched.
 
     Returns
     -------
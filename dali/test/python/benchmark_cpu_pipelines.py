@@ -0,0 +1,353 @@
+# Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Throughput benchmark of canonical CPU-only DALI pipelines.
+
+The pipelines read synthetic data, generated locally, so no dataset (and no GPU) is needed.
+Each pipeline is run for all combinations of the ``num_threads``, ``batch_size`` and
+``prefetch_queue_depth`` values given on the command line. The results can be written
+to a JSON file and compared against a baseline stored earlier with the same script::
+
+    python benchmark_cpu_pipelines.py --output baseline.json
+    # ... change DALI ...
+    python benchmark_cpu_pipelines.py --output current.json --baseline baseline.json
+
+The comparison fails (non-zero exit code) if the throughput of any configuration dropped by
+more than ``--tolerance`` with respect to the baseline.
+"""
+
+from nvidia.dali.pipeline import Pipeline
+import nvidia.dali.fn as fn
+import nvidia.dali.types as types
+import nvidia.dali as dali
+import numpy as np
+from PIL import Image
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import wave
+
+# -------------------------------------------------------------------------------------------------
+# synthetic data
+
+def _random_image(rng, height, width):
+    """A smooth image with some noise - compresses like a photo rather than like pure noise"""
+    y = np.linspace(0, rng.uniform(2, 8), height)[:, np.newaxis, np.newaxis]
+    x = np.linspace(0, rng.uniform(2, 8), width)[np.newaxis, :, np.newaxis]
+    phase = rng.uniform(0, 2 * np.pi, size=(1, 1, 3))
+    img = 127.5 + 100 * np.sin(x + phase) * np.cos(y - phase)
+    img += rng.normal(0, 10, size=(height, width, 3))
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+def _random_image_shape(rng):
+    return int(rng.integers(240, 640)), int(rng.integers(320, 800))
+
+def make_image_files(out_dir, num_samples, rng):
+    """Writes JPEG files to `out_dir`/<label>/ - the layout expected by FileReader"""
+    for i in range(num_samples):
+        label_dir = os.path.join(out_dir, str(i % 10))
+        os.makedirs(label_dir, exist_ok=True)
+        h, w = _random_image_shape(rng)
+        Image.fromarray(_random_image(rng, h, w)).save(
+            os.path.join(label_dir, "img_{}.jpg".format(i)), quality=90)
+
+def make_coco_files(out_dir, num_samples, rng):
+    """Writes JPEG files and a COCO annotations file with random boxes"""
+    images_dir = os.path.join(out_dir, "images")
+    os.makedirs(images_dir, exist_ok=True)
+    images, annotations = [], []
+    for i in range(num_samples):
+        h, w = _random_image_shape(rng)
+        file_name = "img_{}.jpg".format(i)
+        Image.fromarray(_random_image(rng, h, w)).save(os.path.join(images_dir, file_name),
+                                                       quality=90)
+        images.append({"id": i + 1, "file_name": file_name, "height": h, "width": w})
+        for _ in range(int(rng.integers(1, 20))):
+            bw, bh = rng.uniform(0.05, 0.5) * w, rng.uniform(0.05, 0.5) * h
+            bx, by = rng.uniform(0, w - bw), rng.uniform(0, h - bh)
+            annotations.append({"id": len(annotations) + 1, "image_id": i + 1,
+                                "category_id": int(rng.integers(1, 81)),
+                                "bbox": [bx, by, bw, bh], "area": bw * bh, "iscrowd": 0})
+    categories = [{"id": i, "name": "category_{}".format(i)} for i in range(1, 81)]
+    annotations_file = os.path.join(out_dir, "annotations.json")
+    with open(annotations_file, "w") as f:
+        json.dump({"images": images, "annotations": annotations, "categories": categories}, f)
+    return images_dir, annotations_file
+
+def make_asr_files(out_dir, num_samples, rng, sample_rate=16000):
+    """Writes 16-bit mono WAV files (1-15 s of noisy tones) and a NeMo ASR manifest"""
+    manifest = os.path.join(out_dir, "manifest.json")
+    with open(manifest, "w") as f:
+        for i in range(num_samples):
+            length = int(rng.uniform(1, 15) * sample_rate)
+            t = np.arange(length) / sample_rate
+            signal = np.sin(2 * np.pi * rng.uniform(100, 1000) * t)
+            signal += 0.1 * rng.normal(size=length)
+            samples = (np.clip(signal / 1.5, -1, 1) * 32767).astype(np.int16)
+            path = os.path.join(out_dir, "audio_{}.wav".format(i))
+            with wave.open(path, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(sample_rate)
+                wav.writeframes(samples.tobytes())
+            json.dump({"audio_filepath": path, "duration": length / sample_rate,
+                       "text": "sample {}".format(i)}, f)
+            f.write("\n")
+    return manifest
+
+def make_numpy_files(out_dir, num_samples, rng):
+    """Writes 3D float32 volumes of varying size as .npy files"""
+    os.makedirs(out_dir, exist_ok=True)
+    for i in range(num_samples):
+        shape = tuple(int(e) for e in rng.integers(96, 160, size=3))
+        np.save(os.path.join(out_dir, "vol_{}.npy".format(i)),
+                rng.normal(size=shape).astype(np.float32))
+
+# -------------------------------------------------------------------------------------------------
+# pipelines
+
+def classification_pipeline(data):
+    jpegs, labels = fn.file_reader(file_root=data["images"], random_shuffle=True)
+    images = fn.image_decoder(jpegs, device="cpu", output_type=types.RGB)
+    images = fn.random_resized_crop(images, size=(224, 224))
+    images = fn.crop_mirror_normalize(images, dtype=types.FLOAT, output_layout="CHW",
+                                      mean=[0.485 * 255, 0.456 * 255, 0.406 * 255],
+                                      std=[0.229 * 255, 0.224 * 255, 0.225 * 255],
+                                      mirror=fn.coin_flip())
+    return images, labels
+
+def _anchors(grid=19, sizes=(0.1, 0.3, 0.6)):
+    anchors = []
+    for y, x, s in itertools.product(range(grid), range(grid), sizes):
+        cx, cy = (x + 0.5) / grid, (y + 0.5) / grid
+        anchors += [max(cx - s / 2, 0), max(cy - s / 2, 0), min(cx + s / 2, 1), min(cy + s / 2, 1)]
+    return anchors
+
+def detection_pipeline(data):
+    jpegs, boxes, labels = fn.coco_reader(file_root=data["coco_images"],
+                                          annotations_file=data["coco_annotations"],
+                                          ltrb=True, ratio=True, skip_empty=True,
+                                          random_shuffle=True)
+    images = fn.image_decoder(jpegs, device="cpu", output_type=types.RGB)
+    flip = fn.coin_flip()
+    boxes = fn.bb_flip(boxes, ltrb=True, horizontal=flip)
+    images = fn.resize(images, resize_x=300, resize_y=300)
+    images = fn.crop_mirror_normalize(images, dtype=types.FLOAT, output_layout="CHW",
+                                      mean=[0.485 * 255, 0.456 * 255, 0.406 * 255],
+                                      std=[0.229 * 255, 0.224 * 255, 0.225 * 255],
+                                      mirror=flip)
+    boxes, labels = fn.box_encoder(boxes, labels, anchors=_anchors(), criteria=0.5,
+                                   offset=True, scale=300, stds=[0.1, 0.1, 0.2, 0.2])
+    return images, boxes, labels
+
+def asr_pipeline(data):
+    audio, _ = fn.nemo_asr_reader(manifest_filepaths=[data["asr_manifest"]], dtype=types.FLOAT,
+                                  downmix=True, sample_rate=16000, read_text=False,
+                                  random_shuffle=True)
+    audio = fn.preemphasis_filter(audio)
+    spec = fn.spectrogram(audio, nfft=512, window_length=320, window_step=160)
+    mel = fn.mel_filter_bank(spec, sample_rate=16000, nfilter=64)
+    mel = fn.to_decibels(mel, multiplier=10, cutoff_db=-80)
+    return fn.normalize(mel, axes=[1])
+
+def numpy3d_pipeline(data):
+    volumes = fn.numpy_reader(file_root=data["numpy"], file_filter="*.npy", random_shuffle=True)
+    volumes = fn.reshape(volumes, layout="DHW")
+    anchor = fn.uniform(range=[0.0, 0.4], shape=[3])
+    volumes = fn.slice(volumes, anchor, [64, 64, 64], axes=[0, 1, 2], normalized_anchor=True,
+                       normalized_shape=False, out_of_bounds_policy="pad")
+    volumes = fn.flip(volumes, horizontal=fn.coin_flip(), depthwise=fn.coin_flip())
+    return fn.normalize(volumes)
+
+PIPELINES = {
+    "classification": classification_pipeline,
+    "detection": detection_pipeline,
+    "asr": asr_pipeline,
+    "numpy3d": numpy3d_pipeline,
+}
+
+def prepare_data(root, pipelines, num_samples, seed):
+    rng = np.random.default_rng(seed)
+    data = {}
+    if "classification" in pipelines:
+        data["images"] = os.path.join(root, "images")
+        make_image_files(data["images"], num_samples, rng)
+    if "detection" in pipelines:
+        data["coco_images"], data["coco_annotations"] = \
+            make_coco_files(os.path.join(root, "coco"), num_samples, rng)
+    if "asr" in pipelines:
+        asr_dir = os.path.join(root, "asr")
+        os.makedirs(asr_dir, exist_ok=True)
+        data["asr_manifest"] = make_asr_files(asr_dir, num_samples, rng)
+    if "numpy3d" in pipelines:
+        data["numpy"] = os.path.join(root, "numpy")
+        make_numpy_files(data["numpy"], num_samples, rng)
+    return data
+
+# -------------------------------------------------------------------------------------------------
+# benchmark
+
+def run_config(name, data, num_threads, batch_size, prefetch, iters, warmup, seed):
+    pipe = Pipeline(batch_size=batch_size, num_threads=num_threads, device_id=None,
+                    prefetch_queue_depth=prefetch, seed=seed)
+    with pipe:
+        outputs = PIPELINES[name](data)
+        if not isinstance(outputs, tuple):
+            outputs = (outputs,)
+        pipe.set_outputs(*outputs)
+    start = time.perf_counter()
+    pipe.build()
+    build_time = time.perf_counter() - start
+    for _ in range(warmup):
+        pipe.run()
+    iter_times = []
+    start = time.perf_counter()
+    for _ in range(iters):
+        iter_start = time.perf_counter()
+        pipe.run()
+        iter_times.append(time.perf_counter() - iter_start)
+    total_time = time.perf_counter() - start
+    del pipe
+    iter_times = np.array(iter_times)
+    return {
+        "pipeline": name,
+        "num_threads": num_threads,
+        "batch_size": batch_size,
+        "prefetch_queue_depth": prefetch,
+        "iterations": iters,
+        "samples_per_sec": iters * batch_size / total_time,
+        "iter_time_mean": float(np.mean(iter_times)),
+        "iter_time_p50": float(np.percentile(iter_times, 50)),
+        "iter_time_p90": float(np.percentile(iter_times, 90)),
+        "iter_time_max": float(np.max(iter_times)),
+        "build_time": build_time,
+    }
+
+def config_key(result):
+    return (result["pipeline"], result["num_threads"], result["batch_size"],
+            result["prefetch_queue_depth"])
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Returns the list of the configurations whose throughput dropped below the baseline
+    by more than `tolerance` (relative)"""
+    baseline_results = {config_key(r): r for r in baseline["results"]}
+    regressions = []
+    print("\n{:<16} {:>7} {:>6} {:>8} {:>12} {:>12} {:>8}".format(
+        "pipeline", "threads", "batch", "prefetch", "baseline", "current", "change"))
+    for r in results:
+        ref = baseline_results.get(config_key(r))
+        if ref is None:
+            continue
+        change = r["samples_per_sec"] / ref["samples_per_sec"] - 1
+        regressed = change < -tolerance
+        print("{:<16} {:>7} {:>6} {:>8} {:>12.1f} {:>12.1f} {:>+7.1f}%{}".format(
+            *config_key(r), ref["samples_per_sec"], r["samples_per_sec"], change * 100,
+            "  REGRESSION" if regressed else ""))
+        if regressed:
+            regressions.append(r)
+    return regressions
+
+def environment_info():
+    return {
+        "dali_version": dali.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": multiprocessing.cpu_count(),
+    }
+
+def int_list(value):
+    return [int(v) for v in value.split(",")]
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput benchmark of CPU-only DALI pipelines "
+                                                 "on synthetic data")
+    parser.add_argument("--pipelines", default=",".join(PIPELINES.keys()), type=str,
+                        help="comma-separated list of pipelines to run, out of: {}"
+                             .format(", ".join(PIPELINES.keys())))
+    parser.add_argument("-j", "--num_threads", default="1,2,4", type=int_list,
+                        help="comma-separated list of thread counts (default: 1,2,4)")
+    parser.add_argument("-b", "--batch_size", default="32", type=int_list,
+                        help="comma-separated list of batch sizes (default: 32)")
+    parser.add_argument("--prefetch", default="2", type=int_list,
+                        help="comma-separated list of prefetch queue depths (default: 2)")
+    parser.add_argument("-i", "--iters", default=50, type=int,
+                        help="number of measured iterations (default: 50)")
+    parser.add_argument("--warmup", default=5, type=int,
+                        help="number of iterations run before the measurement (default: 5)")
+    parser.add_argument("--num_samples", default=128, type=int,
+                        help="number of synthetic samples generated for each pipeline")
+    parser.add_argument("--data_dir", default=None, type=str,
+                        help="where to put the synthetic data (default: a temporary directory)")
+    parser.add_argument("--seed", default=1234, type=int, help="random seed")
+    parser.add_argument("-o", "--output", default=None, type=str,
+                        help="JSON file to write the results to")
+    parser.add_argument("--baseline", default=None, type=str,
+                        help="JSON file with the results to compare against")
+    parser.add_argument("--tolerance", default=0.1, type=float,
+                        help="allowed relative drop of the throughput with respect to "
+                             "the baseline (default: 0.1)")
+    args = parser.parse_args()
+
+    pipelines = args.pipelines.split(",")
+    for name in pipelines:
+        if name not in PIPELINES:
+            parser.error("Unknown pipeline: {}".format(name))
+
+    tmp_dir = None
+    data_dir = args.data_dir
+    if data_dir is None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        data_dir = tmp_dir.name
+    print("Generating synthetic data in {}".format(data_dir))
+    data = prepare_data(data_dir, pipelines, args.num_samples, args.seed)
+
+    results = []
+    for name, num_threads, batch_size, prefetch in itertools.product(
+            pipelines, args.num_threads, args.batch_size, args.prefetch):
+        r = run_config(name, data, num_threads, batch_size, prefetch, args.iters, args.warmup,
+                       args.seed)
+        print("{}: threads: {}, batch: {}, prefetch: {}, speed: {:.1f} [samples/s], "
+              "avg time: {:.4f} [s], p90 time: {:.4f} [s]".format(
+                  name, num_threads, batch_size, prefetch, r["samples_per_sec"],
+                  r["iter_time_mean"], r["iter_time_p90"]))
+        results.append(r)
+
+    report = {"environment": environment_info(), "config": vars(args), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print("Results written to {}".format(args.output))
+
+    if tmp_dir is not None:
+        tmp_dir.cleanup()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("\n{} configuration(s) slower than the baseline by more than {:.0f}%".format(
+                len(regressions), args.tolerance * 100))
+            sys.exit(1)
+        print("\nNo regressions with respect to the baseline")
+
+if __name__ == "__main__":
+    main()
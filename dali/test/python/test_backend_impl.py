@@ -15,6 +15,7 @@
 from nvidia.dali.backend_impl import *
 from nvidia.dali.pipeline import Pipeline
 import nvidia.dali.ops as ops
+import nvidia.dali.types as types
 import numpy as np
 from numpy.testing import assert_array_equal, assert_allclose
 from nose.tools import assert_raises
@@ -128,3 +129,28 @@ def test_tensor_cpu_squeeze():
              (0, (1, 5, 1), "ABC", "BC"),
              (None, (3, 5, 1), "ABC", "AB")]:
         yield check_squeeze, shape, dim, in_layout, expected_out_layout
+
+def test_host_memory_pool_stats():
+    batch_size = 4
+    # alternating sample sizes make the host buffers grow and shrink, reusing the pooled memory
+    def source(iteration):
+        size = 100000 if iteration % 2 else 1000
+        return [np.full((size,), i, dtype=np.uint8) for i in range(batch_size)]
+
+    pipe = Pipeline(batch_size, 1, None)
+    with pipe:
+        data = ops.ExternalSource(source=source)()
+        pipe.set_outputs(ops.Cast(dtype=types.INT32)(data))
+    pipe.build()
+    ResetHostMemoryPoolStats()
+    for _ in range(6):
+        pipe.run()
+    stats = GetHostMemoryPoolStats()
+    for key in ["hits", "misses", "upstream_bytes", "peak_upstream_bytes", "cached_bytes"]:
+        assert key in stats
+    assert stats["hits"] > 0
+    assert stats["peak_upstream_bytes"] >= stats["upstream_bytes"]
+    assert stats["upstream_bytes"] >= stats["cached_bytes"]
+
+    ReleaseHostMemoryPool()
+    assert GetHostMemoryPoolStats()["cached_bytes"] == 0
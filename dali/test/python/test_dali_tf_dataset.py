@@ -147,6 +147,69 @@ def test_tf_dataset_cpu():
     _test_tf_dataset('cpu')
 
 
+def test_tf_dataset_autotune_cpu():
+    batch_size = 12
+    num_threads = 4
+    iterations = 20
+
+    dataset_pipeline = TestPipeline(batch_size, num_threads, 'cpu', device_id=None)
+    shapes = (
+        (batch_size, 3, 224, 224),
+        (batch_size, 1, 1),
+        (batch_size, 1))
+    dtypes = (
+        tf.float32,
+        tf.int32,
+        tf.int16)
+
+    dataset_results = []
+    with tf.device('/cpu:0'):
+        daliset = dali_tf.DALIDataset(
+            pipeline=dataset_pipeline,
+            batch_size=batch_size,
+            output_shapes=shapes,
+            output_dtypes=dtypes,
+            num_threads=tf.data.experimental.AUTOTUNE,
+            prefetch_queue_depth=tf.data.experimental.AUTOTUNE,
+            max_num_threads=num_threads,
+            max_prefetch_queue_depth=3,
+            device_id=None)
+        # a downstream stage, tuned together with DALI
+        daliset = daliset.map(lambda images, ids, ids_16: (images * 2, ids, ids_16),
+                              num_parallel_calls=tf.data.experimental.AUTOTUNE)
+        assert daliset.options().experimental_optimization.autotune is not False
+
+        iterator = tf.compat.v1.data.make_initializable_iterator(daliset)
+        next_element = iterator.get_next()
+
+    with tf.compat.v1.Session() as sess:
+        sess.run([tf.compat.v1.global_variables_initializer(), iterator.initializer])
+        for _ in range(iterations):
+            dataset_results.append(sess.run(next_element))
+
+    standalone_pipeline = TestPipeline(batch_size, num_threads, 'cpu', device_id=None)
+    standalone_pipeline.build()
+    for dataset_result in dataset_results:
+        standalone_result = tuple(result.as_array() for result in standalone_pipeline.run())
+        assert np.array_equal(dataset_result[0], standalone_result[0] * 2)
+        for dataset_out, standalone_out in zip(dataset_result[1:], standalone_result[1:]):
+            assert np.array_equal(dataset_out, standalone_out)
+
+
+@raises(ValueError)
+def test_tf_dataset_autotune_exec_separated():
+    batch_size = 12
+    dataset_pipeline = TestPipeline(batch_size, 4, 'cpu', device_id=None)
+    with tf.device('/cpu:0'):
+        dali_tf.DALIDataset(
+            pipeline=dataset_pipeline,
+            batch_size=batch_size,
+            output_dtypes=(tf.float32, tf.int32, tf.int16),
+            exec_separated=True,
+            prefetch_queue_depth=tf.data.experimental.AUTOTUNE,
+            device_id=None)
+
+
 @raises(Exception)
 def test_different_num_shapes_dtypes():
     batch_size = 12
@@ -371,6 +371,52 @@ def test_external_source_with_sample_info():
             check_output(pipe.run(), batch)
 
 
+def test_external_source_callback_prefetch():
+    batch_size = 5
+    for prefetch_depth in [1, 3]:
+        for batch in [True, False]:
+            pipe = Pipeline(batch_size, 3, 0, py_callback_prefetch_depth = prefetch_depth)
+
+            def src(info):
+                iteration = info if batch else info.iteration
+                if iteration == 4:
+                    raise StopIteration
+                if batch:
+                    return [make_array([iteration * 10 + s + 1.5], dtype=datapy.float32) for s in range(batch_size)]
+                return make_array([iteration * 10 + info.idx_in_batch + 1.5], dtype=datapy.float32)
+
+            pipe.set_outputs(fn.external_source(src, batch = batch))
+            pipe.build()
+
+            for _ in range(2):
+                for i in range(4):
+                    batch_data = [np.array([i * 10 + s + 1.5], dtype=np.float32) for s in range(batch_size)]
+                    check_output(pipe.run(), batch_data)
+                assert_raises(StopIteration, pipe.run)
+                pipe.reset()
+
+
+def test_external_source_async_callback():
+    import asyncio
+    batch_size = 4
+    for prefetch_depth in [0, 2]:
+        for batch in [True, False]:
+            pipe = Pipeline(batch_size, 3, 0, py_callback_prefetch_depth = prefetch_depth)
+
+            async def src(info):
+                await asyncio.sleep(0.001)
+                if batch:
+                    return [make_array([info * 10 + s + 1.5], dtype=datapy.float32) for s in range(batch_size)]
+                return make_array([info.iteration * 10 + info.idx_in_batch + 1.5], dtype=datapy.float32)
+
+            pipe.set_outputs(fn.external_source(src, batch = batch))
+            pipe.build()
+
+            for i in range(5):
+                batch_data = [np.array([i * 10 + s + 1.5], dtype=np.float32) for s in range(batch_size)]
+                check_output(pipe.run(), batch_data)
+
+
 def test_external_source_generator():
     pipe = Pipeline(1, 3, 0)
 
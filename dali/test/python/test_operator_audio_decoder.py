@@ -112,3 +112,66 @@ def test_decoded_vs_generated():
       assert np.allclose(res_mix, rosa3, rtol = 0, atol=3e-3)
 
       idx = (idx + 1) % len(names)
+
+class DecoderRegionPipeline(Pipeline):
+  def __init__(self, offsets, durations, downmix, sample_rate=None):
+    super(DecoderRegionPipeline, self).__init__(batch_size=len(offsets), num_threads=3,
+                                                device_id=0)
+    self.offsets = offsets
+    self.durations = durations
+    self.file_source = ops.ExternalSource()
+    self.offset_source = ops.ExternalSource()
+    self.duration_source = ops.ExternalSource()
+    rate_args = {} if sample_rate is None else {'sample_rate': sample_rate}
+    self.full_decoder = ops.AudioDecoder(downmix=downmix, dtype=types.FLOAT, **rate_args)
+    self.region_decoder = ops.AudioDecoder(downmix=downmix, dtype=types.FLOAT, **rate_args)
+
+  def define_graph(self):
+    self.raw_file = self.file_source()
+    self.offset = self.offset_source()
+    self.duration = self.duration_source()
+    full, _ = self.full_decoder(self.raw_file)
+    region, _ = self.region_decoder(self.raw_file, offset=self.offset, duration=self.duration)
+    return full, region
+
+  def iter_setup(self):
+    files = []
+    for i in range(self.batch_size):
+      with open(names[i % len(names)], mode = "rb") as f:
+        files.append(np.array(bytearray(f.read()), np.uint8))
+    self.feed_input(self.raw_file, files)
+    self.feed_input(self.offset, [np.array(o, dtype=np.float32) for o in self.offsets])
+    self.feed_input(self.duration, [np.array(d, dtype=np.float32) for d in self.durations])
+
+def check_decode_region(downmix):
+  # offset, duration in seconds; the last ones exceed the length of the audio
+  offsets = [0.0, 0.1, 0.25, 0.5, 10.0, 0.3]
+  durations = [0.1, 0.2, -1.0, 0.05, 1.0, 10.0]
+  pipeline = DecoderRegionPipeline(offsets, durations, downmix)
+  pipeline.build()
+  full, region = pipeline.run()
+  for i in range(len(offsets)):
+    idx = i % len(names)
+    start = min(int(offsets[i] * rates[idx]), lengths[idx])
+    end = lengths[idx] if durations[i] < 0 else \
+          min(start + int(durations[i] * rates[idx]), lengths[idx])
+    ref = full.at(i)[start:end]
+    out = region.at(i)
+    assert out.shape == ref.shape, "{} vs {}".format(out.shape, ref.shape)
+    assert np.array_equal(out, ref)
+
+def test_decode_region():
+  for downmix in [False, True]:
+    yield check_decode_region, downmix
+
+def test_decode_region_resampled_length():
+  offsets = [0.1, 0.2, 0.3]
+  durations = [0.2, 0.1, 0.3]
+  pipeline = DecoderRegionPipeline(offsets, durations, True, sample_rate=rate1)
+  pipeline.build()
+  _, region = pipeline.run()
+  for i in range(len(offsets)):
+    idx = i % len(names)
+    length = int(durations[i] * rates[idx])
+    ref_len = math.ceil(length * rate1 / rates[idx])
+    assert abs(region.at(i).shape[0] - ref_len) <= 1
@@ -49,3 +49,44 @@ def test_color_twist_vs_cpu():
     compare_pipelines(ColorTwistPipeline(batch_size, seed, iter(rand_it1), kind="new"),
                       ColorTwistPipeline(batch_size, seed, iter(rand_it2), kind="oldCpu"),
                       batch_size=batch_size, N_iterations=16, eps=1)
+
+
+class ColorAugmentPipeline(Pipeline):
+    def __init__(self, batch_size, seed, data_iterator, fuse_color_ops, output_intermediate=False,
+                 num_threads=2, device_id=0):
+        super(ColorAugmentPipeline, self).__init__(batch_size, num_threads, device_id, seed=seed,
+                                                   fuse_color_ops=fuse_color_ops)
+        self.input = ops.ExternalSource(source=data_iterator)
+        self.hue = ops.Uniform(range=[-20., 20.], seed=seed)
+        self.sat = ops.Uniform(range=[0.5, 1.5], seed=seed + 1)
+        self.bri = ops.Uniform(range=[0.5, 1.5], seed=seed + 2)
+        self.con = ops.Uniform(range=[0.5, 1.5], seed=seed + 3)
+        self.hsv = ops.Hsv(device="cpu", dtype=types.FLOAT)
+        self.brightness_contrast = ops.BrightnessContrast(device="cpu", brightness_shift=0.1)
+        self.color_twist = ops.ColorTwist(device="cpu", dtype=types.UINT8)
+        self.output_intermediate = output_intermediate
+
+    def define_graph(self):
+        images = self.input()
+        hsv = self.hsv(images, hue=self.hue(), saturation=self.sat())
+        bc = self.brightness_contrast(hsv, brightness=self.bri(), contrast=self.con())
+        out = self.color_twist(bc, hue=-self.hue(), contrast=self.con())
+        return (out, bc) if self.output_intermediate else out
+
+
+def check_fused_color_ops(output_intermediate):
+    batch_size = 8
+    seed = 1313
+    rand_it1 = RandomDataIterator(batch_size, shape=(300, 400, 3))
+    rand_it2 = RandomDataIterator(batch_size, shape=(300, 400, 3))
+    # the fused operators don't round the intermediate results
+    compare_pipelines(ColorAugmentPipeline(batch_size, seed, iter(rand_it1), False,
+                                           output_intermediate),
+                      ColorAugmentPipeline(batch_size, seed, iter(rand_it2), True,
+                                           output_intermediate),
+                      batch_size=batch_size, N_iterations=4, eps=1e-3, max_allowed_error=1)
+
+
+def test_fused_color_ops():
+    for output_intermediate in [False, True]:
+        yield check_fused_color_ops, output_intermediate
@@ -15,6 +15,7 @@
 from nvidia.dali.pipeline import Pipeline
 import nvidia.dali.ops as ops
 import nvidia.dali.types as types
+import numpy as np
 import os
 
 from test_utils import check_batch
@@ -114,3 +115,34 @@ def test_image_decoder_memory_stats():
     for threads in {1, 2, 3, 4}:
         for size in {1, 10}:
             yield check, img_type, size, device, threads
+
+class DecoderDtypePipeline(Pipeline):
+    def __init__(self, data_path, batch_size, output_type, dtype):
+        super(DecoderDtypePipeline, self).__init__(batch_size, 3, 0, prefetch_queue_depth=1)
+        self.input = ops.FileReader(file_root = data_path, shard_id = 0, num_shards = 1)
+        self.decode = ops.ImageDecoder(device = 'cpu', output_type = output_type)
+        self.decode_dtype = ops.ImageDecoder(device = 'cpu', output_type = output_type, dtype = dtype)
+
+    def define_graph(self):
+        inputs, _ = self.input(name="Reader")
+        return self.decode(inputs), self.decode_dtype(inputs)
+
+def check_decoder_dtype(img_type, output_type, dtype):
+    data_path = os.path.join(test_data_root, good_path, img_type)
+    pipe = DecoderDtypePipeline(data_path, 4, output_type, dtype)
+    pipe.build()
+    out8, out = pipe.run()
+    scale = {types.UINT16: 257., types.FLOAT: 1. / 255.}[dtype]
+    for i in range(len(out8)):
+        img8 = out8.at(i).astype(np.float64)
+        img = out.at(i)
+        assert img.dtype == {types.UINT16: np.uint16, types.FLOAT: np.float32}[dtype]
+        assert img.shape == img8.shape
+        # 16-bit images are decoded with the full precision, so allow for the 8-bit rounding
+        assert np.max(np.abs(img.astype(np.float64) / scale - img8)) <= 1
+
+def test_decoder_dtype():
+    for img_type in ['png', 'tiff', 'jpeg']:
+        for output_type in [types.RGB, types.GRAY]:
+            for dtype in [types.UINT16, types.FLOAT]:
+                yield check_decoder_dtype, img_type, output_type, dtype
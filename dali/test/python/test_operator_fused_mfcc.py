@@ -0,0 +1,103 @@
+# Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from nvidia.dali.pipeline import Pipeline
+import nvidia.dali.ops as ops
+import numpy as np
+from test_utils import compare_pipelines
+from test_utils import RandomDataIterator
+from nose.tools import raises
+
+class ChainedMFCCPipeline(Pipeline):
+    def __init__(self, batch_size, iterator, nfft, window_length, window_step, nfilter,
+                 n_mfcc, dct_type, lifter, reference, num_threads=1, device_id=0):
+        super(ChainedMFCCPipeline, self).__init__(batch_size, num_threads, device_id)
+        self.iterator = iterator
+        self.inputs = ops.ExternalSource()
+        self.spectrogram = ops.Spectrogram(nfft=nfft,
+                                           window_length=window_length,
+                                           window_step=window_step)
+        self.mel = ops.MelFilterBank(nfilter=nfilter, sample_rate=16000)
+        db_args = {} if reference is None else {'reference': reference}
+        self.to_db = ops.ToDecibels(multiplier=10.0, cutoff_db=-80.0, **db_args)
+        self.mfcc = ops.MFCC(n_mfcc=n_mfcc, dct_type=dct_type, lifter=lifter, axis=0)
+
+    def define_graph(self):
+        self.data = self.inputs()
+        return self.mfcc(self.to_db(self.mel(self.spectrogram(self.data))))
+
+    def iter_setup(self):
+        self.feed_input(self.data, self.iterator.next())
+
+class FusedMFCCPipeline(Pipeline):
+    def __init__(self, batch_size, iterator, nfft, window_length, window_step, nfilter,
+                 n_mfcc, dct_type, lifter, reference, num_threads=1, device_id=0):
+        super(FusedMFCCPipeline, self).__init__(batch_size, num_threads, device_id)
+        self.iterator = iterator
+        self.inputs = ops.ExternalSource()
+        db_args = {} if reference is None else {'reference': reference}
+        self.mfcc = ops.FusedMFCC(nfft=nfft,
+                                  window_length=window_length,
+                                  window_step=window_step,
+                                  nfilter=nfilter,
+                                  sample_rate=16000,
+                                  multiplier=10.0,
+                                  cutoff_db=-80.0,
+                                  n_mfcc=n_mfcc,
+                                  dct_type=dct_type,
+                                  lifter=lifter,
+                                  **db_args)
+
+    def define_graph(self):
+        self.data = self.inputs()
+        return self.mfcc(self.data)
+
+    def iter_setup(self):
+        self.feed_input(self.data, self.iterator.next())
+
+def check_fused_mfcc_vs_chained(batch_size, shape, nfft, window_length, window_step, nfilter,
+                                n_mfcc, dct_type, lifter, reference):
+    eii1 = RandomDataIterator(batch_size, shape=shape, dtype=np.float32)
+    eii2 = RandomDataIterator(batch_size, shape=shape, dtype=np.float32)
+    args = (nfft, window_length, window_step, nfilter, n_mfcc, dct_type, lifter, reference)
+    compare_pipelines(ChainedMFCCPipeline(batch_size, iter(eii1), *args),
+                      FusedMFCCPipeline(batch_size, iter(eii2), *args),
+                      batch_size=batch_size, N_iterations=3, eps=1e-03)
+
+def test_fused_mfcc_vs_chained():
+    for batch_size in [1, 3]:
+        # shape, nfft, window_length, window_step, nfilter, n_mfcc, dct_type, lifter, reference
+        for args in [((16000,), 512, 400, 160, 64, 20, 2, 0.0, None),
+                     ((10000,), 256, 256, 128, 40, 13, 2, 22.0, 1.0),
+                     ((8000,), 480, 400, 200, 80, 40, 3, 0.0, None),
+                     ((4000,), 300, 300, 100, 20, 20, 1, 0.0, 1.0)]:
+            yield (check_fused_mfcc_vs_chained, batch_size) + args
+
+@raises(RuntimeError)
+def check_fused_mfcc_wrong_args(kwargs):
+    batch_size = 2
+    eii = RandomDataIterator(batch_size, shape=(4000,), dtype=np.float32)
+    pipe = Pipeline(batch_size, 1, 0)
+    with pipe:
+        data = ops.ExternalSource(source=iter(eii))()
+        pipe.set_outputs(ops.FusedMFCC(**kwargs)(data))
+    pipe.build()
+    pipe.run()
+
+def test_fused_mfcc_wrong_args():
+    for kwargs in [{'window_length': 512, 'nfft': 256},       # window longer than the FFT
+                   {'power': 3},                              # unsupported power
+                   {'dct_type': 1, 'dct_normalize': True},    # DCT-I ortho-normalization
+                   {'mel_formula': 'bark'}]:                  # unsupported mel formula
+        yield check_fused_mfcc_wrong_args, kwargs
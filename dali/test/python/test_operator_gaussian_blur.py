@@ -141,6 +141,25 @@ def test_image_gaussian_blur_slow():
             yield check_gaussian_blur, 10, None, window_size, dev
 
 
+# For large sigmas the CPU operator uses a recursive approximation of the Gaussian,
+# which differs from the convolution by up to 2% of the input range
+def check_gaussian_blur_large_sigma(batch_size, sigma, window_size):
+    pipe = get_gaussian_pipe(batch_size, sigma, window_size, "cpu")
+    pipe.build()
+    for _ in range(test_iters):
+        result, input = pipe.run()
+        input = to_batch(input, batch_size)
+        baseline_cv = [gaussian_cv(img, sigma, window_size) for img in input]
+        check_batch(result, baseline_cv, batch_size, max_allowed_error=0.02 * 255 + 1,
+                    expected_layout="HWC")
+
+
+def test_image_gaussian_blur_large_sigma():
+    # the windows are not truncated: 2 * ceil(3 * sigma) + 1
+    for sigma, window_size in [(6.0, 37), ([15.0, 10.0], [91, 61])]:
+        yield check_gaussian_blur_large_sigma, 4, sigma, window_size
+
+
 def check_gaussian_blur_cpu_gpu(batch_size, sigma, window_size):
     cpu_pipe = get_gaussian_pipe(batch_size, sigma, window_size, "cpu")
     gpu_pipe = get_gaussian_pipe(batch_size, sigma, window_size, "gpu")
@@ -14,6 +14,7 @@
 
 import nvidia.dali.fn as fn
 import nvidia.dali as dali
+import nvidia.dali.backend as backend
 from nvidia.dali.pipeline import Pipeline
 import nvidia.dali.types as types
 import os
@@ -54,3 +55,30 @@ def test_operator_peek_image_shape():
         for out_type in test_types:
             data_path = os.path.join(test_data_root, path, img_type)
             yield run_decode, data_path, out_type
+
+def run_backend_peek(data_path):
+    batch_size = 4
+    pipe = Pipeline(batch_size=batch_size, num_threads=4, device_id=0)
+    input, _ = fn.file_reader(file_root=data_path, shard_id=0, num_shards=1, name="reader")
+    pipe.set_outputs(input, fn.peek_image_shape(input))
+    pipe.build()
+    samples = 0
+    length = pipe.reader_meta(name="reader")['epoch_size']
+    while samples < length:
+        samples += batch_size
+        (encoded, shapes) = pipe.run()
+        for i in range(batch_size):
+            data = encoded.at(i)
+            shape = backend.PeekImageShape(data)
+            assert tuple(shape) == tuple(shapes.at(i)), "{} vs {}".format(shape, shapes.at(i))
+            # the header is enough; fall back to the whole file only if it doesn't fit
+            try:
+                header_shape = backend.PeekImageShape(data[:1024])
+            except RuntimeError:
+                continue
+            assert header_shape == shape, "{} vs {}".format(header_shape, shape)
+
+def test_backend_peek_image_shape():
+    for img_type in file_types:
+        data_path = os.path.join(test_data_root, path, img_type)
+        yield run_backend_peek, data_path
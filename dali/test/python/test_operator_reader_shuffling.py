@@ -256,3 +256,65 @@ def test_pad_last_batch():
     print(set(mirrored_data))
     assert len(set(mirrored_data)) == 1
     assert len(next_img_ids_list) != len(next_img_ids_list_set)
+
+class COCOBucketingPipeline(Pipeline):
+    def __init__(self, batch_size, shard_id, num_shards, aspect_ratio_buckets, pad_last_batch):
+        super(COCOBucketingPipeline, self).__init__(batch_size, 4, 0, prefetch_queue_depth=1)
+        self.input = ops.COCOReader(file_root=data_sets[0][0], annotations_file=data_sets[0][1],
+                                    shard_id=shard_id, num_shards=num_shards, image_ids=True,
+                                    shuffle_after_epoch=True, pad_last_batch=pad_last_batch,
+                                    aspect_ratio_buckets=aspect_ratio_buckets)
+
+    def define_graph(self):
+        _, __, ___, ids = self.input(name="Reader")
+        return ids
+
+def coco_aspect_ratios():
+    import json
+    with open(data_sets[0][1]) as f:
+        images = json.load(f)['images']
+    return {img['id']: img['width'] / img['height'] for img in images}
+
+def test_aspect_ratio_buckets():
+    aspect_ratios = coco_aspect_ratios()
+    all_ratios = np.array(sorted(aspect_ratios.values()))
+    batch_size = 4
+    nbuckets = 4
+    pipe = COCOBucketingPipeline(batch_size, 0, 1, nbuckets, pad_last_batch=True)
+    pipe.build()
+    dataset_size = pipe.epoch_size("Reader")
+    bucket_size = int(math.ceil(dataset_size / nbuckets))
+    prev_ids = None
+    for epoch in range(3):
+        ids = []
+        # the padded, last batch can mix the buckets
+        for _ in range(dataset_size // batch_size):
+            batch = np.concatenate(pipe.run()[0].as_array())
+            ratios = [aspect_ratios[i] for i in batch]
+            # the samples in a batch come from at most two adjacent buckets
+            between = np.sum((all_ratios > min(ratios)) & (all_ratios < max(ratios)))
+            assert between < 2 * bucket_size, (epoch, ratios)
+            ids.append(batch)
+        if dataset_size % batch_size:
+            pipe.run()
+        ids = np.concatenate(ids)
+        assert prev_ids is None or np.any(ids != prev_ids)
+        prev_ids = ids
+
+def test_aspect_ratio_buckets_sharding():
+    num_shards = 2
+    pipes = [COCOBucketingPipeline(1, shard_id, num_shards, 3, pad_last_batch=False)
+             for shard_id in range(num_shards)]
+    [pipe.build() for pipe in pipes]
+    ref_pipe = COCOBucketingPipeline(1, 0, 1, 3, pad_last_batch=False)
+    ref_pipe.build()
+    _, ref_set, _ = gather_ids([ref_pipe])
+    prev_sets = None
+    for epoch in range(2):
+        _, sets, _ = gather_ids(pipes)
+        # the shards are disjoint and together cover the whole dataset
+        assert not sets[0].intersection(sets[1])
+        assert sets[0].union(sets[1]) == ref_set
+        # the global order is reshuffled after each epoch
+        assert prev_sets is None or sets[0] != prev_sets[0]
+        prev_sets = sets
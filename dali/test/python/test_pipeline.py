@@ -1575,6 +1575,203 @@ def test_executor_meta():
             assert(calc_avg_max(v["real_memory_size"]) == v["max_real_memory_size"])
             assert(calc_avg_max(v["reserved_memory_size"]) == v["max_reserved_memory_size"])
 
+def test_executor_meta_fft_plan_cache():
+    batch_size = 8
+    data = RandomDataIterator(batch_size, shape=(4000,), dtype=np.float32)
+    pipe = Pipeline(batch_size=batch_size, num_threads=2, device_id=None, enable_memory_stats=True)
+    with pipe:
+        audio = fn.external_source(data)
+        pipe.set_outputs(fn.spectrogram(audio, nfft=512, window_length=400, window_step=160))
+    pipe.build()
+    niter = 3
+    for _ in range(niter):
+        pipe.run()
+    meta = pipe.executor_statistics()
+    spectrogram_meta = [v for k, v in meta.items() if "Spectrogram" in k]
+    assert len(spectrogram_meta) == 1
+    hits = spectrogram_meta[0]["fft_plan_cache_hits"]
+    misses = spectrogram_meta[0]["fft_plan_cache_misses"]
+    # one plan per sample (more iterations may have been run ahead of time);
+    # at most one plan per thread has to be created
+    assert hits + misses >= niter * batch_size
+    assert (hits + misses) % batch_size == 0
+    assert misses <= 2
+
+def test_executor_meta_parallel_efficiency():
+    batch_size = 16
+    data = RandomDataIterator(batch_size, shape=(100, 200, 3), dtype=np.uint8)
+    pipe = Pipeline(batch_size=batch_size, num_threads=4, device_id=None, enable_memory_stats=True)
+    with pipe:
+        images = fn.external_source(data, layout="HWC")
+        pipe.set_outputs(fn.flip(images, horizontal=1))
+    pipe.build()
+    for _ in range(3):
+        pipe.run()
+    meta = pipe.executor_statistics()
+    flip_meta = [v for k, v in meta.items() if "Flip" in k]
+    assert len(flip_meta) == 1
+    for key in ["parallel_efficiency", "mean_parallel_efficiency"]:
+        efficiency = flip_meta[0][key]
+        assert 0 < efficiency <= 1.0 + 1e-6, "{}: {}".format(key, efficiency)
+
+
+def _memory_hints_test_pipe(batch_size, shape=(100, 200, 3), name="hinted_flip", **kwargs):
+    data = RandomDataIterator(batch_size, shape=shape, dtype=np.uint8)
+    pipe = Pipeline(batch_size=batch_size, num_threads=2, device_id=None, **kwargs)
+    with pipe:
+        images = fn.external_source(data, layout="HWC", name="hinted_source")
+        pipe.set_outputs(fn.flip(images, horizontal=1, name=name))
+    return pipe
+
+def _recorded_memory_hints(batch_size, **kwargs):
+    pipe = _memory_hints_test_pipe(batch_size, enable_memory_stats=True, **kwargs)
+    pipe.build()
+    pipe.run()
+    return pipe.memory_hints()
+
+def test_memory_hints():
+    import json
+    batch_size = 4
+    sample_size = 100 * 200 * 3
+    hints = json.loads(json.dumps(_recorded_memory_hints(batch_size)))
+    flip_hints = [v for k, v in hints.items() if k.endswith(":Flip")]
+    assert len(flip_hints) == 1 and len(flip_hints[0]) == 1
+    assert flip_hints[0][0] >= sample_size
+
+    # the outputs are preallocated at build, before the first run
+    pipe = _memory_hints_test_pipe(batch_size, memory_hints=hints, memory_budget=sample_size)
+    assert_raises(RuntimeError, pipe.build)
+
+    # the samples are much smaller than the recorded ones, so the output buffer is as large
+    # only because it was preallocated
+    pipe = _memory_hints_test_pipe(batch_size, shape=(10, 20, 3), enable_memory_stats=True,
+                                   memory_hints=hints)
+    pipe.build()
+    pipe.run()
+    meta = pipe.executor_statistics()
+    flip_meta = meta["CPU_hinted_flip"]
+    assert flip_meta["reserved_memory_size"][0] >= batch_size * sample_size
+
+def test_memory_hints_generated_names():
+    # the names generated for unnamed operators differ between the pipelines,
+    # the hints must match nevertheless
+    hints = _recorded_memory_hints(4, name=None)
+    pipe = _memory_hints_test_pipe(4, name=None, memory_hints=hints,
+                                   memory_budget=100 * 200 * 3)
+    assert_raises(RuntimeError, pipe.build)
+
+def test_memory_hints_other_graph():
+    hints = _recorded_memory_hints(4)
+    pipe = Pipeline(batch_size=4, num_threads=2, device_id=None, memory_hints=hints)
+    with pipe:
+        pipe.set_outputs(fn.external_source(RandomDataIterator(4, shape=(10, 10)),
+                                            name="hinted_source"))
+    assert_raises(RuntimeError, pipe.build)
+
+def test_memory_hints_without_stats():
+    pipe = _memory_hints_test_pipe(4)
+    pipe.build()
+    assert_raises(RuntimeError, pipe.memory_hints)
+
+def test_memory_budget_exceeded():
+    pipe = _memory_hints_test_pipe(4, memory_budget=100 * 200 * 3)
+    pipe.build()
+    assert_raises(RuntimeError, pipe.run)
+
+def test_memory_budget_preallocation():
+    hints = _recorded_memory_hints(4)
+    pipe = _memory_hints_test_pipe(4, memory_hints=hints)
+    pipe.build()
+    pipe = _memory_hints_test_pipe(4, memory_hints=hints, memory_budget=100 * 200 * 3)
+    assert_raises(RuntimeError, pipe.build)
+
+def test_memory_budget_sufficient():
+    pipe = _memory_hints_test_pipe(4, memory_budget=1 << 30)
+    pipe.build()
+    for _ in range(3):
+        pipe.run()
+
+def _tracing_test_pipe(batch_size, enable_tracing):
+    def source(sample_info):
+        return np.full((32, 32, 3), sample_info.idx_in_batch, dtype=np.uint8)
+    pipe = Pipeline(batch_size=batch_size, num_threads=2, device_id=None,
+                    enable_tracing=enable_tracing)
+    with pipe:
+        images = fn.external_source(source=source, batch=False, layout="HWC")
+        pipe.set_outputs(fn.flip(images, horizontal=1, name="traced_flip"))
+    return pipe
+
+def test_export_trace():
+    import json
+    import tempfile
+    batch_size = 5
+    pipe = _tracing_test_pipe(batch_size, True)
+    pipe.build()
+    for _ in range(3):
+        pipe.run()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "trace.json")
+        pipe.export_trace(filename)
+        with open(filename) as f:
+            trace = json.load(f)
+    events = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    for e in events:
+        assert e["dur"] >= 0
+    names = set(e["name"] for e in events)
+    assert "[DALI][Executor] RunCPU" in names
+    assert "[DALI][CPU op] traced_flip" in names
+    # the per-sample work done in the thread pool is labeled with the operator and the sample
+    samples = set(e["args"]["sample_begin"] for e in events
+                  if e["name"] == "[DALI][CPU op] traced_flip" and "args" in e)
+    assert samples == set(range(batch_size))
+    thread_names = [e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"]
+    assert any("thread pool" in name for name in thread_names)
+
+def test_export_trace_disabled():
+    pipe = _tracing_test_pipe(2, False)
+    pipe.build()
+    pipe.run()
+    with assert_raises(RuntimeError):
+        pipe.export_trace("trace.json")
+
+def _autotune_test_pipe(batch_size):
+    # the samples of n-th batch are filled with n, so the order of the batches can be checked
+    def source(sample_info):
+        return np.full((64, 64, 3), sample_info.iteration % 256, dtype=np.uint8)
+    pipe = Pipeline(batch_size=batch_size, num_threads=1, device_id=None)
+    with pipe:
+        images = fn.external_source(source=source, batch=False, layout="HWC")
+        pipe.set_outputs(fn.flip(images, horizontal=1))
+    return pipe
+
+def test_autotune():
+    import json
+    batch_size = 4
+    pipe = _autotune_test_pipe(batch_size)
+    config = pipe.autotune(iterations=3, num_threads=[1, 2], prefetch_queue_depth=[1, 2])
+    assert config["num_threads"] in [1, 2]
+    assert config["prefetch_queue_depth"] in [1, 2]
+    assert config["throughput"] > 0
+    assert config["memory_estimate"] > 0
+    # 2 thread counts + 2 queue depths
+    assert len(config["trials"]) == 4
+    json.loads(json.dumps(config))
+    # the pipeline is built with the chosen configuration and starts from the beginning
+    assert pipe.num_threads == config["num_threads"]
+    for i in range(3):
+        out, = pipe.run()
+        assert np.all(out.as_array() == i)
+
+def test_autotune_memory_budget():
+    pipe = _autotune_test_pipe(4)
+    assert_raises(RuntimeError, pipe.autotune, iterations=2, num_threads=[1],
+                  prefetch_queue_depth=[1, 2], memory_budget=1)
+
+def test_autotune_built():
+    pipe = _autotune_test_pipe(4)
+    pipe.build()
+    assert_raises(RuntimeError, pipe.autotune)
+
 
 def trigger_output_dtype_deprecated_warning():
     batch_size = 10
@@ -1697,6 +1894,33 @@ def test_epoch_size():
     assert(pipe.epoch_size("file_reader") != 0)
     assert(len(pipe.epoch_size()) == 4)
 
+def test_reader_io_stats():
+    batch_size = 8
+    for dont_use_mmap in [False, True]:
+        pipe = Pipeline(batch_size, num_threads=1, device_id=None, prefetch_queue_depth=1)
+        with pipe:
+            jpegs, _ = fn.file_reader(file_root=jpeg_folder, dont_use_mmap=dont_use_mmap,
+                                      name="file_reader")
+            pipe.set_outputs(jpegs)
+        pipe.build()
+        epoch_size = pipe.epoch_size("file_reader")
+        for _ in range((epoch_size + batch_size - 1) // batch_size + 1):
+            pipe.run()
+        io_stats = pipe.reader_meta("file_reader")["io_stats"]
+        assert io_stats["epochs_completed"] >= 1
+        total = io_stats["total"]
+        last_epoch = io_stats["last_epoch"]
+        # one read per file
+        assert last_epoch["read_calls"] == epoch_size
+        assert last_epoch["bytes_read"] > 0
+        assert sum(last_epoch["read_latency_histogram"]) == last_epoch["read_calls"]
+        if io_stats["epochs_completed"] == 1:
+            current_calls = io_stats["current_epoch"]["read_calls"]
+            assert total["read_calls"] == last_epoch["read_calls"] + current_calls
+        assert total["bytes_read"] >= last_epoch["bytes_read"]
+        assert total["consumer_wait_time_ns"] >= 0
+        assert total["cache_hits"] == 0
+
 def test_pipeline_out_of_scope():
     def get_output():
         pipe = dali.pipeline.Pipeline(1, 1, 0)
@@ -1718,3 +1942,65 @@ def test_return_constants():
     for i, o in enumerate(other):
         assert o.at(0) == types[i](42)
         assert o.at(0).dtype == types[i]
+
+def test_variable_batch_size():
+    max_batch_size = 8
+    batch_sizes = [8, 3, 1, 5, 8]
+    data = [[np.full((2, 3), i * 10 + s, dtype=np.uint8) for s in range(bs)]
+            for i, bs in enumerate(batch_sizes)]
+    pipe = Pipeline(max_batch_size, 2, None)
+    with pipe:
+        src = fn.external_source(source=data)
+        pipe.set_outputs(src, fn.cast(src, dtype=types.FLOAT))
+    pipe.build()
+    for i, bs in enumerate(batch_sizes):
+        raw, cast = pipe.run()
+        assert len(raw) == bs and len(cast) == bs
+        for s in range(bs):
+            assert_array_equal(raw.at(s), data[i][s])
+            assert_array_equal(cast.at(s), data[i][s].astype(np.float32))
+
+def test_variable_batch_size_unsupported_op():
+    data = [[np.zeros((4, 4, 3), dtype=np.uint8)] * 2]
+    pipe = Pipeline(4, 1, None)
+    with pipe:
+        pipe.set_outputs(fn.crop(fn.external_source(source=data), crop=(2, 2)))
+    pipe.build()
+    with assert_raises(RuntimeError):
+        pipe.run()
+
+def test_variable_batch_size_gpu_output():
+    batch_sizes = [4, 2, 3]
+    data = [[np.full((5,), i * 10 + s, dtype=np.int32) for s in range(bs)]
+            for i, bs in enumerate(batch_sizes)]
+    pipe = Pipeline(4, 2, 0)
+    with pipe:
+        src = fn.external_source(source=data)
+        pipe.set_outputs(src, src.gpu())
+    pipe.build()
+    for i, bs in enumerate(batch_sizes):
+        cpu, gpu = pipe.run()
+        gpu = gpu.as_cpu()
+        assert len(cpu) == bs and len(gpu) == bs
+        for s in range(bs):
+            assert_array_equal(cpu.at(s), data[i][s])
+            assert_array_equal(gpu.at(s), data[i][s])
+
+def test_variable_batch_size_argument_input_mismatch():
+    images = [[np.zeros((4, 4, 3), dtype=np.uint8)] * 4]
+    crop_x = [[np.array(0.5, dtype=np.float32)] * 2]
+    pipe = Pipeline(4, 1, None)
+    with pipe:
+        img = fn.external_source(source=images)
+        pipe.set_outputs(fn.crop(img, crop=(2, 2), crop_pos_x=fn.external_source(source=crop_x)))
+    pipe.build()
+    with assert_raises(RuntimeError):
+        pipe.run()
+
+def test_variable_batch_size_too_big():
+    pipe = Pipeline(2, 1, None)
+    with pipe:
+        pipe.set_outputs(fn.external_source(source=[[np.zeros(3)] * 3]))
+    pipe.build()
+    with assert_raises(RuntimeError):
+        pipe.run()
@@ -0,0 +1,148 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <sys/resource.h>
+#include <algorithm>
+#include "dali/util/io_stats.h"
+
+namespace dali {
+
+namespace {
+
+thread_local IOStats *tl_current_stats = nullptr;
+
+}  // namespace
+
+constexpr int IOCounters::kLatencyBuckets;
+
+int IOCounters::LatencyBucket(int64_t latency_ns) {
+  int64_t us = latency_ns / 1000;
+  int bucket = 0;
+  while (us > 0 && bucket < kLatencyBuckets - 1) {
+    us >>= 1;
+    bucket++;
+  }
+  return bucket;
+}
+
+IOCounters &IOCounters::operator+=(const IOCounters &other) {
+  bytes_read += other.bytes_read;
+  read_calls += other.read_calls;
+  read_time += other.read_time;
+  for (int i = 0; i < kLatencyBuckets; i++)
+    read_latency_histogram[i] += other.read_latency_histogram[i];
+  major_page_faults += other.major_page_faults;
+  minor_page_faults += other.minor_page_faults;
+  cache_hits += other.cache_hits;
+  consumer_wait_time += other.consumer_wait_time;
+  producer_wait_time += other.producer_wait_time;
+  return *this;
+}
+
+IOCounters &IOCounters::operator-=(const IOCounters &other) {
+  bytes_read -= other.bytes_read;
+  read_calls -= other.read_calls;
+  read_time -= other.read_time;
+  for (int i = 0; i < kLatencyBuckets; i++)
+    read_latency_histogram[i] -= other.read_latency_histogram[i];
+  major_page_faults -= other.major_page_faults;
+  minor_page_faults -= other.minor_page_faults;
+  cache_hits -= other.cache_hits;
+  consumer_wait_time -= other.consumer_wait_time;
+  producer_wait_time -= other.producer_wait_time;
+  return *this;
+}
+
+void IOStats::RecordRead(int64_t bytes, int64_t latency_ns) {
+  int bucket = IOCounters::LatencyBucket(latency_ns);
+  std::lock_guard<std::mutex> lock(mutex_);
+  total_.bytes_read += bytes;
+  total_.read_calls++;
+  total_.read_time += latency_ns;
+  total_.read_latency_histogram[bucket]++;
+}
+
+void IOStats::RecordPageFaults(int64_t major, int64_t minor) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  total_.major_page_faults += major;
+  total_.minor_page_faults += minor;
+}
+
+void IOStats::RecordCacheHit() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  total_.cache_hits++;
+}
+
+void IOStats::RecordConsumerWait(int64_t time_ns) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  total_.consumer_wait_time += time_ns;
+}
+
+void IOStats::RecordProducerWait(int64_t time_ns) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  total_.producer_wait_time += time_ns;
+}
+
+void IOStats::EndEpoch() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  last_epoch_ = total_ - epoch_start_;
+  epoch_start_ = total_;
+  epochs_completed_++;
+}
+
+IOCounters IOStats::Total() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return total_;
+}
+
+IOCounters IOStats::CurrentEpoch() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return total_ - epoch_start_;
+}
+
+IOCounters IOStats::LastEpoch() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return last_epoch_;
+}
+
+int64_t IOStats::EpochsCompleted() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return epochs_completed_;
+}
+
+void IOStats::ThreadPageFaults(int64_t *major, int64_t *minor) {
+  *major = 0;
+  *minor = 0;
+#ifdef RUSAGE_THREAD
+  struct rusage usage;
+  if (getrusage(RUSAGE_THREAD, &usage) == 0) {
+    *major = usage.ru_majflt;
+    *minor = usage.ru_minflt;
+  }
+#endif
+}
+
+IOStatsScope::IOStatsScope(IOStats *stats) : prev_(tl_current_stats) {
+  tl_current_stats = stats;
+}
+
+IOStatsScope::~IOStatsScope() {
+  tl_current_stats = prev_;
+}
+
+IOStats *IOStatsScope::Current() {
+  return tl_current_stats;
+}
+
+}  // namespace dali
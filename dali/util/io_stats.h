@@ -0,0 +1,140 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_UTIL_IO_STATS_H_
+#define DALI_UTIL_IO_STATS_H_
+
+#include <array>
+#include <chrono>
+#include <cstdint>
+#include <mutex>
+#include "dali/core/api_helper.h"
+
+namespace dali {
+
+/**
+ * @brief I/O counters of a data reader. All the times are in nanoseconds.
+ */
+struct DLL_PUBLIC IOCounters {
+  /**
+   * @brief Number of buckets in the read latency histogram.
+   *
+   * Bucket 0 counts the reads which took less than 1 us, bucket i > 0 - the reads which took
+   * [2^(i-1), 2^i) us; the last bucket counts all the longer reads as well.
+   */
+  static constexpr int kLatencyBuckets = 24;
+
+  int64_t bytes_read = 0;
+  int64_t read_calls = 0;
+  int64_t read_time = 0;
+  std::array<int64_t, kLatencyBuckets> read_latency_histogram{};
+  int64_t major_page_faults = 0;     // page faults of the thread which reads the data
+  int64_t minor_page_faults = 0;
+  int64_t cache_hits = 0;            // samples skipped thanks to `skip_cached_images`
+  int64_t consumer_wait_time = 0;    // time the operator waited for a prefetched batch
+  int64_t producer_wait_time = 0;    // time the prefetching waited for a free slot in the queue
+
+  DLL_PUBLIC static int LatencyBucket(int64_t latency_ns);
+
+  DLL_PUBLIC IOCounters &operator+=(const IOCounters &other);
+  DLL_PUBLIC IOCounters &operator-=(const IOCounters &other);
+
+  IOCounters operator-(const IOCounters &other) const {
+    IOCounters ret = *this;
+    ret -= other;
+    return ret;
+  }
+};
+
+/**
+ * @brief Thread-safe collection of the I/O counters of a data reader, cumulative and per epoch
+ */
+class DLL_PUBLIC IOStats {
+ public:
+  DLL_PUBLIC void RecordRead(int64_t bytes, int64_t latency_ns);
+  DLL_PUBLIC void RecordPageFaults(int64_t major, int64_t minor);
+  DLL_PUBLIC void RecordCacheHit();
+  DLL_PUBLIC void RecordConsumerWait(int64_t time_ns);
+  DLL_PUBLIC void RecordProducerWait(int64_t time_ns);
+
+  /**
+   * @brief Marks the end of the epoch - the counters collected since the end of the previous one
+   *        are reported as the last epoch.
+   */
+  DLL_PUBLIC void EndEpoch();
+
+  DLL_PUBLIC IOCounters Total() const;
+  DLL_PUBLIC IOCounters CurrentEpoch() const;
+  DLL_PUBLIC IOCounters LastEpoch() const;
+  DLL_PUBLIC int64_t EpochsCompleted() const;
+
+  /**
+   * @brief Gets the number of page faults of the calling thread so far;
+   *        0 if not supported by the platform.
+   */
+  DLL_PUBLIC static void ThreadPageFaults(int64_t *major, int64_t *minor);
+
+ private:
+  mutable std::mutex mutex_;
+  IOCounters total_, epoch_start_, last_epoch_;
+  int64_t epochs_completed_ = 0;
+};
+
+/**
+ * @brief Makes the FileStreams used in the calling thread report the reads to `stats` (RAII)
+ *
+ * The scopes can be nested; nullptr disables the reporting within the scope.
+ */
+class DLL_PUBLIC IOStatsScope {
+ public:
+  DLL_PUBLIC explicit IOStatsScope(IOStats *stats);
+  DLL_PUBLIC ~IOStatsScope();
+
+  /**
+   * @brief The statistics that the reads done by the calling thread are to be reported to
+   */
+  DLL_PUBLIC static IOStats *Current();
+
+  IOStatsScope(const IOStatsScope &) = delete;
+  IOStatsScope &operator=(const IOStatsScope &) = delete;
+
+ private:
+  IOStats *prev_;
+};
+
+/**
+ * @brief Measures the duration of a read and reports it to the current IOStats, if there are any
+ */
+class IOReadTimer {
+ public:
+  IOReadTimer() : stats_(IOStatsScope::Current()) {
+    if (stats_)
+      start_ = std::chrono::steady_clock::now();
+  }
+
+  void Done(int64_t bytes) {
+    if (stats_) {
+      stats_->RecordRead(bytes, std::chrono::duration_cast<std::chrono::nanoseconds>(
+          std::chrono::steady_clock::now() - start_).count());
+    }
+  }
+
+ private:
+  IOStats *stats_;
+  std::chrono::steady_clock::time_point start_;
+};
+
+}  // namespace dali
+
+#endif  // DALI_UTIL_IO_STATS_H_
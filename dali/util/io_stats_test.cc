@@ -0,0 +1,111 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <gtest/gtest.h>
+#include <unistd.h>
+#include <cstdio>
+#include <cstdlib>
+#include <string>
+#include <vector>
+#include "dali/util/file.h"
+#include "dali/util/io_stats.h"
+
+namespace dali {
+
+TEST(IOStats, LatencyBucket) {
+  EXPECT_EQ(IOCounters::LatencyBucket(0), 0);
+  EXPECT_EQ(IOCounters::LatencyBucket(999), 0);
+  EXPECT_EQ(IOCounters::LatencyBucket(1000), 1);
+  EXPECT_EQ(IOCounters::LatencyBucket(1999), 1);
+  EXPECT_EQ(IOCounters::LatencyBucket(2000), 2);
+  EXPECT_EQ(IOCounters::LatencyBucket(1000000), 10);  // 1 ms - [512, 1024) us
+  EXPECT_EQ(IOCounters::LatencyBucket(int64_t(1) << 60), IOCounters::kLatencyBuckets - 1);
+}
+
+TEST(IOStats, Epochs) {
+  IOStats stats;
+  stats.RecordRead(100, 500);
+  stats.RecordRead(50, 3000);
+  stats.RecordCacheHit();
+  stats.EndEpoch();
+  stats.RecordRead(10, 500);
+  stats.RecordConsumerWait(7);
+  stats.RecordProducerWait(3);
+  stats.RecordPageFaults(1, 2);
+
+  auto last = stats.LastEpoch();
+  EXPECT_EQ(last.bytes_read, 150);
+  EXPECT_EQ(last.read_calls, 2);
+  EXPECT_EQ(last.read_time, 3500);
+  EXPECT_EQ(last.read_latency_histogram[0], 1);
+  EXPECT_EQ(last.read_latency_histogram[2], 1);
+  EXPECT_EQ(last.cache_hits, 1);
+
+  auto current = stats.CurrentEpoch();
+  EXPECT_EQ(current.bytes_read, 10);
+  EXPECT_EQ(current.read_calls, 1);
+  EXPECT_EQ(current.read_latency_histogram[0], 1);
+  EXPECT_EQ(current.cache_hits, 0);
+  EXPECT_EQ(current.consumer_wait_time, 7);
+  EXPECT_EQ(current.producer_wait_time, 3);
+  EXPECT_EQ(current.major_page_faults, 1);
+  EXPECT_EQ(current.minor_page_faults, 2);
+
+  auto total = stats.Total();
+  EXPECT_EQ(total.bytes_read, 160);
+  EXPECT_EQ(total.read_calls, 3);
+  EXPECT_EQ(total.read_latency_histogram[0], 2);
+  EXPECT_EQ(stats.EpochsCompleted(), 1);
+}
+
+TEST(IOStats, FileStreamReads) {
+  char path[] = "/tmp/dali_io_stats_test_XXXXXX";
+  int fd = mkstemp(path);
+  ASSERT_GE(fd, 0);
+  std::vector<uint8_t> data(1000, 42);
+  ASSERT_EQ(write(fd, data.data(), data.size()), static_cast<ssize_t>(data.size()));
+  close(fd);
+
+  for (bool use_mmap : {false, true}) {
+    IOStats stats;
+    std::vector<uint8_t> buffer(600);
+    auto stream = FileStream::Open(path, false, use_mmap);
+    {
+      IOStatsScope scope(&stats);
+      EXPECT_EQ(IOStatsScope::Current(), &stats);
+      EXPECT_EQ(stream->Read(buffer.data(), 600), 600u);
+      {
+        IOStatsScope disabled(nullptr);
+        stream->Seek(0);
+        stream->Read(buffer.data(), 600);
+      }
+      stream->Seek(600);
+      EXPECT_EQ(stream->Read(buffer.data(), 600), 400u);
+    }
+    EXPECT_EQ(IOStatsScope::Current(), nullptr);
+    stream->Seek(0);
+    stream->Read(buffer.data(), 600);  // not recorded
+
+    auto total = stats.Total();
+    EXPECT_EQ(total.bytes_read, 1000) << "mmap: " << use_mmap;
+    EXPECT_EQ(total.read_calls, 2) << "mmap: " << use_mmap;
+    int64_t histogram_total = 0;
+    for (auto count : total.read_latency_histogram)
+      histogram_total += count;
+    EXPECT_EQ(histogram_total, 2);
+  }
+  unlink(path);
+}
+
+}  // namespace dali
@@ -33,6 +33,7 @@
 #include <tuple>
 
 #include "dali/util/mmaped_file.h"
+#include "dali/util/io_stats.h"
 #include "dali/core/error_handling.h"
 
 static int _sysctl(struct __sysctl_args *args);
@@ -180,6 +181,9 @@ shared_ptr<void> MmapedFileStream::Get(size_t n_bytes) {
   if (pos_ + n_bytes > length_) {
     return nullptr;
   }
+  // the data is only mapped here - the time of actually reading it from the disk is reported
+  // as the page faults of the thread that touches the memory
+  IOReadTimer timer;
   auto tmp = p_;
   shared_ptr<void> p(ReadAheadHelper(p_, pos_, n_bytes, !read_ahead_whole_file_),
     [tmp](void*) {
@@ -193,13 +197,16 @@ shared_ptr<void> MmapedFileStream::Get(size_t n_bytes) {
     // It will be freed, when last shared_ptr is deleted.
   });
   pos_ += n_bytes;
+  timer.Done(n_bytes);
   return p;
 }
 
 size_t MmapedFileStream::Read(uint8_t * buffer, size_t n_bytes) {
+  IOReadTimer timer;
   n_bytes = std::min(n_bytes, length_ - pos_);
   memcpy(buffer, ReadAheadHelper(p_, pos_, n_bytes, !read_ahead_whole_file_), n_bytes);
   pos_ += n_bytes;
+  timer.Done(n_bytes);
   return n_bytes;
 }
 
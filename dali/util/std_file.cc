@@ -20,6 +20,7 @@
 #include <string>
 
 #include "dali/core/error_handling.h"
+#include "dali/util/io_stats.h"
 #include "dali/util/std_file.h"
 
 namespace dali {
@@ -42,7 +43,9 @@ void StdFileStream::Seek(int64 pos) {
 }
 
 size_t StdFileStream::Read(uint8_t* buffer, size_t n_bytes) {
+  IOReadTimer timer;
   size_t n_read = std::fread(buffer, 1, n_bytes, fp_);
+  timer.Done(n_read);
   return n_read;
 }
 
@@ -12,7 +12,9 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
+#include <algorithm>
 #include <chrono>
+#include <memory>
 #include <sstream>
 
 #include "tensorflow/core/public/version.h"
@@ -37,6 +39,7 @@
 #include "tensorflow/core/framework/common_shape_fns.h"
 
 #include "tensorflow/core/framework/dataset.h"
+#include "tensorflow/core/framework/model.h"
 #include "tensorflow/core/framework/op_kernel.h"
 #include "tensorflow/core/framework/partial_tensor_shape.h"
 #include "tensorflow/core/framework/tensor.h"
@@ -88,6 +91,27 @@ class DALIDatasetOp : public DatasetOpKernel {
     int cpu_prefetch_queue_depth;
     int gpu_prefetch_queue_depth;
     bool enable_memory_stats;
+    // Upper bounds for the values tuned by tf.data, when `num_threads` or
+    // `prefetch_queue_depth` is set to AUTOTUNE
+    int max_num_threads;
+    int max_prefetch_queue_depth;
+
+    /**
+     * @brief The size of the DALI thread pool. With autotuning, the pool is created with
+     *        `max_num_threads` threads and the number of threads actually used is tuned.
+     */
+    int ThreadPoolSize() const {
+      return num_threads == model::kAutotune ? max_num_threads : num_threads;
+    }
+
+    /**
+     * @brief The depth of the executor queue. With autotuning, the queue holds
+     *        `max_prefetch_queue_depth` batches and the number of batches in flight is tuned.
+     */
+    int QueueDepth() const {
+      return prefetch_queue_depth == model::kAutotune ? max_prefetch_queue_depth
+                                                      : prefetch_queue_depth;
+    }
   };
 
   static constexpr const char* const kPipeline = "pipeline";
@@ -99,6 +123,8 @@ class DALIDatasetOp : public DatasetOpKernel {
   static constexpr const char* const kCpuPrefetchQueueDepth = "cpu_prefetch_queue_depth";
   static constexpr const char* const kGpuPrefetchQueueDepth = "gpu_prefetch_queue_depth";
   static constexpr const char* const kGpuMemoryStats = "enable_memory_stats";
+  static constexpr const char* const kMaxNumThreads = "max_num_threads";
+  static constexpr const char* const kMaxPrefetchQueueDepth = "max_prefetch_queue_depth";
 
   void FillPipelineDef(OpKernelConstruction* context, PipelineDef &def) {
     OP_REQUIRES_OK(context, context->GetAttr(kPipeline, &def.pipeline));
@@ -110,6 +136,18 @@ class DALIDatasetOp : public DatasetOpKernel {
     OP_REQUIRES_OK(context, context->GetAttr(kCpuPrefetchQueueDepth, &def.cpu_prefetch_queue_depth));
     OP_REQUIRES_OK(context, context->GetAttr(kGpuPrefetchQueueDepth, &def.gpu_prefetch_queue_depth));
     OP_REQUIRES_OK(context, context->GetAttr(kGpuMemoryStats, &def.enable_memory_stats));
+    OP_REQUIRES_OK(context, context->GetAttr(kMaxNumThreads, &def.max_num_threads));
+    OP_REQUIRES_OK(context, context->GetAttr(kMaxPrefetchQueueDepth,
+                                             &def.max_prefetch_queue_depth));
+    OP_REQUIRES(context, def.ThreadPoolSize() > 0,
+                errors::InvalidArgument("`num_threads` must be positive or AUTOTUNE, "
+                                        "with a positive `max_num_threads`."));
+    OP_REQUIRES(context, def.QueueDepth() > 0,
+                errors::InvalidArgument("`prefetch_queue_depth` must be positive or AUTOTUNE, "
+                                        "with a positive `max_prefetch_queue_depth`."));
+    OP_REQUIRES(context, !def.exec_separated || def.prefetch_queue_depth != model::kAutotune,
+                errors::InvalidArgument("`prefetch_queue_depth` can't be tuned "
+                                        "with `exec_separated`."));
   }
 
   PipelineDef pipeline_def_;
@@ -216,6 +254,8 @@ class DALIDatasetOp : public DatasetOpKernel {
       SerializeField(attrs, b, kCpuPrefetchQueueDepth, pipeline_def_.cpu_prefetch_queue_depth);
       SerializeField(attrs, b, kGpuPrefetchQueueDepth, pipeline_def_.gpu_prefetch_queue_depth);
       SerializeField(attrs, b, kGpuMemoryStats, pipeline_def_.enable_memory_stats);
+      SerializeField(attrs, b, kMaxNumThreads, pipeline_def_.max_num_threads);
+      SerializeField(attrs, b, kMaxPrefetchQueueDepth, pipeline_def_.max_prefetch_queue_depth);
 
       return attrs;
     }
@@ -226,16 +266,16 @@ class DALIDatasetOp : public DatasetOpKernel {
         pipeline_def_.pipeline.c_str(),
         pipeline_def_.pipeline.length(),
         pipeline_def_.batch_size,
-        pipeline_def_.num_threads,
+        pipeline_def_.ThreadPoolSize(),
         pipeline_def_.device_id,
         pipeline_def_.exec_separated,
-        pipeline_def_.prefetch_queue_depth,
+        pipeline_def_.QueueDepth(),
         pipeline_def_.cpu_prefetch_queue_depth,
         pipeline_def_.gpu_prefetch_queue_depth,
         pipeline_def_.enable_memory_stats));
 
       if (!pipeline_def_.exec_separated) {
-        TF_DALI_CALL(daliPrefetchUniform(pipeline_handle, pipeline_def_.prefetch_queue_depth));
+        TF_DALI_CALL(daliPrefetchUniform(pipeline_handle, pipeline_def_.QueueDepth()));
       } else {
         TF_DALI_CALL(daliPrefetchSeparate(pipeline_handle, pipeline_def_.cpu_prefetch_queue_depth,
                                        pipeline_def_.gpu_prefetch_queue_depth));
@@ -271,13 +311,43 @@ class DALIDatasetOp : public DatasetOpKernel {
       explicit Iterator(const Params &params, daliPipelineHandle pipeline_handle,
                         bool enable_memory_stats = false)
           : DatasetIterator<Dataset>(params), pipeline_handle_(pipeline_handle),
-            enable_memory_stats_(enable_memory_stats) {}
+            enable_memory_stats_(enable_memory_stats),
+            tuning_mu_(std::make_shared<mutex>()),
+            tuning_cond_var_(std::make_shared<condition_variable>()),
+            num_threads_(std::make_shared<model::SharedState>(
+                params.dataset->pipeline_def_.num_threads, tuning_mu_, tuning_cond_var_)),
+            prefetch_depth_(std::make_shared<model::SharedState>(
+                params.dataset->pipeline_def_.prefetch_queue_depth, tuning_mu_, tuning_cond_var_)),
+            thread_limit_(params.dataset->pipeline_def_.ThreadPoolSize()),
+            in_flight_(params.dataset->pipeline_def_.QueueDepth()) {}
 
       Status Initialize(IteratorContext* context) override {
         if (!dataset()->fail_on_device_mismatch_) {
             LOG(WARNING) << "DALI LOG: Allocator Name in Iterator: " << context->allocator({})->Name();
         }
-        return Status::OK(); 
+        // The tuning starts from the full thread pool and queue, the same as without autotuning
+        mutex_lock l(*tuning_mu_);
+        if (num_threads_->value == model::kAutotune) {
+          num_threads_->value = dataset()->pipeline_def_.ThreadPoolSize();
+        }
+        if (prefetch_depth_->value == model::kAutotune) {
+          prefetch_depth_->value = dataset()->pipeline_def_.QueueDepth();
+        }
+        return Status::OK();
+      }
+
+      /**
+       * @brief Reports the DALI thread count and prefetch depth to the tf.data model, so the
+       *        autotuner can balance them with the other stages of the input pipeline.
+       *        Only the values set to AUTOTUNE are tunable.
+       */
+      std::shared_ptr<model::Node> CreateNode(IteratorContext *context,
+                                              model::Node::Args args) const override {
+        const auto &def = dataset()->pipeline_def_;
+        return model::MakeAsyncKnownRatioNode(
+            std::move(args), /* ratio = */ 1,
+            {model::MakeParameter(kParallelism, num_threads_, 1, def.ThreadPoolSize()),
+             model::MakeParameter(kBufferSize, prefetch_depth_, 1, def.QueueDepth())});
       }
 
       Status GetNextInternal(IteratorContext *context, std::vector<Tensor> *out_tensors,
@@ -366,9 +436,9 @@ class DALIDatasetOp : public DatasetOpKernel {
         *end_of_sequence = false;
 
         TF_DALI_CALL(daliOutputRelease(&pipeline_handle_));
-        TF_DALI_CALL(daliRun(&pipeline_handle_));
+        in_flight_--;
 
-        return Status::OK();
+        return ScheduleRuns();
       }
 
       ~Iterator() {
@@ -409,6 +479,41 @@ class DALIDatasetOp : public DatasetOpKernel {
 #endif
 
      private:
+      static constexpr const char* const kParallelism = "parallelism";
+      static constexpr const char* const kBufferSize = "buffer_size";
+
+      /**
+       * @brief Applies the current values of the tuned parameters and schedules the next
+       *        iterations of the pipeline.
+       *
+       * The thread limit is changed only between the iterations. The pipeline is created with
+       * the maximal queue depth and the tuned depth is the number of iterations kept in flight,
+       * so when it is lowered, new iterations are scheduled only after enough of the already
+       * scheduled ones are consumed.
+       */
+      Status ScheduleRuns() {
+        int num_threads, depth;
+        {
+          mutex_lock l(*tuning_mu_);
+          num_threads = static_cast<int>(num_threads_->value);
+          depth = static_cast<int>(prefetch_depth_->value);
+        }
+        const auto &def = dataset()->pipeline_def_;
+        if (num_threads != thread_limit_) {
+          TF_DALI_CALL(daliSetThreadLimit(&pipeline_handle_, num_threads));
+          thread_limit_ = num_threads;
+        }
+        if (def.exec_separated) {
+          TF_DALI_CALL(daliRun(&pipeline_handle_));
+          return Status::OK();
+        }
+        depth = std::max(1, std::min(depth, def.QueueDepth()));
+        while (in_flight_ < depth) {
+          TF_DALI_CALL(daliRun(&pipeline_handle_));
+          in_flight_++;
+        }
+        return Status::OK();
+      }
 
       /**
        * @brief Get a shape that is compatible with the partial required shape (set for TF dataset)
@@ -532,6 +637,16 @@ class DALIDatasetOp : public DatasetOpKernel {
       tensorflow::mutex mu_;
       daliPipelineHandle pipeline_handle_;
       bool enable_memory_stats_;
+
+      // The state of the parameters tuned by tf.data; it has its own lock, as the autotuner
+      // must not wait for the pipeline run
+      std::shared_ptr<mutex> tuning_mu_;
+      std::shared_ptr<condition_variable> tuning_cond_var_;
+      std::shared_ptr<model::SharedState> num_threads_;
+      std::shared_ptr<model::SharedState> prefetch_depth_;
+      // The thread limit set in DALI and the number of the scheduled, not consumed, iterations
+      int thread_limit_;
+      int in_flight_;
     };  //Iterator
   };   //Dataset
 };
@@ -558,6 +673,8 @@ REGISTER_OP("DALIDataset")
   .Attr("cpu_prefetch_queue_depth: int")
   .Attr("gpu_prefetch_queue_depth: int")
   .Attr("enable_memory_stats: bool = false")
+  .Attr("max_num_threads: int = -1")
+  .Attr("max_prefetch_queue_depth: int = -1")
   .Attr("output_shapes: list(shape) >= 1")
   .Attr("output_dtypes: list({bool, half, float, uint8, uint16, uint32, uint64, int8, int16, int32, int64}) >= 1")
   .Attr("fail_on_device_mismatch: bool = true")
@@ -569,6 +686,8 @@ DALI Dataset plugin
 Creates a DALI dataset compatible with tf.data.Dataset from a DALI pipeline.
 `shapes` must match the shape of the corresponding DALI Pipeline output tensor shape.
 `dtypes` must match the type of the corresponding DALI Pipeline output tensors type.
+`num_threads` and `prefetch_queue_depth` can be set to -1 (AUTOTUNE), to be tuned by tf.data
+up to `max_num_threads` and `max_prefetch_queue_depth` respectively.
 )doc");
 
 }  // namespace dali_tf_impl
@@ -37,6 +37,7 @@ export BUILD_NVJPEG=${BUILD_NVJPEG:-ON}
 # use a default value as it differs for CUDA 10 and CUDA 11.x
 export BUILD_NVJPEG2K=${BUILD_NVJPEG2K:-ON}
 export BUILD_LIBTIFF=${BUILD_LIBTIFF:-ON}
+export BUILD_LIBPNG=${BUILD_LIBPNG:-ON}
 export BUILD_NVOF=${BUILD_NVOF:-ON}
 export BUILD_NVDEC=${BUILD_NVDEC:-ON}
 export BUILD_LIBSND=${BUILD_LIBSND:-ON}
@@ -76,6 +77,7 @@ cmake ../ -DCMAKE_INSTALL_PREFIX=.                 \
       -DBUILD_NVJPEG=${BUILD_NVJPEG}               \
       -DBUILD_NVJPEG2K=${BUILD_NVJPEG2K}           \
       -DBUILD_LIBTIFF=${BUILD_LIBTIFF}             \
+      -DBUILD_LIBPNG=${BUILD_LIBPNG}               \
       -DBUILD_NVOF=${BUILD_NVOF}                   \
       -DBUILD_NVDEC=${BUILD_NVDEC}                 \
       -DBUILD_LIBSND=${BUILD_LIBSND}               \
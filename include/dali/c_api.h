@@ -247,6 +247,13 @@ DLL_PUBLIC void daliPrefetchUniform(daliPipelineHandle *pipe_handle, int queue_d
 DLL_PUBLIC void daliPrefetchSeparate(daliPipelineHandle *pipe_handle,
                                      int cpu_queue_depth, int gpu_queue_depth);
 
+/**
+ * @brief Limit the number of worker threads running the CPU operators of the pipeline.
+ * The limit can be changed between the iterations; it is clamped to [1, num_threads]
+ * (the `num_threads` of the pipeline, which is the size of its thread pool).
+ */
+DLL_PUBLIC void daliSetThreadLimit(daliPipelineHandle *pipe_handle, int num_threads);
+
 /**
  * @brief Wait until the output of the pipeline is ready.
  * Releases previously returned buffers.
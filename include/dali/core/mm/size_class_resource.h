@@ -0,0 +1,306 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_CORE_MM_SIZE_CLASS_RESOURCE_H_
+#define DALI_CORE_MM_SIZE_CLASS_RESOURCE_H_
+
+#include <algorithm>
+#include <mutex>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+#include "dali/core/util.h"
+#include "dali/core/mm/memory_resource.h"
+#include "dali/core/mm/detail/free_list.h"
+
+namespace dali {
+namespace mm {
+
+struct size_class_options {
+  /// Allocations up to this size use the smallest size class
+  size_t min_class_size = 256;
+  /// Allocations larger than this are passed directly to the upstream resource
+  size_t max_class_size = (static_cast<size_t>(1) << 30);
+  /**
+   * @brief Log2 of the number of size classes per power of two.
+   *
+   * The allocation size is rounded up to the nearest size class, so the memory overhead
+   * is at most 1/(2^size_class_bits).
+   */
+  int size_class_bits = 2;
+  /// Maximum number of bytes kept in the free lists; blocks above this limit are freed
+  size_t max_cached_bytes = static_cast<size_t>(-1);  // no limit
+  /// Alignment of the blocks requested from upstream
+  size_t upstream_alignment = 64;
+  /**
+   * @brief If true, the freed blocks are not reused until `synchronize` is called.
+   *
+   * This is used when the memory may still be in use after it's been freed (e.g. by
+   * asynchronous copies) - `synchronize` is called only when there are no blocks
+   * readily available in the free lists.
+   */
+  bool deferred_reuse = false;
+  /**
+   * @brief If false, the allocation never waits for `synchronize` - the deferred blocks
+   *        are reused only after an explicit call to `reclaim_deferred`.
+   *
+   * Meaningful only with `deferred_reuse`.
+   */
+  bool reclaim_on_allocate = true;
+};
+
+struct pool_stats {
+  /// Number of allocations served from the free lists
+  size_t hits = 0;
+  /// Number of allocations that required an allocation from upstream
+  size_t misses = 0;
+  /// Number of bytes currently allocated from upstream (including the cached blocks)
+  size_t upstream_bytes = 0;
+  /// Peak value of `upstream_bytes`
+  size_t peak_upstream_bytes = 0;
+  /// Number of bytes kept in the free lists
+  size_t cached_bytes = 0;
+};
+
+/**
+ * @brief A memory resource which keeps the freed blocks in free lists of uniform
+ *        size classes and reuses them for subsequent allocations.
+ *
+ * Unlike pool_resource_base, the blocks are never split or merged - an allocation is
+ * rounded up to its size class and the whole block is returned to the free list of that class.
+ * This makes the allocation and deallocation O(1) and is well suited for workloads which
+ * repeatedly allocate and free buffers of similar sizes.
+ */
+template <class LockType = std::mutex>
+class size_class_resource : public memory_resource {
+ public:
+  explicit size_class_resource(memory_resource *upstream, const size_class_options &opt = {})
+  : upstream_(upstream), options_(opt) {}
+
+  size_class_resource(const size_class_resource &) = delete;
+  size_class_resource(size_class_resource &&) = delete;
+
+  ~size_class_resource() {
+    release_cached();
+  }
+
+  /**
+   * @brief Returns the size of the block which is allocated for a request of given size
+   */
+  size_t class_size(size_t bytes) const noexcept {
+    if (bytes <= options_.min_class_size)
+      return options_.min_class_size;
+    if (bytes > options_.max_class_size)
+      return bytes;
+    int log2 = ilog2(bytes - 1);
+    size_t step = std::max<size_t>((static_cast<size_t>(1) << log2) >> options_.size_class_bits,
+                                   1);
+    return align_up(bytes, step);
+  }
+
+  /**
+   * @brief Returns all cached blocks to the upstream resource
+   */
+  void release_cached() {
+    lock_guard guard(lock_);
+    synchronize_deferred();
+    for (auto &cls : free_lists_) {
+      while (void *ptr = cls.second.get()) {
+        upstream_->deallocate(ptr, cls.first, options_.upstream_alignment);
+        stats_.upstream_bytes -= cls.first;
+        stats_.cached_bytes -= cls.first;
+      }
+    }
+    free_lists_.clear();
+  }
+
+  /**
+   * @brief Calls `synchronize` and makes the blocks deferred until now available for reuse.
+   *
+   * The lock is not held while synchronizing, so the resource can be used in the meantime.
+   */
+  void reclaim_deferred() {
+    std::vector<std::pair<void *, size_t>> blocks;
+    {
+      lock_guard guard(lock_);
+      blocks.swap(deferred_);
+    }
+    if (blocks.empty())
+      return;
+    try {
+      synchronize();
+    } catch (...) {
+      lock_guard guard(lock_);
+      deferred_.insert(deferred_.end(), blocks.begin(), blocks.end());
+      throw;
+    }
+    lock_guard guard(lock_);
+    for (auto &blk : blocks)
+      free_lists_[blk.second].put(blk.first);
+  }
+
+  void set_max_cached_bytes(size_t max_bytes) {
+    {
+      lock_guard guard(lock_);
+      options_.max_cached_bytes = max_bytes;
+      if (stats_.cached_bytes <= max_bytes)
+        return;
+    }
+    release_cached();
+  }
+
+  size_t max_cached_bytes() const {
+    return options_.max_cached_bytes;
+  }
+
+  pool_stats get_stats() const {
+    lock_guard guard(lock_);
+    return stats_;
+  }
+
+  void reset_stats() {
+    lock_guard guard(lock_);
+    stats_.hits = 0;
+    stats_.misses = 0;
+    stats_.peak_upstream_bytes = stats_.upstream_bytes;
+  }
+
+ protected:
+  /**
+   * @brief Waits until the memory of the deferred blocks can be reused.
+   *
+   * Used only when `deferred_reuse` is set.
+   */
+  virtual void synchronize() {}
+
+  /**
+   * @brief Called, without the lock held, after a freed block is deferred.
+   */
+  virtual void on_deferred() {}
+
+  void *do_allocate(size_t bytes, size_t alignment) override {
+    if (!bytes)
+      return nullptr;
+    if (!is_pooled(bytes, alignment)) {
+      void *ptr = upstream_->allocate(bytes, alignment);
+      lock_guard guard(lock_);
+      stats_.misses++;
+      add_upstream_bytes(bytes);
+      return ptr;
+    }
+
+    size_t blk_size = class_size(bytes);
+    {
+      lock_guard guard(lock_);
+      void *ptr = get_cached(blk_size);
+      if (!ptr && !deferred_.empty() && options_.reclaim_on_allocate) {
+        synchronize_deferred();
+        ptr = get_cached(blk_size);
+      }
+      if (ptr) {
+        stats_.hits++;
+        return ptr;
+      }
+    }
+
+    void *ptr;
+    try {
+      ptr = upstream_->allocate(blk_size, options_.upstream_alignment);
+    } catch (const std::bad_alloc &) {
+      // free the cached memory and retry
+      release_cached();
+      ptr = upstream_->allocate(blk_size, options_.upstream_alignment);
+    }
+    lock_guard guard(lock_);
+    stats_.misses++;
+    add_upstream_bytes(blk_size);
+    return ptr;
+  }
+
+  void do_deallocate(void *ptr, size_t bytes, size_t alignment) override {
+    if (!ptr)
+      return;
+    if (!is_pooled(bytes, alignment)) {
+      upstream_->deallocate(ptr, bytes, alignment);
+      lock_guard guard(lock_);
+      stats_.upstream_bytes -= bytes;
+      return;
+    }
+
+    size_t blk_size = class_size(bytes);
+    bool deferred = false;
+    {
+      lock_guard guard(lock_);
+      if (stats_.cached_bytes + blk_size <= options_.max_cached_bytes) {
+        stats_.cached_bytes += blk_size;
+        if (!options_.deferred_reuse) {
+          free_lists_[blk_size].put(ptr);
+          return;
+        }
+        deferred_.emplace_back(ptr, blk_size);
+        deferred = true;
+      } else {
+        stats_.upstream_bytes -= blk_size;
+      }
+    }
+    if (deferred) {
+      on_deferred();
+      return;
+    }
+    upstream_->deallocate(ptr, blk_size, options_.upstream_alignment);
+  }
+
+ private:
+  bool is_pooled(size_t bytes, size_t alignment) const noexcept {
+    return bytes <= options_.max_class_size && alignment <= options_.upstream_alignment;
+  }
+
+  void *get_cached(size_t blk_size) {
+    auto it = free_lists_.find(blk_size);
+    if (it == free_lists_.end())
+      return nullptr;
+    void *ptr = it->second.get();
+    if (ptr)
+      stats_.cached_bytes -= blk_size;
+    return ptr;
+  }
+
+  // Requires the lock to be held
+  void synchronize_deferred() {
+    if (deferred_.empty())
+      return;
+    synchronize();
+    for (auto &blk : deferred_)
+      free_lists_[blk.second].put(blk.first);
+    deferred_.clear();
+  }
+
+  void add_upstream_bytes(size_t bytes) {
+    stats_.upstream_bytes += bytes;
+    stats_.peak_upstream_bytes = std::max(stats_.peak_upstream_bytes, stats_.upstream_bytes);
+  }
+
+  memory_resource *upstream_;
+  size_class_options options_;
+  std::unordered_map<size_t, uniform_free_list> free_lists_;
+  std::vector<std::pair<void *, size_t>> deferred_;
+  pool_stats stats_;
+  mutable LockType lock_;
+  using lock_guard = std::lock_guard<LockType>;
+};
+
+}  // namespace mm
+}  // namespace dali
+
+#endif  // DALI_CORE_MM_SIZE_CLASS_RESOURCE_H_
@@ -31,6 +31,7 @@
 #endif
 
 #include "dali/core/api_helper.h"
+#include "dali/core/tracer.h"
 
 namespace dali {
 
@@ -88,6 +89,7 @@ struct TimeRange : RangeBase {
   bool started = false;
 };
 
+// DALI domain timerange; when tracing is enabled, the range is also recorded in the Tracer
 struct DomainTimeRange : RangeBase {
   explicit DomainTimeRange(const std::string &name, const uint32_t rgb = kBlue)
     : DomainTimeRange(name.c_str(), rgb) {}
@@ -95,9 +97,12 @@ struct DomainTimeRange : RangeBase {
   explicit DomainTimeRange(const char *name, const uint32_t rgb = kBlue);
   ~DomainTimeRange();
 #else
-  explicit DomainTimeRange(const char *name, const uint32_t rgb = kBlue) {}
+  explicit DomainTimeRange(const char *name, const uint32_t rgb = kBlue) : trace_(name) {}
   ~DomainTimeRange() {}
 #endif
+
+ private:
+  TraceScope trace_;
 };
 
 }  // namespace dali
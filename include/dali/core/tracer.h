@@ -0,0 +1,158 @@
+// Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef DALI_CORE_TRACER_H_
+#define DALI_CORE_TRACER_H_
+
+#include <atomic>
+#include <cstdint>
+#include <mutex>
+#include <string>
+#include <vector>
+#include "dali/core/api_helper.h"
+
+namespace dali {
+
+/**
+ * @brief A single time range recorded by the Tracer
+ */
+struct TraceEvent {
+  std::string name;
+  int64_t start = 0;       // in nanoseconds, see Tracer::Now
+  int64_t end = 0;         // in nanoseconds, see Tracer::Now
+  int thread_id = 0;       // see Tracer::ThreadId
+  int sample_begin = -1;   // range of samples processed, -1 if not applicable
+  int sample_end = -1;
+};
+
+/**
+ * @brief Lightweight, process-wide tracer of the pipeline execution
+ *
+ * The events are kept in a fixed-capacity ring buffer - when it's full, the oldest events
+ * are overwritten. The tracer is enabled as long as there's at least one client which enabled
+ * it (e.g. a pipeline built with tracing enabled); when disabled, recording a range costs
+ * a single atomic load.
+ *
+ * The events can be exported in the Chrome trace format (chrome://tracing, Perfetto).
+ */
+class DLL_PUBLIC Tracer {
+ public:
+  static constexpr size_t kDefaultCapacity = 1 << 16;
+
+  DLL_PUBLIC static Tracer &Get();
+
+  /**
+   * @brief Enables the tracer; the calls must be balanced with `Disable`.
+   *
+   * The capacity of the buffer is the largest one requested by the clients that have it enabled.
+   * Enabling a disabled tracer starts a new session - the previously recorded events are
+   * discarded.
+   */
+  DLL_PUBLIC void Enable(size_t capacity = kDefaultCapacity);
+
+  DLL_PUBLIC void Disable();
+
+  bool enabled() const {
+    return enabled_.load(std::memory_order_relaxed);
+  }
+
+  /**
+   * @brief Adds the event to the buffer; ignored when the tracer is disabled.
+   */
+  DLL_PUBLIC void Record(TraceEvent event);
+
+  /**
+   * @brief Returns the buffered events, the oldest first
+   */
+  DLL_PUBLIC std::vector<TraceEvent> Events() const;
+
+  DLL_PUBLIC void Clear();
+
+  /**
+   * @brief Returns the buffered events as a JSON document in the Chrome trace format
+   */
+  DLL_PUBLIC std::string ExportChromeTrace() const;
+
+  /**
+   * @brief Current time in nanoseconds, relative to an arbitrary, process-wide origin
+   */
+  DLL_PUBLIC static int64_t Now();
+
+  /**
+   * @brief Small integer identifying the calling thread in the trace
+   */
+  DLL_PUBLIC static int ThreadId();
+
+  /**
+   * @brief Sets the name of the calling thread, as displayed in the exported trace
+   */
+  DLL_PUBLIC static void SetThreadName(const std::string &name);
+
+ private:
+  Tracer() = default;
+
+  std::atomic<bool> enabled_{false};
+  mutable std::mutex mutex_;
+  int clients_ = 0;
+  std::vector<TraceEvent> events_;
+  size_t capacity_ = 0;
+  size_t head_ = 0;   // index of the oldest event
+  size_t count_ = 0;
+};
+
+/**
+ * @brief Records a time range of the calling thread in the Tracer (RAII)
+ *
+ * The scopes in a thread form a stack; `SetSampleRange` and `CurrentName` refer to the innermost
+ * active scope of the calling thread.
+ */
+class DLL_PUBLIC TraceScope {
+ public:
+  explicit TraceScope(const std::string &name) : TraceScope(name.c_str()) {}
+
+  explicit TraceScope(const char *name) {
+    if (Tracer::Get().enabled())
+      Start(name);
+  }
+
+  ~TraceScope() {
+    if (active_)
+      Stop();
+  }
+
+  /**
+   * @brief Sets the range of samples processed in the innermost active scope of the calling thread
+   */
+  DLL_PUBLIC static void SetSampleRange(int begin, int end);
+
+  /**
+   * @brief Name of the innermost active scope of the calling thread or nullptr, if there's none
+   */
+  DLL_PUBLIC static const char *CurrentName();
+
+  TraceScope(const TraceScope &) = delete;
+  TraceScope &operator=(const TraceScope &) = delete;
+
+ private:
+  DLL_PUBLIC void Start(const char *name);
+  DLL_PUBLIC void Stop();
+
+  bool active_ = false;
+  TraceScope *parent_ = nullptr;
+  TraceEvent event_;
+};
+
+}  // namespace dali
+
+#endif  // DALI_CORE_TRACER_H_
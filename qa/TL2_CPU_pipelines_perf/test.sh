@@ -0,0 +1,23 @@
+#!/bin/bash -e
+# used pip packages
+pip_packages="numpy>=1.17 pillow"
+target_dir=./dali/test/python
+
+test_body() {
+    # CPU only test, remove CUDA from the search path just in case
+    export LD_LIBRARY_PATH=""
+    export PATH=${PATH/cuda/}
+
+    # the results are compared against a baseline collected on the same machine, if provided
+    BASELINE_ARGS=""
+    if [ -n "$DALI_CPU_PERF_BASELINE" ] && [ -f "$DALI_CPU_PERF_BASELINE" ]; then
+        BASELINE_ARGS="--baseline $DALI_CPU_PERF_BASELINE --tolerance ${DALI_CPU_PERF_TOLERANCE:-0.1}"
+    fi
+
+    python benchmark_cpu_pipelines.py -j 1,2,4,8 -b 16,64 --prefetch 1,2,3 -i 50 \
+        --output ${DALI_CPU_PERF_RESULTS:-cpu_pipelines_perf.json} $BASELINE_ARGS
+}
+
+pushd ../..
+source ./qa/test_template.sh
+popd
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Creates an index with the shapes of all the images in a dataset.
+
+Only the headers of the images are read and parsed, so the index can be built for very
+large datasets (e.g. to create aspect-ratio buckets) without decoding any image.
+Each line of the index contains the path of the image, relative to the dataset root,
+followed by its height, width and number of channels::
+
+    class_a/img_0001.jpg 375 500 3
+
+Example usage::
+
+    python image_shape_index.py /data/imagenet/train train_shapes.txt --num_workers 32
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from nvidia.dali.backend import PeekImageShape
+
+image_extensions = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff',
+                    '.pnm', '.ppm', '.pgm', '.pbm', '.jp2')
+
+def list_images(root, file_list=None):
+    """Returns the paths of the images, relative to `root`"""
+    if file_list is not None:
+        with open(file_list, 'r') as f:
+            # the format of the `file_list` of the FileReader: the path is the first column
+            return [line.split()[0] for line in f if line.strip()]
+    images = []
+    for dirpath, _, filenames in os.walk(root, followlinks=True):
+        for filename in filenames:
+            if filename.lower().endswith(image_extensions):
+                images.append(os.path.relpath(os.path.join(dirpath, filename), root))
+    images.sort()
+    return images
+
+def peek_shape(path, header_bytes):
+    """Reads the shape of the image, reading only the beginning of the file if possible"""
+    with open(path, 'rb') as f:
+        data = f.read(header_bytes)
+        try:
+            return PeekImageShape(data)
+        except RuntimeError:
+            # The header didn't fit (e.g. a large EXIF block, or a TIFF IFD at the end
+            # of the file) - retry with the whole file
+            if len(data) < header_bytes:
+                raise
+            data += f.read()
+    return PeekImageShape(data)
+
+def create_index(root, index_path, file_list=None, num_workers=8, header_bytes=64 * 1024):
+    """Writes the image -> shape index of the images in `root` to `index_path`.
+
+    Returns the number of indexed images and the list of images, which couldn't be parsed.
+    """
+    images = list_images(root, file_list)
+
+    def work(relpath):
+        try:
+            return peek_shape(os.path.join(root, relpath), header_bytes), None
+        except (RuntimeError, OSError) as e:
+            return None, str(e)
+
+    failed = []
+    count = 0
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=num_workers) as executor, open(index_path, 'w') as idx:
+        # `map` keeps the order of the images, so the index is deterministic
+        for relpath, (shape, error) in zip(images, executor.map(work, images, chunksize=64)):
+            if shape is None:
+                failed.append((relpath, error))
+                continue
+            idx.write('{} {} {} {}\n'.format(relpath, *shape))
+            count += 1
+            if count % 100000 == 0:
+                print('indexed {} images in {:.1f} s'.format(count, time.time() - start))
+    return count, failed
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Creates an index with the shapes (height, width, channels) of the images '
+                    'in a dataset, by parsing the image headers only.')
+    parser.add_argument('root', help='Root directory of the dataset')
+    parser.add_argument('index', help='Path to the index file, that will be created/overwritten')
+    parser.add_argument('--file_list', default=None,
+                        help='Optional list of files (relative to `root`) to index, in the format '
+                             'of the FileReader `file_list`. By default, `root` is traversed.')
+    parser.add_argument('--num_workers', type=int, default=os.cpu_count() or 8,
+                        help='Number of worker threads')
+    parser.add_argument('--header_bytes', type=int, default=64 * 1024,
+                        help='Number of bytes read from the beginning of each file. The whole '
+                             'file is read only when the header doesn\'t fit.')
+    args = parser.parse_args()
+
+    count, failed = create_index(args.root, args.index, args.file_list,
+                                 args.num_workers, args.header_bytes)
+    print('indexed {} images'.format(count))
+    for relpath, error in failed:
+        print('failed to parse {}: {}'.format(relpath, error), file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()